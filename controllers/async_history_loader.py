@@ -49,8 +49,10 @@ class AsyncHistoryWorker(QObject):
                             batch_loaded += 1
                             continue
                             
-                        # Controlla se l'issue è fittizio prima di fare chiamata API
-                        if self.jira_service.is_likely_fictitious_ticket(jira_key):
+                        # Controlla se l'issue è fittizio (euristica o registro persistente
+                        # dei 404 già visti) prima di fare chiamata API
+                        if (self.jira_service.is_likely_fictitious_ticket(jira_key)
+                                or self.jira_service.is_ticket_marked_as_fictitious(jira_key)):
                             title = f"Issue fittizio: {jira_key}"
                             self.title_loaded.emit(jira_key, title, "")
                             batch_loaded += 1
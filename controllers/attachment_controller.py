@@ -139,10 +139,10 @@ class AttachmentController:
                 
         return result
         
-    async def download_attachment(self, jira_key: str, attachment_info: Dict[str, Any], 
-                              force_download: bool = False) -> Optional[str]:
+    def queue_download(self, jira_key: str, attachment_info: Dict[str, Any], 
+                       force_download: bool = False) -> Optional[int]:
         """
-        Download an attachment for a Jira issue.
+        Queue the download of an attachment for a Jira issue.
         
         Args:
             jira_key: The Jira issue key
@@ -150,9 +150,9 @@ class AttachmentController:
             force_download: If True, download even if we already have it
             
         Returns:
-            The local path to the downloaded file, or None on failure
+            The download id, or None if the attachment is already stored locally
         """
-        return await self.attachment_service.download_attachment(
+        return self.attachment_service.queue_download(
             jira_key=jira_key,
             attachment_info=attachment_info,
             force_download=force_download
@@ -59,6 +59,8 @@ class ConfigController:
         # Set auto-sync state
         auto_sync = self.app_settings.get_setting("auto_sync", "false").lower() == "true"
         self.view.set_auto_sync(auto_sync)
+        coalesce_worklogs = self.app_settings.get_setting("coalesce_worklogs", "false").lower() == "true"
+        self.view.set_coalesce_worklogs(coalesce_worklogs)
         # Set always-on-top state
         always_on_top = self.app_settings.get_setting("always_on_top", "false").lower() == "true"
         try:
@@ -101,6 +103,7 @@ class ConfigController:
         pat = config["pat"]
         jql = config["jql"]
         auto_sync = config["auto_sync"]
+        coalesce_worklogs = config.get("coalesce_worklogs", False)
         log_info = config["log_info"]
         log_debug = config["log_debug"]
         log_warning = config["log_warning"]
@@ -143,6 +146,7 @@ class ConfigController:
 
             # Save auto-sync setting
             self.app_settings.set_setting("auto_sync", str(auto_sync).lower())
+            self.app_settings.set_setting("coalesce_worklogs", str(coalesce_worklogs).lower())
 
             # Save log level settings
             self.app_settings.set_setting("log_info", str(log_info).lower())
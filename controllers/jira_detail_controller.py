@@ -11,150 +11,14 @@ import webbrowser
 
 from services.jira_service import JiraService
 from services.git_tracking_service import GitTrackingService
+from services.download_manager import KIND_FILE, get_download_manager
+from services.thumbnail_cache import THUMBNAIL_SIZE, get_thumbnail_cache
+from services.pixmap_cache import shared_pixmap_cache
 from views.markdown_editor import MarkdownEditor
 import logging
 
 _logger = logging.getLogger('JiraTimeTracker')
 
-class AttachmentDownloadWorker(QThread):
-    """Worker thread for downloading attachments asynchronously."""
-    
-    progress_updated = pyqtSignal(object, int)  # attachment_widget, progress_percentage
-    download_finished = pyqtSignal(object, str)  # attachment_widget, file_path
-    download_error = pyqtSignal(object, str)     # attachment_widget, error_message
-    
-    def __init__(self, jira_service, attachment_data, attachment_widget):
-        super().__init__()
-        self.jira_service = jira_service
-        self.attachment_data = attachment_data
-        self.attachment_widget = attachment_widget
-        self.is_cancelled = False
-        self.setObjectName(f"AttachmentDownload-{attachment_data.get('filename', 'unknown')}")
-    
-    def cancel(self):
-        """Cancel the download."""
-        self.is_cancelled = True
-    
-    def run(self):
-        """Download the attachment."""
-        try:
-            if self.is_cancelled:
-                return
-                
-            filename = self.attachment_data.get('filename')
-            attachment_id = self.attachment_data.get('id')
-            
-            if not attachment_id:
-                self.download_error.emit(self.attachment_widget, "ID allegato mancante")
-                return
-            
-            # Update status to downloading
-            self.progress_updated.emit(self.attachment_widget, 0)
-            
-            # Determine save path
-            from PyQt6.QtCore import QStandardPaths
-            download_dir = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.DownloadLocation)
-            save_path = os.path.join(download_dir, filename)
-            
-            # Ensure the directory exists
-            os.makedirs(os.path.dirname(save_path), exist_ok=True)
-            
-            # Use the direct Jira API to download the attachment
-            import asyncio
-            success = asyncio.run(self.jira_service.download_attachment(attachment_id, save_path))
-            
-            if not success:
-                self.download_error.emit(self.attachment_widget, "Download fallito")
-                return
-                
-            # Report 100% progress
-            self.progress_updated.emit(self.attachment_widget, 100)
-            
-            self.download_finished.emit(self.attachment_widget, save_path)
-            
-        except Exception as e:
-            if not self.is_cancelled:
-                self.download_error.emit(self.attachment_widget, str(e))
-
-
-class ThumbnailDownloadWorker(QThread):
-    """Worker thread for downloading and creating image thumbnails."""
-    
-    thumbnail_ready = pyqtSignal(object, object)  # attachment_widget, QPixmap
-    thumbnail_error = pyqtSignal(object, str)     # attachment_widget, error_message
-    
-    def __init__(self, jira_service, attachment_data, attachment_widget):
-        super().__init__()
-        self.jira_service = jira_service
-        self.attachment_data = attachment_data
-        self.attachment_widget = attachment_widget
-        self.is_cancelled = False
-        self.setObjectName(f"ThumbnailDownload-{attachment_data.get('filename', 'unknown')}")
-    
-    def cancel(self):
-        """Cancel the thumbnail download."""
-        self.is_cancelled = True
-    
-    def run(self):
-        """Download image and create thumbnail."""
-        try:
-            if self.is_cancelled:
-                return
-                
-            filename = self.attachment_data.get('filename')
-            attachment_id = self.attachment_data.get('id')
-            
-            if not attachment_id:
-                self.thumbnail_error.emit(self.attachment_widget, "ID allegato mancante")
-                return
-            
-            # Create a temporary file to download the image
-            import tempfile
-            with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(filename)[1]) as tmp_file:
-                temp_path = tmp_file.name
-            
-            # Download the image using Jira API
-            import asyncio
-            success = asyncio.run(self.jira_service.download_attachment(attachment_id, temp_path))
-            
-            if not success:
-                self.thumbnail_error.emit(self.attachment_widget, "Download thumbnail fallito")
-                try:
-                    os.unlink(temp_path)
-                except:
-                    pass
-                return
-                
-            if self.is_cancelled:
-                try:
-                    os.unlink(temp_path)
-                except:
-                    pass
-                return
-            
-            # Create QPixmap from the temporary file
-            from PyQt6.QtGui import QPixmap
-            
-            pixmap = QPixmap()
-            if pixmap.load(temp_path):
-                # Scale to thumbnail size (64x64) maintaining aspect ratio
-                thumbnail = pixmap.scaled(64, 64, Qt.AspectRatioMode.KeepAspectRatio, 
-                                        Qt.TransformationMode.SmoothTransformation)
-                self.thumbnail_ready.emit(self.attachment_widget, thumbnail)
-            else:
-                self.thumbnail_error.emit(self.attachment_widget, "Impossibile caricare l'immagine")
-                
-            # Clean up temporary file
-            try:
-                os.unlink(temp_path)
-            except:
-                pass
-            
-        except Exception as e:
-            if not self.is_cancelled:
-                self.thumbnail_error.emit(self.attachment_widget, str(e))
-
-
 class IssueLinksLoaderWorker(QThread):
     """Worker thread for loading issue links asynchronously."""
     
@@ -391,12 +255,14 @@ class JiraDetailController(QObject):
     time_updated = pyqtSignal(str, int) # Emits the jira_key and seconds when time changes
     window_closed = pyqtSignal(str) # Emits the jira_key when the window is closed
 
-    def __init__(self, view, jira_service, db_service, jira_key):
+    def __init__(self, view, jira_service, db_service, jira_key, metadata_cache=None):
         super().__init__()
         self.view = view
         self.jira_service = jira_service
         self.db_service = db_service
         self.jira_key = jira_key
+        # Shared JiraMetadataCache of the main controller: priorities without a round trip
+        self.metadata_cache = metadata_cache
         self.priority_controller = None
         
         # Initialize Git tracking service
@@ -409,17 +275,22 @@ class JiraDetailController(QObject):
         self._issue_data = None
         self._attachments_data = []
         self._attachment_widgets = []
-        self._download_workers = []
-        self._thumbnail_workers = []
+        self._downloads = {}  # download id -> (attachment_widget, kind), for this view's downloads
+        self._thumbnail_widgets = {}  # attachment id -> attachment_widget waiting for its thumbnail
         self._links_loader_worker = None
         self._issue_detail_loader_worker = None
         self._active_note_editor = None
         self._current_note_title = None # Track the title of the active note
         
-        # Queues for pending downloads
-        self._pending_thumbnail_widgets = []
-        self._pending_download_widgets = []
-        self._max_concurrent_downloads = 3
+        # Downloads and thumbnails run on the shared download manager (bounded parallelism)
+        self.download_manager = get_download_manager(db_service, jira_service)
+        self.download_manager.item_progress.connect(self._on_manager_progress)
+        self.download_manager.item_finished.connect(self._on_manager_finished)
+        self.download_manager.item_failed.connect(self._on_manager_failed)
+        self.download_manager.item_cancelled.connect(self._on_manager_cancelled)
+        self.thumbnail_cache = get_thumbnail_cache(db_service, jira_service)
+        self.thumbnail_cache.thumbnail_ready.connect(self._on_cached_thumbnail_ready)
+        self.thumbnail_cache.thumbnail_failed.connect(self._on_cached_thumbnail_failed)
         
         self._connect_signals()
         # Removed autosave timer - now using git-based system
@@ -794,8 +665,6 @@ class JiraDetailController(QObject):
         
         self._attachments_data = self._issue_data.get('fields', {}).get('attachment', [])
         self._attachment_widgets = []
-        self._download_workers = []
-        self._thumbnail_workers = []
         
         if not self._attachments_data:
             # Show "no attachments" message
@@ -809,11 +678,7 @@ class JiraDetailController(QObject):
         self.view.download_selected_btn.setEnabled(True)
         self.view.download_all_btn.setEnabled(True)
         
-        # Limit concurrent downloads to prevent too many threads
-        self._pending_thumbnail_widgets = []
-        self._pending_download_widgets = []
-        
-        # Create widgets for each attachment and start downloads/thumbnails with limit
+        # Create widgets for each attachment and queue downloads/thumbnails (the manager limits concurrency)
         for i, attachment in enumerate(self._attachments_data):
             filename = attachment.get('filename', 'Unknown')
             size_kb = attachment.get('size', 0) / 1024
@@ -847,21 +712,13 @@ class JiraDetailController(QObject):
             image_extensions = ['jpg', 'jpeg', 'png', 'gif', 'bmp', 'tiff', 'webp']
             
             if file_extension in image_extensions:
-                # Start thumbnail download for images (limit concurrent)
-                if len(self._thumbnail_workers) < self._max_concurrent_downloads:
-                    self._start_thumbnail_download(attachment_widget)
-                else:
-                    # Queue for later
-                    self._pending_thumbnail_widgets.append(attachment_widget)
-                    attachment_widget.thumbnail_label.setText("🖼️")
-                    attachment_widget.thumbnail_label.setStyleSheet("border: 1px solid #ccc; background-color: #f8f8f8; font-size: 24px;")
+                # Start thumbnail download for images
+                attachment_widget.thumbnail_label.setText("🖼️")
+                attachment_widget.thumbnail_label.setStyleSheet("border: 1px solid #ccc; background-color: #f8f8f8; font-size: 24px;")
+                self._start_thumbnail_download(attachment_widget)
             else:
-                # Start automatic download for non-image files (limit concurrent)
-                if len(self._download_workers) < self._max_concurrent_downloads:
-                    self._start_attachment_download(attachment_widget)
-                else:
-                    # Queue for later
-                    self._pending_download_widgets.append(attachment_widget)
+                # Start automatic download for non-image files
+                self._start_attachment_download(attachment_widget)
 
     def _upload_attachment(self):
         """Opens a file dialog to select a file and adds it to the sync queue."""
@@ -870,10 +727,14 @@ class JiraDetailController(QObject):
         if not file_path:
             return
 
-        payload = {
-            "jira_key": self.jira_key,
-            "file_path": file_path
-        }
+        # La coda carica una copia: il file originale può cambiare senza effetti sull'upload
+        from services.attachment_upload import stage_file
+        try:
+            payload = {"jira_key": self.jira_key, **stage_file(file_path)}
+        except OSError as e:
+            _logger.error(f"Error staging attachment {file_path}: {e}")
+            QMessageBox.warning(self.view, "Upload Failed", f"Unable to read '{os.path.basename(file_path)}': {e}")
+            return
 
         self.db_service.add_to_sync_queue("ADD_ATTACHMENT", json.dumps(payload))
 
@@ -882,19 +743,8 @@ class JiraDetailController(QObject):
 
     def _clear_attachment_widgets(self):
         """Clear all attachment widgets and cancel any ongoing downloads."""
-        # Cancel all download workers
-        for worker in self._download_workers:
-            worker.cancel()
-            worker.wait()
-        
-        self._download_workers.clear()
-        
-        # Cancel all thumbnail workers
-        for worker in self._thumbnail_workers:
-            worker.cancel()
-            worker.wait()
-        
-        self._thumbnail_workers.clear()
+        # Cancel this view's downloads (the partial files are resumed by a later download)
+        self._cancel_downloads()
         
         # Clear pending queues
         
@@ -971,9 +821,6 @@ class JiraDetailController(QObject):
         
         # Chiamare il metodo mousePressEvent originale se necessario
         # super(type(attachment_widget.thumbnail_label), attachment_widget.thumbnail_label).mousePressEvent(event)
-        self._pending_thumbnail_widgets.clear()
-        self._pending_download_widgets.clear()
-        
         # Clear all widgets from the layout
         while self.view.attachments_layout.count():
             item = self.view.attachments_layout.takeAt(0)
@@ -1606,21 +1453,21 @@ class JiraDetailController(QObject):
         """Handler to be called when the window is closed."""
         self._save_current_note() # Ensure last active note is saved
         
-        # Cancel all ongoing downloads
-        _logger.debug("Cancelling download workers...")
-        for worker in self._download_workers[:]:  # Copy list to avoid modification during iteration
-            try:
-                worker.cancel()
-            except Exception as e:
-                _logger.debug(f"Error cancelling download worker: {e}")
-        
-        # Cancel all thumbnail downloads
-        _logger.debug("Cancelling thumbnail workers...")
-        for worker in self._thumbnail_workers[:]:  # Copy list to avoid modification during iteration
+        # Cancel all ongoing downloads and thumbnails
+        _logger.debug("Cancelling downloads...")
+        self._cancel_downloads()
+        for signal, slot in (
+            (self.download_manager.item_progress, self._on_manager_progress),
+            (self.download_manager.item_finished, self._on_manager_finished),
+            (self.download_manager.item_failed, self._on_manager_failed),
+            (self.download_manager.item_cancelled, self._on_manager_cancelled),
+            (self.thumbnail_cache.thumbnail_ready, self._on_cached_thumbnail_ready),
+            (self.thumbnail_cache.thumbnail_failed, self._on_cached_thumbnail_failed),
+        ):
             try:
-                worker.cancel()
-            except Exception as e:
-                _logger.debug(f"Error cancelling thumbnail worker: {e}")
+                signal.disconnect(slot)
+            except TypeError:
+                pass  # Not connected
         
         # Cancel links loader
         if self._links_loader_worker:
@@ -1643,20 +1490,6 @@ class JiraDetailController(QObject):
         from PyQt6.QtCore import QDeadlineTimer
         timeout = QDeadlineTimer(5000)  # 5 second timeout
         
-        # Wait for download workers
-        for worker in self._download_workers[:]:
-            if worker.isRunning() and not worker.wait(timeout):
-                _logger.warning(f"Download worker did not finish within timeout, terminating: {type(worker).__name__}")
-                worker.terminate()
-                worker.wait(1000)  # Give it 1 more second after terminate
-        
-        # Wait for thumbnail workers
-        for worker in self._thumbnail_workers[:]:
-            if worker.isRunning() and not worker.wait(timeout):
-                _logger.warning(f"Thumbnail worker did not finish within timeout, terminating: {type(worker).__name__}")
-                worker.terminate()
-                worker.wait(1000)
-        
         # Wait for links loader
         if self._links_loader_worker and self._links_loader_worker.isRunning():
             if not self._links_loader_worker.wait(timeout):
@@ -1676,8 +1509,23 @@ class JiraDetailController(QObject):
         # Emit the window closed signal
         self.window_closed.emit(self.jira_key)
         
+        self._release_resources()
         event.accept()
 
+    def _release_resources(self):
+        """
+        Drops what the closed window keeps in memory (issue JSON, comment HTML,
+        attachment widgets and their pixmaps) and deletes the window, instead
+        of waiting for the garbage collector. Shared pixmaps stay in the
+        shared cache within its budget.
+        """
+        self._clear_attachment_widgets()
+        self._issue_data = None
+        self._attachments_data = []
+        self.view.details_browser.clear()
+        self.view.comments_browser.clear()
+        self.view.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose, True)
+
     def _toggle_timer(self):
         """Starts or pauses the timer."""
         if self.is_running:
@@ -1719,7 +1567,7 @@ class JiraDetailController(QObject):
             task = data["task"]
             
             # Add to local worklog history
-            self.db_service.add_local_worklog(
+            local_worklog_id = self.db_service.add_local_worklog(
                 self.jira_key, 
                 start_time, 
                 seconds,
@@ -1733,7 +1581,8 @@ class JiraDetailController(QObject):
                 "time_spent_seconds": seconds,
                 "start_time": start_time.isoformat(),
                 "comment": comment,
-                "task": task
+                "task": task,
+                "local_worklog_ids": [local_worklog_id]
             }
             
             # Add to sync queue
@@ -1785,19 +1634,22 @@ class JiraDetailController(QObject):
             start_time = start_time_obj.isoformat() if start_time_obj else datetime.now().isoformat()
             
             # Add to local worklog history
-            self.db_service.add_local_worklog(
+            local_worklog_id = self.db_service.add_local_worklog(
                 self.jira_key, 
                 start_time_obj if start_time_obj else datetime.now(), 
                 seconds_to_log,
                 "Worklog from Jira Time Tracker"
             )
             
-            # Add to sync queue
+            # Add to sync queue. tracked_seconds (not rounded) lets the worklog
+            # coalescing round the merged total only once
             payload = {
                 "jira_key": self.jira_key,
                 "time_spent_seconds": seconds_to_log,
+                "tracked_seconds": self.total_seconds_tracked,
                 "start_time": start_time,
-                "comment": "Worklog from Jira Time Tracker"
+                "comment": "Worklog from Jira Time Tracker",
+                "local_worklog_ids": [local_worklog_id]
             }
             
             # Add to sync queue
@@ -1934,56 +1786,99 @@ class JiraDetailController(QObject):
             self.view.notification_btn.setText("🔔 Non ricevere notifiche")
 
     def _start_attachment_download(self, attachment_widget):
-        """Start downloading an attachment."""
-        # Create and start download worker
-        worker = AttachmentDownloadWorker(
-            self.jira_service,
-            attachment_widget.attachment_data,
-            attachment_widget
+        """Queue the download of an attachment to the Downloads folder."""
+        from PyQt6.QtCore import QStandardPaths
+        attachment_data = attachment_widget.attachment_data
+        download_dir = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.DownloadLocation)
+        self._queue_download(
+            attachment_widget, KIND_FILE, os.path.join(download_dir, attachment_data.get('filename'))
         )
-        
-        # Connect signals
-        worker.progress_updated.connect(self._on_download_progress)
-        worker.download_finished.connect(self._on_download_finished)
-        worker.download_error.connect(self._on_download_error)
-        
-        # Store worker reference
-        self._download_workers.append(worker)
-        # Start download
-        worker.start()
+        self._on_download_progress(attachment_widget, 0)
     
     def _start_thumbnail_download(self, attachment_widget):
-        """Start downloading thumbnail for an image attachment."""
-        # Create and start thumbnail worker
-        worker = ThumbnailDownloadWorker(
-            self.jira_service,
-            attachment_widget.attachment_data,
-            attachment_widget
+        """Show the thumbnail of an image attachment, from the thumbnail cache when available."""
+        attachment_data = attachment_widget.attachment_data
+        cached_path = self.thumbnail_cache.request(self.jira_key, attachment_data, THUMBNAIL_SIZE)
+        if cached_path:
+            self._show_thumbnail(attachment_widget, cached_path)
+        else:
+            self._thumbnail_widgets[str(attachment_data.get('id'))] = attachment_widget
+    
+    def _queue_download(self, attachment_widget, kind, target_path):
+        attachment_data = attachment_widget.attachment_data
+        download_id = self.download_manager.enqueue(
+            kind, self.jira_key, attachment_data.get('id'), attachment_data.get('filename'), target_path,
+            total_bytes=attachment_data.get('size'), url=attachment_data.get('content'),
+            mime_type=attachment_data.get('mimeType')
         )
-        
-        # Connect signals
-        worker.thumbnail_ready.connect(self._on_thumbnail_ready)
-        worker.thumbnail_error.connect(self._on_thumbnail_error)
-        
-        # Store worker reference
-        self._thumbnail_workers.append(worker)
-        # Start thumbnail download
-        worker.start()
+        self._downloads[download_id] = (attachment_widget, kind)
+        return download_id
+    
+    def _cancel_downloads(self):
+        """Cancel this view's queued and running downloads."""
+        for download_id in list(self._downloads):
+            self.download_manager.cancel(download_id)
+        self._downloads.clear()
+        # Thumbnails already being generated are kept in the cache for the next view
+        for attachment_id in list(self._thumbnail_widgets):
+            self.thumbnail_cache.cancel(attachment_id)
+        self._thumbnail_widgets.clear()
+    
+    def _show_thumbnail(self, attachment_widget, file_path):
+        # The cached thumbnail is already scaled to THUMBNAIL_SIZE; the pixmap is shared with other windows
+        pixmap = shared_pixmap_cache().load(file_path)
+        if not pixmap.isNull():
+            self._on_thumbnail_ready(attachment_widget, pixmap)
+        else:
+            self._on_thumbnail_error(attachment_widget, "Impossibile caricare l'immagine")
+    
+    @pyqtSlot(str, int, str)
+    def _on_cached_thumbnail_ready(self, attachment_id, size, file_path):
+        attachment_widget = self._thumbnail_widgets.pop(attachment_id, None)
+        if attachment_widget is not None and size == THUMBNAIL_SIZE:
+            self._show_thumbnail(attachment_widget, file_path)
+    
+    @pyqtSlot(str, int, str)
+    def _on_cached_thumbnail_failed(self, attachment_id, size, error_message):
+        attachment_widget = self._thumbnail_widgets.pop(attachment_id, None)
+        if attachment_widget is not None and size == THUMBNAIL_SIZE:
+            self._on_thumbnail_error(attachment_widget, error_message)
+    
+    @pyqtSlot(int, object, object)
+    def _on_manager_progress(self, download_id, done, total):
+        entry = self._downloads.get(download_id)
+        if not entry:
+            return
+        attachment_widget = entry[0]
+        total = total or attachment_widget.attachment_data.get('size') or 0
+        if total:
+            self._on_download_progress(attachment_widget, min(100, int(done * 100 / total)))
+    
+    @pyqtSlot(int, str)
+    def _on_manager_finished(self, download_id, file_path):
+        entry = self._downloads.pop(download_id, None)
+        if not entry:
+            return  # Not a download of this view
+        attachment_widget = entry[0]
+        self._on_download_progress(attachment_widget, 100)
+        self._on_download_finished(attachment_widget, file_path)
+    
+    @pyqtSlot(int, str)
+    def _on_manager_failed(self, download_id, error_message):
+        entry = self._downloads.pop(download_id, None)
+        if not entry:
+            return
+        self._on_download_error(entry[0], error_message)
+    
+    @pyqtSlot(int)
+    def _on_manager_cancelled(self, download_id):
+        self._downloads.pop(download_id, None)
     
     @pyqtSlot(object, object)
     def _on_thumbnail_ready(self, attachment_widget, pixmap):
         """Handle successful thumbnail creation."""
         # Set the thumbnail pixmap to the widget
         attachment_widget.thumbnail_label.setPixmap(pixmap)
-        
-        # Remove worker from active list
-        for worker in self._thumbnail_workers:
-            if worker.attachment_widget == attachment_widget:
-                self._thumbnail_workers.remove(worker)
-                break
-        
-        # Start next pending thumbnail download
-        self._start_next_pending_thumbnail()
     
     @pyqtSlot(object, str)
     def _on_thumbnail_error(self, attachment_widget, error_message):
@@ -1993,30 +1888,18 @@ class JiraDetailController(QObject):
         attachment_widget.thumbnail_label.setText("🖼️❌")
         
         print(f"Thumbnail error for {attachment_widget.filename}: {error_message}")
-        
-        # Remove worker from active list
-        for worker in self._thumbnail_workers:
-            if worker.attachment_widget == attachment_widget:
-                self._thumbnail_workers.remove(worker)
-                break
-        
-        # Start next pending thumbnail download
-        self._start_next_pending_thumbnail()
     
     def _download_single_attachment(self, attachment_widget):
         """Download a single attachment."""
-        # Cancel any existing download for this widget
-        for worker in self._download_workers:
-            if worker.attachment_widget == attachment_widget:
-                worker.cancel()
-                worker.wait()
-                self._download_workers.remove(worker)
-                break
+        # A download already in progress for this widget continues
+        for download_id, (widget, kind) in self._downloads.items():
+            if widget is attachment_widget and kind == KIND_FILE and self.download_manager.is_active(download_id):
+                return
         
         # Reset widget state
         self._reset_attachment_widget(attachment_widget)
         
-        # Start new download
+        # Start new download (resumes the partial file of an interrupted one)
         self._start_attachment_download(attachment_widget)
     
     def _download_selected_attachments(self):
@@ -2055,15 +1938,6 @@ class JiraDetailController(QObject):
         attachment_widget.download_btn.clicked.connect(
             lambda: self._open_downloaded_file(file_path)
         )
-        
-        # Remove worker from active list
-        for worker in self._download_workers:
-            if worker.attachment_widget == attachment_widget:
-                self._download_workers.remove(worker)
-                break
-        
-        # Start next pending download
-        self._start_next_pending_download()
     
     @pyqtSlot(object, str)
     def _on_download_error(self, attachment_widget, error_message):
@@ -2079,15 +1953,6 @@ class JiraDetailController(QObject):
         )
         
         print(f"Download error for {attachment_widget.filename}: {error_message}")
-        
-        # Remove worker from active list
-        for worker in self._download_workers:
-            if worker.attachment_widget == attachment_widget:
-                self._download_workers.remove(worker)
-                break
-        
-        # Start next pending download
-        self._start_next_pending_download()
     
     def _reset_attachment_widget(self, attachment_widget):
         """Reset an attachment widget to initial state."""
@@ -2218,18 +2083,6 @@ class JiraDetailController(QObject):
             if child_data.get('children'):
                 self._add_tree_children(child_item, child_data['children'])
 
-    def _start_next_pending_thumbnail(self):
-        """Start the next pending thumbnail download if available."""
-        if self._pending_thumbnail_widgets and len(self._thumbnail_workers) < self._max_concurrent_downloads:
-            widget = self._pending_thumbnail_widgets.pop(0)
-            self._start_thumbnail_download(widget)
-    
-    def _start_next_pending_download(self):
-        """Start the next pending download if available."""
-        if self._pending_download_widgets and len(self._download_workers) < self._max_concurrent_downloads:
-            widget = self._pending_download_widgets.pop(0)
-            self._start_attachment_download(widget)
-    
     def _on_issue_loaded(self, issue_data):
         """Handle successful loading of issue details."""
         try:
@@ -2431,8 +2284,7 @@ class JiraDetailController(QObject):
         new_priority_name = self.view.priority_combo.currentText()
         
         # Get priority configuration controller
-        from controllers.priority_config_controller import PriorityConfigController
-        priority_controller = PriorityConfigController(self.db_service, self.jira_service)
+        priority_controller = self._get_priority_controller()
         
         # Update priority
         success = priority_controller.update_priority(self.jira_key, new_priority_id)
@@ -2446,8 +2298,7 @@ class JiraDetailController(QObject):
     
     def _show_priority_config(self):
         """Show the priority configuration dialog."""
-        from controllers.priority_config_controller import PriorityConfigController
-        priority_controller = PriorityConfigController(self.db_service, self.jira_service)
+        priority_controller = self._get_priority_controller()
         
         # Open priority configuration dialog
         priority_controller.open_priority_config_dialog(parent=self.view)
@@ -2458,9 +2309,9 @@ class JiraDetailController(QObject):
     def populate_priority_combo(self, priorities=None):
         """Populate the priority combo box with available priorities from Jira."""
         if not priorities:
-            # If not provided, try to get them from the priority controller
-            if hasattr(self, 'priority_controller') and self.priority_controller:
-                priorities = self.priority_controller.get_available_priorities()
+            # If not provided, try to get them from the priority controller (on the shared metadata cache)
+            if self.priority_controller or self.metadata_cache is not None:
+                priorities = self._get_priority_controller().get_available_priorities()
             else:
                 # Default priorities if no controller available
                 priorities = [
@@ -2471,13 +2322,24 @@ class JiraDetailController(QObject):
                     {"id": "5", "name": "Lowest"}
                 ]
         
-        # Clear existing items
+        # Clear existing items (refilling is not a priority change of the issue)
+        self.view.priority_combo.blockSignals(True)
         self.view.priority_combo.clear()
         
         # Add priorities to the combo box
         for priority in priorities:
             self.view.priority_combo.addItem(priority.get("name", "Unknown"), priority.get("id"))
+        self.view.priority_combo.blockSignals(False)
     
+    def _get_priority_controller(self):
+        """Priority controller of the view, created on first use on the shared metadata cache."""
+        if not self.priority_controller:
+            from controllers.priority_config_controller import PriorityConfigController
+            self.priority_controller = PriorityConfigController(
+                self.db_service, self.jira_service, metadata_cache=self.metadata_cache
+            )
+        return self.priority_controller
+
     def _update_issue_priority(self, index):
         """Handle priority selection change."""
         if index < 0:
@@ -2489,20 +2351,13 @@ class JiraDetailController(QObject):
         if not priority_id:
             return
             
-        # Get or create priority controller if needed
-        if not self.priority_controller:
-            from controllers.priority_config_controller import PriorityConfigController
-            self.priority_controller = PriorityConfigController(self.db_service, self.jira_service)
-        
         # Update priority
-        self.priority_controller.update_priority(self.jira_key, priority_id)
+        self._get_priority_controller().update_priority(self.jira_key, priority_id)
     
     def _show_priority_config(self):
         """Show the priority configuration dialog."""
         # Get or create priority controller if needed
-        if not self.priority_controller:
-            from controllers.priority_config_controller import PriorityConfigController
-            self.priority_controller = PriorityConfigController(self.db_service, self.jira_service)
+        self._get_priority_controller()
         
         # Open the configuration dialog
         self.priority_controller.open_priority_config_dialog(self.view)
@@ -1,21 +1,28 @@
 from PyQt6.QtCore import QObject, pyqtSignal, QThread, Qt, QTimer, QEvent
-from PyQt6.QtWidgets import QTableWidgetItem, QPushButton, QApplication, QMessageBox
+from PyQt6.QtWidgets import QApplication, QMessageBox
 from qfluentwidgets import FluentIcon as FIF
 import logging
 import re
+import time
 
 logger = logging.getLogger('JiraTimeTracker')
 
-from workers.worker import JiraWorker
+from workers.worker import JiraWorker, JiraLoadAllWorker, MetadataRefreshWorker
+from workers.sync_worker import SyncWorker
 from views.mini_widget_view import MiniWidgetView
+from views.issue_table_model import IssueRow
 from controllers.mini_widget_controller import MiniWidgetController
 from controllers.jql_history_controller import JqlHistoryController
 from controllers.history_view_controller import HistoryViewController
 from controllers.sync_queue_controller import SyncQueueController
 from controllers.notification_controller import NotificationController
 from services.network_service import NetworkService
+from services.metadata_cache import JiraMetadataCache
 from services.startup_coordinator import StartupCoordinator
 
+# Issues per page of the grid (infinite scroll)
+GRID_PAGE_SIZE = 100
+
 
 class MainController(QObject):
     # Using a signal to decouple the controller from knowing about worker threads
@@ -41,13 +48,28 @@ class MainController(QObject):
         self._active_threads: list[QThread] = []
         # Track active worker objects so they are not garbage-collected
         self._active_workers: list[object] = []
+        # Worker of the in-flight "load all", so it can be cancelled
+        self._load_all_worker = None
+        # Generation token of the grid load: every new query bumps it and results
+        # of older generations are discarded when they arrive late
+        self._load_generation = 0
+        self._grid_load_worker = None
+        # Priorities/statuses/issue types served from a local cache, refreshed once per session
+        self.metadata_cache = JiraMetadataCache(db_service, jira_service)
+        self._metadata_refresh_started = False
+        # Worker of the in-flight sync queue run (at most one at a time)
+        self._sync_worker = None
+        # Controller of the sync queue dialog, refreshed while a sync run finishes operations
+        self._sync_queue_controller = None
         self._open_dialog_windows = []  # Track open dialog windows
         
         # Initialize properties used for data loading
         self.is_loading = False
-        self.current_issues = []
+        self.current_issues = []  # IssueRows of the loaded issues, in result order
         self.start_at = 0
         self.all_results_loaded = False
+        # The first page of a reload is reconciled with the rows shown instead of rebuilding the grid
+        self._reconcile_next_page = False
         
         # Initialize startup coordinator for async startup
         self.startup_coordinator = None
@@ -174,8 +196,8 @@ class MainController(QObject):
         self.load_failed.connect(self._on_load_failed)
 
         # Connect grid-specific signals
-        # Keep instant client-side filtering while typing
-        self.view.jira_grid_view.search_box.textChanged.connect(self._filter_grid)
+        # Keep instant client-side filtering while typing (debounced by the grid filter)
+        self.view.jira_grid_view.search_box.textChanged.connect(self.view.jira_grid_view.row_filter.set_text)
         # When the user presses Enter in the search box, perform a server-side search
         try:
             self.view.jira_grid_view.search_box.returnPressed.connect(self._on_search_requested)
@@ -189,20 +211,24 @@ class MainController(QObject):
         self.view.jira_grid_view.table.doubleClicked.connect(self._open_detail_view)
         
         # Monitor item selection in the grid table
-        self.view.jira_grid_view.table.itemSelectionChanged.connect(self._on_grid_selection_changed)
+        self.view.jira_grid_view.table.selectionModel().selectionChanged.connect(self._on_grid_selection_changed)
+        # Edits made through the grid delegates
+        self.view.jira_grid_view.model.priority_changed.connect(self._on_priority_changed)
+        self.view.jira_grid_view.model.favorite_toggled.connect(self._on_favorite_toggled)
+        self.view.jira_grid_view.set_priorities_provider(self.metadata_cache.get_priorities)
+        self._apply_grid_sort_orders()
         # Installa event filter sulla tabella per monitorare gli eventi del mouse
         self.view.jira_grid_view.table.installEventFilter(self)
         
         self.view.jira_grid_view.apply_jql_btn.clicked.connect(self._apply_custom_jql)
+        self.view.jira_grid_view.load_all_btn.clicked.connect(self.load_all_jira_issues)
+        self.view.jira_grid_view.cancel_loading_btn.clicked.connect(self.cancel_load_all)
         self.view.jira_grid_view.jql_combo.currentIndexChanged.connect(self._on_jql_combo_changed)
         self.view.jira_grid_view.favorites_btn.clicked.connect(self._on_favorites_toggled)
         
         # Connect notification button in JiraGridView
         self.view.jira_grid_view.notifications_btn.clicked.connect(self._show_notifications_dialog)
         
-        # Connect sorting completed signal to reconnect favorite buttons
-        self.view.jira_grid_view.sorting_completed.connect(self._reconnect_favorite_buttons)
-
         # Install event filter on JQL combo box to handle Enter key
         self.view.jira_grid_view.jql_combo.installEventFilter(self)
 
@@ -236,23 +262,18 @@ class MainController(QObject):
     def _on_grid_selection_changed(self):
         """Monitors selection changes in the grid table."""
         self._logger.info("[DEBUG] Selezione nella griglia cambiata")
-        selected = self.view.jira_grid_view.table.selectedItems()
-        if selected:
+        issue_key = self.view.jira_grid_view.selected_key()
+        if issue_key:
             try:
-                # Get the selected row
-                row = selected[0].row()
-                key_item = self.view.jira_grid_view.table.item(row, 0)
-                if key_item:
-                    issue_key = key_item.text()
-                    self._logger.debug(f"[DEBUG] Riga selezionata: {row}, Issue Key: {issue_key}")
-                    self._logger.debug(f"[DEBUG] Finestre di dettaglio aperte: {list(self.open_detail_windows.keys())}")
-                    # Verifica se la finestra di dettaglio è attualmente aperta
-                    if issue_key in self.open_detail_windows:
-                        detail_window = self.open_detail_windows[issue_key]
-                        self._logger.debug(f"[DEBUG] La finestra di dettaglio per {issue_key} è attualmente aperta. IsVisible: {detail_window.isVisible()}, IsHidden: {detail_window.isHidden()}")
-                    # Tracciamento stack per vedere da dove viene chiamato
-                    import traceback
-                    self._logger.debug(f"[DEBUG] Stack trace:\n{traceback.format_stack()}")
+                self._logger.debug(f"[DEBUG] Issue Key selezionata: {issue_key}")
+                self._logger.debug(f"[DEBUG] Finestre di dettaglio aperte: {list(self.open_detail_windows.keys())}")
+                # Verifica se la finestra di dettaglio è attualmente aperta
+                if issue_key in self.open_detail_windows:
+                    detail_window = self.open_detail_windows[issue_key]
+                    self._logger.debug(f"[DEBUG] La finestra di dettaglio per {issue_key} è attualmente aperta. IsVisible: {detail_window.isVisible()}, IsHidden: {detail_window.isHidden()}")
+                # Tracciamento stack per vedere da dove viene chiamato
+                import traceback
+                self._logger.debug(f"[DEBUG] Stack trace:\n{traceback.format_stack()}")
             except Exception as e:
                 self._logger.exception(f"[DEBUG] Errore durante l'elaborazione della selezione: {e}")
 
@@ -278,7 +299,11 @@ class MainController(QObject):
     def _on_startup_ui_ready(self):
         """Called when UI should be made available - StartupCoordinator handles UI setup."""
         self._logger.info("Startup coordinator reports UI ready")
-        
+
+        # The grid of the last session, as it was left
+        if self._render_grid_snapshot():
+            return
+
         # Load cached issues immediately using get_recent_issues
         try:
             recent_issues = self.db_service.get_recent_issues(limit=20)
@@ -289,14 +314,9 @@ class MainController(QObject):
                 # Get local times for the grid population
                 local_times = self.db_service.get_all_local_times()
                 
-                # Temporarily disconnect search filter
-                try:
-                    self.view.jira_grid_view.search_box.textChanged.disconnect(self._filter_grid)
-                except:
-                    pass  # May not be connected yet
-                
-                # Convert cached issues to the format expected by _add_issue_to_grid
+                # Convert cached issues to the format expected by _add_issues_to_grid
                 self.current_issues = []  # Reset current issues
+                cached_issues = []
                 for cached_issue in recent_issues:
                     # Convert cached format to Jira API format
                     issue_data = {
@@ -307,12 +327,9 @@ class MainController(QObject):
                             'priority': {'name': cached_issue['priority']}
                         }
                     }
-                    self._add_issue_to_grid(issue_data, local_times)
-                    self.current_issues.append(issue_data)
-                
-                # Reconnect and apply current filter
-                self.view.jira_grid_view.search_box.textChanged.connect(self._filter_grid)
-                self._filter_grid(self.view.jira_grid_view.search_box.text())
+                    cached_issues.append(issue_data)
+                # Rows are filtered as they are inserted
+                self._add_issues_to_grid(cached_issues, local_times)
                 
         except Exception as e:
             self._logger.warning(f"Could not load cached issues: {e}")
@@ -326,32 +343,23 @@ class MainController(QObject):
         fresh_issues = result_data['issues']
         self._logger.info(f"Background data loaded with {len(fresh_issues)} fresh issues")
         
-        # Update with fresh JIRA data by clearing and repopulating the grid
-        if fresh_issues:
-            # Clear current data
-            self.current_issues = []
-            self.view.jira_grid_view.jira_table.setRowCount(0)
-            
-            # Get local times for the grid population  
+        # A rendered snapshot may hold more rows than this first batch: reconciling with it
+        # would remove them, so the grid is reloaded with as many issues as it shows
+        reload_grid = len(fresh_issues) < len(self.view.jira_grid_view.model.rows())
+
+        # Update the cached rows with the fresh JIRA data, touching only what changed
+        if not reload_grid:
             local_times = self.db_service.get_all_local_times()
-            
-            # Temporarily disconnect search filter
-            self.view.jira_grid_view.search_box.textChanged.disconnect(self._filter_grid)
-            
-            # Populate with fresh data
-            for issue in fresh_issues:
-                self._add_issue_to_grid(issue, local_times)
-                self.current_issues.append(issue)
-            
-            # Reconnect and apply current filter
-            self.view.jira_grid_view.search_box.textChanged.connect(self._filter_grid)
-            self._filter_grid(self.view.jira_grid_view.search_box.text())
+            self.current_issues = self._reconcile_grid(fresh_issues, local_times)
         
         # Clear loading status
-        self.view.jira_grid_view.hide_loading()
+        self.view.jira_grid_view.hide_loading_status()
         
         # Update network status
         self.view.update_network_status(self.is_internet_available, self.is_jira_available)
+
+        if reload_grid:
+            self.load_jira_issues()
     
     def _on_startup_completed(self):
         """Called when startup process is completely finished.""" 
@@ -393,13 +401,19 @@ class MainController(QObject):
         - custom_jql: If provided, overrides the default JQL.
         """
         if self.is_loading:
-            return
+            if append:
+                # Infinite scroll while a page is in flight: keep waiting for it
+                return
+            # A new query supersedes the in-flight one
+            self._cancel_inflight_load()
 
         if not append:
+            self._load_generation += 1
             self.current_issues = []
             self.start_at = 0
             self.all_results_loaded = False
-            self.view.jira_grid_view.clear_table()
+            # The rows stay on screen until the first page is reconciled with them
+            self._reconcile_next_page = True
 
         if self.all_results_loaded:
             return
@@ -491,17 +505,39 @@ class MainController(QObject):
                 return
 
         # Modalità online: carica i dati da Jira come di consueto
+        # A reload is reconciled with the rows shown: it fetches at least as many issues as
+        # the grid holds, or the rows past the first page would be removed
+        max_results = GRID_PAGE_SIZE
+        if self._reconcile_next_page:
+            max_results = max(GRID_PAGE_SIZE, len(self.view.jira_grid_view.model.rows()))
         # Create a dedicated thread for this load operation and keep references
+        generation = self._load_generation
         thread = QThread()
-        worker = JiraWorker(self.jira_service, jql, self.start_at, favorite_keys=favorite_keys)
+        worker = JiraWorker(self.jira_service, jql, self.start_at, max_results=max_results,
+                            favorite_keys=favorite_keys, page_size=GRID_PAGE_SIZE)
         worker.moveToThread(thread)
 
         # Wire up signals
         thread.started.connect(worker.run)
-        # Connect signals for success and failure
-        worker.finished.connect(self._on_data_loaded)
-        worker.error.connect(self._on_load_failed)
+        # Connect signals for success and failure, tagged with the generation of this load
+        worker.finished.connect(lambda issues, g=generation: self._on_generation_data_loaded(g, issues))
+        worker.error.connect(lambda message, g=generation: self._on_generation_load_failed(g, message))
 
+        self._grid_load_worker = worker
+        self._start_tracked_worker_thread(thread, worker)
+
+        # Log that a background load started
+        try:
+            self._logger.debug("Started Jira load thread for JQL: %s (start_at=%s, generation=%s)", jql, self.start_at, generation)
+        except Exception:
+            pass
+
+    def _start_tracked_worker_thread(self, thread: QThread, worker: QObject):
+        """
+        Wires the standard cleanup of a worker moved to a QThread, keeps both
+        referenced in _active_threads/_active_workers until the thread finishes,
+        then starts the thread.
+        """
         # Ensure the thread and worker are cleaned up when finished or on error
         worker.finished.connect(thread.quit)
         worker.error.connect(thread.quit)
@@ -525,16 +561,46 @@ class MainController(QObject):
                     self._active_workers.remove(w)
             except Exception:
                 pass
+            if self._grid_load_worker is w:
+                self._grid_load_worker = None
+            if self._load_all_worker is w:
+                self._load_all_worker = None
+            if self._sync_worker is w:
+                self._sync_worker = None
 
         thread.finished.connect(_on_thread_finished)
-
         thread.start()
 
-        # Log that a background load started
-        try:
-            self._logger.debug("Started Jira load thread for JQL: %s (start_at=%s)", jql, self.start_at)
-        except Exception:
-            pass
+    def _cancel_inflight_load(self):
+        """
+        Invalidates the in-flight grid load: its workers are asked to stop and,
+        since the generation moves on, anything they still deliver is dropped.
+        """
+        self._load_generation += 1
+        for worker in (self._grid_load_worker, self._load_all_worker):
+            if worker is not None:
+                try:
+                    worker.stop()
+                except Exception:
+                    pass
+        self._grid_load_worker = None
+        self._load_all_worker = None
+        self.is_loading = False
+        self._logger.debug("Grid load superseded, now at generation %s", self._load_generation)
+
+    def _on_generation_data_loaded(self, generation: int, issues: list):
+        """Delivers worker results to the grid only if they belong to the current load."""
+        if generation != self._load_generation:
+            self._logger.debug("Discarding %s issues from stale load generation %s (current %s)",
+                               len(issues) if issues is not None else 0, generation, self._load_generation)
+            return
+        self._on_data_loaded(issues)
+
+    def _on_generation_load_failed(self, generation: int, error_message: str):
+        if generation != self._load_generation:
+            self._logger.debug("Ignoring error from stale load generation %s: %s", generation, error_message)
+            return
+        self._on_load_failed(error_message)
 
 
     def _on_data_loaded(self, issues: list):
@@ -549,47 +615,144 @@ class MainController(QObject):
 
         if not issues:
             self.all_results_loaded = True
+            if self._reconcile_next_page:
+                self._reconcile_next_page = False
+                self.view.jira_grid_view.reconcile_issue_rows([])
             if not self.current_issues:
                 self.view.jira_grid_view.show_error("No issues found for the current filter.")
             return
 
+        self._append_issues_to_grid(issues)
+
+    def _append_issues_to_grid(self, issues: list):
+        """Caches a batch of issues and appends them to the grid, re-applying the filter."""
         self.start_at += len(issues)
-        self.current_issues.extend(issues)
         
         # Get all local times at once to avoid multiple DB calls in a loop
         local_times = self.db_service.get_all_local_times()
         
         # Save issue details to cache if we're online (only save real data from Jira)
         if self.is_jira_available:
+            cached = []
             for issue in issues:
-                try:
-                    jira_key = issue.get('key')
-                    if jira_key:
-                        fields = issue.get('fields', {})
-                        summary = fields.get('summary', '')
-                        status = fields.get('status', {}).get('name', '')
-                        priority = fields.get('priority', {}).get('name', '')
-                        
-                        # Save to cache database
-                        self.db_service.save_jira_issue(jira_key, summary, status, priority)
-                except Exception as e:
-                    self._logger.warning(f"Failed to cache issue {jira_key}: {str(e)}")
-                    # Continue with next issue
+                jira_key = issue.get('key')
+                if jira_key:
+                    fields = issue.get('fields', {})
+                    cached.append((
+                        jira_key,
+                        fields.get('summary', ''),
+                        (fields.get('status') or {}).get('name', ''),
+                        (fields.get('priority') or {}).get('name', ''),
+                    ))
+            try:
+                # One transaction for the whole page
+                self.db_service.save_jira_issues(cached)
+            except Exception as e:
+                self._logger.warning(f"Failed to cache {len(cached)} issues: {str(e)}")
 
-        # Temporarily disconnect the filter signal to avoid re-filtering during population
-        self.view.jira_grid_view.search_box.textChanged.disconnect(self._filter_grid)
-        
-        for issue in issues:
-            self._add_issue_to_grid(issue, local_times)
+        if self._reconcile_next_page:
+            self._reconcile_next_page = False
+            self.current_issues.extend(self._reconcile_grid(issues, local_times))
+        else:
+            # Rows are inserted in chunks between frames; only the new ones are filtered
+            self._add_issues_to_grid(issues, local_times)
+
+
+    def load_all_jira_issues(self):
+        """
+        Loads the whole result set of the current JQL in one go.
+        A count query is issued first, then the pages are fetched concurrently
+        by a JiraLoadAllWorker and streamed into the grid in result order.
+        """
+        if not self.is_internet_available or not self.is_jira_available:
+            self.view.jira_grid_view.show_info("Il caricamento completo richiede la connessione a Jira.")
+            return
+
+        if self.is_loading:
+            self._cancel_inflight_load()
+
+        input_jql = self.view.jira_grid_view.get_jql_text() or self.app_settings.get_setting(
+            'last_used_jql',
+            self.app_settings.get_setting('jql_query', 'assignee = currentUser() AND status != "Done"'),
+        )
+        jql = self._append_search_filter_to_jql(input_jql, self.view.jira_grid_view.search_box.text())
+
+        favorite_keys = None
+        if self.view.jira_grid_view.favorites_btn.isChecked():
+            favorite_keys = self.db_service.get_all_favorites()
+
+        self._load_generation += 1
+        generation = self._load_generation
+        self.current_issues = []
+        self.start_at = 0
+        # Nothing is left to page in once the full load is running
+        self.all_results_loaded = True
+        # Pages stream into an empty grid
+        self._reconcile_next_page = False
+        self.view.jira_grid_view.clear_table()
+        self.is_loading = True
+        self.view.jira_grid_view.show_status_message("Caricamento di tutti i ticket...", is_loading=True,
+                                                     cancellable=True)
+
+        thread = QThread()
+        worker = JiraLoadAllWorker(self.jira_service, jql, favorite_keys=favorite_keys)
+        worker.moveToThread(thread)
 
-        # Reconnect and apply current filter
-        self.view.jira_grid_view.search_box.textChanged.connect(self._filter_grid)
-        self._filter_grid(self.view.jira_grid_view.search_box.text())
+        thread.started.connect(worker.run)
+        worker.page_loaded.connect(lambda issues, g=generation: self._on_all_issues_page_loaded(g, issues))
+        worker.progress.connect(lambda loaded, total, g=generation: self._on_all_issues_progress(g, loaded, total))
+        worker.finished.connect(lambda count, g=generation: self._on_all_issues_loaded(g, count))
+        worker.error.connect(lambda message, g=generation: self._on_generation_load_failed(g, message))
 
+        self._load_all_worker = worker
+        self._start_tracked_worker_thread(thread, worker)
+
+        try:
+            self._logger.debug("Started Jira load-all thread for JQL: %s", jql)
+        except Exception:
+            pass
+
+    def cancel_load_all(self):
+        """Stops an in-flight load-all; the rows already shown are kept."""
+        worker = getattr(self, '_load_all_worker', None)
+        if worker is not None:
+            worker.stop()
+            grid = self.view.jira_grid_view
+            grid.cancel_loading_btn.setEnabled(False)
+            grid.status_label.setText("Annullamento del caricamento...")
+
+    def _on_all_issues_page_loaded(self, generation: int, issues: list):
+        """Slot receiving the pages of a load-all, already in result order."""
+        if generation != self._load_generation:
+            return
+        if issues:
+            self._append_issues_to_grid(issues)
+
+    def _on_all_issues_progress(self, generation: int, loaded: int, total: int):
+        if generation != self._load_generation:
+            return
+        try:
+            self.view.jira_grid_view.status_label.setText(f"Caricati {loaded} di {total} ticket...")
+        except Exception:
+            pass
+
+    def _on_all_issues_loaded(self, generation: int, count: int):
+        """Slot called when a load-all completes or is cancelled."""
+        if generation != self._load_generation:
+            return
+        self.is_loading = False
+        self.view.jira_grid_view.show_loading(False)
+        self._logger.debug("Load-all completed: %s issues in grid", len(self.current_issues))
+        if not self.current_issues:
+            self.view.jira_grid_view.show_error("No issues found for the current filter.")
 
     def _on_load_failed(self, error_message: str):
         """Slot to handle data loading failures."""
         self.is_loading = False
+        if self._reconcile_next_page:
+            # The rows of the previous load stay: no page may be appended to them
+            self._reconcile_next_page = False
+            self.all_results_loaded = True
         # Log the error so it is visible in file/console
         try:
             self._logger.error("Jira data load failed: %s", error_message)
@@ -612,124 +775,77 @@ class MainController(QObject):
 
     def _add_issue_to_grid(self, issue_data: dict, local_times: dict):
         """Adds a single issue to the grid view's table."""
+        self._add_issues_to_grid([issue_data], local_times)
+
+    def _add_issues_to_grid(self, issues: list, local_times: dict):
+        """
+        Adds a batch of issues to the grid view's table. Favorites, local
+        priorities and colors are read once per batch, not once per row.
+        Each issue is recorded in current_issues as an IssueRow when it is
+        converted; the search result itself is not kept.
+        """
+        make_row = self._grid_row_factory(local_times)
+        # The list of this load: rows converted after a reload do not end up in the next one
+        current_issues = self.current_issues
+
+        def convert(issue):
+            row = make_row(issue)
+            current_issues.append(row)
+            return row
+
+        self.view.jira_grid_view.populator.append(issues, convert)
+
+    def _apply_grid_colors(self):
+        self.view.jira_grid_view.model.set_colors(dict(self.db_service.get_all_status_colors()),
+                                                  dict(self.db_service.get_priority_colors()))
+
+    def _reconcile_grid(self, issues: list, local_times: dict) -> list:
+        """
+        Shows exactly issues in the grid, rewriting only the rows that changed.
+        Returns the IssueRows the model keeps for them (the old record of an
+        unchanged row, the new one otherwise).
+        """
+        make_row = self._grid_row_factory(local_times)
+        rows = [make_row(issue) for issue in issues]
         grid = self.view.jira_grid_view
-        table = grid.table
-        row_position = table.rowCount()
-        table.insertRow(row_position)
-        
+        counts = grid.reconcile_issue_rows(rows)
+        self._logger.debug("Grid reconciled: %s", counts)
+        return [grid.model.record_of_key(row.key) for row in rows]
+
+    def _grid_row_factory(self, local_times: dict):
+        """Returns make_row(issue) -> IssueRow, with favorites, local priorities and colors read once."""
+        favorites = set(self.db_service.get_all_favorites())
+        local_priorities = self.db_service.get_local_priorities()
+        self._apply_grid_colors()
+        return lambda issue: self._issue_to_row(issue, local_times, favorites, local_priorities)
+
+    @staticmethod
+    def _issue_to_row(issue_data: dict, local_times: dict, favorites: set, local_priorities: dict) -> IssueRow:
+        """Row of the grid model for an issue of the search results."""
         jira_key = issue_data['key']
+        fields = issue_data.get('fields', {})
         
         # Calculate total time
-        jira_seconds = issue_data.get('fields', {}).get('timespent') or 0
+        jira_seconds = fields.get('timespent') or 0
         local_seconds = local_times.get(jira_key, 0)
-        total_seconds = jira_seconds + local_seconds
-        
-        # Format time for display
-        hours = total_seconds // 3600
-        minutes = (total_seconds % 3600) // 60
-        time_str = f"{hours}h {minutes}m"
-
-        # Get status for coloring
-        status_name = issue_data.get('fields', {}).get('status', {}).get('name', '')
-        
-        # Get priority information
-        priority_data = issue_data.get('fields', {}).get('priority', {})
-        priority_name = priority_data.get('name', '')
-        priority_id = priority_data.get('id', '')
-        
-        # Create items
-        key_item = QTableWidgetItem(jira_key)
-        title_item = QTableWidgetItem(issue_data.get('fields', {}).get('summary', ''))
-        status_item = QTableWidgetItem(status_name)
-        priority_item = QTableWidgetItem(priority_name)
-        time_item = QTableWidgetItem(time_str)
-        
-        # Apply status color if available
-        status_color_hex = self.db_service.get_status_color(status_name)
-        if status_color_hex:
-            from PyQt6.QtGui import QColor, QBrush
-            color = QColor(status_color_hex)
-            # Use a lighter version of the color for better text visibility
-            color.setAlpha(40)  # Semi-transparent
-            brush = QBrush(color)
-            key_item.setBackground(brush)
-            title_item.setBackground(brush)
-            status_item.setBackground(brush)
-            priority_item.setBackground(brush)
-            time_item.setBackground(brush)
-            
-        # Apply priority color if available
-        priority_color_hex = None
-        if priority_name:
-            priority_color_hex = self.db_service.get_priority_color(priority_name)
-        if not priority_color_hex and priority_id:
-            priority_color_hex = self.db_service.get_priority_color(priority_id)
-            
-        if priority_color_hex:
-            from PyQt6.QtGui import QColor, QBrush
-            color = QColor(priority_color_hex)
-            # Apply color directly to the priority cell with higher opacity
-            color.setAlpha(80)  # More visible for priority
-            brush = QBrush(color)
-            priority_item.setBackground(brush)
-        
-        # Add items to table
-        table.setItem(row_position, 0, key_item)
-        table.setItem(row_position, 1, title_item)
-        table.setItem(row_position, 2, status_item)
-        
-        # Priority column - create combobox for local editing
-        priority_combo = self._create_priority_combo(jira_key, priority_name)
-        table.setCellWidget(row_position, 3, priority_combo)
-        
-        table.setItem(row_position, 4, time_item)
-        
-        # Favorite button logic
-        from qfluentwidgets import TransparentToolButton
-        
-        fav_button = TransparentToolButton()
-        fav_button.setCheckable(True)
-        is_fav = jira_key in self.db_service.get_all_favorites()
-        fav_button.setChecked(is_fav)
-        fav_button.setText("★" if is_fav else "☆")
-        fav_button.clicked.connect(lambda _, key=jira_key, btn=fav_button: self._toggle_favorite(key, btn))
-        table.setCellWidget(row_position, 5, fav_button)
-        
-    def _create_priority_combo(self, jira_key: str, current_priority: str = ""):
-        """Create a priority combobox for the given Jira key."""
-        from PyQt6.QtWidgets import QComboBox
-        
-        priority_combo = QComboBox()
-        priority_combo.addItem("", "")
-        priority_combo.addItem("Highest", "1")
-        priority_combo.addItem("High", "2")
-        priority_combo.addItem("Medium", "3")
-        priority_combo.addItem("Low", "4")
-        priority_combo.addItem("Lowest", "5")
-        
-        # Get local priority override if exists
-        local_priority = self.db_service.get_local_priority(jira_key)
-        if local_priority:
-            # Use local priority
-            priority_name = local_priority.get('name', '')
-            index = priority_combo.findText(priority_name)
-            if index >= 0:
-                priority_combo.setCurrentIndex(index)
-        elif current_priority:
-            # Use current priority from Jira
-            index = priority_combo.findText(current_priority)
-            if index >= 0:
-                priority_combo.setCurrentIndex(index)
-        
-        # Connect change signal
-        priority_combo.currentTextChanged.connect(
-            lambda text, key=jira_key: self._on_priority_changed(key, text)
-        )
         
-        return priority_combo
+        # Local priority override, if any, otherwise the priority from Jira
+        priority_data = fields.get('priority') or {}
+        priority_name = local_priorities.get(jira_key) or priority_data.get('name', '')
+        
+        return IssueRow(
+            key=jira_key,
+            title=fields.get('summary', ''),
+            status=(fields.get('status') or {}).get('name', ''),
+            priority=priority_name,
+            priority_id=priority_data.get('id', '') if jira_key not in local_priorities else '',
+            time_seconds=jira_seconds + local_seconds,
+            favorite=jira_key in favorites,
+            updated=fields.get('updated', ''),
+        )
         
     def _on_priority_changed(self, jira_key: str, priority_name: str):
-        """Handle priority change in the grid combobox."""
+        """Handle priority change made with the grid priority editor."""
         try:
             # Get priority ID for the name
             priority_id = self._get_priority_id_for_name(priority_name)
@@ -740,103 +856,56 @@ class MainController(QObject):
             else:
                 self.db_service.remove_local_priority(jira_key)
                 
-            # Add to sync queue if auto_sync is enabled and we're online
+            # With auto_sync the PriorityUpdates row is pushed by the next sync run
             auto_sync = self.app_settings.get_setting("auto_sync", "false").lower() == "true"
             if auto_sync and self.is_jira_available and priority_id:
-                import json
-                payload = json.dumps({
-                    "jira_key": jira_key,
-                    "priority_id": priority_id
-                })
-                self.db_service.add_to_sync_queue("UPDATE_PRIORITY", payload)
+                self._process_sync_queue()
                     
         except Exception as e:
             self._logger.error(f"Error updating priority for {jira_key}: {e}")
             
     def _get_priority_id_for_name(self, priority_name: str) -> str:
         """Get the priority ID for a given priority name."""
-        priority_map = {
-            "Highest": "1",
-            "High": "2", 
-            "Medium": "3",
-            "Low": "4",
-            "Lowest": "5"
-        }
-        return priority_map.get(priority_name, "")
-
-    def _toggle_favorite(self, jira_key: str, button: QPushButton):
-        """Toggles the favorite status of an issue."""
-        if self.db_service.is_favorite(jira_key):
-            self.db_service.remove_favorite(jira_key)
-            button.setText("☆")
-            button.setChecked(False)
-        else:
+        return self.metadata_cache.get_priority_id(priority_name)
+
+    def _refresh_metadata_in_background(self):
+        """Refreshes the stale Jira metadata once per session, without blocking the UI."""
+        if self._metadata_refresh_started:
+            return
+        try:
+            if not self.jira_service.is_connected():
+                return
+        except Exception:
+            return
+        self._metadata_refresh_started = True
+
+        thread = QThread()
+        worker = MetadataRefreshWorker(self.metadata_cache)
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.error.connect(lambda message: self._logger.warning("Metadata refresh failed: %s", message))
+        worker.finished.connect(self._on_metadata_refreshed)
+        self._start_tracked_worker_thread(thread, worker)
+
+    def _on_metadata_refreshed(self, kinds: list):
+        if 'priorities' in kinds or 'statuses' in kinds:
+            self._apply_grid_sort_orders()
+
+    def _apply_grid_sort_orders(self):
+        """Ranks the priorities and statuses of the grid as the cached Jira metadata lists them."""
+        self.view.jira_grid_view.model.set_sort_orders(self.metadata_cache.get_priorities(),
+                                                       self.metadata_cache.get_statuses())
+
+    def _on_favorite_toggled(self, jira_key: str, favorite: bool):
+        """Saves the favorite status toggled from the grid."""
+        if favorite:
             self.db_service.add_favorite(jira_key)
-            button.setText("★")
-            button.setChecked(True)
+        else:
+            self.db_service.remove_favorite(jira_key)
         
         # If the favorite filter is active, we need to refresh the view
         if self.view.jira_grid_view.favorites_btn.isChecked():
             self._on_favorites_toggled(True)
-            
-    def _reconnect_favorite_buttons(self):
-        """Reconnect all favorite buttons and priority comboboxes after sorting is completed."""
-        try:
-            table = self.view.jira_grid_view.table
-            
-            # Find the favorite and priority column indices
-            favorite_col_index = -1
-            priority_col_index = -1
-            visible_columns = self.view.jira_grid_view.get_visible_columns()
-            for i, col in enumerate(visible_columns):
-                col_id = col.get('id')
-                if col_id == 'favorite':
-                    favorite_col_index = i
-                elif col_id == 'priority':
-                    priority_col_index = i
-            
-            # Reconnect all widgets
-            for row in range(table.rowCount()):
-                # Get the Jira key from the first column
-                key_item = table.item(row, 0)
-                if not key_item:
-                    continue
-                    
-                jira_key = key_item.text()
-                
-                # Reconnect favorite button
-                if favorite_col_index >= 0:
-                    fav_button = table.cellWidget(row, favorite_col_index)
-                    if fav_button:
-                        # Disconnect any existing connections
-                        try:
-                            fav_button.clicked.disconnect()
-                        except TypeError:
-                            pass  # No connections to disconnect
-                        
-                        # Reconnect with the correct jira_key
-                        fav_button.clicked.connect(lambda _, key=jira_key, btn=fav_button: self._toggle_favorite(key, btn))
-                
-                # Reconnect priority combobox
-                if priority_col_index >= 0:
-                    priority_combo = table.cellWidget(row, priority_col_index)
-                    if priority_combo and hasattr(priority_combo, 'currentTextChanged'):
-                        # Disconnect any existing connections
-                        try:
-                            priority_combo.currentTextChanged.disconnect()
-                        except TypeError:
-                            pass  # No connections to disconnect
-                        
-                        # Reconnect with the correct jira_key
-                        priority_combo.currentTextChanged.connect(
-                            lambda text, key=jira_key: self._on_priority_changed(key, text)
-                        )
-                    
-        except Exception as e:
-            self._logger.error(f"Error reconnecting widgets: {e}")
-            import traceback
-            self._logger.error(traceback.format_exc())
-
 
     def _on_scroll(self, value):
         """
@@ -898,35 +967,6 @@ class MainController(QObject):
         except Exception:
             pass
         
-    def _filter_grid(self, text: str):
-        """
-        Filters the grid rows based on the search text.
-        Req: 2.3.2 (search bar)
-        """
-        table = self.view.jira_grid_view.table
-        search_term = text.lower()
-        for row in range(table.rowCount()):
-            key_item = table.item(row, 0)
-            title_item = table.item(row, 1)
-            
-            if not key_item:
-                continue
-                
-            # Check if item text contains the search term
-            key_match = search_term in key_item.text().lower()
-            title_match = title_item and search_term in title_item.text().lower()
-
-            # Also consider favorite status if the favorites filter is active
-            is_favorite = self.db_service.is_favorite(key_item.text())
-            show_only_favorites = self.view.jira_grid_view.favorites_btn.isChecked()
-
-            should_be_visible = (key_match or title_match) and (not show_only_favorites or is_favorite)
-
-            if should_be_visible:
-                table.setRowHidden(row, False)
-            else:
-                table.setRowHidden(row, True)
-
     def _append_search_filter_to_jql(self, jql: str | None, search_text: str) -> str:
         """
         Append a search filter to a JQL query using Jira's contains operator (~).
@@ -1191,7 +1231,8 @@ class MainController(QObject):
                 detail_window, 
                 self.jira_service, 
                 self.db_service,
-                jira_key
+                jira_key,
+                metadata_cache=self.metadata_cache
             )
             
             # Store controller on the window to keep it alive
@@ -1446,12 +1487,10 @@ class MainController(QObject):
 
     def _open_detail_view(self, model_index):
         """Opens the detail view for the clicked issue."""
-        row = model_index.row()
-        key_item = self.view.jira_grid_view.table.item(row, 0)
-        if not key_item:
+        issue_key = self.view.jira_grid_view.key_at(model_index.row())
+        if not issue_key:
             return
 
-        issue_key = key_item.text()
         self._logger.info(f"Double-click opening detail for: {issue_key}. Currently open: {list(self.open_detail_windows.keys())}")
 
         # Set flag to prevent automatic closures during opening
@@ -1489,7 +1528,8 @@ class MainController(QObject):
                 detail_window, 
                 self.jira_service, 
                 self.db_service,
-                issue_key
+                issue_key,
+                metadata_cache=self.metadata_cache
             )
 
             # Store controller on the window to keep it alive
@@ -1510,10 +1550,12 @@ class MainController(QObject):
             if not hasattr(self, 'priority_controller'):
                 self.priority_controller = PriorityConfigController(
                     self.db_service,
-                    self.jira_service
+                    self.jira_service,
+                    metadata_cache=self.metadata_cache
                 )
+            detail_controller.priority_controller = self.priority_controller
             
-            # Populate priorities in the detail view
+            # Populate priorities in the detail view (from the local metadata cache, no round trip)
             priorities = self.priority_controller.get_available_priorities()
             detail_controller.populate_priority_combo(priorities)
 
@@ -1586,7 +1628,8 @@ class MainController(QObject):
             detail_window, 
             self.jira_service, 
             self.db_service,
-            last_active_key
+            last_active_key,
+            metadata_cache=self.metadata_cache
         )
         
         detail_window.controller = detail_controller 
@@ -1651,7 +1694,7 @@ class MainController(QObject):
                 start_time = end_time - timedelta(seconds=seconds)
                 
                 # Add worklog to database
-                self.db_service.add_local_worklog(
+                local_worklog_id = self.db_service.add_local_worklog(
                     jira_key=jira_key,
                     start_time=start_time,
                     duration_seconds=seconds,
@@ -1681,7 +1724,8 @@ class MainController(QObject):
                         "jira_key": jira_key,
                         "start_time": start_time.isoformat(),
                         "seconds": seconds,
-                        "comment": note if note else ""
+                        "comment": note if note else "",
+                        "local_worklog_ids": [local_worklog_id]
                     })
                     self.db_service.add_to_sync_queue("ADD_WORKLOG", payload)
                     self._logger.debug(f"Worklog added to sync queue for {jira_key}")
@@ -1783,15 +1827,11 @@ class MainController(QObject):
                 self._logger.debug(f"[DEBUG] Backtrace della chiusura:\n{traceback.format_stack()}")
                 
                 # Controllare che non ci siano chiusure durante la selezione della griglia
-                selected = self.view.jira_grid_view.table.selectedItems()
-                if selected:
-                    row = selected[0].row()
-                    key_item = self.view.jira_grid_view.table.item(row, 0)
-                    if key_item:
-                        selected_key = key_item.text()
-                        self._logger.debug(f"[DEBUG] Chiusura finestra mentre è selezionato: {selected_key}")
-                        if selected_key == jira_key:
-                            self._logger.warning(f"[DEBUG] ATTENZIONE: Stiamo chiudendo la stessa finestra che è selezionata nella griglia!")
+                selected_key = self.view.jira_grid_view.selected_key()
+                if selected_key:
+                    self._logger.debug(f"[DEBUG] Chiusura finestra mentre è selezionato: {selected_key}")
+                    if selected_key == jira_key:
+                        self._logger.warning(f"[DEBUG] ATTENZIONE: Stiamo chiudendo la stessa finestra che è selezionata nella griglia!")
                 
                 self._logger.debug(f"[DEBUG] Chiamando window.close() per {jira_key}")
                 window.close()  # This will trigger the removal from the dictionary
@@ -1854,6 +1894,8 @@ class MainController(QObject):
 
     def _on_main_window_closing(self):
         """Handles the main window closing event by hiding the mini widget."""
+        self._save_grid_snapshot()
+
         # Stop the widget update timer
         if hasattr(self, 'widget_update_timer'):
             self.widget_update_timer.stop()
@@ -1876,6 +1918,13 @@ class MainController(QObject):
         except Exception:
             pass
 
+        # Stop attachment downloads: the unfinished ones are resumed at the next start
+        try:
+            if getattr(self, 'attachment_service', None):
+                self.attachment_service.download_manager.shutdown(wait=False)
+        except Exception:
+            pass
+
         # Close any open detail windows (which will also stop their workers)
         try:
             for key, win in list(self.open_detail_windows.items()):
@@ -2001,7 +2050,8 @@ class MainController(QObject):
             except Exception:
                 pass
             detail_controller = JiraDetailController(
-                detail_window, self.jira_service, self.db_service, jira_key
+                detail_window, self.jira_service, self.db_service, jira_key,
+                metadata_cache=self.metadata_cache
             )
             detail_window.controller = detail_controller
             self.open_detail_windows[jira_key] = detail_window
@@ -2161,7 +2211,7 @@ class MainController(QObject):
         that were temporarily given WindowStaysOnTopHint. This helps when the user
         explicitly activates the main window (clicking its taskbar entry, etc.)."""
         try:
-            from PyQt6.QtWidgets import QTableWidget
+            from PyQt6.QtWidgets import QTableView
             from PyQt6.QtCore import QEvent
             from PyQt6.QtGui import QMouseEvent
 
@@ -2175,7 +2225,7 @@ class MainController(QObject):
             elif event.type() == QEvent.Type.MouseButtonPress:
                 self._logger.debug(f"[DEBUG] MouseButtonPress event ricevuto da {watched}")
                 # Log specifico per i click sulla tabella
-                if isinstance(watched, QTableWidget) or (hasattr(watched, 'table') and watched is self.view.jira_grid_view.table):
+                if isinstance(watched, QTableView) or (hasattr(watched, 'table') and watched is self.view.jira_grid_view.table):
                     mouse_event = QMouseEvent(event)
                     pos = mouse_event.pos()
                     self._logger.debug(f"[DEBUG] Click sulla tabella rilevato a posizione ({pos.x()}, {pos.y()})")
@@ -2192,10 +2242,10 @@ class MainController(QObject):
                     import traceback
                     self._logger.debug(f"[DEBUG] Stack trace al click:\n{traceback.format_stack()}")
             elif event.type() == QEvent.Type.MouseButtonRelease:
-                if isinstance(watched, QTableWidget) or (hasattr(watched, 'table') and watched is self.view.jira_grid_view.table):
+                if isinstance(watched, QTableView) or (hasattr(watched, 'table') and watched is self.view.jira_grid_view.table):
                     self._logger.debug(f"[DEBUG] MouseButtonRelease sulla tabella")
             elif event.type() == QEvent.Type.MouseButtonDblClick:
-                if isinstance(watched, QTableWidget) or (hasattr(watched, 'table') and watched is self.view.jira_grid_view.table):
+                if isinstance(watched, QTableView) or (hasattr(watched, 'table') and watched is self.view.jira_grid_view.table):
                     self._logger.debug(f"[DEBUG] MouseButtonDblClick sulla tabella")
             
             if watched is self.view and event.type() == QEvent.Type.WindowActivate:
@@ -2279,7 +2329,30 @@ class MainController(QObject):
             self.view.update_sync_status(p_len, f_len)
         except Exception:
             pass
+
+        # With auto-sync the pending operations and priority changes are pushed as soon
+        # as Jira is reachable and their retry time (NextAttemptAt) has come
+        if getattr(self, 'is_jira_available', False) and (
+                (p_len and self._has_due_sync_operations()) or self._has_pending_priority_updates()):
+            try:
+                auto_sync = self.app_settings.get_setting("auto_sync", "false").lower() == "true"
+            except Exception:
+                auto_sync = False
+            if auto_sync:
+                self._process_sync_queue()
         
+    def _has_due_sync_operations(self) -> bool:
+        try:
+            return bool(self.db_service.has_due_sync_operations())
+        except Exception:
+            return False
+
+    def _has_pending_priority_updates(self) -> bool:
+        try:
+            return bool(self.db_service.has_pending_priority_updates())
+        except Exception:
+            return False
+
     def _show_sync_queue_dialog(self):
         """Shows the sync queue management dialog."""
         try:
@@ -2293,6 +2366,7 @@ class MainController(QObject):
                 pass
                 
             sync_queue_controller.sync_operation_changed.connect(self._update_sync_status)
+            self._sync_queue_controller = sync_queue_controller
             
             # Track the dialog window
             self._open_dialog_windows.append(sync_queue_controller.view)
@@ -2350,16 +2424,9 @@ class MainController(QObject):
         thread.started.connect(worker.run)
         worker.finished.connect(lambda issues: self._on_mentions_loaded({"issues": issues}))
         worker.error.connect(lambda error: self._on_mentions_error(error))
-        worker.finished.connect(thread.quit)
-        worker.finished.connect(worker.deleteLater)
-        thread.finished.connect(thread.deleteLater)
         
-        # Keep references
-        self._active_threads.append(thread)
-        self._active_workers.append(worker)
-        
-        # Start the thread
-        thread.start()
+        # Keep references until the thread finishes, then start it
+        self._start_tracked_worker_thread(thread, worker)
         
     def _on_mentions_loaded(self, result):
         """Handle loaded mentions."""
@@ -2380,7 +2447,6 @@ class MainController(QObject):
             self.view.jira_grid_view.show_info("Nessuna menzione", "Non sono stati trovati ticket che ti menzionano.")
             return
             
-        self.current_issues = issues
         self.data_loaded.emit(issues)
         
     def _on_mentions_error(self, error):
@@ -2470,12 +2536,24 @@ class MainController(QObject):
         # Update the UI indicator
         self.view.update_network_status(self.is_internet_available, self.is_jira_available)
         
+        if is_connected:
+            # First connection of the session: bring the metadata cache up to date
+            self._refresh_metadata_in_background()
+        if is_connected and not old_state:
+            # Downloads left unfinished by the last shutdown, when the app was started offline
+            self._resume_attachment_downloads()
+        
         # If JIRA just came back online and we're not during startup
         if is_connected and not old_state and not getattr(self, 'is_during_startup', False):
             # Show a message
             self._show_offline_notification("Connessione a JIRA ripristinata", 
                 "L'applicazione è ora in modalità online.\n"
                 "Le modifiche locali possono essere sincronizzate con il server.")
+
+            # Push what was queued while offline (operations and priority changes)
+            auto_sync = self.app_settings.get_setting("auto_sync", "false").lower() == "true"
+            if auto_sync:
+                self._process_sync_queue()
         elif is_connected and not old_state and getattr(self, 'is_during_startup', False):
             self._logger.info("[STARTUP] JIRA connection restored during startup - suppressing notification")
             
@@ -2492,6 +2570,16 @@ class MainController(QObject):
                 "L'applicazione continuerà a funzionare in modalità parzialmente offline.\n"
                 "I dati saranno salvati localmente e sincronizzati quando la connessione a JIRA sarà ripristinata.")
     
+    def _resume_attachment_downloads(self):
+        """Resumes the attachment downloads interrupted by the last shutdown."""
+        attachment_service = getattr(self, 'attachment_service', None)
+        if attachment_service is None:
+            return
+        try:
+            attachment_service.download_manager.resume_pending()
+        except Exception as e:
+            self._logger.warning(f"Could not resume the attachment downloads: {e}")
+
     def _try_reconnect_jira(self):
         """Attempts to reconnect to JIRA."""
         try:
@@ -2509,6 +2597,7 @@ class MainController(QObject):
                 self.jira_service.connect(jira_url, pat)
                 self.is_jira_available = True
                 self._logger.info("Riconnessione a JIRA riuscita")
+                self._resume_attachment_downloads()
                 
                 # Aggiorna l'indicatore
                 self.view.update_network_status(self.is_internet_available, self.is_jira_available)
@@ -2537,37 +2626,46 @@ class MainController(QObject):
             wait_msg.setText("Verifica della connessione in corso...")
             wait_msg.setStandardButtons(QMessageBox.StandardButton.NoButton)
             wait_msg.show()
-            
-            # Esegue controllo della connessione
+
+            # Il controllo gira in background: il risultato arriva con probe_completed
+            def _on_probe_completed(internet_available, jira_available):
+                try:
+                    self.network_service.probe_completed.disconnect(_on_probe_completed)
+                except TypeError:
+                    pass
+                # Chiudi il messaggio di attesa
+                wait_msg.close()
+                self._show_connection_check_result(internet_available, jira_available)
+
+            self.network_service.probe_completed.connect(_on_probe_completed)
             self.network_service.check_connection()
             
-            # Chiudi il messaggio di attesa
-            wait_msg.close()
-            
-            # Mostra il risultato
-            result_msg = QMessageBox(self.view)
-            result_msg.setWindowTitle("Stato connessione")
-            
-            if self.is_internet_available and self.is_jira_available:
-                result_msg.setText("✅ Connessione a internet e JIRA disponibile")
-                result_msg.setIcon(QMessageBox.Icon.Information)
-            elif self.is_internet_available:
-                result_msg.setText("⚠️ Connessione a internet disponibile, ma JIRA non raggiungibile")
-                result_msg.setIcon(QMessageBox.Icon.Warning)
-                result_msg.setInformativeText("Possibili cause:\n- Server JIRA non disponibile\n- Problemi con le credenziali\n- Problemi di rete interni")
-            else:
-                result_msg.setText("❌ Nessuna connessione a internet")
-                result_msg.setIcon(QMessageBox.Icon.Critical)
-                result_msg.setInformativeText("Controlla la connessione di rete")
-            
-            result_msg.exec()
-            
         except Exception as e:
             self._logger.error(f"Errore durante la verifica manuale della connessione: {e}")
             try:
                 wait_msg.close()
             except Exception:
                 pass
+
+    def _show_connection_check_result(self, internet_available: bool, jira_available: bool):
+        """Shows the outcome of a manual connection check."""
+        from PyQt6.QtWidgets import QMessageBox
+        result_msg = QMessageBox(self.view)
+        result_msg.setWindowTitle("Stato connessione")
+        
+        if internet_available and jira_available:
+            result_msg.setText("✅ Connessione a internet e JIRA disponibile")
+            result_msg.setIcon(QMessageBox.Icon.Information)
+        elif internet_available:
+            result_msg.setText("⚠️ Connessione a internet disponibile, ma JIRA non raggiungibile")
+            result_msg.setIcon(QMessageBox.Icon.Warning)
+            result_msg.setInformativeText("Possibili cause:\n- Server JIRA non disponibile\n- Problemi con le credenziali\n- Problemi di rete interni")
+        else:
+            result_msg.setText("❌ Nessuna connessione a internet")
+            result_msg.setIcon(QMessageBox.Icon.Critical)
+            result_msg.setInformativeText("Controlla la connessione di rete")
+        
+        result_msg.exec()
     
     def _show_offline_notification(self, title, message):
         """Shows a non-modal notification about network status changes."""
@@ -2591,14 +2689,73 @@ class MainController(QObject):
             self._logger.error(f"Errore nel mostrare la notifica offline: {e}")
     
     def _process_sync_queue(self):
-        """Processes the sync queue when connection is restored."""
-        # TODO: This would normally be done by a sync worker
-        # For this implementation, we'll trigger it when connection is restored
-        # and if auto-sync is enabled
-        pass
+        """Pushes the pending sync queue operations to Jira in background."""
+        if self._sync_worker is not None:
+            return  # A run is already in progress: it will pick up the new items too
+        try:
+            if not self.jira_service.is_connected():
+                return
+        except Exception:
+            return
+
+        try:
+            coalesce = self.app_settings.get_setting("coalesce_worklogs", "false").lower() == "true"
+        except Exception:
+            coalesce = False
+
+        thread = QThread()
+        worker = SyncWorker(self.jira_service, self.db_service, coalesce_worklogs=coalesce)
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.finished.connect(self._on_sync_queue_processed)
+        worker.progress.connect(self._on_sync_progress)
+        worker.item_finished.connect(self._on_sync_item_finished)
+        worker.upload_progress.connect(self._on_upload_progress)
+        worker.error.connect(lambda message: self._logger.error("Sync queue run failed: %s", message))
+        self._sync_worker = worker
+        self._start_tracked_worker_thread(thread, worker)
+
+    def _on_sync_progress(self, done: int, total: int):
+        """Shows how far the sync run is on the sync indicator."""
+        try:
+            self.view.sync_status_indicator.set_run_progress(done, total)
+        except Exception:
+            pass
+
+    def _on_sync_item_finished(self, operation_id: int, error: str):
+        """Keeps the sync queue dialog, if open, in step with the running sync."""
+        if error:
+            self._logger.debug("Sync item %s not sent: %s", operation_id, error)
+        controller = self._sync_queue_controller
+        try:
+            if controller is not None and controller.view.isVisible():
+                controller.refresh_later()
+        except RuntimeError:
+            # Dialog already destroyed
+            self._sync_queue_controller = None
+
+    def _on_upload_progress(self, operation_id: int, sent: int, total: int):
+        """Shows the progress of the attachment being uploaded by the sync run."""
+        try:
+            self.view.sync_status_indicator.set_transfer_progress(sent, total)
+        except Exception:
+            pass
+
+    def _on_sync_queue_processed(self, summary: dict):
+        """Refreshes the sync indicator after a sync run."""
+        try:
+            self.view.sync_status_indicator.set_run_progress(None, None)
+        except Exception:
+            pass
+        if summary.get('total'):
+            self._logger.info("Sync queue processed: %s", summary)
+        self._update_sync_status()
 
     def load_cached_issues_immediately(self):
         """Load cached issues immediately for responsive UI startup."""
+        # The grid of the last session, as it was left, when its JQL is still the current one
+        if self._render_grid_snapshot():
+            return
         try:
             self._logger.info("Loading cached issues for immediate display")
             
@@ -2620,6 +2777,54 @@ class MainController(QObject):
         except Exception as e:
             self._logger.error(f"Error loading cached issues: {e}")
 
+    def _grid_jql(self) -> str:
+        """JQL loaded in the grid by a refresh."""
+        return self.app_settings.get_setting(
+            'last_used_jql',
+            self.app_settings.get_setting('jql_query', 'assignee = currentUser() AND status != "Done"'),
+        )
+
+    def _render_grid_snapshot(self) -> bool:
+        """
+        Shows the grid saved at the end of the last session, synchronously and
+        before any network activity. The first page of the next refresh is
+        reconciled with it. Returns False if there is no usable snapshot.
+        """
+        grid = self.view.jira_grid_view
+        try:
+            snapshot = self.db_service.get_grid_snapshot()
+            if (not snapshot or snapshot.get('jql') != self._grid_jql()
+                    or bool(snapshot.get('favorites_only')) != grid.favorites_btn.isChecked()):
+                return False
+            started = time.perf_counter()
+            self._apply_grid_colors()
+            if not grid.restore_snapshot(snapshot):
+                return False
+        except Exception as e:
+            self._logger.warning(f"Could not render the grid snapshot: {e}")
+            return False
+        grid.set_jql_text(snapshot['jql'])
+        # The snapshot stands for the loaded issues until the first page replaces it
+        self.current_issues = list(grid.model.rows())
+        self._reconcile_next_page = True
+        self._logger.info("Grid snapshot rendered: %s rows in %.1f ms", len(snapshot.get('rows') or []),
+                          (time.perf_counter() - started) * 1000)
+        return True
+
+    def _save_grid_snapshot(self):
+        """Saves the grid as shown, to be rendered at the next launch."""
+        grid = self.view.jira_grid_view
+        if not self.is_jira_available or not grid.model.rows():
+            # Offline the grid holds placeholders of the favorites, not a JQL result
+            return
+        try:
+            snapshot = grid.snapshot()
+            snapshot['jql'] = self._grid_jql()
+            snapshot['favorites_only'] = grid.favorites_btn.isChecked()
+            self.db_service.save_grid_snapshot(snapshot)
+        except Exception as e:
+            self._logger.warning(f"Could not save the grid snapshot: {e}")
+
     def start_background_data_loading(self):
         """Start background data loading without blocking the UI."""
         try:
@@ -2636,6 +2841,7 @@ class MainController(QObject):
             if self.is_jira_available and self.jira_service.is_connected():
                 # Use a timer to start background refresh after a short delay
                 QTimer.singleShot(1000, self._start_background_refresh)
+                self._refresh_metadata_in_background()
             else:
                 # Update status to show offline mode
                 if not self.current_issues:
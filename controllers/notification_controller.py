@@ -1,24 +1,35 @@
-from PyQt6.QtCore import QObject, pyqtSignal, QTimer
+import logging
+
+from PyQt6.QtCore import QObject, pyqtSignal, QTimer, QThread
 
 from services.db_service import DatabaseService
 from services.jira_service import JiraService
+from services.notification_poller import NotificationPoller
+from workers.worker import NotificationCheckWorker
 
 class NotificationController(QObject):
     """
     Controller for managing notifications about Jira issue comments.
     """
     notification_count_changed = pyqtSignal(int)  # Signal emitted when notification count changes
+    check_completed = pyqtSignal(dict)  # Summary of a background check (see NotificationPoller.poll)
     
     def __init__(self, db_service: DatabaseService, jira_service: JiraService, parent=None):
         super().__init__(parent)
         self.db_service = db_service
         self.jira_service = jira_service
         self.notification_count = 0
+        self.poller = NotificationPoller(db_service, jira_service)
+        self._check_thread = None
+        self._check_worker = None
+        self._logger = logging.getLogger('JiraTimeTracker')
         
-        # Set up refresh timer (check every 5 minutes by default)
+        # Set up refresh timer. Each subscription has its own polling interval
+        # (see NotificationPoller): the timer only wakes up the scheduler, and a
+        # tick with nothing due costs a database read and no request to Jira
         self.refresh_timer = QTimer(self)
         self.refresh_timer.timeout.connect(self.check_notifications)
-        self.check_interval = 5 * 60 * 1000  # 5 minutes in milliseconds
+        self.check_interval = 60 * 1000  # 1 minute in milliseconds
         
     def start_notification_checks(self):
         """Start periodic notification checks."""
@@ -40,9 +51,17 @@ class NotificationController(QObject):
     def stop_notification_checks(self):
         """Stop periodic notification checks."""
         self.refresh_timer.stop()
+        thread = self._check_thread
+        if thread is not None:
+            try:
+                # A cycle is a handful of requests: let it end instead of killing it
+                thread.quit()
+                thread.wait(5000)
+            except RuntimeError:
+                pass  # Already deleted
         
     def set_check_interval(self, minutes: int):
-        """Set the interval for checking notifications."""
+        """Set how often the scheduler looks for due subscriptions."""
         if minutes < 1:
             minutes = 1  # Minimum 1 minute
         self.check_interval = minutes * 60 * 1000
@@ -52,55 +71,55 @@ class NotificationController(QObject):
             self.refresh_timer.stop()
             self.refresh_timer.start(self.check_interval)
             
-    def check_notifications(self):
-        """Check for new notifications on subscribed issues."""
-        # Get all notification subscriptions (defensive)
+    def check_notifications(self, force: bool = False):
+        """
+        Check for new notifications on the subscriptions that are due (all of
+        them if force, e.g. when the user asks for a refresh).
+        The Jira requests run in a background thread (see NotificationPoller);
+        a check requested while another one is running is skipped.
+        """
+        if self._check_thread is not None:
+            return
+
         try:
-            subscriptions = self.db_service.get_all_notification_subscriptions()
+            connected = self.jira_service.is_connected()
         except Exception:
-            subscriptions = []
-
-        if not subscriptions:
-            try:
-                self._update_notification_count(0)
-            except Exception:
-                pass
+            connected = False
+        if not connected:
+            # Offline: just show what is already stored
+            self._refresh_count_from_db()
             return
-        
-        # We'll track new notifications found in this check
-        new_notifications_count = 0
-        
-        # For each subscription, check if there are new comments
-        for subscription in subscriptions:
-            issue_key = subscription['issue_key']
-            last_comment_date = subscription['last_comment_date']  # This could be None for first check
-            
-            try:
-                # Get comments for the issue from Jira
-                comments = self.jira_service.get_issue_comments(issue_key)
-                if not comments:
-                    continue
-                
-                # Find the newest comment
-                newest_comment = max(comments, key=lambda c: c.get('created', ''))
-                newest_date = newest_comment.get('created')
-                
-                # If no last comment date recorded or the newest comment is newer, we have a notification
-                if not last_comment_date or newest_date > last_comment_date:
-                    new_notifications_count += 1
-                    # Update the last comment date in the database if possible
-                    try:
-                        if hasattr(self.db_service, 'update_notification_subscription'):
-                            self.db_service.update_notification_subscription(
-                                issue_key,
-                                {'last_comment_date': newest_date, 'is_read': False}
-                            )
-                    except Exception:
-                        pass
-            except Exception as e:
-                print(f"Error checking notifications for {issue_key}: {str(e)}")
-                
-        # Update the notification count
+
+        thread = QThread()
+        worker = NotificationCheckWorker(self.poller, force=force)
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.finished.connect(self._on_check_finished)
+        worker.error.connect(self._on_check_failed)
+        worker.finished.connect(thread.quit)
+        worker.error.connect(thread.quit)
+        thread.finished.connect(self._on_check_thread_finished)
+        thread.finished.connect(worker.deleteLater)
+        thread.finished.connect(thread.deleteLater)
+
+        self._check_thread = thread
+        self._check_worker = worker
+        thread.start()
+
+    def _on_check_finished(self, summary: dict):
+        self._logger.debug("Notification check completed: %s", summary)
+        self._refresh_count_from_db()
+        self.check_completed.emit(summary)
+
+    def _on_check_failed(self, message: str):
+        self._logger.warning("Notification check failed: %s", message)
+        self._refresh_count_from_db()
+
+    def _on_check_thread_finished(self):
+        self._check_thread = None
+        self._check_worker = None
+
+    def _refresh_count_from_db(self):
         try:
             unread_count = self.db_service.get_unread_notifications_count()
         except Exception:
@@ -7,10 +7,12 @@ class PriorityConfigController(QObject):
     
     priority_updated = pyqtSignal(str, str)  # jira_key, new_priority
     
-    def __init__(self, db_service, jira_service):
+    def __init__(self, db_service, jira_service, metadata_cache=None):
         super().__init__()
         self.db_service = db_service
         self.jira_service = jira_service
+        # Cache locale dei metadati Jira: evita un round trip per ogni combo
+        self.metadata_cache = metadata_cache
         self.logger = logging.getLogger('JiraTimeTracker')
         
     def update_priority(self, jira_key, new_priority):
@@ -44,6 +46,10 @@ class PriorityConfigController(QObject):
     
     def _get_priority_id_for_name(self, priority_name: str) -> str:
         """Get the priority ID for a given priority name."""
+        if self.metadata_cache is not None:
+            priority_id = self.metadata_cache.get_priority_id(priority_name)
+            if priority_id:
+                return priority_id
         priority_map = {
             "Highest": "1",
             "High": "2", 
@@ -56,6 +62,9 @@ class PriorityConfigController(QObject):
     def get_available_priorities(self):
         """Get list of available priorities from Jira."""
         try:
+            if self.metadata_cache is not None:
+                # Filled synchronously from the local cache, refreshed in background
+                return self.metadata_cache.get_priorities()
             if self.jira_service.is_connected():
                 priorities = self.jira_service.get_priorities()
                 return priorities
@@ -1,10 +1,12 @@
-from PyQt6.QtCore import QObject, Qt, pyqtSignal
+from PyQt6.QtCore import QObject, Qt, QTimer, pyqtSignal
 from PyQt6.QtWidgets import (
     QTableWidgetItem, QWidget, QHBoxLayout, QPushButton,
     QMessageBox, QHeaderView
 )
 from PyQt6.QtGui import QColor, QBrush, QIcon
 import json
+from datetime import datetime, timezone
+from services.attachment_upload import discard_staged
 from views.sync_queue_dialog import SyncQueueDialog
 from qfluentwidgets import FluentIcon as FIF, getIconColor
 from qfluentwidgets.common.icon import FluentIconBase, Icon
@@ -20,6 +22,11 @@ class SyncQueueController(QObject):
         self.jira_service = jira_service
         # Parent the dialog to the provided parent (usually the main window)
         self.view = SyncQueueDialog(parent)
+        # A sync run finishes operations in bursts: the table is reloaded once per burst
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(300)
+        self._refresh_timer.timeout.connect(self._load_data)
         self._connect_signals()
         
     def _connect_signals(self):
@@ -33,6 +40,10 @@ class SyncQueueController(QObject):
         self._load_data()
         self.view.show()
         
+    def refresh_later(self):
+        """Reloads the table shortly, e.g. when a sync run has finished an operation."""
+        self._refresh_timer.start()
+
     def _load_data(self):
         """Loads the sync queue data from the database."""
         self.view.clear_table()
@@ -49,15 +60,15 @@ class SyncQueueController(QObject):
         # Combine operations for display
         all_ops = []
         for op in pending_ops:
-            all_ops.append((op[0], op[1], op[2], "Pending", op[3], None))
+            all_ops.append((op[0], op[1], op[2], "Pending", op[3], None, op[4]))
             
         for op in failed_ops:
-            all_ops.append((op[0], op[1], op[2], "Failed", op[3], op[4]))
+            all_ops.append((op[0], op[1], op[2], "Failed", op[3], op[4], None))
             
         # Add rows to table
         self.view.table.setRowCount(len(all_ops))
         
-        for row, (op_id, op_type, payload, status, attempts, error) in enumerate(all_ops):
+        for row, (op_id, op_type, payload, status, attempts, error, next_attempt) in enumerate(all_ops):
             # Create items for the table
             id_item = QTableWidgetItem(str(op_id))
             type_item = QTableWidgetItem(op_type)
@@ -70,7 +81,7 @@ class SyncQueueController(QObject):
                 elif op_type == "ADD_COMMENT":
                     display_text = f"Jira: {payload_data.get('jira_key')}, Commento: {payload_data.get('body')[:30]}..."
                 elif op_type == "ADD_ATTACHMENT":
-                    display_text = f"Jira: {payload_data.get('jira_key')}, File: {payload_data.get('file_path')}"
+                    display_text = f"Jira: {payload_data.get('jira_key')}, File: {payload_data.get('file_name') or payload_data.get('file_path')}"
                 else:
                     display_text = payload[:50] + "..." if len(payload) > 50 else payload
             except json.JSONDecodeError:
@@ -78,7 +89,7 @@ class SyncQueueController(QObject):
                 
             payload_item = QTableWidgetItem(display_text)
             status_item = QTableWidgetItem(status)
-            attempts_item = QTableWidgetItem(str(attempts))
+            attempts_item = QTableWidgetItem(self._format_attempts(attempts, next_attempt))
             
             # Set colors based on status
             if status == "Pending":
@@ -105,6 +116,19 @@ class SyncQueueController(QObject):
         # Resize columns
         self.view.table.resizeColumnsToContents()
         
+    @staticmethod
+    def _format_attempts(attempts, next_attempt):
+        """Attempts count, with the local time of the next retry for the operations in backoff."""
+        if not attempts or not next_attempt:
+            return str(attempts)
+        try:
+            due = datetime.strptime(next_attempt, "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc)
+        except ValueError:
+            return str(attempts)
+        if due <= datetime.now(timezone.utc):
+            return str(attempts)
+        return f"{attempts} (riprova alle {due.astimezone().strftime('%H:%M')})"
+
     def _add_action_buttons(self, row, op_id, status, error):
         """Adds action buttons to the row."""
         widget = QWidget()
@@ -179,10 +203,9 @@ class SyncQueueController(QObject):
             
     def _retry_operation(self, op_id):
         """Retries a single failed operation."""
-        # In a real implementation, this would attempt to execute the operation
-        # For now, we'll just mark it as pending again
+        # Rimessa in coda subito: la esegue il prossimo giro di sincronizzazione
         try:
-            self.db_service.update_sync_operation_status(op_id, "Pending")
+            self.db_service.requeue_sync_operations([op_id])
             self.view.show_info(f"Operazione {op_id} rimessa in coda.")
             self._load_data()  # Reload the data
             self.sync_operation_changed.emit()
@@ -203,6 +226,7 @@ class SyncQueueController(QObject):
             try:
                 # For now, we'll just update the status to "Deleted"
                 # In a full implementation, you might want to actually delete it or archive it
+                self._discard_staged_attachment(op_id)
                 self.db_service.update_sync_operation_status(op_id, "Deleted")
                 self.view.show_info(f"Operazione {op_id} eliminata.")
                 self._load_data()  # Reload the data
@@ -210,6 +234,15 @@ class SyncQueueController(QObject):
             except Exception as e:
                 self.view.show_error(f"Errore durante l'eliminazione: {str(e)}")
                 
+    def _discard_staged_attachment(self, op_id):
+        """Removes the staged copy of an attachment upload that is taken off the queue."""
+        operation = self.db_service.get_sync_operation(op_id)
+        if operation and operation[1] == "ADD_ATTACHMENT":
+            try:
+                discard_staged(json.loads(operation[2]))
+            except (TypeError, ValueError):
+                pass
+
     def _retry_all_failed(self):
         """Retries all failed operations."""
         # Get failed operations
@@ -220,11 +253,9 @@ class SyncQueueController(QObject):
             return
             
         try:
-            count = 0
-            for op in failed_ops:
-                op_id = op[0]
-                self.db_service.update_sync_operation_status(op_id, "Pending")
-                count += 1
+            # Una sola transazione; la SyncEngine si ferma al primo errore di rete,
+            # autenticazione o rate limit e ripianifica le altre invece di riprovarle tutte
+            count = self.db_service.requeue_sync_operations()
                 
             self.view.show_info(f"{count} operazioni rimesse in coda.")
             self._load_data()  # Reload the data
@@ -253,6 +284,7 @@ class SyncQueueController(QObject):
         if reply == QMessageBox.StandardButton.Yes:
             try:
                 for op_id in op_ids:
+                    self._discard_staged_attachment(op_id)
                     self.db_service.update_sync_operation_status(op_id, "Deleted")
                     
                 self.view.show_info(f"{len(op_ids)} operazioni eliminate.")
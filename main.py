@@ -210,7 +210,10 @@ def init_services(app_settings, db_service, cred_service):
         base_retry_delay=base_retry_delay,
         max_delay=max_delay,
         non_retryable_statuses=non_retryable_statuses,
+        fictitious_recheck_days=_parse_float(app_settings.get_setting('jira/fictitious_recheck_days'), 7.0),
     )
+    # Carica il registro persistente dei ticket fittizi (404 già noti)
+    jira_service.set_fictitious_store(db_service)
     
     # Initialize attachment service
     attachment_service = AttachmentService(db_service, jira_service)
@@ -321,7 +324,10 @@ def main():
         base_retry_delay=base_retry_delay,
         max_delay=max_delay,
         non_retryable_statuses=non_retryable_statuses,
+        fictitious_recheck_days=_parse_float(app_settings.get_setting('jira/fictitious_recheck_days'), 7.0),
     )
+    # Carica il registro persistente dei ticket fittizi (404 già noti)
+    jira_service.set_fictitious_store(db_service)
     
     # Initialize attachment service
     from services.attachment_service import AttachmentService
@@ -348,7 +354,21 @@ def main():
         jira_url = app_settings.get_setting("JIRA_URL")
         pat = cred_service.get_pat(jira_url)
 
-    # 3. Attempt to connect to Jira on startup
+    # 3. Setup main window and controller (MVC)
+    main_window = MainWindow()
+    main_controller = MainController(main_window, db_service, jira_service, app_settings, timezone_service)
+    # Attach the attachment service to the main controller
+    main_controller.attachment_service = attachment_service
+    
+    # Show window immediately without blocking startup
+    main_window.show()
+    
+    # Load cached data first for immediate UI responsiveness: the last session's grid
+    # is painted before any network activity
+    main_controller.load_cached_issues_immediately()
+    app.processEvents()
+
+    # 4. Attempt to connect to Jira on startup
     try:
         import socket
         # Controlla prima se il DNS può essere risolto
@@ -385,21 +405,14 @@ def main():
             # Final fallback: log and continue (do not crash the app because of UI errors)
             logger.exception('Failed to show connection warning dialog')
     
-    # 4. Setup main window and controller (MVC)
-    main_window = MainWindow()
-    main_controller = MainController(main_window, db_service, jira_service, app_settings, timezone_service)
-    # Attach the attachment service to the main controller
-    main_controller.attachment_service = attachment_service
-    
-    # Set initial network status based on connection attempt result
+    # Set network status based on connection attempt result
     main_controller.is_internet_available = True  # Presumed true since we got to this point
     main_controller.is_jira_available = jira_service.is_connected()
-    
-    # Show window immediately without blocking startup
-    main_window.show()
-    
-    # Load cached data first for immediate UI responsiveness
-    main_controller.load_cached_issues_immediately()
+    main_window.update_network_status(main_controller.is_internet_available, main_controller.is_jira_available)
+
+    # Riprende i download di allegati interrotti alla chiusura precedente
+    if jira_service.is_connected():
+        attachment_service.download_manager.resume_pending()
     
     # Start background data loading without blocking UI
     main_controller.start_background_data_loading()
@@ -13,7 +13,7 @@ import os
 from PyQt6.QtWidgets import (
     QWidget, QMainWindow, QFrame, QHBoxLayout, QVBoxLayout,
     QStackedWidget, QPushButton, QSizePolicy, QSpacerItem,
-    QLabel, QLineEdit, QTextEdit, QCheckBox, QComboBox, QTableWidget
+    QLabel, QLineEdit, QTextEdit, QCheckBox, QComboBox, QTableWidget, QTableView
 )
 from PyQt6.QtGui import QIcon
 from PyQt6.QtCore import QTranslator
@@ -749,6 +749,11 @@ class TableWidget(QTableWidget):
             pass
 
 
+class TableView(QTableView):
+    """Thin wrapper around QTableView, the model-based counterpart of TableWidget."""
+    pass
+
+
 class LineEdit(QLineEdit):
     pass
 
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the sync engine against the local Jira stand-in.
+
+Fills a temporary SyncQueue with N worklogs spread over a few issues and
+pushes them with different pool sizes, printing the throughput of each run.
+
+    python scripts/benchmark_sync.py --items 1000 --issues 50 --latency 0.02
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.db_service import DatabaseService  # noqa: E402
+from services.jira_service import JiraService  # noqa: E402
+from services.sync_engine import SyncEngine  # noqa: E402
+from tests.jira_standin import FaultConfig, JiraDataset, JiraStandIn  # noqa: E402
+
+
+def _fill_queue(db, items, issues):
+    # Queued like the app does, with their idempotency keys
+    for n in range(items):
+        db.add_to_sync_queue("ADD_WORKLOG", json.dumps({
+            "jira_key": f"PRJ-{n % issues + 1}",
+            "time_spent_seconds": 60,
+            "start_time": datetime(2025, 3, 1, 9, 0).isoformat(),
+            "comment": f"benchmark {n}",
+        }))
+
+
+def run(items, issues, latency, workers_list):
+    with tempfile.TemporaryDirectory() as tmp:
+        with JiraStandIn(JiraDataset.synthetic(issues), FaultConfig(latency=latency)) as server:
+            jira_service = JiraService()
+            jira_service.connect(server.url, 'token')
+            for workers in workers_list:
+                db = DatabaseService(db_name=f'bench_{workers}.db')
+                db.db_path = os.path.join(tmp, f'bench_{workers}.db')
+                db.initialize_db()
+                _fill_queue(db, items, issues)
+
+                started = time.perf_counter()
+                summary = SyncEngine(db, jira_service, max_workers=workers).run()
+                elapsed = time.perf_counter() - started
+                print(f"workers={workers:>2}  items={summary['succeeded']}/{summary['total']}  "
+                      f"{elapsed:7.2f}s  {summary['succeeded'] / elapsed:8.1f} items/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--items', type=int, default=1000)
+    parser.add_argument('--issues', type=int, default=50)
+    parser.add_argument('--latency', type=float, default=0.02, help='Latency per request in seconds')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 8])
+    args = parser.parse_args()
+    run(args.items, args.issues, args.latency, args.workers)
+
+
+if __name__ == '__main__':
+    main()
@@ -4,13 +4,16 @@ Handles downloading, saving, and tracking of file attachments.
 """
 
 import os
-import hashlib
 import logging
 import mimetypes
 import shutil
+import threading
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple, Any
 
+from services.blob_store import BlobStore, hash_file
+from services.download_manager import KIND_ATTACHMENT, get_download_manager
+
 logger = logging.getLogger('JiraTimeTracker')
 
 class AttachmentService:
@@ -21,10 +24,11 @@ class AttachmentService:
     - Downloads files from Jira attachments
     - Computes and verifies file hashes to detect changes
     - Keeps track of downloaded files
-    - Manages the local storage of attachments
+    - Manages the local storage of attachments, storing each distinct
+      content once (see blob_store)
     """
     
-    def __init__(self, db_service, jira_service, app_settings=None):
+    def __init__(self, db_service, jira_service, app_settings=None, download_manager=None):
         """
         Initialize the attachment service.
         
@@ -32,13 +36,19 @@ class AttachmentService:
             db_service: Database service for persistent storage
             jira_service: Jira service for retrieving attachments
             app_settings: Application settings (optional)
+            download_manager: DownloadManager to use (default: the application's one)
         """
         self.db_service = db_service
         self.jira_service = jira_service
         self.app_settings = app_settings
+        self.download_manager = download_manager or get_download_manager(db_service, jira_service)
+        self.download_manager.set_completion_hook(KIND_ATTACHMENT, self._register_download)
         
         # Set up the attachments directory
         self._setup_attachments_dir()
+        self.blob_store = BlobStore(os.path.join(self.attachments_dir, "blobs"))
+        # Serializes storing and deleting blobs (downloads complete in worker threads)
+        self._store_lock = threading.Lock()
         
     def _setup_attachments_dir(self):
         """Set up the directory where attachments will be stored."""
@@ -83,12 +93,7 @@ class AttachmentService:
             SHA-256 hash of the file as a hexadecimal string
         """
         try:
-            sha256_hash = hashlib.sha256()
-            with open(file_path, "rb") as f:
-                # Read in chunks to handle large files efficiently
-                for byte_block in iter(lambda: f.read(4096), b""):
-                    sha256_hash.update(byte_block)
-            return sha256_hash.hexdigest()
+            return hash_file(file_path).hexdigest()
         except Exception as e:
             logger.error(f"Failed to compute file hash for {file_path}: {e}")
             return ""
@@ -162,10 +167,10 @@ class AttachmentService:
         
         return True, attachment_info
         
-    async def download_attachment(self, jira_key: str, attachment_info: Dict[str, Any], 
-                                force_download: bool = False) -> Optional[str]:
+    def queue_download(self, jira_key: str, attachment_info: Dict[str, Any],
+                       force_download: bool = False) -> Optional[int]:
         """
-        Download an attachment from Jira.
+        Queue the download of an attachment into the local attachments store.
         
         Args:
             jira_key: The Jira issue key
@@ -173,61 +178,51 @@ class AttachmentService:
             force_download: If True, download even if we already have it
             
         Returns:
-            The local path to the downloaded file, or None on failure
+            The id of the download (see DownloadManager signals), or None if
+            the attachment is already stored locally
         """
-        try:
-            attachment_id = attachment_info.get('id')
-            filename = attachment_info.get('filename', 'unknown_file')
-            file_size = attachment_info.get('size', 0)
-            mime_type = attachment_info.get('mimeType')
-            
-            # Check if we already have this attachment
-            if not force_download:
-                exists, db_info = self.check_attachment_exists(jira_key, attachment_id)
-                if exists:
-                    logger.debug(f"Attachment {attachment_id} already downloaded at {db_info['file_path']}")
-                    return db_info['file_path']
-            
-            # Determine where to save the file
-            file_path = self.get_attachment_path(jira_key, attachment_id, filename)
-            
-            # Download the file from Jira - rimuovo i parametri nominati per evitare conflitti
-            success = await self.jira_service.download_attachment(
-                attachment_id, 
-                file_path
-            )
-            
-            if not success:
-                logger.error(f"Failed to download attachment {attachment_id}")
-                return None
-                
-            # Compute the file hash
-            file_hash = self.compute_file_hash(file_path)
-            
-            # Check if the hash matches an existing record
+        attachment_id = attachment_info.get('id')
+        filename = attachment_info.get('filename', 'unknown_file')
+        
+        # Check if we already have this attachment
+        if not force_download:
             exists, db_info = self.check_attachment_exists(jira_key, attachment_id)
-            if exists and db_info['file_hash'] == file_hash:
-                # Hash hasn't changed, we can use the existing file
-                logger.debug(f"File hash unchanged for {attachment_id}")
-                return db_info['file_path']
-            
-            # Save/update the attachment record
+            if exists:
+                logger.debug(f"Attachment {attachment_id} already downloaded at {db_info['file_path']}")
+                return None
+        
+        return self.download_manager.enqueue(
+            KIND_ATTACHMENT, jira_key, attachment_id, filename,
+            self.get_attachment_path(jira_key, attachment_id, filename),
+            total_bytes=attachment_info.get('size'),
+            url=attachment_info.get('content'),
+            mime_type=attachment_info.get('mimeType')
+        )
+        
+    def _register_download(self, download: Dict[str, Any]):
+        """
+        Store a completed download in the blob store and record it in
+        FileAttachments (called by the DownloadManager in its worker thread,
+        also for downloads resumed after a restart). The hash was computed
+        while downloading.
+        """
+        jira_key, attachment_id = download['jira_key'], download['attachment_id']
+        with self._store_lock:
+            previous = self.db_service.get_file_attachment(jira_key, attachment_id)
+            file_path = self.blob_store.ingest(download['target_path'], download['sha256'])
             self.db_service.add_file_attachment(
                 jira_key=jira_key,
                 attachment_id=attachment_id,
-                file_name=filename,
+                file_name=download['file_name'],
                 file_path=file_path,
-                file_hash=file_hash,
-                file_size=file_size,
-                mime_type=mime_type
+                file_hash=download['sha256'],
+                file_size=download['total_bytes'],
+                mime_type=download['mime_type']
             )
-            
-            logger.info(f"Successfully downloaded attachment {filename} for {jira_key}")
-            return file_path
-            
-        except Exception as e:
-            logger.error(f"Error downloading attachment: {e}")
-            return None
+            if previous and previous['file_hash'] != download['sha256']:
+                # The attachment was downloaded again with a different content
+                self._release_blob(previous['file_hash'])
+        logger.info(f"Successfully downloaded attachment {download['file_name']} for {download['jira_key']}")
             
     def get_local_attachments(self, jira_key: str) -> List[Dict[str, Any]]:
         """
@@ -282,26 +277,33 @@ class AttachmentService:
             True if the attachment was deleted successfully
         """
         try:
-            # Get the attachment info
-            attachment_info = self.db_service.get_file_attachment(jira_key, attachment_id)
-            if not attachment_info:
-                logger.warning(f"Attachment {attachment_id} not found in database")
-                return False
+            with self._store_lock:
+                # Get the attachment info
+                attachment_info = self.db_service.get_file_attachment(jira_key, attachment_id)
+                if not attachment_info:
+                    logger.warning(f"Attachment {attachment_id} not found in database")
+                    return False
+                    
+                # Delete the per-issue link (the blob may be shared with other issues)
+                file_path = attachment_info['file_path']
+                if file_path != self.blob_store.blob_path(attachment_info['file_hash']) and os.path.isfile(file_path):
+                    os.remove(file_path)
+                    logger.info(f"Deleted attachment file: {file_path}")
                 
-            # Delete the file
-            file_path = attachment_info['file_path']
-            if os.path.isfile(file_path):
-                os.remove(file_path)
-                logger.info(f"Deleted attachment file: {file_path}")
-            
-            # Remove from database
-            self.db_service.delete_file_attachment(jira_key, attachment_id)
+                # Remove from database
+                self.db_service.delete_file_attachment(jira_key, attachment_id)
+                self._release_blob(attachment_info['file_hash'])
             
             return True
         except Exception as e:
             logger.error(f"Error deleting attachment {attachment_id}: {e}")
             return False
             
+    def _release_blob(self, file_hash: str):
+        """Removes a blob once no attachment refers to it (call with _store_lock held)."""
+        if self.db_service.count_file_attachments_by_hash(file_hash) == 0 and self.blob_store.remove(file_hash):
+            logger.debug(f"Removed unreferenced blob {file_hash}")
+            
     def open_attachment(self, file_path: str) -> bool:
         """
         Open an attachment file with the system's default application.
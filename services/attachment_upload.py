@@ -0,0 +1,59 @@
+import os
+import shutil
+import uuid
+
+from PyQt6.QtCore import QStandardPaths
+
+
+class UploadCancelled(Exception):
+    """Raised inside an attachment upload when its cancel event is set."""
+
+
+# Timeout di lettura proporzionale alla dimensione: un upload lento ma vivo non va interrotto
+CONNECT_TIMEOUT = 10.0
+BASE_READ_TIMEOUT = 30.0
+MIN_UPLOAD_RATE = 64 * 1024  # bytes/s
+
+
+def upload_timeout(size: int) -> tuple:
+    """(connect, read) timeout for uploading `size` bytes at no less than MIN_UPLOAD_RATE."""
+    return CONNECT_TIMEOUT, BASE_READ_TIMEOUT + max(0, size) / MIN_UPLOAD_RATE
+
+
+def staging_dir() -> str:
+    data_dir = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppDataLocation)
+    path = os.path.join(data_dir, "upload_staging")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def stage_file(file_path: str, staging_root: str = None) -> dict:
+    """
+    Copies a file to be uploaded into the staging directory, so the upload
+    (and its retries) sends the content selected by the user even if the
+    original changes or is removed.
+
+    Returns the ADD_ATTACHMENT payload fields: file_path (the staged copy),
+    file_name, file_size and original_path.
+    """
+    staging_root = staging_root or staging_dir()
+    file_name = os.path.basename(file_path)
+    staged_path = os.path.join(staging_root, f"{uuid.uuid4().hex}_{file_name}")
+    shutil.copyfile(file_path, staged_path)
+    return {
+        "file_path": staged_path,
+        "file_name": file_name,
+        "file_size": os.path.getsize(staged_path),
+        "original_path": file_path,
+    }
+
+
+def discard_staged(payload: dict):
+    """Removes the staged copy of an uploaded attachment (never the user's original)."""
+    staged_path = payload.get("file_path")
+    if not staged_path or staged_path == payload.get("original_path", staged_path):
+        return
+    try:
+        os.remove(staged_path)
+    except OSError:
+        pass
@@ -0,0 +1,79 @@
+"""
+Content-addressed store of the downloaded attachments.
+
+Each distinct content is stored once, as blobs/<h[0:2]>/<h[2:4]>/<sha256>
+under the attachments directory. The per-issue path of an attachment
+(AttachmentService.get_attachment_path) is a hardlink to its blob; where
+hardlinks are not supported the attachment refers to the blob path itself.
+The references are the FileAttachments rows with the blob's hash (FileHash):
+the blob is removed with the last of them (AttachmentService.delete_attachment).
+"""
+
+import hashlib
+import os
+
+HASH_ALGORITHM = "sha256"
+
+
+def new_hasher():
+    return hashlib.new(HASH_ALGORITHM)
+
+
+def hash_file(file_path: str, hasher=None, block_size: int = 1024 * 1024):
+    """Feeds the content of a file to hasher (a new one by default) and returns it."""
+    hasher = hasher or new_hasher()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            hasher.update(block)
+    return hasher
+
+
+class BlobStore:
+    def __init__(self, root: str):
+        self.root = root
+
+    def blob_path(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest[2:4], digest)
+
+    def has_blob(self, digest: str) -> bool:
+        return os.path.isfile(self.blob_path(digest))
+
+    def ingest(self, file_path: str, digest: str) -> str:
+        """
+        Adds a downloaded file, whose content has the given digest, to the store.
+
+        If the content is already stored, the file is replaced by a link to the
+        existing blob. Returns the path the attachment must refer to: file_path
+        when it is hardlinked to the blob, otherwise the blob path (file_path is
+        then removed).
+        """
+        blob_path = self.blob_path(digest)
+        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+        if os.path.isfile(blob_path):
+            if os.path.samefile(file_path, blob_path):
+                return file_path
+            os.remove(file_path)
+            return self._link(blob_path, file_path)
+        try:
+            os.link(file_path, blob_path)
+            return file_path
+        except OSError:
+            # File system senza hardlink: il blob resta l'unica copia
+            os.replace(file_path, blob_path)
+            return blob_path
+
+    def remove(self, digest: str) -> bool:
+        """Removes a blob no longer referenced; returns whether it existed."""
+        try:
+            os.remove(self.blob_path(digest))
+            return True
+        except OSError:
+            return False
+
+    @staticmethod
+    def _link(blob_path: str, file_path: str) -> str:
+        try:
+            os.link(blob_path, file_path)
+            return file_path
+        except OSError:
+            return blob_path
@@ -70,7 +70,11 @@ class DatabaseService:
                     PriorityName TEXT,
                     UpdatedAt DATETIME DEFAULT CURRENT_TIMESTAMP,
                     SyncStatus TEXT DEFAULT 'pending',
-                    SyncedAt DATETIME
+                    SyncedAt DATETIME,
+                    Attempts INTEGER NOT NULL DEFAULT 0,
+                    NextAttemptAt DATETIME,
+                    LastError TEXT,
+                    Version INTEGER NOT NULL DEFAULT 0
                 );
             """)
             
@@ -80,6 +84,22 @@ class DatabaseService:
             except sqlite3.OperationalError:
                 print("Adding SyncedAt column to PriorityUpdates table")
                 cursor.execute("ALTER TABLE PriorityUpdates ADD COLUMN SyncedAt DATETIME")
+
+            # Add push retry columns to PriorityUpdates if not exist
+            try:
+                cursor.execute("SELECT Attempts, NextAttemptAt, LastError FROM PriorityUpdates LIMIT 1")
+            except sqlite3.OperationalError:
+                print("Adding Attempts, NextAttemptAt and LastError columns to PriorityUpdates table")
+                cursor.execute("ALTER TABLE PriorityUpdates ADD COLUMN Attempts INTEGER NOT NULL DEFAULT 0")
+                cursor.execute("ALTER TABLE PriorityUpdates ADD COLUMN NextAttemptAt DATETIME")
+                cursor.execute("ALTER TABLE PriorityUpdates ADD COLUMN LastError TEXT")
+
+            # Add Version column to PriorityUpdates if not exist
+            try:
+                cursor.execute("SELECT Version FROM PriorityUpdates LIMIT 1")
+            except sqlite3.OperationalError:
+                print("Adding Version column to PriorityUpdates table")
+                cursor.execute("ALTER TABLE PriorityUpdates ADD COLUMN Version INTEGER NOT NULL DEFAULT 0")
             
             # PriorityConfig Table for priority customizations
             cursor.execute("""
@@ -177,9 +197,32 @@ class DatabaseService:
                     Status TEXT NOT NULL DEFAULT 'Pending',
                     Attempts INTEGER NOT NULL DEFAULT 0,
                     ErrorMessage TEXT,
-                    CreatedAt DATETIME DEFAULT CURRENT_TIMESTAMP
+                    CreatedAt DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    IdempotencyKey TEXT,
+                    NextAttemptAt DATETIME,
+                    LastErrorClass TEXT
                 );
             """)
+
+            # Add IdempotencyKey column to SyncQueue if not exists
+            try:
+                cursor.execute("SELECT IdempotencyKey FROM SyncQueue LIMIT 1")
+            except sqlite3.OperationalError:
+                print("Adding IdempotencyKey column to SyncQueue table")
+                cursor.execute("ALTER TABLE SyncQueue ADD COLUMN IdempotencyKey TEXT")
+
+            # Add retry scheduling columns to SyncQueue if not exist
+            try:
+                cursor.execute("SELECT NextAttemptAt, LastErrorClass FROM SyncQueue LIMIT 1")
+            except sqlite3.OperationalError:
+                print("Adding NextAttemptAt and LastErrorClass columns to SyncQueue table")
+                cursor.execute("ALTER TABLE SyncQueue ADD COLUMN NextAttemptAt DATETIME")
+                cursor.execute("ALTER TABLE SyncQueue ADD COLUMN LastErrorClass TEXT")
+                cursor.execute("UPDATE SyncQueue SET NextAttemptAt = COALESCE(CreatedAt, datetime('now'))")
+            # The scheduler picks the due operations through this index
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_syncqueue_due ON SyncQueue (Status, NextAttemptAt)"
+            )
             # LocalTimeLog Table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS LocalTimeLog (
@@ -215,6 +258,13 @@ class DatabaseService:
             except sqlite3.OperationalError:
                 print("Adding Task column to LocalWorklogHistory table")
                 cursor.execute("ALTER TABLE LocalWorklogHistory ADD COLUMN Task TEXT DEFAULT 'compito'")
+
+            # Add MergedIntoId column to LocalWorklogHistory if not exists (worklog coalescing)
+            try:
+                cursor.execute("SELECT MergedIntoId FROM LocalWorklogHistory LIMIT 1")
+            except sqlite3.OperationalError:
+                print("Adding MergedIntoId column to LocalWorklogHistory table")
+                cursor.execute("ALTER TABLE LocalWorklogHistory ADD COLUMN MergedIntoId INTEGER")
             
             # ViewHistory Table
             cursor.execute("""
@@ -285,9 +335,22 @@ class DatabaseService:
                     LastCheckedTimestamp DATETIME NOT NULL,
                     LastKnownCommentId TEXT,
                     last_comment_date TEXT,
-                    is_read INTEGER DEFAULT 1
+                    is_read INTEGER DEFAULT 1,
+                    NextCheckAt TEXT,
+                    PollIntervalSeconds INTEGER
                 );
             """)
+
+            # Scheduling columns for adaptive notification polling
+            try:
+                cursor.execute("SELECT NextCheckAt, PollIntervalSeconds FROM NotificationSubscriptions LIMIT 1")
+            except sqlite3.OperationalError:
+                print("Adding scheduling columns to NotificationSubscriptions table")
+                for column in ("NextCheckAt TEXT", "PollIntervalSeconds INTEGER"):
+                    try:
+                        cursor.execute(f"ALTER TABLE NotificationSubscriptions ADD COLUMN {column}")
+                    except sqlite3.OperationalError:
+                        pass  # Column already exists
             
             # FileAttachments Table - Tracks downloaded files
             cursor.execute("""
@@ -305,7 +368,48 @@ class DatabaseService:
                     UNIQUE(JiraKey, AttachmentId)
                 );
             """)
+            # FileHash identifica il blob del contenuto: le righe con lo stesso hash ne sono i riferimenti
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_fileattachments_hash ON FileAttachments (FileHash)"
+            )
             
+            # DownloadQueue Table - Download di allegati, ripresi dopo un riavvio.
+            # Il file parziale (<TargetPath>.part) è la fonte di verità dei byte ricevuti;
+            # BytesDone è solo informativo. Kind: 'attachment' (archivio locale),
+            # 'file' (salvataggio scelto dall'utente), 'preview' (miniature, non riprese).
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS DownloadQueue (
+                    Id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    Kind TEXT NOT NULL DEFAULT 'file',
+                    JiraKey TEXT,
+                    AttachmentId TEXT NOT NULL,
+                    FileName TEXT NOT NULL,
+                    TargetPath TEXT NOT NULL,
+                    Url TEXT,
+                    TotalBytes INTEGER,
+                    BytesDone INTEGER NOT NULL DEFAULT 0,
+                    MimeType TEXT,
+                    Status TEXT NOT NULL DEFAULT 'Pending',
+                    Attempts INTEGER NOT NULL DEFAULT 0,
+                    ErrorMessage TEXT,
+                    CreatedAt DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+                );
+            """)
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_downloadqueue_status ON DownloadQueue (Status)"
+            )
+
+            # Thumbnails Table - Indice della cache su disco delle miniature degli allegati
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS Thumbnails (
+                    AttachmentId TEXT NOT NULL,
+                    Size INTEGER NOT NULL,
+                    FilePath TEXT NOT NULL,
+                    CreatedAt DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (AttachmentId, Size)
+                );
+            """)
+
             # Issue tracking state table for change detection
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS IssueTrackingState (
@@ -316,6 +420,36 @@ class DatabaseService:
                 );
             """)
             
+            # FictitiousTickets Table - Registro persistente dei ticket inesistenti su Jira
+            # (404 o marcati a mano), per evitare round trip ripetuti ad ogni avvio.
+            # RecheckAfter NULL = nessuna scadenza (es. marcatura manuale).
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS FictitiousTickets (
+                    JiraKey TEXT PRIMARY KEY NOT NULL,
+                    Reason TEXT NOT NULL,
+                    MarkedAt DATETIME NOT NULL,
+                    RecheckAfter DATETIME
+                );
+            """)
+            
+            # JiraMetadataCache Table - Liste di metadati Jira (priorità, stati, tipi) in JSON
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS JiraMetadataCache (
+                    Kind TEXT PRIMARY KEY NOT NULL,
+                    Payload TEXT NOT NULL,
+                    FetchedAt DATETIME NOT NULL
+                );
+            """)
+
+            # GridSnapshot Table - Ultima griglia mostrata (una sola riga), ridisegnata all'avvio
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS GridSnapshot (
+                    Id INTEGER PRIMARY KEY CHECK (Id = 1),
+                    Payload TEXT NOT NULL,
+                    SavedAt DATETIME NOT NULL
+                );
+            """)
+            
             conn.commit()
             print("Database initialized successfully.")
         except sqlite3.Error as e:
@@ -980,13 +1114,18 @@ class DatabaseService:
 
     # --- Sync Queue Methods ---
     def add_to_sync_queue(self, operation_type: str, payload: str):
-        """Adds a new operation to the synchronization queue."""
+        """
+        Adds a new operation to the synchronization queue, with the idempotency
+        key used to recognize it on the server if it has to be sent again.
+        """
+        from services.idempotency import operation_key
         conn = self.get_connection()
         try:
             cursor = conn.cursor()
             cursor.execute(
-                'INSERT INTO SyncQueue (OperationType, Payload) VALUES (?, ?)',
-                (operation_type, payload)
+                'INSERT INTO SyncQueue (OperationType, Payload, IdempotencyKey, NextAttemptAt) '
+                "VALUES (?, ?, ?, datetime('now'))",
+                (operation_type, payload, operation_key(operation_type, payload))
             )
             conn.commit()
         finally:
@@ -1008,12 +1147,16 @@ class DatabaseService:
             conn.close()
     
     def get_local_worklogs(self, jira_key: str) -> list:
-        """Gets all local worklog entries for a specific Jira issue."""
+        """
+        Gets all local worklog entries for a specific Jira issue. Entries merged
+        into another one by the worklog coalescing are not returned.
+        """
         conn = self.get_connection()
         try:
             cursor = conn.cursor()
             cursor.execute(
-                'SELECT Id, StartTime, DurationSeconds, Comment, SyncStatus, Task FROM LocalWorklogHistory WHERE JiraKey = ? ORDER BY StartTime DESC',
+                'SELECT Id, StartTime, DurationSeconds, Comment, SyncStatus, Task FROM LocalWorklogHistory '
+                'WHERE JiraKey = ? AND MergedIntoId IS NULL ORDER BY StartTime DESC',
                 (jira_key,)
             )
             return cursor.fetchall()
@@ -1039,6 +1182,19 @@ class DatabaseService:
         finally:
             conn.close()
     
+    def update_local_worklogs_sync_status(self, worklog_ids: list, status: str):
+        """Updates the sync status of several worklog entries (and of the entries merged into them)."""
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.executemany(
+                'UPDATE LocalWorklogHistory SET SyncStatus = ? WHERE Id = ? OR MergedIntoId = ?',
+                [(status, worklog_id, worklog_id) for worklog_id in worklog_ids]
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
     def update_worklog_comment(self, worklog_id: int, comment: str):
         """Updates the comment of a worklog entry."""
         conn = self.get_connection()
@@ -1403,7 +1559,10 @@ class DatabaseService:
                 except sqlite3.OperationalError:
                     pass
                 
-            cursor.execute('SELECT JiraKey, last_comment_date, is_read FROM NotificationSubscriptions')
+            cursor.execute(
+                'SELECT JiraKey, last_comment_date, is_read, LastCheckedTimestamp, NextCheckAt, PollIntervalSeconds '
+                'FROM NotificationSubscriptions'
+            )
             results = cursor.fetchall()
             
             # Convert to list of dictionaries for easier access
@@ -1412,7 +1571,10 @@ class DatabaseService:
                 subscriptions.append({
                     'issue_key': row[0],
                     'last_comment_date': row[1],
-                    'is_read': bool(row[2])
+                    'is_read': bool(row[2]),
+                    'last_checked': row[3],
+                    'next_check_at': row[4],
+                    'poll_interval': row[5]
                 })
             return subscriptions
         finally:
@@ -1467,6 +1629,31 @@ class DatabaseService:
         finally:
             conn.close()
     
+    def apply_notification_check(self, schedule: dict, new_comment_dates: dict, checked_at: str):
+        """
+        Records the outcome of a notification polling cycle in one transaction.
+
+        Args:
+            schedule: checked key -> (next_check_at, poll_interval_seconds)
+            new_comment_dates: key -> newest comment date, for the issues with new comments
+            checked_at: UTC ISO timestamp of the cycle, stored as LastCheckedTimestamp
+        """
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.executemany(
+                'UPDATE NotificationSubscriptions '
+                'SET LastCheckedTimestamp = ?, NextCheckAt = ?, PollIntervalSeconds = ? WHERE JiraKey = ?',
+                [(checked_at, next_check_at, interval, key) for key, (next_check_at, interval) in schedule.items()]
+            )
+            cursor.executemany(
+                'UPDATE NotificationSubscriptions SET last_comment_date = ?, is_read = 0 WHERE JiraKey = ?',
+                [(comment_date, key) for key, comment_date in new_comment_dates.items()]
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
     def get_unread_notifications_count(self) -> int:
         """Gets the count of unread notifications."""
         conn = self.get_connection()
@@ -1500,38 +1687,228 @@ class DatabaseService:
     
     # --- Sync Queue Additional Methods ---
     def get_pending_sync_operations(self) -> list:
-        """Gets all pending sync operations."""
+        """
+        Gets all pending sync operations
+        (Id, OperationType, Payload, Attempts, NextAttemptAt, LastErrorClass).
+        """
         conn = self.get_connection()
         try:
             cursor = conn.cursor()
             cursor.execute(
-                'SELECT Id, OperationType, Payload, Attempts FROM SyncQueue WHERE Status = "Pending" ORDER BY CreatedAt'
+                'SELECT Id, OperationType, Payload, Attempts, NextAttemptAt, LastErrorClass '
+                'FROM SyncQueue WHERE Status = "Pending" ORDER BY CreatedAt'
             )
             return cursor.fetchall()
         finally:
             conn.close()
     
     def get_failed_sync_operations(self) -> list:
-        """Gets all failed sync operations."""
+        """
+        Gets all failed sync operations
+        (Id, OperationType, Payload, Attempts, ErrorMessage, LastErrorClass).
+        """
         conn = self.get_connection()
         try:
             cursor = conn.cursor()
             cursor.execute(
-                'SELECT Id, OperationType, Payload, Attempts, ErrorMessage FROM SyncQueue WHERE Status = "Failed" ORDER BY CreatedAt'
+                'SELECT Id, OperationType, Payload, Attempts, ErrorMessage, LastErrorClass '
+                'FROM SyncQueue WHERE Status = "Failed" ORDER BY CreatedAt'
             )
             return cursor.fetchall()
         finally:
             conn.close()
+
+    def get_sync_operation(self, operation_id: int):
+        """Gets one sync operation (Id, OperationType, Payload, Status), or None."""
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute('SELECT Id, OperationType, Payload, Status FROM SyncQueue WHERE Id = ?', (operation_id,))
+            return cursor.fetchone()
+        finally:
+            conn.close()
+
+    def has_due_sync_operations(self) -> bool:
+        """True if some pending operation has reached its NextAttemptAt."""
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                'SELECT 1 FROM SyncQueue WHERE Status = "Pending" AND NextAttemptAt <= datetime(\'now\') LIMIT 1'
+            )
+            return cursor.fetchone() is not None
+        finally:
+            conn.close()
     
-    def update_sync_operation_status(self, operation_id: int, status: str, error_message: str = None):
+    def claim_sync_operations(self, limit: int | None = None) -> list:
+        """
+        Atomically moves the due pending operations (NextAttemptAt reached) to
+        "Processing" and returns them (Id, OperationType, Payload, Attempts,
+        IdempotencyKey), oldest first.
+        Two sync runs can never claim the same operation.
+        Attempts is returned as it was before the claim, then incremented: an
+        operation claimed with Attempts > 0 may already have reached Jira.
+        """
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            # BEGIN IMMEDIATE prende subito il lock in scrittura: select e update sono atomici
+            cursor.execute('BEGIN IMMEDIATE')
+            query = ('SELECT Id, OperationType, Payload, Attempts, IdempotencyKey FROM SyncQueue '
+                     'WHERE Status = "Pending" AND NextAttemptAt <= datetime(\'now\') ORDER BY Id')
+            params = ()
+            if limit is not None:
+                query += ' LIMIT ?'
+                params = (limit,)
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+            cursor.executemany(
+                'UPDATE SyncQueue SET Status = "Processing", Attempts = Attempts + 1 WHERE Id = ?',
+                [(row[0],) for row in rows]
+            )
+            conn.commit()
+            return rows
+        finally:
+            conn.close()
+
+    def release_sync_operations(self, operation_ids: list, next_attempt_at: str = None):
+        """
+        Returns claimed operations that were not attempted to "Pending",
+        optionally not before next_attempt_at (UTC, 'YYYY-MM-DD HH:MM:SS').
+        """
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.executemany(
+                'UPDATE SyncQueue SET Status = "Pending", Attempts = MAX(Attempts - 1, 0), '
+                'NextAttemptAt = COALESCE(?, NextAttemptAt) '
+                'WHERE Id = ? AND Status = "Processing"',
+                [(next_attempt_at, operation_id) for operation_id in operation_ids]
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def reschedule_sync_operation(self, operation_id: int, next_attempt_at: str, error_message: str, error_class: str):
+        """Puts a failed operation back in the queue, to be retried at next_attempt_at (UTC)."""
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                'UPDATE SyncQueue SET Status = "Pending", NextAttemptAt = ?, ErrorMessage = ?, LastErrorClass = ? '
+                'WHERE Id = ?',
+                (next_attempt_at, error_message, error_class, operation_id)
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def requeue_sync_operations(self, operation_ids: list = None) -> int:
+        """
+        Manual retry: puts the given failed operations (all of them if None)
+        back in the queue, due now. Attempts is kept, so each of them gets one
+        more attempt before the automatic retry limit stops it again.
+        """
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            query = 'UPDATE SyncQueue SET Status = "Pending", NextAttemptAt = datetime(\'now\') WHERE Status = "Failed"'
+            if operation_ids is None:
+                cursor.execute(query)
+                count = cursor.rowcount
+            else:
+                cursor.executemany(query + ' AND Id = ?', [(operation_id,) for operation_id in operation_ids])
+                count = cursor.rowcount
+            conn.commit()
+            return count
+        finally:
+            conn.close()
+
+    def get_coalescible_worklog_operations(self) -> list:
+        """Pending worklogs never sent (Id, Payload, NextAttemptAt), oldest first."""
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                'SELECT Id, Payload, NextAttemptAt FROM SyncQueue '
+                'WHERE Status = "Pending" AND Attempts = 0 AND OperationType = "ADD_WORKLOG" ORDER BY Id'
+            )
+            return cursor.fetchall()
+        finally:
+            conn.close()
+
+    def apply_worklog_merges(self, merges: list) -> int:
+        """
+        Applies the merges planned by services.worklog_coalescer in one
+        transaction. A merge is skipped if one of its operations has been
+        claimed in the meantime. Returns the number of operations merged away.
+        """
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute('BEGIN IMMEDIATE')
+            merged = 0
+            for merge in merges:
+                operation_ids = [merge['survivor_id']] + merge['merged_ids']
+                placeholders = ','.join('?' * len(operation_ids))
+                cursor.execute(
+                    f'SELECT COUNT(*) FROM SyncQueue WHERE Id IN ({placeholders}) AND Status = "Pending" AND Attempts = 0',
+                    operation_ids
+                )
+                if cursor.fetchone()[0] != len(operation_ids):
+                    continue
+                cursor.execute(
+                    'UPDATE SyncQueue SET Payload = ?, IdempotencyKey = ?, '
+                    'NextAttemptAt = COALESCE(?, NextAttemptAt) WHERE Id = ?',
+                    (merge['payload'], merge['idempotency_key'], merge['next_attempt_at'], merge['survivor_id'])
+                )
+                cursor.executemany(
+                    'UPDATE SyncQueue SET Status = "Merged", ErrorMessage = ? WHERE Id = ?',
+                    [(f"Merged into operation {merge['survivor_id']}", operation_id) for operation_id in merge['merged_ids']]
+                )
+                if merge['local_survivor_id'] is not None:
+                    cursor.execute(
+                        'UPDATE LocalWorklogHistory SET DurationSeconds = ?, StartTime = ? WHERE Id = ?',
+                        (merge['local_duration'], merge['local_start_time'], merge['local_survivor_id'])
+                    )
+                    cursor.executemany(
+                        'UPDATE LocalWorklogHistory SET MergedIntoId = ? WHERE Id = ?',
+                        [(merge['local_survivor_id'], local_id) for local_id in merge['local_merged_ids']]
+                    )
+                merged += len(merge['merged_ids'])
+            conn.commit()
+            return merged
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def reset_interrupted_sync_operations(self) -> int:
+        """
+        Returns to "Pending" the operations left in "Processing" by a run that
+        did not end (e.g. the app was closed or crashed). Call it before a new run.
+        """
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute('UPDATE SyncQueue SET Status = "Pending" WHERE Status = "Processing"')
+            conn.commit()
+            return cursor.rowcount
+        finally:
+            conn.close()
+
+    def update_sync_operation_status(self, operation_id: int, status: str, error_message: str = None,
+                                     error_class: str = None):
         """Updates the status of a sync operation."""
         conn = self.get_connection()
         try:
             cursor = conn.cursor()
             if status == "Failed" and error_message:
+                # Attempts is counted when the operation is claimed (claim_sync_operations)
                 cursor.execute(
-                    'UPDATE SyncQueue SET Status = ?, ErrorMessage = ?, Attempts = Attempts + 1 WHERE Id = ?',
-                    (status, error_message, operation_id)
+                    'UPDATE SyncQueue SET Status = ?, ErrorMessage = ?, LastErrorClass = ? WHERE Id = ?',
+                    (status, error_message, error_class, operation_id)
                 )
             else:
                 cursor.execute(
@@ -1644,6 +2021,16 @@ class DatabaseService:
         finally:
             conn.close()
     
+    def count_file_attachments_by_hash(self, file_hash: str) -> int:
+        """Number of file attachments stored with the given content hash (references to its blob)."""
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute('SELECT COUNT(*) FROM FileAttachments WHERE FileHash = ?', (file_hash,))
+            return cursor.fetchone()[0]
+        finally:
+            conn.close()
+    
     def update_attachment_last_checked(self, jira_key: str, attachment_id: str):
         """Updates the last checked timestamp for an attachment."""
         conn = self.get_connection()
@@ -1676,6 +2063,164 @@ class DatabaseService:
         finally:
             conn.close()
             
+    # --- Thumbnail Cache Methods ---
+    def get_thumbnail(self, attachment_id: str, size: int):
+        """Returns the file path of the cached thumbnail of an attachment, or None."""
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                'SELECT FilePath FROM Thumbnails WHERE AttachmentId = ? AND Size = ?',
+                (str(attachment_id), size)
+            )
+            row = cursor.fetchone()
+            return row[0] if row else None
+        finally:
+            conn.close()
+
+    def save_thumbnail(self, attachment_id: str, size: int, file_path: str):
+        """Adds or replaces the cached thumbnail of an attachment."""
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                'INSERT OR REPLACE INTO Thumbnails (AttachmentId, Size, FilePath) VALUES (?, ?, ?)',
+                (str(attachment_id), size, file_path)
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    # --- Download Queue Methods ---
+    def enqueue_download(self, kind: str, jira_key: str, attachment_id: str, file_name: str,
+                         target_path: str, total_bytes: int = None, url: str = None,
+                         mime_type: str = None) -> int:
+        """
+        Queues the download of an attachment to target_path and returns its id.
+        A download of the same attachment to the same path that is not finished
+        (pending, running, failed or cancelled) is put back to "Pending" and
+        reused, so its partial file is resumed instead of started over.
+        """
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute('BEGIN IMMEDIATE')
+            cursor.execute(
+                'SELECT Id FROM DownloadQueue WHERE AttachmentId = ? AND TargetPath = ? ORDER BY Id LIMIT 1',
+                (str(attachment_id), target_path)
+            )
+            row = cursor.fetchone()
+            if row:
+                download_id = row[0]
+                cursor.execute(
+                    'UPDATE DownloadQueue SET Status = CASE Status WHEN "Running" THEN Status ELSE "Pending" END, '
+                    'Kind = ?, ErrorMessage = NULL, '
+                    'TotalBytes = COALESCE(?, TotalBytes), Url = COALESCE(?, Url), '
+                    'MimeType = COALESCE(?, MimeType) WHERE Id = ?',
+                    (kind, total_bytes, url, mime_type, download_id)
+                )
+            else:
+                cursor.execute(
+                    'INSERT INTO DownloadQueue (Kind, JiraKey, AttachmentId, FileName, TargetPath, Url, '
+                    'TotalBytes, MimeType) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                    (kind, jira_key, str(attachment_id), file_name, target_path, url, total_bytes, mime_type)
+                )
+                download_id = cursor.lastrowid
+            conn.commit()
+            return download_id
+        finally:
+            conn.close()
+
+    def get_download(self, download_id: int):
+        """Returns a download of the queue as a dictionary, or None."""
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                'SELECT Id, Kind, JiraKey, AttachmentId, FileName, TargetPath, Url, TotalBytes, BytesDone, '
+                'MimeType, Status, Attempts, ErrorMessage FROM DownloadQueue WHERE Id = ?',
+                (download_id,)
+            )
+            row = cursor.fetchone()
+            if not row:
+                return None
+            return {
+                'id': row[0],
+                'kind': row[1],
+                'jira_key': row[2],
+                'attachment_id': row[3],
+                'file_name': row[4],
+                'target_path': row[5],
+                'url': row[6],
+                'total_bytes': row[7],
+                'bytes_done': row[8],
+                'mime_type': row[9],
+                'status': row[10],
+                'attempts': row[11],
+                'error_message': row[12],
+            }
+        finally:
+            conn.close()
+
+    def get_unfinished_downloads(self, kinds: tuple = None) -> list:
+        """
+        Ids of the downloads interrupted by a shutdown ("Pending" or "Running"),
+        oldest first, optionally only of the given kinds.
+        """
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            query = 'SELECT Id FROM DownloadQueue WHERE Status IN ("Pending", "Running")'
+            params = []
+            if kinds:
+                query += f' AND Kind IN ({",".join("?" * len(kinds))})'
+                params.extend(kinds)
+            cursor.execute(query + ' ORDER BY Id', params)
+            return [row[0] for row in cursor.fetchall()]
+        finally:
+            conn.close()
+
+    def start_download(self, download_id: int) -> bool:
+        """Marks a pending download as "Running"; False if it is no longer pending (e.g. cancelled)."""
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                'UPDATE DownloadQueue SET Status = "Running", Attempts = Attempts + 1 '
+                'WHERE Id = ? AND Status = "Pending"',
+                (download_id,)
+            )
+            conn.commit()
+            return cursor.rowcount == 1
+        finally:
+            conn.close()
+
+    def update_download(self, download_id: int, status: str = None, bytes_done: int = None,
+                        total_bytes: int = None, url: str = None, error_message: str = None):
+        """Updates the given fields of a download (None leaves a field unchanged)."""
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                'UPDATE DownloadQueue SET Status = COALESCE(?, Status), BytesDone = COALESCE(?, BytesDone), '
+                'TotalBytes = COALESCE(?, TotalBytes), Url = COALESCE(?, Url), '
+                'ErrorMessage = COALESCE(?, ErrorMessage) WHERE Id = ?',
+                (status, bytes_done, total_bytes, url, error_message, download_id)
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def delete_downloads(self, download_ids: list):
+        """Removes finished or abandoned downloads from the queue."""
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.executemany('DELETE FROM DownloadQueue WHERE Id = ?', [(i,) for i in download_ids])
+            conn.commit()
+        finally:
+            conn.close()
+
     # --- Jira Issue Cache Methods ---
     
     def save_jira_issue(self, jira_key: str, summary: str = None, status: str = None, priority: str = None):
@@ -1731,6 +2276,30 @@ class DatabaseService:
         finally:
             conn.close()
             
+    def save_jira_issues(self, issues: list):
+        """
+        Saves or updates the cached details of many issues in one transaction.
+        `issues` is a list of (jira_key, summary, status, priority).
+        """
+        if not issues:
+            return
+        from datetime import datetime, timezone
+        current_time = datetime.now(timezone.utc).isoformat()
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.executemany(
+                "UPDATE JiraIssueCache SET Summary = ?, Status = ?, Priority = ?, UpdatedAt = ? WHERE JiraKey = ?",
+                [(summary, status, priority, current_time, jira_key) for jira_key, summary, status, priority in issues]
+            )
+            cursor.executemany("""
+                INSERT OR IGNORE INTO JiraIssueCache (JiraKey, Summary, Status, Priority, UpdatedAt)
+                VALUES (?, ?, ?, ?, ?)
+            """, [(jira_key, summary, status, priority, current_time) for jira_key, summary, status, priority in issues])
+            conn.commit()
+        finally:
+            conn.close()
+            
     def get_jira_issue(self, jira_key: str) -> dict:
         """Gets the cached details for a Jira issue."""
         conn = self.get_connection()
@@ -1830,7 +2399,11 @@ class DatabaseService:
             conn.close()
             
     def store_priority_update(self, jira_key: str, priority_id: str, priority_name: str = None) -> bool:
-        """Store a priority update for later syncing with Jira."""
+        """
+        Store a priority update for later syncing with Jira.
+        Every edit gets a Version higher than any stored one, so a push result
+        can tell the row it read from a later edit (see record_priority_update_results).
+        """
         conn = self.get_connection()
         if conn is None:
             return False
@@ -1839,8 +2412,9 @@ class DatabaseService:
             cursor = conn.cursor()
             cursor.execute("""
                 INSERT OR REPLACE INTO PriorityUpdates
-                (JiraKey, PriorityId, PriorityName, UpdatedAt, SyncStatus)
-                VALUES (?, ?, ?, datetime('now'), 'pending')
+                (JiraKey, PriorityId, PriorityName, UpdatedAt, SyncStatus, Version)
+                VALUES (?, ?, ?, datetime('now'), 'pending',
+                        (SELECT COALESCE(MAX(Version), 0) + 1 FROM PriorityUpdates))
             """, (jira_key, priority_id, priority_name))
             conn.commit()
             return True
@@ -1879,6 +2453,22 @@ class DatabaseService:
         finally:
             conn.close()
     
+    def get_local_priorities(self) -> dict:
+        """Names of all the local priority overrides, by Jira key (see get_local_priority)."""
+        conn = self.get_connection()
+        if conn is None:
+            return {}
+        
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT JiraKey, PriorityId, PriorityName FROM PriorityUpdates")
+            return {row[0]: row[2] if row[2] else row[1] for row in cursor.fetchall()}
+        except sqlite3.Error as e:
+            print(f"Database error getting local priorities: {e}")
+            return {}
+        finally:
+            conn.close()
+    
     def set_local_priority(self, jira_key: str, priority_id: str, priority_name: str) -> bool:
         """Set a local priority override for a Jira issue."""
         return self.store_priority_update(jira_key, priority_id, priority_name)
@@ -1912,7 +2502,7 @@ class DatabaseService:
         try:
             cursor = conn.cursor()
             cursor.execute("""
-                SELECT JiraKey, PriorityId, PriorityName, UpdatedAt
+                SELECT JiraKey, PriorityId, PriorityName, UpdatedAt, Attempts, NextAttemptAt, Version
                 FROM PriorityUpdates
                 WHERE SyncStatus = 'pending'
                 ORDER BY UpdatedAt ASC
@@ -1924,7 +2514,10 @@ class DatabaseService:
                     'jira_key': row[0],
                     'priority_id': row[1],
                     'priority_name': row[2],
-                    'updated_at': row[3]
+                    'updated_at': row[3],
+                    'attempts': row[4],
+                    'next_attempt_at': row[5],
+                    'version': row[6]
                 }
                 for row in results
             ]
@@ -1934,6 +2527,62 @@ class DatabaseService:
         finally:
             conn.close()
     
+    def has_pending_priority_updates(self) -> bool:
+        """True if some priority update is waiting to be pushed and due."""
+        conn = self.get_connection()
+        if conn is None:
+            return False
+        try:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT 1 FROM PriorityUpdates
+                WHERE SyncStatus = 'pending' AND (NextAttemptAt IS NULL OR NextAttemptAt <= datetime('now'))
+                LIMIT 1
+            """)
+            return cursor.fetchone() is not None
+        except sqlite3.Error as e:
+            print(f"Database error checking priority updates: {e}")
+            return False
+        finally:
+            conn.close()
+
+    def record_priority_update_results(self, results: list) -> bool:
+        """
+        Records the outcome of a batch of priority pushes in one transaction.
+        Each result is a dict with jira_key, priority_id, version, status
+        ('synced', 'failed' or 'pending' to retry), error (None if the push
+        was not attempted) and next_attempt_at.
+        A row edited again after it was read (a new Version) is left untouched.
+        """
+        conn = self.get_connection()
+        if conn is None:
+            return False
+        try:
+            cursor = conn.cursor()
+            for result in results:
+                match = (result['jira_key'], result['priority_id'], result['version'])
+                if result['status'] == 'synced':
+                    cursor.execute("""
+                        UPDATE PriorityUpdates
+                        SET SyncStatus = 'synced', SyncedAt = datetime('now'), Attempts = Attempts + 1, LastError = NULL
+                        WHERE JiraKey = ? AND PriorityId = ? AND Version = ?
+                    """, match)
+                else:
+                    cursor.execute("""
+                        UPDATE PriorityUpdates
+                        SET SyncStatus = ?, Attempts = Attempts + ?, NextAttemptAt = ?, LastError = COALESCE(?, LastError)
+                        WHERE JiraKey = ? AND PriorityId = ? AND Version = ?
+                    """, (result['status'], 1 if result.get('error') else 0, result.get('next_attempt_at'),
+                          result.get('error')) + match)
+            conn.commit()
+            return True
+        except sqlite3.Error as e:
+            conn.rollback()
+            print(f"Database error recording priority update results: {e}")
+            return False
+        finally:
+            conn.close()
+
     def mark_priority_update_synced(self, jira_key: str) -> bool:
         """Mark a priority update as synced."""
         conn = self.get_connection()
@@ -1955,6 +2604,147 @@ class DatabaseService:
         finally:
             conn.close()
     
+    # --- Jira Metadata Cache Methods ---
+
+    def get_metadata_cache(self, kind: str):
+        """Returns (items, fetched_at_iso) for a metadata kind, or None if never cached."""
+        conn = self.get_connection()
+        if conn is None:
+            return None
+        try:
+            import json
+            cursor = conn.cursor()
+            cursor.execute("SELECT Payload, FetchedAt FROM JiraMetadataCache WHERE Kind = ?", (kind,))
+            row = cursor.fetchone()
+            if not row:
+                return None
+            return json.loads(row[0]), row[1]
+        except (sqlite3.Error, ValueError) as e:
+            print(f"Database error loading metadata cache '{kind}': {e}")
+            return None
+        finally:
+            conn.close()
+
+    def save_metadata_cache(self, kind: str, items: list) -> bool:
+        """Stores the list for a metadata kind with the current UTC timestamp."""
+        conn = self.get_connection()
+        if conn is None:
+            return False
+        try:
+            import json
+            from datetime import timezone
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT OR REPLACE INTO JiraMetadataCache (Kind, Payload, FetchedAt)
+                VALUES (?, ?, ?)
+            """, (kind, json.dumps(items), datetime.now(timezone.utc).isoformat()))
+            conn.commit()
+            return True
+        except sqlite3.Error as e:
+            print(f"Database error saving metadata cache '{kind}': {e}")
+            return False
+        finally:
+            conn.close()
+
+    # --- Grid Snapshot Methods ---
+
+    def get_grid_snapshot(self) -> dict | None:
+        """Returns the snapshot of the grid saved at the end of the last session, or None."""
+        conn = self.get_connection()
+        if conn is None:
+            return None
+        try:
+            import json
+            cursor = conn.cursor()
+            cursor.execute("SELECT Payload FROM GridSnapshot WHERE Id = 1")
+            row = cursor.fetchone()
+            return json.loads(row[0]) if row else None
+        except (sqlite3.Error, ValueError) as e:
+            print(f"Database error loading grid snapshot: {e}")
+            return None
+        finally:
+            conn.close()
+
+    def save_grid_snapshot(self, snapshot: dict) -> bool:
+        """Replaces the saved snapshot of the grid."""
+        conn = self.get_connection()
+        if conn is None:
+            return False
+        try:
+            import json
+            from datetime import timezone
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT OR REPLACE INTO GridSnapshot (Id, Payload, SavedAt)
+                VALUES (1, ?, ?)
+            """, (json.dumps(snapshot, separators=(',', ':')), datetime.now(timezone.utc).isoformat()))
+            conn.commit()
+            return True
+        except sqlite3.Error as e:
+            print(f"Database error saving grid snapshot: {e}")
+            return False
+        finally:
+            conn.close()
+
+    # --- Fictitious Ticket Registry Methods ---
+
+    def get_fictitious_tickets(self) -> dict:
+        """
+        Returns the persisted fictitious tickets as a dict
+        JiraKey -> {'reason', 'marked_at', 'recheck_after'} (recheck_after may be None).
+        """
+        conn = self.get_connection()
+        if conn is None:
+            return {}
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT JiraKey, Reason, MarkedAt, RecheckAfter FROM FictitiousTickets")
+            return {
+                row[0]: {'reason': row[1], 'marked_at': row[2], 'recheck_after': row[3]}
+                for row in cursor.fetchall()
+            }
+        except sqlite3.Error as e:
+            print(f"Database error loading fictitious tickets: {e}")
+            return {}
+        finally:
+            conn.close()
+
+    def save_fictitious_ticket(self, jira_key: str, reason: str, recheck_after: str | None = None) -> bool:
+        """Inserts or refreshes a fictitious ticket entry (timestamps in UTC ISO format)."""
+        conn = self.get_connection()
+        if conn is None:
+            return False
+        try:
+            from datetime import timezone
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT OR REPLACE INTO FictitiousTickets (JiraKey, Reason, MarkedAt, RecheckAfter)
+                VALUES (?, ?, ?, ?)
+            """, (jira_key, reason, datetime.now(timezone.utc).isoformat(), recheck_after))
+            conn.commit()
+            return True
+        except sqlite3.Error as e:
+            print(f"Database error saving fictitious ticket: {e}")
+            return False
+        finally:
+            conn.close()
+
+    def delete_fictitious_ticket(self, jira_key: str) -> bool:
+        """Removes a ticket from the fictitious registry."""
+        conn = self.get_connection()
+        if conn is None:
+            return False
+        try:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM FictitiousTickets WHERE JiraKey = ?", (jira_key,))
+            conn.commit()
+            return True
+        except sqlite3.Error as e:
+            print(f"Database error deleting fictitious ticket: {e}")
+            return False
+        finally:
+            conn.close()
+
     # --- Issue Change Tracking ---
     # Note: Issue change tracking is now handled by GitTrackingService
     # The IssueTrackingState table is kept for compatibility but not actively used
@@ -0,0 +1,282 @@
+"""
+Central download manager for Jira attachments.
+
+Every attachment download goes through a DownloadManager:
+  * downloads run on a bounded pool of worker threads
+  * the queue is persisted in the DownloadQueue table, so downloads
+    interrupted by a shutdown are resumed at the next start
+    (resume_pending); previews are not resumed
+  * a download writes to "<target>.part" and resumes it with an HTTP Range
+    request after an interruption, a cancel or a restart
+  * the chunk size adapts to the connection speed (next_chunk_size)
+  * progress is reported per download (item_progress) and for all the
+    downloads in progress (aggregate_progress)
+"""
+
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from services.sync_backoff import NETWORK, RATE_LIMIT, SERVER, classify_error
+
+logger = logging.getLogger('JiraTimeTracker')
+
+
+class DownloadCancelled(Exception):
+    """Raised inside an attachment download when its cancel event is set."""
+
+
+# Kind of a download (colonna Kind della DownloadQueue)
+KIND_ATTACHMENT = "attachment"  # archivio locale degli allegati (FileAttachments)
+KIND_FILE = "file"              # file salvato dove ha scelto l'utente
+KIND_PREVIEW = "preview"        # immagine per le miniature: non ripresa dopo un riavvio
+
+CONNECT_TIMEOUT = 10.0
+READ_TIMEOUT = 60.0  # per ogni lettura, non per l'intero download
+
+MIN_CHUNK_SIZE = 64 * 1024
+MAX_CHUNK_SIZE = 1024 * 1024
+# A chunk read faster than FAST_CHUNK_SECONDS doubles the next one, slower than SLOW_CHUNK_SECONDS halves it
+FAST_CHUNK_SECONDS = 0.05
+SLOW_CHUNK_SECONDS = 0.5
+
+MAX_WORKERS = 3
+# Seconds before each new attempt of a download interrupted by a network or server error
+RETRY_DELAYS = (1.0, 4.0)
+RETRYABLE_CLASSES = (NETWORK, SERVER, RATE_LIMIT)
+
+
+def partial_path(file_path: str) -> str:
+    return file_path + ".part"
+
+
+def next_chunk_size(current: int, elapsed: float) -> int:
+    """Size of the next chunk to read, given how long reading the last one of `current` bytes took."""
+    if elapsed < FAST_CHUNK_SECONDS:
+        return min(MAX_CHUNK_SIZE, current * 2)
+    if elapsed > SLOW_CHUNK_SECONDS:
+        return max(MIN_CHUNK_SIZE, current // 2)
+    return current
+
+
+_shared_manager = None
+_shared_lock = threading.Lock()
+
+
+def get_download_manager(db_service, jira_service) -> "DownloadManager":
+    """
+    The application's DownloadManager, created on first use. The interrupted
+    downloads are resumed by the caller (resume_pending), once the completion
+    hooks are registered.
+    """
+    global _shared_manager
+    with _shared_lock:
+        if _shared_manager is None:
+            _shared_manager = DownloadManager(db_service, jira_service)
+        return _shared_manager
+
+
+class DownloadManager(QObject):
+    """
+    Runs the queued attachment downloads on a bounded thread pool.
+
+    Signals are emitted from the worker threads: connected slots of objects
+    living in the UI thread are called there (queued connection).
+    """
+
+    item_progress = pyqtSignal(int, object, object)  # download id, bytes done, total bytes (None if unknown)
+    item_finished = pyqtSignal(int, str)             # download id, file path
+    item_failed = pyqtSignal(int, str)               # download id, error message
+    item_cancelled = pyqtSignal(int)                 # download id
+    aggregate_progress = pyqtSignal(object, object)  # bytes done, total bytes of the downloads in progress
+
+    def __init__(self, db_service, jira_service, max_workers: int = MAX_WORKERS,
+                 retry_delays: tuple = RETRY_DELAYS, parent=None):
+        super().__init__(parent)
+        self.db_service = db_service
+        self.jira_service = jira_service
+        self._retry_delays = retry_delays
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="AttachmentDownload")
+        self._lock = threading.Lock()
+        self._cancel_events = {}  # download id -> threading.Event, for queued and running downloads
+        self._progress = {}       # download id -> (bytes done, total bytes), until the pool is idle
+        self._completion_hooks = {}  # kind -> callable(download), run in the worker thread
+        self._closing = False
+
+    def set_completion_hook(self, kind: str, hook):
+        """
+        Registers a callable(download) run in the worker thread when a
+        download of the given kind completes, before item_finished. The
+        download dictionary (see DatabaseService.get_download) also carries
+        the 'sha256' of the content.
+        """
+        self._completion_hooks[kind] = hook
+
+    def enqueue(self, kind: str, jira_key: str, attachment_id: str, file_name: str, target_path: str,
+                total_bytes: int = None, url: str = None, mime_type: str = None) -> int:
+        """
+        Queues a download and returns its id. Queueing again the same
+        attachment to the same path returns the same id: a download in progress
+        is not started twice, an interrupted one is resumed.
+        """
+        download_id = self.db_service.enqueue_download(
+            kind, jira_key, attachment_id, file_name, target_path,
+            total_bytes=total_bytes, url=url, mime_type=mime_type
+        )
+        self._submit(download_id, total_bytes)
+        return download_id
+
+    def resume_pending(self) -> list:
+        """
+        Resumes the downloads interrupted by the last shutdown; returns their ids.
+        Downloads already queued or running in this session are left alone, so
+        it can be called again whenever the connection to Jira comes back.
+        """
+        previews = [download_id for download_id in self.db_service.get_unfinished_downloads(kinds=(KIND_PREVIEW,))
+                    if not self.is_active(download_id)]
+        for download_id in previews:
+            download = self.db_service.get_download(download_id)
+            self._remove_partial(download['target_path'])
+        self.db_service.delete_downloads(previews)
+
+        download_ids = [download_id for download_id in self.db_service.get_unfinished_downloads()
+                        if not self.is_active(download_id)]
+        for download_id in download_ids:
+            self.db_service.update_download(download_id, status="Pending")
+            self._submit(download_id)
+        if download_ids:
+            logger.info(f"Resuming {len(download_ids)} interrupted downloads")
+        return download_ids
+
+    def cancel(self, download_id: int):
+        """Stops a queued or running download; its partial file is kept for a later resume."""
+        with self._lock:
+            cancel_event = self._cancel_events.get(download_id)
+        if cancel_event is not None:
+            cancel_event.set()
+
+    def is_active(self, download_id: int) -> bool:
+        with self._lock:
+            return download_id in self._cancel_events
+
+    def shutdown(self, wait: bool = True):
+        """
+        Stops all the downloads. The queued and running ones stay "Pending"
+        in the DownloadQueue and are resumed by resume_pending at the next start.
+        """
+        self._closing = True
+        with self._lock:
+            cancel_events = list(self._cancel_events.values())
+        for cancel_event in cancel_events:
+            cancel_event.set()
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _submit(self, download_id: int, total_bytes: int = None):
+        with self._lock:
+            if download_id in self._cancel_events:
+                return
+            cancel_event = threading.Event()
+            self._cancel_events[download_id] = cancel_event
+            self._progress[download_id] = (0, total_bytes)
+        self._executor.submit(self._run, download_id, cancel_event)
+
+    def _run(self, download_id: int, cancel_event: threading.Event):
+        try:
+            self._download(download_id, cancel_event)
+        except Exception as e:
+            logger.error(f"Unexpected error in download {download_id}: {e}", exc_info=True)
+        finally:
+            with self._lock:
+                self._cancel_events.pop(download_id, None)
+                if not self._cancel_events:
+                    self._progress.clear()
+
+    def _download(self, download_id: int, cancel_event: threading.Event):
+        if cancel_event.is_set():
+            self._stopped(download_id, None)
+            return
+        if not self.db_service.start_download(download_id):
+            return
+        download = self.db_service.get_download(download_id)
+        target_path = download['target_path']
+
+        attempt = 0
+        while True:
+            try:
+                if not download['url']:
+                    download['url'] = self.jira_service.get_attachment_url(download['attachment_id'])
+                    self.db_service.update_download(download_id, url=download['url'])
+                size, digest = self.jira_service.stream_attachment(
+                    download['url'], target_path,
+                    progress_callback=lambda done, total: self._report_progress(download_id, done, total),
+                    cancel_event=cancel_event
+                )
+                break
+            except DownloadCancelled:
+                self._stopped(download_id, target_path)
+                return
+            except Exception as e:
+                if (attempt < len(self._retry_delays) and classify_error(e) in RETRYABLE_CLASSES
+                        and not cancel_event.wait(self._retry_delays[attempt])):
+                    attempt += 1
+                    logger.warning(f"Download of {download['file_name']} interrupted, resuming: {e}")
+                    continue
+                if cancel_event.is_set():
+                    self._stopped(download_id, target_path)
+                    return
+                logger.error(f"Error downloading {download['file_name']}: {e}")
+                self.db_service.update_download(
+                    download_id, status="Failed", bytes_done=self._partial_size(target_path), error_message=str(e)
+                )
+                with self._lock:
+                    self._progress.pop(download_id, None)
+                self.item_failed.emit(download_id, str(e))
+                return
+
+        download.update({'bytes_done': size, 'total_bytes': size, 'sha256': digest})
+        hook = self._completion_hooks.get(download['kind'])
+        if hook:
+            try:
+                hook(download)
+            except Exception as e:
+                # Il file è comunque scaricato: l'errore riguarda solo la sua registrazione
+                logger.error(f"Error registering download of {download['file_name']}: {e}")
+        self.db_service.delete_downloads([download_id])
+        self._report_progress(download_id, size, size)
+        self.item_finished.emit(download_id, target_path)
+
+    def _stopped(self, download_id: int, target_path: str | None):
+        bytes_done = self._partial_size(target_path) if target_path else None
+        with self._lock:
+            self._progress.pop(download_id, None)
+        if self._closing:
+            # Ripreso al prossimo avvio
+            self.db_service.update_download(download_id, status="Pending", bytes_done=bytes_done)
+            return
+        self.db_service.update_download(download_id, status="Cancelled", bytes_done=bytes_done)
+        self.item_cancelled.emit(download_id)
+
+    def _report_progress(self, download_id: int, done: int, total: int | None):
+        with self._lock:
+            self._progress[download_id] = (done, total)
+            aggregate_done = sum(item_done for item_done, _total in self._progress.values())
+            aggregate_total = sum(max(item_total or 0, item_done) for item_done, item_total in self._progress.values())
+        self.item_progress.emit(download_id, done, total)
+        self.aggregate_progress.emit(aggregate_done, aggregate_total)
+
+    @staticmethod
+    def _partial_size(target_path: str) -> int:
+        try:
+            return os.path.getsize(partial_path(target_path))
+        except OSError:
+            return 0
+
+    @staticmethod
+    def _remove_partial(target_path: str):
+        try:
+            os.remove(partial_path(target_path))
+        except OSError:
+            pass
@@ -0,0 +1,70 @@
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+
+
+# Operazioni per cui il server permette di verificare se sono già state applicate
+IDEMPOTENT_OPERATIONS = ("ADD_WORKLOG", "ADD_COMMENT", "ADD_ATTACHMENT")
+
+
+def normalize_text(text) -> str:
+    return "\n".join(line.rstrip() for line in str(text or "").replace("\r\n", "\n").strip().split("\n"))
+
+
+def _normalize_started(value) -> str:
+    """Start time as UTC to the second; naive values are local time (as when queued)."""
+    if not value:
+        return ""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            try:
+                value = datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%f%z")
+            except ValueError:
+                return value
+    if value.tzinfo is None:
+        value = value.astimezone()
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def _digest(*parts) -> str:
+    return hashlib.sha256(json.dumps(parts, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def worklog_key(issue_key, started, seconds, comment) -> str:
+    return _digest("worklog", issue_key, _normalize_started(started), int(seconds or 0), normalize_text(comment))
+
+
+def comment_key(issue_key, body) -> str:
+    return _digest("comment", issue_key, normalize_text(body))
+
+
+def attachment_key(issue_key, file_name, size) -> str:
+    return _digest("attachment", issue_key, file_name or "", int(size or 0))
+
+
+def operation_key(operation_type: str, payload) -> str | None:
+    """
+    Stable idempotency key of a queued operation (hash of issue, start time,
+    duration and comment for worklogs; of issue and body for comments; of
+    issue, file name and size for attachments), or None for operations that
+    cannot be matched on the server.
+    """
+    if isinstance(payload, str):
+        try:
+            payload = json.loads(payload)
+        except ValueError:
+            return None
+    if not isinstance(payload, dict):
+        return None
+    if operation_type == "ADD_WORKLOG":
+        seconds = payload.get("time_spent_seconds", payload.get("seconds"))
+        return worklog_key(payload.get("jira_key"), payload.get("start_time"), seconds, payload.get("comment"))
+    if operation_type == "ADD_COMMENT":
+        return comment_key(payload.get("jira_key"), payload.get("body"))
+    if operation_type == "ADD_ATTACHMENT" and payload.get("file_size") is not None:
+        file_name = payload.get("file_name") or os.path.basename(payload.get("file_path") or "")
+        return attachment_key(payload.get("jira_key"), file_name, payload["file_size"])
+    return None
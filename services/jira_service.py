@@ -1,9 +1,11 @@
 from jira import JIRA, JIRAError
+import requests
+import urllib3
 import time
 import random
 import logging
-import tempfile
 import os
+from datetime import datetime, timezone
 from typing import Callable, Any
 import json
 
@@ -20,6 +22,7 @@ class JiraService:
         sleep_func: Callable[[float], None] | None = None,
         non_retryable_statuses: list[int] | None = None,
         non_retryable_exceptions: list[type] | None = None,
+        fictitious_recheck_days: float = 7.0,
     ):
         self.jira = None
         # Configurable retry policy
@@ -37,8 +40,16 @@ class JiraService:
             default_excs.extend(non_retryable_exceptions)
         self._non_retryable_exceptions = tuple(default_excs)
         
-        # Cache for fictitious tickets to avoid repeated API calls
-        self._fictitious_tickets = set()
+        # Registry of tickets known not to exist on Jira, to avoid repeated API calls:
+        # key -> recheck deadline (epoch seconds, None = never expires).
+        # Persisted through set_fictitious_store() so it survives restarts.
+        self._fictitious_tickets: dict[str, float | None] = {}
+        self._fictitious_store = None
+        self._fictitious_recheck_seconds = fictitious_recheck_days * 24 * 3600
+
+        # Callbacks notified of the outcome of every Jira call (passive health
+        # monitoring, see NetworkService). Called from the calling thread.
+        self._health_listeners: list[Callable[[bool], None]] = []
 
     @staticmethod
     def is_likely_fictitious_ticket(ticket_key: str) -> bool:
@@ -180,6 +191,42 @@ class JiraService:
             self._logger.debug(f"Test connessione veloce fallito: {e}")
             return False
         
+    def ping(self, timeout: float = 3.0) -> bool:
+        """
+        Cheap reachability probe: GET /rest/api/2/serverInfo with its own
+        timeout (no retries, no search load on Jira, process-wide socket
+        timeout untouched).
+        """
+        if not self.jira:
+            return False
+        try:
+            session = self.jira._session
+            url = f"{self.jira.server_url}/rest/api/2/serverInfo"
+            # ResilientSession.request forza il proprio timeout: si usa quello di requests
+            response = requests.Session.request(session, 'GET', url, timeout=timeout)
+            return response.status_code < 500
+        except Exception as e:
+            self._logger.debug("Jira ping failed: %s", e)
+            return False
+
+    def add_health_listener(self, callback: Callable[[bool], None]):
+        """Registers callback(ok) to be told whether each Jira call reached a working server."""
+        if callback not in self._health_listeners:
+            self._health_listeners.append(callback)
+
+    def remove_health_listener(self, callback: Callable[[bool], None]):
+        try:
+            self._health_listeners.remove(callback)
+        except ValueError:
+            pass
+
+    def _report_health(self, ok: bool):
+        for callback in list(self._health_listeners):
+            try:
+                callback(ok)
+            except Exception as e:
+                self._logger.debug("Health listener failed: %s", e)
+
     def set_offline_state(self):
         """
         Imposta esplicitamente il servizio in modalità offline.
@@ -206,6 +253,87 @@ class JiraService:
             self._logger.error(f"Failed to get Jira priorities: {str(e)}")
             return []
             
+    def get_statuses(self) -> list:
+        """
+        Gets all issue statuses from Jira.
+        Returns a list of dicts with 'id', 'name' and 'category' (statusCategory key).
+        """
+        if not self.is_connected():
+            raise ConnectionError("Not connected to Jira.")
+
+        try:
+            def _do_get_statuses():
+                return [
+                    {
+                        'id': s.id,
+                        'name': s.name,
+                        'category': getattr(getattr(s, 'statusCategory', None), 'key', ''),
+                    }
+                    for s in self.jira.statuses()
+                ]
+
+            return self._with_retries(_do_get_statuses)
+        except Exception as e:
+            self._logger.error(f"Failed to get Jira statuses: {str(e)}")
+            return []
+
+    def get_issue_types(self) -> list:
+        """
+        Gets all issue types from Jira.
+        Returns a list of dicts with 'id', 'name' and 'subtask'.
+        """
+        if not self.is_connected():
+            raise ConnectionError("Not connected to Jira.")
+
+        try:
+            def _do_get_issue_types():
+                return [
+                    {'id': t.id, 'name': t.name, 'subtask': bool(getattr(t, 'subtask', False))}
+                    for t in self.jira.issue_types()
+                ]
+
+            return self._with_retries(_do_get_issue_types)
+        except Exception as e:
+            self._logger.error(f"Failed to get Jira issue types: {str(e)}")
+            return []
+
+    def get_issue_link_types(self) -> list:
+        """
+        Gets all issue link types from Jira.
+        Returns a list of dicts with 'id', 'name', 'inward' and 'outward'.
+        """
+        if not self.is_connected():
+            raise ConnectionError("Not connected to Jira.")
+
+        try:
+            def _do_get_link_types():
+                return [
+                    {'id': t.id, 'name': t.name, 'inward': t.inward, 'outward': t.outward}
+                    for t in self.jira.issue_link_types()
+                ]
+
+            return self._with_retries(_do_get_link_types)
+        except Exception as e:
+            self._logger.error(f"Failed to get Jira issue link types: {str(e)}")
+            return []
+
+    def set_issue_priority(self, issue_key: str, priority_id: str):
+        """
+        Sets the priority of a Jira issue with a single PUT (no GET of the
+        issue first). Raises on failure, so callers can tell the error apart.
+        """
+        if not self.is_connected():
+            raise ConnectionError("Not connected to Jira.")
+
+        def _do_update_priority():
+            self.jira._session.put(
+                self.jira._get_url(f"issue/{issue_key}"),
+                data=json.dumps({'fields': {'priority': {'id': priority_id}}})
+            )
+            return True
+
+        return self._with_retries(_do_update_priority)
+
     def update_issue_priority(self, issue_key: str, priority_id: str) -> bool:
         """
         Updates the priority of a Jira issue.
@@ -215,11 +343,7 @@ class JiraService:
             raise ConnectionError("Not connected to Jira.")
             
         try:
-            def _do_update_priority():
-                self.jira.issue(issue_key).update(fields={'priority': {'id': priority_id}})
-                return True
-                
-            return self._with_retries(_do_update_priority)
+            return self.set_issue_priority(issue_key, priority_id)
         except Exception as e:
             self._logger.error(f"Failed to update priority for {issue_key}: {str(e)}")
             return False
@@ -254,28 +378,24 @@ class JiraService:
             self._logger.error(f"Failed to get issues mentioning the user: {str(e)}")
             return {"issues": [], "error": str(e)}
             
-    def search_issues(self, jql: str, start_at: int = 0, max_results: int = 100, issue_keys: list[str] | None = None) -> list:
+    def search_issues(self, jql: str, start_at: int = 0, max_results: int = 100, issue_keys: list[str] | None = None,
+                      fields: str = "summary,status,timespent,updated") -> list:
         """
         Searches for issues using a JQL query.
         Optionally filters by a list of issue keys.
+        By default only the fields needed by the grid view are requested.
         """
         if not self.is_connected():
             raise ConnectionError("Not connected to Jira.")
 
-        final_jql = jql
         if issue_keys is not None:
+            # Keys known to be missing on Jira would only make the query fail
+            issue_keys = [key for key in issue_keys if not self.is_ticket_marked_as_fictitious(key)]
             if not issue_keys:
                 return []  # If favorite list is empty, return no results
-            keys_str = ", ".join(f'"{key}"' for key in issue_keys)
-            # Combine with existing JQL if present
-            if final_jql:
-                final_jql = f"key in ({keys_str}) AND ({final_jql})"
-            else:
-                final_jql = f"key in ({keys_str})"
+        final_jql = self._build_search_jql(jql, issue_keys)
         
         def _do_search():
-            # We only need a few fields for the grid view
-            fields = "summary,status,timespent"
             self._logger.debug("[JiraService.search_issues] Eseguo search_issues con JQL: %s, startAt: %s, maxResults: %s", final_jql, start_at, max_results)
             issues = self.jira.search_issues(
                 final_jql,
@@ -293,6 +413,44 @@ class JiraService:
             self._logger.error("Error searching Jira issues: %s", getattr(e, 'text', None))
             raise e
 
+    @staticmethod
+    def _build_search_jql(jql: str, issue_keys: list[str] | None = None) -> str:
+        """Combina la JQL con un eventuale filtro sulle chiavi (es. preferiti)."""
+        if not issue_keys:
+            return jql
+        keys_str = ", ".join(f'"{key}"' for key in issue_keys)
+        # Combine with existing JQL if present
+        if jql:
+            return f"key in ({keys_str}) AND ({jql})"
+        return f"key in ({keys_str})"
+
+    def count_issues(self, jql: str, issue_keys: list[str] | None = None) -> int:
+        """
+        Returns the total number of issues matching a JQL query.
+        Uses a maxResults=0 search so Jira only computes the total without
+        serializing any issue.
+        """
+        if not self.is_connected():
+            raise ConnectionError("Not connected to Jira.")
+
+        if issue_keys is not None and not issue_keys:
+            return 0
+        final_jql = self._build_search_jql(jql, issue_keys)
+
+        def _do_count():
+            # Same request as search_issues(json_result=True), which warns on maxResults=0
+            result = self.jira._get_json(
+                "search",
+                params={"jql": final_jql, "startAt": 0, "maxResults": 0, "fields": "key"},
+            )
+            return int(result.get('total', 0) or 0)
+
+        try:
+            return self._with_retries(_do_count)
+        except JIRAError as e:
+            self._logger.error("Error counting Jira issues: %s", getattr(e, 'text', None))
+            raise e
+
     def get_issue(self, issue_key: str) -> dict:
         """
         Retrieves full details for a single issue, including comments and attachments.
@@ -301,14 +459,13 @@ class JiraService:
             raise ConnectionError("Not connected to Jira.")
             
         # Check if this is a known fictitious ticket
-        if issue_key in self._fictitious_tickets:
-            self._logger.debug("Skipping known fictitious ticket: %s", issue_key)
-            raise JIRAError(f"Ticket {issue_key} is marked as fictitious", status_code=404)
+        self._raise_if_fictitious(issue_key)
             
         # Check if ticket appears to be fictitious
         if self.is_likely_fictitious_ticket(issue_key):
             self._logger.info("Ticket '%s' appears to be fictitious, marking it and skipping Jira API call", issue_key)
-            self._fictitious_tickets.add(issue_key)
+            # The heuristic is cheap to recompute, so it is not persisted
+            self._fictitious_tickets[issue_key] = None
             raise JIRAError(f"Ticket {issue_key} appears to be fictitious", status_code=404)
         
         def _do_get():
@@ -327,22 +484,92 @@ class JiraService:
             return self._with_retries(_do_get)
         except JIRAError as e:
             # If we get a 404 (not found), mark this ticket as potentially fictitious
-            if hasattr(e, 'status_code') and e.status_code == 404:
-                self._logger.info("Ticket '%s' returned 404, marking as fictitious to avoid future API calls", issue_key)
-                self._fictitious_tickets.add(issue_key)
+            self._note_not_found(issue_key, e)
             
             self._logger.error("Error fetching issue '%s': %s", issue_key, getattr(e, 'text', None))
             raise e
 
+    def set_fictitious_store(self, store) -> int:
+        """
+        Attaches a persistent store for the fictitious ticket registry (the
+        DatabaseService) and loads its still-valid entries.
+        Expired entries are dropped so the ticket is checked on Jira once more.
+        
+        Returns:
+            Number of entries loaded
+        """
+        self._fictitious_store = store
+        try:
+            entries = store.get_fictitious_tickets()
+        except Exception as e:
+            self._logger.warning("Could not load fictitious ticket registry: %s", e)
+            return 0
+
+        now = time.time()
+        loaded = 0
+        for key, entry in entries.items():
+            deadline = self._parse_recheck_after(entry.get('recheck_after'))
+            if deadline is not None and deadline <= now:
+                self._forget_fictitious(key)
+                continue
+            self._fictitious_tickets[key] = deadline
+            loaded += 1
+        self._logger.debug("Loaded %s fictitious tickets from the local registry", loaded)
+        return loaded
+
+    @staticmethod
+    def _parse_recheck_after(value) -> float | None:
+        if not value:
+            return None
+        try:
+            dt = datetime.fromisoformat(value)
+            if dt.tzinfo is None:
+                dt = dt.replace(tzinfo=timezone.utc)
+            return dt.timestamp()
+        except (TypeError, ValueError):
+            # Unreadable deadline: recheck right away
+            return 0.0
+
+    def _remember_fictitious(self, issue_key: str, reason: str, expires: bool) -> None:
+        """Adds a ticket to the registry and persists it if a store is attached."""
+        deadline = time.time() + self._fictitious_recheck_seconds if expires else None
+        self._fictitious_tickets[issue_key] = deadline
+        if self._fictitious_store is not None:
+            recheck_after = datetime.fromtimestamp(deadline, timezone.utc).isoformat() if deadline else None
+            try:
+                self._fictitious_store.save_fictitious_ticket(issue_key, reason, recheck_after)
+            except Exception as e:
+                self._logger.warning("Could not persist fictitious ticket '%s': %s", issue_key, e)
+
+    def _forget_fictitious(self, issue_key: str) -> None:
+        self._fictitious_tickets.pop(issue_key, None)
+        if self._fictitious_store is not None:
+            try:
+                self._fictitious_store.delete_fictitious_ticket(issue_key)
+            except Exception as e:
+                self._logger.warning("Could not remove fictitious ticket '%s': %s", issue_key, e)
+
+    def _note_not_found(self, issue_key: str, error: Exception) -> None:
+        """Records a 404 for an issue read so the next reads skip the network."""
+        if getattr(error, 'status_code', None) == 404 and issue_key:
+            self._logger.info("Ticket '%s' returned 404, marking as fictitious to avoid future API calls", issue_key)
+            self._remember_fictitious(issue_key.strip(), 'not_found', expires=True)
+
+    def _raise_if_fictitious(self, issue_key: str) -> None:
+        if self.is_ticket_marked_as_fictitious(issue_key):
+            self._logger.debug("Skipping known fictitious ticket: %s", issue_key)
+            raise JIRAError(f"Ticket {issue_key} is marked as fictitious", status_code=404)
+
     def mark_ticket_as_fictitious(self, issue_key: str) -> None:
         """
         Manually mark a ticket as fictitious to avoid future API calls.
+        Manual marks don't expire.
         
         Args:
             issue_key: The Jira ticket key to mark as fictitious
         """
         if issue_key:
-            self._fictitious_tickets.add(issue_key.strip())
+            self._remember_fictitious(issue_key.strip(), 'manual', expires=False)
             self._logger.info("Manually marked ticket '%s' as fictitious", issue_key)
 
     def unmark_ticket_as_fictitious(self, issue_key: str) -> None:
@@ -353,12 +580,13 @@ class JiraService:
             issue_key: The Jira ticket key to remove from fictitious list
         """
         if issue_key:
-            self._fictitious_tickets.discard(issue_key.strip())
+            self._forget_fictitious(issue_key.strip())
             self._logger.info("Removed ticket '%s' from fictitious list", issue_key)
 
     def is_ticket_marked_as_fictitious(self, issue_key: str) -> bool:
         """
         Check if a ticket is marked as fictitious.
+        An entry past its recheck deadline is dropped, so the next read goes to Jira.
         
         Args:
             issue_key: The Jira ticket key to check
@@ -366,7 +594,17 @@ class JiraService:
         Returns:
             True if the ticket is marked as fictitious, False otherwise
         """
-        return issue_key.strip() in self._fictitious_tickets if issue_key else False
+        if not issue_key:
+            return False
+        issue_key = issue_key.strip()
+        if issue_key not in self._fictitious_tickets:
+            return False
+        deadline = self._fictitious_tickets.get(issue_key)
+        if deadline is not None and deadline <= time.time():
+            self._logger.debug("Fictitious mark of '%s' expired, it will be rechecked on Jira", issue_key)
+            self._forget_fictitious(issue_key)
+            return False
+        return True
 
     def get_fictitious_tickets(self) -> list[str]:
         """
@@ -375,7 +613,7 @@ class JiraService:
         Returns:
             List of ticket keys marked as fictitious
         """
-        return sorted(list(self._fictitious_tickets))
+        return sorted(key for key in list(self._fictitious_tickets) if self.is_ticket_marked_as_fictitious(key))
 
     def add_comment(self, issue_key: str, body: str):
         """
@@ -395,26 +633,164 @@ class JiraService:
             self._logger.error("Error adding comment to '%s': %s", issue_key, getattr(e, 'text', None))
             raise e
 
-    def add_attachment(self, issue_key: str, file_path: str):
+    def add_worklog(self, issue_key: str, time_spent_seconds: int, started=None, comment: str = ""):
         """
-        Attaches a file to a Jira issue.
+        Adds a worklog to a Jira issue.
+
+        Args:
+            started: datetime or ISO string; naive values are local time
         """
         if not self.is_connected():
             raise ConnectionError("Not connected to Jira.")
-        
-        def _do_attach():
-            with open(file_path, 'rb') as f:
-                self.jira.add_attachment(issue=issue_key, attachment=f)
-            return True
+
+        if isinstance(started, str):
+            started = datetime.fromisoformat(started)
+        if started is not None and started.tzinfo is None:
+            # Jira needs the offset, which strftime('%z') omits for naive datetimes
+            started = started.astimezone()
+
+        def _do_add():
+            return self.jira.add_worklog(
+                issue_key,
+                timeSpentSeconds=str(int(time_spent_seconds)),
+                comment=comment or None,
+                started=started
+            )
+
+        try:
+            worklog = self._with_retries(_do_add)
+            self._logger.info("Successfully added worklog to %s", issue_key)
+            return worklog
+        except JIRAError as e:
+            self._logger.error("Error adding worklog to '%s': %s", issue_key, getattr(e, 'text', None))
+            raise e
+
+    def get_issue_worklogs(self, issue_key: str) -> list:
+        """
+        Retrieves the worklogs of an issue (one request).
+        """
+        if not self.is_connected():
+            raise ConnectionError("Not connected to Jira.")
+        self._raise_if_fictitious(issue_key)
+
+        def _do_get_worklogs():
+            return [
+                {
+                    'id': worklog.id,
+                    'started': getattr(worklog, 'started', None),
+                    'timeSpentSeconds': getattr(worklog, 'timeSpentSeconds', 0),
+                    'comment': getattr(worklog, 'comment', ''),
+                }
+                for worklog in self.jira.worklogs(issue_key)
+            ]
 
         try:
-            return self._with_retries(_do_attach)
+            return self._with_retries(_do_get_worklogs)
         except JIRAError as e:
-            self._logger.error("Error attaching file to '%s': %s", issue_key, getattr(e, 'text', None))
+            self._note_not_found(issue_key, e)
+            self._logger.error("Error getting worklogs for '%s': %s", issue_key, getattr(e, 'text', None))
             raise e
+
+    def add_attachment(self, issue_key: str, file_path: str):
+        """
+        Attaches a file to a Jira issue.
+        """
+        self.upload_attachment(issue_key, file_path)
+        return True
+
+    def upload_attachment(self, issue_key: str, file_path: str, file_name: str = None,
+                          progress_callback: Callable[[int, int], None] | None = None,
+                          cancel_event=None) -> dict:
+        """
+        Uploads a file as attachment of an issue, streaming the multipart body
+        from disk (the file is never loaded in memory).
+
+        Args:
+            file_name: name shown on Jira (default: the file's name)
+            progress_callback: optional callable(bytes_sent, total_bytes),
+                called from the uploading thread
+            cancel_event: optional threading.Event; when set, the upload is
+                aborted and UploadCancelled is raised
+
+        The read timeout grows with the file size (see attachment_upload).
+        There is no automatic retry here: a failed upload is retried by the
+        sync queue, which first checks whether the previous one arrived.
+        Returns the attachment metadata (id, filename, size).
+        """
+        from requests_toolbelt import MultipartEncoder, MultipartEncoderMonitor
+        from services.attachment_upload import UploadCancelled, upload_timeout
+
+        if not self.is_connected():
+            raise ConnectionError("Not connected to Jira.")
+        self._raise_if_fictitious(issue_key)
+
+        file_name = file_name or os.path.basename(file_path)
+        url = self.jira._get_url(f"issue/{issue_key}/attachments")
+
+        def _on_read(monitor):
+            if cancel_event is not None and cancel_event.is_set():
+                raise UploadCancelled(f"Upload of '{file_name}' cancelled")
+            if progress_callback:
+                progress_callback(monitor.bytes_read, monitor.len)
+
+        try:
+            with open(file_path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                monitor = MultipartEncoderMonitor(
+                    MultipartEncoder(fields={'file': (file_name, f, 'application/octet-stream')}), _on_read)
+                # requests.Session.request direttamente: ResilientSession imporrebbe il suo timeout
+                # e ripeterebbe l'intero upload
+                response = requests.Session.request(
+                    self.jira._session, 'POST', url, data=monitor,
+                    headers={'Content-Type': monitor.content_type, 'X-Atlassian-Token': 'no-check'},
+                    timeout=upload_timeout(size)
+                )
+        except UploadCancelled:
+            raise
         except FileNotFoundError:
             self._logger.error("Attachment file not found: %s", file_path)
             raise
+        except requests.RequestException as e:
+            self._logger.error("Error uploading '%s' to '%s': %s", file_name, issue_key, e)
+            self._report_health(False)
+            raise
+
+        # Jira has answered: the server is reachable
+        self._report_health(True)
+        if response.status_code >= 400:
+            error = JIRAError(status_code=response.status_code, text=response.text, url=url, response=response)
+            self._note_not_found(issue_key, error)
+            self._logger.error("Error attaching file to '%s': %s", issue_key, response.text)
+            raise error
+        created = response.json()
+        created = created[0] if isinstance(created, list) else created
+        return {'id': str(created.get('id')), 'filename': created.get('filename'), 'size': created.get('size')}
+
+    def get_issue_attachments(self, issue_key: str) -> list:
+        """
+        Retrieves the attachments metadata of an issue (one request).
+        """
+        if not self.is_connected():
+            raise ConnectionError("Not connected to Jira.")
+        self._raise_if_fictitious(issue_key)
+
+        def _do_get_attachments():
+            issue = self.jira.issue(issue_key, fields='attachment')
+            return [
+                {
+                    'id': str(attachment.id),
+                    'filename': getattr(attachment, 'filename', None),
+                    'size': getattr(attachment, 'size', None),
+                }
+                for attachment in (getattr(issue.fields, 'attachment', None) or [])
+            ]
+
+        try:
+            return self._with_retries(_do_get_attachments)
+        except JIRAError as e:
+            self._note_not_found(issue_key, e)
+            self._logger.error("Error getting attachments for '%s': %s", issue_key, getattr(e, 'text', None))
+            raise e
             
     def get_issue_comments(self, issue_key: str) -> list:
         """
@@ -422,6 +798,7 @@ class JiraService:
         """
         if not self.is_connected():
             raise ConnectionError("Not connected to Jira.")
+        self._raise_if_fictitious(issue_key)
         
         def _do_get_comments():
             comments = self.jira.comments(issue_key)
@@ -440,91 +817,160 @@ class JiraService:
         try:
             return self._with_retries(_do_get_comments)
         except JIRAError as e:
+            self._note_not_found(issue_key, e)
             self._logger.error("Error getting comments for '%s': %s", issue_key, getattr(e, 'text', None))
             raise e
             
+    def get_attachment_url(self, attachment_id: str) -> str:
+        """
+        Returns the content URL of an attachment (one request for its metadata).
+        """
+        if not self.is_connected():
+            raise ConnectionError("Not connected to Jira.")
+
+        def _do_get_attachment_url():
+            return self.jira.attachment(str(attachment_id)).content
+
+        return self._with_retries(_do_get_attachment_url)
+
+    def stream_attachment(self, url: str, file_path: str,
+                          progress_callback: Callable[[int, int | None], None] | None = None,
+                          cancel_event=None) -> tuple[int, str]:
+        """
+        Downloads the content at url into file_path through "<file_path>.part".
+
+        A partial file left by an interrupted download is resumed with an HTTP
+        Range request; if the server ignores the range the download starts
+        over. The chunk size adapts to the connection speed (see
+        download_manager.next_chunk_size). The file is moved to file_path only
+        when complete. Its SHA-256 is computed while streaming (the part
+        already on disk is read once when a download is resumed).
+
+        Args:
+            progress_callback: optional callable(bytes_done, total_bytes or None),
+                called from the downloading thread
+            cancel_event: optional threading.Event; when set, the download is
+                aborted (keeping the partial file) and DownloadCancelled is raised
+
+        There is no automatic retry here: see DownloadManager.
+        Returns (size, SHA-256 hex digest) of the downloaded file.
+        """
+        from services.blob_store import hash_file, new_hasher
+        from services.download_manager import (
+            CONNECT_TIMEOUT, MIN_CHUNK_SIZE, READ_TIMEOUT, DownloadCancelled, next_chunk_size, partial_path
+        )
+
+        if not self.is_connected():
+            raise ConnectionError("Not connected to Jira.")
+
+        part_path = partial_path(file_path)
+        dir_name = os.path.dirname(file_path)
+        if dir_name:
+            os.makedirs(dir_name, exist_ok=True)
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+
+        # identity: gli offset del Range devono corrispondere ai byte scritti su disco
+        headers = {'Accept-Encoding': 'identity'}
+        if offset:
+            headers['Range'] = f'bytes={offset}-'
+        try:
+            # requests.Session.request direttamente: ResilientSession imporrebbe il suo timeout
+            # e ripeterebbe la richiesta da zero
+            response = requests.Session.request(
+                self.jira._session, 'GET', url, headers=headers, stream=True,
+                timeout=(CONNECT_TIMEOUT, READ_TIMEOUT)
+            )
+        except requests.RequestException as e:
+            self._logger.error("Error downloading '%s': %s", url, e)
+            self._report_health(False)
+            raise
+
+        # Jira has answered: the server is reachable
+        self._report_health(True)
+        with response:
+            content_range = response.headers.get('Content-Range', '')
+            total = content_range.rpartition('/')[2]
+            total = int(total) if total.isdigit() else None
+
+            if response.status_code == 416 and offset:
+                response.close()
+                if total == offset:
+                    # The previous attempt was interrupted after the last byte
+                    digest = hash_file(part_path).hexdigest()
+                    os.replace(part_path, file_path)
+                    return offset, digest
+                os.remove(part_path)
+                return self.stream_attachment(url, file_path, progress_callback, cancel_event)
+            if response.status_code >= 400:
+                self._logger.error("Error downloading '%s': HTTP %s", url, response.status_code)
+                raise JIRAError(status_code=response.status_code, text=response.text, url=url, response=response)
+
+            if response.status_code == 206:
+                if not content_range.startswith(f'bytes {offset}-'):
+                    response.close()
+                    os.remove(part_path)
+                    return self.stream_attachment(url, file_path, progress_callback, cancel_event)
+                mode = 'ab'
+            else:
+                # The server ignored the range (or there was none): start over
+                offset, mode = 0, 'wb'
+                length = response.headers.get('Content-Length', '')
+                total = int(length) if length.isdigit() else None
+
+            done = offset
+            hasher = hash_file(part_path) if offset else new_hasher()
+            chunk_size = MIN_CHUNK_SIZE
+            try:
+                with open(part_path, mode) as f:
+                    while True:
+                        if cancel_event is not None and cancel_event.is_set():
+                            raise DownloadCancelled(f"Download of '{url}' cancelled")
+                        started = time.monotonic()
+                        chunk = response.raw.read(chunk_size, decode_content=True)
+                        if not chunk:
+                            break
+                        f.write(chunk)
+                        hasher.update(chunk)
+                        done += len(chunk)
+                        if progress_callback:
+                            progress_callback(done, total)
+                        chunk_size = next_chunk_size(chunk_size, time.monotonic() - started)
+            except urllib3.exceptions.HTTPError as e:
+                # Connessione interrotta a metà: il file parziale resta per la ripresa
+                raise requests.ConnectionError(e) from e
+
+        if total is not None and done < total:
+            raise requests.ConnectionError(f"Download of '{url}' interrupted at {done}/{total} bytes")
+        os.replace(part_path, file_path)
+        return done, hasher.hexdigest()
+
     async def download_attachment(self, attachment_id: str, file_path: str) -> bool:
         """
         Downloads an attachment from Jira using its ID and saves it to the specified path.
         Returns True if download was successful.
-        
+
+        Prefer DownloadManager, which runs downloads in parallel, persists them
+        and reports their progress.
+
         Args:
             attachment_id: The Jira attachment ID
             file_path: The local file path to save the attachment to
-        
+
         Returns:
             True if the download was successful, False otherwise
         """
         if not self.is_connected():
             raise ConnectionError("Not connected to Jira.")
-        
-        def _do_download():
-            import requests
-
-            # Get the attachment info from Jira
-            attachment_url = None
-            try:
-                # Try to get attachment directly from JIRA API
-                attachment = self.jira.attachment(attachment_id)
-                if attachment:
-                    attachment_url = attachment.get('content', None)
-            except Exception as ex:
-                self._logger.warning(f"Could not get attachment info via API: {ex}")
-                # Fallback to constructing URL directly
-                attachment_url = f"{self.jira.server_url}/secure/attachment/{attachment_id}"
-            
-            if not attachment_url:
-                self._logger.error("Failed to determine attachment URL for ID: %s", attachment_id)
-                return False
-
-            # Use streaming request with a timeout
-            sess = getattr(self.jira, '_session', None)
-            if sess is None:
-                # fallback to requests
-                sess = requests.Session()
-
-            resp = sess.get(attachment_url, stream=True, timeout=30)
-            try:
-                resp.raise_for_status()
-            except Exception:
-                # If 429 with Retry-After, raise JIRAError-like with status_code attribute
-                status = getattr(resp, 'status_code', None)
-                self._logger.error("Failed to download attachment, status: %s", status)
-                resp.raise_for_status()
-
-            # Ensure the directory exists
-            dir_name = os.path.dirname(file_path)
-            if dir_name:
-                os.makedirs(dir_name, exist_ok=True)
-
-            # Stream to a temporary file then move atomically
-            fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(file_path) + '.', dir=dir_name or None)
-            os.close(fd)
-            try:
-                with open(tmp_path, 'wb') as f:
-                    for chunk in resp.iter_content(chunk_size=8192):
-                        if chunk:
-                            f.write(chunk)
-                # Atomic replace
-                os.replace(tmp_path, file_path)
-            except Exception as e:
-                # cleanup temp file on failure
-                try:
-                    os.remove(tmp_path)
-                except Exception:
-                    pass
-                self._logger.error("Failed to save attachment: %s", e)
-                raise
-
-            self._logger.info("Successfully downloaded attachment: %s", file_path)
-            return True
 
         try:
-            return self._with_retries(_do_download)
+            url = self.get_attachment_url(attachment_id)
+            self._with_retries(lambda: self.stream_attachment(url, file_path))
         except Exception as e:
             self._logger.error("Error downloading attachment ID '%s': %s", attachment_id, e)
             return False
-            
+        self._logger.info("Successfully downloaded attachment: %s", file_path)
+        return True
+
     def download_attachment_by_url(self, attachment_url: str, filename: str, save_path: str = None) -> str:
         """
         Downloads an attachment from Jira by URL and saves it to the specified path.
@@ -534,66 +980,26 @@ class JiraService:
         """
         if not self.is_connected():
             raise ConnectionError("Not connected to Jira.")
-        
-        def _do_download():
-            import requests
 
-            # Use streaming request with a timeout
-            sess = getattr(self.jira, '_session', None)
-            if sess is None:
-                # fallback to requests
-                sess = requests.Session()
-
-            resp = sess.get(attachment_url, stream=True, timeout=30)
-            try:
-                resp.raise_for_status()
-            except Exception:
-                # If 429 with Retry-After, raise JIRAError-like with status_code attribute
-                status = getattr(resp, 'status_code', None)
-                self._logger.error("Failed to download attachment, status: %s", status)
-                resp.raise_for_status()
-
-            # Determine save path
-            if save_path is None:
-                # Use default download directory
-                from PyQt6.QtCore import QStandardPaths
-                download_dir = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.DownloadLocation)
-                target_path = os.path.join(download_dir, filename)
-            else:
-                target_path = save_path
-
-            # Ensure the directory exists - handle when dirname is empty
-            dir_name = os.path.dirname(target_path)
-            if dir_name:
-                os.makedirs(dir_name, exist_ok=True)
-
-            # Stream to a temporary file then move atomically
-            fd, tmp_path = tempfile.mkstemp(prefix=filename + '.', dir=dir_name or None)
-            os.close(fd)
-            try:
-                with open(tmp_path, 'wb') as f:
-                    for chunk in resp.iter_content(chunk_size=8192):
-                        if chunk:
-                            f.write(chunk)
-                # Atomic replace
-                os.replace(tmp_path, target_path)
-            except Exception:
-                # cleanup temp file on failure
-                try:
-                    os.remove(tmp_path)
-                except Exception:
-                    pass
-                raise
-
-            self._logger.info("Successfully downloaded attachment: %s", target_path)
-            return target_path
+        # Determine save path
+        if save_path is None:
+            # Use default download directory
+            from PyQt6.QtCore import QStandardPaths
+            download_dir = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.DownloadLocation)
+            target_path = os.path.join(download_dir, filename)
+        else:
+            target_path = save_path
 
         try:
-            return self._with_retries(_do_download)
+            # Un nuovo tentativo riprende dal file parziale
+            self._with_retries(lambda: self.stream_attachment(attachment_url, target_path))
         except Exception as e:
             print(f"Error downloading attachment '{filename}': {e}")
             raise e
 
+        self._logger.info("Successfully downloaded attachment: %s", target_path)
+        return target_path
+
     def _with_retries(
         self,
         func: Callable[[], Any],
@@ -618,18 +1024,23 @@ class JiraService:
         last_exc: Exception | None = None
         for attempt in range(1, max_attempts + 1):
             try:
-                return func()
+                result = func()
+                self._report_health(True)
+                return result
             except JIRAError as e:
                 status_code = getattr(e, 'status_code', None)
                 # Non-retryable client errors
                 if status_code is not None and 400 <= int(status_code) < 500:
                     self._logger.error("Non-retryable JIRA error (status %s): %s", status_code, getattr(e, 'text', None))
+                    # Jira has answered: the server is reachable
+                    self._report_health(True)
                     raise
 
                 last_exc = e
                 # If this was the last attempt, re-raise
                 if attempt >= max_attempts:
                     self._logger.error("JIRA error after %d attempts: %s", attempt, e)
+                    self._report_health(False)
                     raise
 
                 # If the exception carries a Retry-After info, respect it
@@ -659,6 +1070,7 @@ class JiraService:
                 last_exc = e
                 if attempt >= max_attempts:
                     self._logger.error("Network error after %d attempts: %s", attempt, e)
+                    self._report_health(False)
                     raise
 
                 delay = min(self._max_delay, base_delay * (2 ** (attempt - 1))) + random.uniform(0, base_delay)
@@ -690,6 +1102,8 @@ class JiraService:
         """Get the watchers for an issue."""
         if not self.is_connected():
             raise ConnectionError("Not connected to Jira.")
+        if self.is_ticket_marked_as_fictitious(issue_key):
+            return []
             
         def _do_get_watchers():
             watchers = self.jira.watchers(issue_key)
@@ -698,6 +1112,7 @@ class JiraService:
         try:
             return self._with_retries(_do_get_watchers)
         except Exception as e:
+            self._note_not_found(issue_key, e)
             self._logger.error(f"Error getting watchers for {issue_key}: {e}")
             return []
             
@@ -0,0 +1,124 @@
+import logging
+import time
+from datetime import datetime
+
+
+# Priorità standard di Jira, usate finché la cache non è mai stata popolata
+DEFAULT_PRIORITIES = [
+    {"id": "1", "name": "Highest"},
+    {"id": "2", "name": "High"},
+    {"id": "3", "name": "Medium"},
+    {"id": "4", "name": "Low"},
+    {"id": "5", "name": "Lowest"},
+]
+
+
+class JiraMetadataCache:
+    """
+    Local cache of Jira metadata (priorities, statuses, issue types, link types).
+
+    Lists are persisted in the JiraMetadataCache table and kept in memory, so
+    combo boxes can be filled synchronously without a network round trip.
+    refresh() re-fetches the lists older than the TTL; it is meant to run once
+    in the background after the connection to Jira is established.
+    """
+
+    KINDS = ('priorities', 'statuses', 'issue_types', 'link_types')
+
+    def __init__(self, db_service, jira_service, ttl_seconds: float = 24 * 3600):
+        self.db_service = db_service
+        self.jira_service = jira_service
+        self.ttl_seconds = ttl_seconds
+        self._logger = logging.getLogger('JiraTimeTracker')
+        self._items: dict[str, list] = {}
+        self._fetched_at: dict[str, float] = {}
+        self._load()
+
+    def _load(self):
+        """Loads the persisted lists into memory."""
+        for kind in self.KINDS:
+            try:
+                cached = self.db_service.get_metadata_cache(kind)
+            except Exception as e:
+                self._logger.warning("Could not load cached Jira %s: %s", kind, e)
+                cached = None
+            if not cached:
+                continue
+            items, fetched_at = cached
+            self._items[kind] = items
+            try:
+                self._fetched_at[kind] = datetime.fromisoformat(fetched_at).timestamp()
+            except (TypeError, ValueError):
+                self._fetched_at[kind] = 0.0
+
+    def get(self, kind: str) -> list:
+        """Returns the cached list for kind (a copy); priorities fall back to Jira's defaults."""
+        items = self._items.get(kind)
+        if items:
+            return [dict(item) for item in items]
+        if kind == 'priorities':
+            return [dict(item) for item in DEFAULT_PRIORITIES]
+        return []
+
+    def get_priorities(self) -> list:
+        return self.get('priorities')
+
+    def get_statuses(self) -> list:
+        return self.get('statuses')
+
+    def get_issue_types(self) -> list:
+        return self.get('issue_types')
+
+    def get_link_types(self) -> list:
+        return self.get('link_types')
+
+    def get_priority_id(self, priority_name: str) -> str:
+        """Returns the id of a priority by name, or '' if unknown."""
+        for priority in self.get_priorities():
+            if priority.get('name') == priority_name:
+                return str(priority.get('id', ''))
+        return ''
+
+    def is_stale(self, kind: str) -> bool:
+        fetched_at = self._fetched_at.get(kind)
+        return fetched_at is None or time.time() - fetched_at >= self.ttl_seconds
+
+    def refresh(self, force: bool = False) -> list[str]:
+        """
+        Fetches from Jira the lists that are stale (or all of them if force)
+        and persists them. Blocking: call it from a worker thread.
+
+        Returns:
+            The kinds that were refreshed
+        """
+        if not self.jira_service or not self.jira_service.is_connected():
+            return []
+
+        fetchers = {
+            'priorities': self.jira_service.get_priorities,
+            'statuses': self.jira_service.get_statuses,
+            'issue_types': self.jira_service.get_issue_types,
+            'link_types': self.jira_service.get_issue_link_types,
+        }
+        refreshed = []
+        for kind in self.KINDS:
+            if not force and not self.is_stale(kind):
+                continue
+            try:
+                items = fetchers[kind]()
+            except Exception as e:
+                self._logger.warning("Could not refresh Jira %s: %s", kind, e)
+                continue
+            if not items:
+                # Keep the previous list: an empty answer is almost always an error
+                continue
+            self._items[kind] = items
+            self._fetched_at[kind] = time.time()
+            try:
+                self.db_service.save_metadata_cache(kind, items)
+            except Exception as e:
+                self._logger.warning("Could not persist Jira %s: %s", kind, e)
+            refreshed.append(kind)
+        if refreshed:
+            self._logger.info("Jira metadata refreshed: %s", ", ".join(refreshed))
+        return refreshed
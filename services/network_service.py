@@ -1,5 +1,7 @@
 import socket
 import logging
+import threading
+import time
 from PyQt6.QtCore import QObject, pyqtSignal, QTimer, QSettings
 
 logger = logging.getLogger('JiraTimeTracker')
@@ -8,137 +10,203 @@ class NetworkService(QObject):
     """
     Servizio per monitorare lo stato della connessione internet e JIRA.
     Fornisce segnali per notificare cambiamenti nello stato della connessione.
+
+    Lo stato di JIRA viene dedotto soprattutto in modo passivo, dall'esito delle
+    chiamate reali di JiraService. Una sonda leggera (GET serverInfo, timeout
+    per singola richiesta) gira in un thread in background solo quando
+    l'applicazione è inattiva o dopo un errore, quindi il thread della UI non
+    si blocca mai e Jira non riceve ricerche inutili.
     """
     # Segnali per cambiamenti dello stato della connessione
     connection_changed = pyqtSignal(bool)  # True quando la connessione è disponibile, False altrimenti
     jira_connection_changed = pyqtSignal(bool)  # True quando JIRA è disponibile, False altrimenti
-    
-    def __init__(self, jira_service=None, check_interval=30000):
+    probe_completed = pyqtSignal(bool, bool)  # (internet, jira) al termine di ogni sonda
+
+    # Uso interno: consegnano al thread della UI risultati prodotti da altri thread
+    _probe_finished = pyqtSignal(bool, bool)
+    _jira_call_outcome = pyqtSignal(bool)
+
+    def __init__(self, jira_service=None, check_interval=30000, probe_timeout=3.0, internet_check_hosts=None):
         """
         Inizializza il servizio di rete.
-        
+
         Args:
             jira_service: Istanza di JiraService per verificare la connessione a JIRA
             check_interval: Intervallo in millisecondi per controllare lo stato della connessione
+            probe_timeout: Timeout in secondi di ogni singola connessione della sonda
+            internet_check_hosts: Host (indirizzo, porta) usati per verificare internet
+                quando JIRA non risponde
         """
         super().__init__()
         self.jira_service = jira_service
         self.check_interval = check_interval
+        self.probe_timeout = probe_timeout
         self.is_internet_available = False
         self.is_jira_available = False
         self._last_known_jira_state = False
-        self._internet_check_hosts = [
-            # DNS Google
-            ('8.8.8.8', 53),
-            # DNS Cloudflare
-            ('1.1.1.1', 53),
-            # Fallback al DNS locale se configurato
-            (socket.gethostbyname(socket.gethostname()), 53)
-        ]
-        
+        if internet_check_hosts is None:
+            internet_check_hosts = [
+                # DNS Google
+                ('8.8.8.8', 53),
+                # DNS Cloudflare
+                ('1.1.1.1', 53),
+            ]
+        self._internet_check_hosts = list(internet_check_hosts)
+        self._last_jira_success = 0.0  # time.monotonic() dell'ultima chiamata riuscita
+        self._probe_running = False
+
+        self._probe_finished.connect(self._apply_probe_result)
+        self._jira_call_outcome.connect(self._apply_jira_call_outcome)
+
         # Avvio il timer per controllare periodicamente la connessione
         self.check_timer = QTimer()
-        self.check_timer.timeout.connect(self.check_connection)
+        self.check_timer.timeout.connect(self._on_check_timer)
         self.check_timer.setInterval(check_interval)
-        
+
     def start_monitoring(self):
         """Avvia il monitoraggio della connessione."""
+        if self.jira_service and hasattr(self.jira_service, 'add_health_listener'):
+            self.jira_service.add_health_listener(self._on_jira_call)
         # Controllo immediato dello stato
         self.check_connection()
         # Avvio del timer per controlli periodici
         self.check_timer.start()
         logger.info("Monitoraggio della connessione avviato")
-        
+
     def stop_monitoring(self):
         """Ferma il monitoraggio della connessione."""
         self.check_timer.stop()
+        if self.jira_service and hasattr(self.jira_service, 'remove_health_listener'):
+            self.jira_service.remove_health_listener(self._on_jira_call)
         logger.info("Monitoraggio della connessione fermato")
-        
+
     def check_connection(self):
         """
-        Controlla lo stato della connessione internet e JIRA.
-        Emette segnali quando lo stato cambia.
+        Avvia in background un controllo dello stato della connessione internet e JIRA.
+        Al termine emette probe_completed e, se lo stato è cambiato,
+        connection_changed / jira_connection_changed. Se un controllo è già in
+        corso non ne avvia un altro.
+        """
+        if self._probe_running:
+            return
+        self._probe_running = True
+        thread = threading.Thread(target=self._run_probe, name="NetworkProbe", daemon=True)
+        thread.start()
+
+    def _on_check_timer(self):
+        # Se una chiamata reale a JIRA è riuscita di recente lo stato è già noto
+        recently_active = time.monotonic() - self._last_jira_success < self.check_interval / 1000
+        if self.is_jira_available and recently_active:
+            return
+        self.check_connection()
+
+    # --- Monitoraggio passivo ---
+
+    def _on_jira_call(self, ok: bool):
+        """Listener di JiraService: può essere chiamato da qualsiasi thread."""
+        try:
+            self._jira_call_outcome.emit(ok)
+        except RuntimeError:
+            pass  # Servizio già distrutto
+
+    def _apply_jira_call_outcome(self, ok: bool):
+        if ok:
+            self._last_jira_success = time.monotonic()
+            # Una risposta di JIRA implica anche la connessione internet
+            self._set_state(True, True)
+        elif self.is_jira_available:
+            # Un errore non basta per dichiarare JIRA irraggiungibile: lo verifica la sonda
+            self.check_connection()
+
+    # --- Sonda attiva (thread in background) ---
+
+    def _run_probe(self):
+        try:
+            internet_available, jira_available = self.probe()
+        except Exception as e:
+            logger.warning(f"Errore nel controllo della connessione: {e}")
+            internet_available, jira_available = False, False
+        try:
+            self._probe_finished.emit(internet_available, jira_available)
+        except RuntimeError:
+            pass  # Servizio già distrutto
+
+    def probe(self) -> tuple[bool, bool]:
+        """
+        Controlla la connessione; bloccante, va eseguito fuori dal thread della UI.
+
+        Returns:
+            (internet disponibile, JIRA disponibile)
         """
-        # Controlla connessione internet
+        if not self.jira_service:
+            return self._check_internet_connection(), False
+
+        if self.jira_service.is_connected():
+            if self.jira_service.ping(timeout=self.probe_timeout):
+                return True, True
+            return self._check_internet_connection(), False
+
         internet_available = self._check_internet_connection()
-        
-        # Se lo stato è cambiato, emetti il segnale
+        if not internet_available:
+            return False, False
+        return True, self._try_reconnect()
+
+    def _try_reconnect(self) -> bool:
+        """Tenta di riconnettersi se le credenziali sono disponibili."""
+        try:
+            # Recupera le credenziali
+            settings = QSettings()
+            settings.beginGroup("Jira")
+            jira_url = settings.value("url", "")
+            settings.endGroup()
+
+            # Recupera il PAT
+            from services.credential_service import CredentialService
+            cred_service = CredentialService()
+            pat = cred_service.get_pat(jira_url)
+
+            if jira_url and pat:
+                # Tenta la riconnessione
+                logger.info(f"Tentativo di riconnessione a JIRA: {jira_url}")
+                self.jira_service.connect(jira_url, pat)
+                logger.info("Riconnessione a JIRA riuscita")
+                return True
+        except Exception as e:
+            logger.warning(f"Tentativo di riconnessione a JIRA fallito: {e}")
+        return False
+
+    def _apply_probe_result(self, internet_available: bool, jira_available: bool):
+        self._probe_running = False
+        if jira_available:
+            self._last_jira_success = time.monotonic()
+        self._set_state(internet_available, jira_available)
+        self.probe_completed.emit(internet_available, jira_available)
+
+    def _set_state(self, internet_available: bool, jira_available: bool):
+        """Aggiorna lo stato ed emette i segnali se è cambiato (thread della UI)."""
         if internet_available != self.is_internet_available:
             self.is_internet_available = internet_available
             self.connection_changed.emit(internet_available)
             logger.info(f"Stato connessione internet cambiato: {'disponibile' if internet_available else 'non disponibile'}")
-        
-        # Se la connessione internet è disponibile, controlla JIRA
-        jira_available = False
-        if internet_available and self.jira_service:
-            # Prima verifica se il DNS può essere risolto
-            try:
-                socket.gethostbyname("sviluppo.maggiolicloud.it")
-                can_resolve_dns = True
-            except socket.error:
-                can_resolve_dns = False
-                logger.warning("Impossibile risolvere il nome host di JIRA (DNS non raggiungibile)")
-            
-            # Procedi solo se il DNS può essere risolto
-            if can_resolve_dns:
-                try:
-                    if self.jira_service.is_connected():
-                        # Test reale della connessione a JIRA
-                        try:
-                            # Esegui una query minima per verificare che la connessione funzioni
-                            # Usa una query che richiede pochi dati, senza consumare troppe risorse
-                            # Questa query torna un massimo di 1 risultato
-                            self.jira_service.search_issues("created >= now() AND created <= now()", max_results=1)
-                            jira_available = True
-                        except Exception as e:
-                            logger.warning(f"Test connessione JIRA fallito: {e}")
-                            jira_available = False
-                    else:
-                        # Tenta di riconnettersi se le credenziali sono disponibili
-                        try:
-                            # Recupera le credenziali
-                            from PyQt6.QtCore import QSettings
-                            settings = QSettings()
-                            settings.beginGroup("Jira")
-                            jira_url = settings.value("url", "")
-                            settings.endGroup()
-                            
-                            # Recupera il PAT
-                            from services.credential_service import CredentialService
-                            cred_service = CredentialService()
-                            pat = cred_service.get_pat(jira_url)
-                            
-                            if jira_url and pat:
-                                # Tenta la riconnessione
-                                logger.info(f"Tentativo di riconnessione a JIRA: {jira_url}")
-                                self.jira_service.connect(jira_url, pat)
-                                jira_available = True
-                                logger.info("Riconnessione a JIRA riuscita")
-                        except Exception as e:
-                            logger.warning(f"Tentativo di riconnessione a JIRA fallito: {e}")
-                            jira_available = False
-                except Exception as e:
-                    logger.warning(f"Errore nel controllo della connessione JIRA: {e}")
-                    jira_available = False
-        
-        # Se lo stato di JIRA è cambiato, emetti il segnale
+
         if jira_available != self.is_jira_available:
             self.is_jira_available = jira_available
             self.jira_connection_changed.emit(jira_available)
             logger.info(f"Stato connessione JIRA cambiato: {'disponibile' if jira_available else 'non disponibile'}")
-    
+
     def _check_internet_connection(self) -> bool:
         """
         Controlla se la connessione internet è disponibile.
-        
+
         Returns:
             bool: True se la connessione è disponibile, False altrimenti.
         """
         for host, port in self._internet_check_hosts:
             try:
-                socket.setdefaulttimeout(2)
-                socket.socket(socket.AF_INET, socket.SOCK_STREAM).connect((host, port))
-                return True
-            except socket.error:
+                # Timeout sul singolo socket: socket.setdefaulttimeout cambierebbe
+                # il timeout di tutto il processo
+                with socket.create_connection((host, port), timeout=self.probe_timeout):
+                    return True
+            except OSError:
                 continue
-        return False
\ No newline at end of file
+        return False
@@ -0,0 +1,205 @@
+import logging
+import math
+from datetime import datetime, timedelta, timezone
+
+from jira import JIRAError
+
+
+class NotificationPoller:
+    """
+    Checks the subscribed issues for new comments with as few requests as possible.
+
+    Instead of reading the comments of every subscription, each cycle runs one
+    `key in (...) AND updated >= -Nm` search per chunk of keys and fetches the
+    comments only for the issues Jira reports as changed since the last check.
+    All the subscription updates of a cycle are written in one transaction.
+    Blocking: call poll() from a worker thread.
+
+    Each subscription has its own polling interval: it doubles (up to
+    max_interval) every time the issue is found quiet and drops back towards
+    min_interval when the issue shows activity. A cycle only looks at the
+    subscriptions that are due and never sends more than request_budget
+    requests; what does not fit stays due for the next cycle.
+    """
+
+    def __init__(self, db_service, jira_service, chunk_size: int = 50,
+                 min_interval: int = 2 * 60, base_interval: int = 5 * 60,
+                 max_interval: int = 6 * 3600, request_budget: int = 20):
+        self.db_service = db_service
+        self.jira_service = jira_service
+        self.chunk_size = chunk_size
+        self.min_interval = min_interval
+        self.base_interval = base_interval
+        self.max_interval = max_interval
+        self.request_budget = request_budget
+        self._logger = logging.getLogger('JiraTimeTracker')
+
+    @staticmethod
+    def _parse_timestamp(value):
+        try:
+            parsed = datetime.fromisoformat(value)
+        except (TypeError, ValueError):
+            return None
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed
+
+    @staticmethod
+    def _to_jira_precision(value):
+        """
+        Jira timestamps have millisecond precision: a change in the same
+        millisecond as a check must still count as newer than the check.
+        """
+        return value.replace(microsecond=value.microsecond // 1000 * 1000)
+
+    @classmethod
+    def _updated_since_jql(cls, subscriptions, now):
+        """
+        JQL clause matching the issues updated since the oldest check of the chunk.
+        A relative date ("-Nm") avoids any mismatch between UTC and the time zone
+        of the Jira user; one extra minute covers the rounding.
+        """
+        checked = [cls._parse_timestamp(s.get('last_checked')) for s in subscriptions]
+        if not checked or any(c is None for c in checked):
+            return ''
+        minutes = math.ceil(max(0.0, (now - min(checked)).total_seconds()) / 60) + 1
+        return f'updated >= "-{minutes}m"'
+
+    def _changed_keys(self, chunk, now):
+        """
+        Returns the keys of the chunk updated since their last check, or None
+        if Jira rejected the search and every issue has to be checked.
+        """
+        keys = [s['issue_key'] for s in chunk]
+        try:
+            issues = self.jira_service.search_issues(
+                self._updated_since_jql(chunk, now),
+                max_results=len(keys),
+                issue_keys=keys,
+                fields="updated"
+            )
+        except JIRAError as e:
+            # Jira rifiuta l'intera query se una sola chiave non esiste più:
+            # per questo blocco si torna al controllo issue per issue
+            self._logger.warning("Notification search failed (%s), checking %d issues one by one",
+                                 getattr(e, 'status_code', None), len(keys))
+            return None
+
+        # The JQL window is rounded to the minute: compare the exact timestamps
+        # so an issue already read in the previous cycle is not read again
+        last_checked = {s['issue_key']: self._parse_timestamp(s.get('last_checked')) for s in chunk}
+        changed = set()
+        for issue in issues:
+            key = issue.get('key')
+            updated = self._parse_timestamp((issue.get('fields') or {}).get('updated'))
+            checked = last_checked.get(key)
+            if updated is None or checked is None or updated >= self._to_jira_precision(checked):
+                changed.add(key)
+        return changed
+
+    def _newest_comment_date(self, issue_key):
+        comments = self.jira_service.get_issue_comments(issue_key)
+        if not comments:
+            return None
+        return max(comments, key=lambda c: c.get('created', '')).get('created')
+
+    def _is_new_comment(self, subscription, newest_date):
+        """
+        True if newest_date is newer than the last comment seen. Before any
+        comment has been seen, only comments written after the last check count.
+        """
+        last_comment_date = subscription.get('last_comment_date')
+        if last_comment_date:
+            newest, last = self._parse_timestamp(newest_date), self._parse_timestamp(last_comment_date)
+            if newest is None or last is None:
+                return newest_date > last_comment_date
+            return newest > last
+        newest, checked = self._parse_timestamp(newest_date), self._parse_timestamp(subscription.get('last_checked'))
+        return newest is None or checked is None or newest >= self._to_jira_precision(checked)
+
+    def _is_due(self, subscription, now):
+        next_check_at = self._parse_timestamp(subscription.get('next_check_at'))
+        return next_check_at is None or next_check_at <= now
+
+    def _next_interval(self, subscription, activity):
+        """
+        New polling interval of a subscription.
+
+        Args:
+            activity: 'comment' (new comments), 'updated' (changed without new
+                comments), 'quiet' (unchanged) or None (unknown)
+        """
+        interval = subscription.get('poll_interval') or self.base_interval
+        if activity == 'comment':
+            interval = self.min_interval
+        elif activity == 'updated':
+            interval = interval // 2
+        elif activity == 'quiet':
+            interval = interval * 2
+        return max(self.min_interval, min(self.max_interval, interval))
+
+    def poll(self, force: bool = False) -> dict:
+        """
+        Runs one polling cycle over the due subscriptions (all of them if force).
+
+        Returns:
+            dict with 'due' (subscriptions due), 'checked' (subscriptions checked),
+            'changed' (issues whose comments were read), 'new_notifications'
+            (issues with new comments) and 'requests' (requests sent to Jira)
+        """
+        summary = {'due': 0, 'checked': 0, 'changed': 0, 'new_notifications': 0, 'requests': 0}
+        if not self.jira_service or not self.jira_service.is_connected():
+            return summary
+
+        # The cycle starts now: updates arriving while it runs are seen next time
+        now = datetime.now(timezone.utc)
+        subscriptions = self.db_service.get_all_notification_subscriptions()
+        due = [s for s in subscriptions if force or self._is_due(s, now)]
+        if not due:
+            return summary
+        summary['due'] = len(due)
+        # Most overdue first (never scheduled sorts first); similar last checks share a chunk
+        due.sort(key=lambda s: (s.get('next_check_at') or '', s.get('last_checked') or ''))
+
+        budget = self.request_budget
+        schedule = {}
+        new_comment_dates = {}
+        for start in range(0, len(due), self.chunk_size):
+            if budget <= 0:
+                break
+            chunk = due[start:start + self.chunk_size]
+            budget -= 1
+            try:
+                changed = self._changed_keys(chunk, now)
+            except Exception as e:
+                self._logger.error("Error checking notifications: %s", e)
+                continue
+
+            for subscription in chunk:
+                issue_key = subscription['issue_key']
+                if changed is not None and issue_key not in changed:
+                    activity = 'quiet'
+                else:
+                    if budget <= 0:
+                        continue  # Still due: it will be read in the next cycle
+                    budget -= 1
+                    summary['changed'] += 1
+                    try:
+                        newest_date = self._newest_comment_date(issue_key)
+                    except Exception as e:
+                        self._logger.error("Error checking notifications for %s: %s", issue_key, e)
+                        continue
+                    if newest_date and self._is_new_comment(subscription, newest_date):
+                        new_comment_dates[issue_key] = newest_date
+                        activity = 'comment'
+                    else:
+                        activity = 'updated' if changed is not None else None
+                interval = self._next_interval(subscription, activity)
+                schedule[issue_key] = ((now + timedelta(seconds=interval)).isoformat(), interval)
+
+        self.db_service.apply_notification_check(schedule, new_comment_dates, now.isoformat())
+        summary['checked'] = len(schedule)
+        summary['new_notifications'] = len(new_comment_dates)
+        summary['requests'] = self.request_budget - budget
+        self._logger.debug("Notification check: %s", summary)
+        return summary
@@ -0,0 +1,124 @@
+"""
+Shared in-memory cache of pixmaps and icons, bounded in bytes (LRU).
+
+Views take their images from shared_pixmap_cache() instead of keeping their
+own QPixmaps: a pixmap shown by several widgets is stored once (QPixmap is
+implicitly shared) and the least recently used ones are dropped when the
+budget is exceeded, whatever the number of open windows. QPixmap and QIcon
+belong to the UI thread: use the cache only from there.
+"""
+
+from collections import OrderedDict
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QIcon, QPixmap
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+# Costo stimato di un'icona: le pixmap di un QIcon sono create su richiesta
+ICON_COST = 32 * 32 * 4
+
+
+def pixmap_cost(pixmap: QPixmap) -> int:
+    return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+
+class PixmapCache:
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (QPixmap or QIcon, cost in bytes)
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, value, cost: int = None):
+        """Adds a pixmap or icon and returns it; a value larger than the whole budget is not kept."""
+        if cost is None:
+            cost = pixmap_cost(value) if isinstance(value, QPixmap) else ICON_COST
+        self.remove(key)
+        if cost > self.max_bytes:
+            return value
+        self._entries[key] = (value, cost)
+        self._bytes += cost
+        while self._bytes > self.max_bytes:
+            _key, (_value, evicted_cost) = self._entries.popitem(last=False)
+            self._bytes -= evicted_cost
+            self.evictions += 1
+        return value
+
+    def remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+
+    def load(self, path: str, size: int = None) -> QPixmap:
+        """
+        The image at path, scaled to fit size x size when size is given; a
+        null pixmap if it cannot be loaded (not cached, so it is retried).
+        """
+        key = ("file", path, size)
+        pixmap = self.get(key)
+        if pixmap is not None:
+            return pixmap
+        pixmap = QPixmap(path)
+        if pixmap.isNull():
+            return pixmap
+        if size and (pixmap.width() > size or pixmap.height() > size):
+            pixmap = pixmap.scaled(size, size, Qt.AspectRatioMode.KeepAspectRatio,
+                                   Qt.TransformationMode.SmoothTransformation)
+        return self.put(key, pixmap)
+
+    def icon(self, key, factory) -> QIcon:
+        """The icon cached under key, created with factory() on a miss."""
+        key = ("icon", key)
+        icon = self.get(key)
+        if icon is None:
+            icon = self.put(key, factory())
+        return icon
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'bytes': self._bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+
+_shared_cache = None
+
+
+def shared_pixmap_cache() -> PixmapCache:
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = PixmapCache()
+    return _shared_cache
+
+
+def memory_report() -> str:
+    """Footprint of the shared pixmap cache, for the diagnostics."""
+    stats = shared_pixmap_cache().stats()
+    mb = 1024 * 1024
+    return (
+        f"Cache immagini: {stats['entries']} elementi, "
+        f"{stats['bytes'] / mb:.1f} MB su {stats['max_bytes'] / mb:.0f} MB\n"
+        f"Richieste: {stats['hits']} trovate, {stats['misses']} mancanti "
+        f"(hit rate {stats['hit_rate']:.0%}), {stats['evictions']} rimosse per limite di memoria"
+    )
@@ -0,0 +1,88 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+from jira.exceptions import JIRAError
+
+
+# Classi di errore di un'operazione della SyncQueue (colonna LastErrorClass)
+AUTH = "auth"               # 401/403: credenziali scadute o permessi mancanti
+RATE_LIMIT = "rate_limit"   # 429: Jira chiede di rallentare
+SERVER = "server"           # 5xx
+NETWORK = "network"         # timeout, connessione rifiutata, offline
+CLIENT = "client"           # altri 4xx, payload non valido, file mancante: inutile riprovare
+UNKNOWN = "unknown"
+
+# error class -> (first delay in seconds, max delay in seconds, max attempts)
+BACKOFF_POLICIES = {
+    AUTH: (15 * 60, 6 * 3600, 5),
+    RATE_LIMIT: (60, 3600, 20),
+    SERVER: (60, 3600, 10),
+    NETWORK: (30, 30 * 60, 20),
+    UNKNOWN: (60, 3600, 5),
+}
+
+# Errors that concern every operation, not the single one: the run stops sending
+RUN_HALTING_CLASSES = (AUTH, RATE_LIMIT, NETWORK)
+
+
+def classify_error(error: Exception) -> str:
+    """Maps the exception raised by a sync operation to its error class."""
+    if isinstance(error, JIRAError):
+        status_code = getattr(error, 'status_code', None)
+        if status_code is None:
+            return NETWORK
+        status_code = int(status_code)
+        if status_code in (401, 403):
+            return AUTH
+        if status_code == 429:
+            return RATE_LIMIT
+        if status_code >= 500:
+            return SERVER
+        return CLIENT
+    if isinstance(error, (FileNotFoundError, IsADirectoryError, PermissionError, ValueError, KeyError, TypeError)):
+        return CLIENT
+    # Include requests.RequestException, socket timeouts and ConnectionError
+    if isinstance(error, OSError):
+        return NETWORK
+    return UNKNOWN
+
+
+def retry_after_seconds(error: Exception) -> float | None:
+    """Seconds requested by the Retry-After header of the error's response, if any."""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None)
+    if not headers:
+        return None
+    try:
+        value = headers.get('Retry-After')
+        return max(0.0, float(value)) if value is not None else None
+    except (TypeError, ValueError):
+        # Could be an HTTP-date: fall back to the computed backoff
+        return None
+
+
+def retry_delay(error_class: str, attempts: int, retry_after: float | None = None, rng=random.random) -> float | None:
+    """
+    Delay before the next attempt of an operation that failed its
+    `attempts`-th attempt, or None if it must not be retried automatically.
+
+    The delay doubles at each attempt up to the class maximum, plus up to 20%
+    of jitter so the operations failed together are not retried together.
+    """
+    policy = BACKOFF_POLICIES.get(error_class)
+    if policy is None:
+        return None
+    base_delay, max_delay, max_attempts = policy
+    if attempts >= max_attempts:
+        return None
+    delay = min(max_delay, base_delay * (2 ** max(attempts - 1, 0)))
+    delay += delay * 0.2 * rng()
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+
+def next_attempt_at(delay: float, now: datetime | None = None) -> str:
+    """NextAttemptAt value (UTC, same format as SQLite's datetime('now'))."""
+    now = now or datetime.now(timezone.utc)
+    return (now + timedelta(seconds=delay)).strftime("%Y-%m-%d %H:%M:%S")
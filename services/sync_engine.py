@@ -0,0 +1,382 @@
+import json
+import logging
+import os
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from services.attachment_upload import UploadCancelled, discard_staged
+from services.idempotency import IDEMPOTENT_OPERATIONS, attachment_key, comment_key, operation_key, worklog_key
+from services.sync_backoff import (
+    RUN_HALTING_CLASSES, classify_error, next_attempt_at, retry_after_seconds, retry_delay
+)
+from services.worklog_coalescer import coalesce_pending_worklogs
+
+
+# Esito di _execute per un upload interrotto da stop()
+_CANCELLED = object()
+
+
+class SyncEngine:
+    """
+    Pushes the operations of the SyncQueue table to Jira.
+
+    Pending operations are claimed atomically (Status "Processing"), grouped by
+    issue and sent with a bounded pool of threads: different issues proceed in
+    parallel, while the operations of the same issue keep their queue order.
+    When an operation fails, the following ones of the same issue are put back
+    in the queue untouched so the order is preserved in the next run.
+    Blocking: call run() from a worker thread.
+
+    Worklogs, comments and attachments that were already sent once
+    (Attempts > 0) may have reached Jira even if the run did not record it
+    (crash, timeout): before sending them again the engine reads the issue's
+    worklogs/comments/attachments with one request each and marks as done,
+    without re-posting, the operations whose idempotency key matches an item
+    already on the server.
+
+    Attachments are streamed from their staged copy (services.attachment_upload)
+    with progress reported to upload_progress_callback; stop() aborts the
+    uploads in flight and puts them back in the queue.
+
+    A failed operation is retried later with a backoff that depends on the
+    error class (see services.sync_backoff), or marked "Failed" when the error
+    is permanent or the retry limit is reached. Authentication, rate-limit and
+    network errors concern every operation: the run stops sending and puts the
+    remaining operations back in the queue, due together with the failed one.
+
+    With coalesce_worklogs the pending worklogs of the same issue, day and
+    comment are merged before the claim (see services.worklog_coalescer).
+
+    After the queue, the local priority changes of the PriorityUpdates table
+    are pushed in batches of priority_batch_size, with the same pool; the
+    outcomes of each batch are recorded in one transaction.
+    """
+
+    def __init__(self, db_service, jira_service, max_workers: int = 4, coalesce_worklogs: bool = False,
+                 priority_batch_size: int = 50):
+        self.db_service = db_service
+        self.jira_service = jira_service
+        self.max_workers = max_workers
+        self.coalesce_worklogs = coalesce_worklogs
+        self.priority_batch_size = priority_batch_size
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+        self._halted_until = None
+        self._upload_progress_callback = None
+        self._logger = logging.getLogger('JiraTimeTracker')
+        self._handlers = {
+            "ADD_WORKLOG": self._handle_add_worklog,
+            "ADD_COMMENT": self._handle_add_comment,
+            "ADD_ATTACHMENT": self._handle_add_attachment,
+            "UPDATE_PRIORITY": self._handle_update_priority,
+        }
+
+    def stop(self):
+        """Stops the run after the operations already in flight."""
+        self._cancelled.set()
+
+    def run(self, progress_callback=None, upload_progress_callback=None) -> dict:
+        """
+        Processes the pending operations, then the pending priority changes.
+
+        Args:
+            progress_callback: optional callable(done, total, operation_id, error)
+                called from the pool threads after each operation (error is None
+                on success)
+            upload_progress_callback: optional callable(operation_id, bytes_sent,
+                total_bytes) called from the pool threads while an attachment
+                is uploaded (at most once per percent)
+
+        Returns:
+            dict with 'total', 'succeeded', 'failed' (operations marked
+            "Failed"), 'rescheduled' (failed attempts that will be retried),
+            'released' (operations put back in the queue without being
+            attempted), 'already_applied' (operations found on the server
+            and not sent again, counted in 'succeeded' too), 'coalesced'
+            (worklogs merged into another one before the claim) and
+            'priorities_synced'/'priorities_failed' (PriorityUpdates rows
+            pushed / failed, including the ones that will be retried)
+        """
+        summary = {'total': 0, 'succeeded': 0, 'failed': 0, 'rescheduled': 0, 'released': 0,
+                   'already_applied': 0, 'coalesced': 0, 'priorities_synced': 0, 'priorities_failed': 0}
+        if not self.jira_service or not self.jira_service.is_connected():
+            return summary
+
+        # Operazioni rimaste "Processing" da un'esecuzione interrotta
+        self.db_service.reset_interrupted_sync_operations()
+        if self.coalesce_worklogs:
+            try:
+                summary['coalesced'] = coalesce_pending_worklogs(self.db_service)
+            except Exception as e:
+                # I worklog vengono comunque inviati, uno per uno
+                self._logger.error("Worklog coalescing failed: %s", e)
+        self._halted_until = None
+        self._upload_progress_callback = upload_progress_callback
+        with ThreadPoolExecutor(max_workers=max(1, self.max_workers), thread_name_prefix="SyncEngine") as pool:
+            self._process_queue(pool, summary, progress_callback)
+            if not self._cancelled.is_set() and self._halted_until is None:
+                self._push_priority_updates(pool, summary)
+
+        self._logger.info("Sync run finished: %s", summary)
+        return summary
+
+    def _process_queue(self, pool, summary, progress_callback):
+        operations = self.db_service.claim_sync_operations()
+        if not operations:
+            return
+        summary['total'] = len(operations)
+
+        groups = OrderedDict()
+        for operation in operations:
+            groups.setdefault(self._group_key(operation), []).append(operation)
+
+        state = {'done': 0}
+
+        def _report(operation_id, error, retry_at=None):
+            with self._lock:
+                state['done'] += 1
+                if error is None:
+                    summary['succeeded'] += 1
+                elif retry_at is not None:
+                    summary['rescheduled'] += 1
+                else:
+                    summary['failed'] += 1
+                done = state['done']
+            if progress_callback:
+                try:
+                    progress_callback(done, summary['total'], operation_id, error)
+                except Exception as e:
+                    self._logger.debug("Sync progress callback failed: %s", e)
+
+        def _process_group(group):
+            if self._halted_until is not None:
+                self._release(group, summary, self._halted_until)
+                return
+            try:
+                applied = self._applied_on_server(group)
+            except Exception as e:
+                # Senza la verifica un nuovo invio potrebbe creare duplicati: si riprova più tardi
+                operation_id, op_type, _payload, attempts, _key = group[0]
+                error_message, retry_at = self._record_failure(
+                    operation_id, op_type, attempts, e, f"Duplicate check failed: {e}")
+                _report(operation_id, error_message, retry_at)
+                self._release(group[1:], summary, retry_at)
+                return
+
+            for index, (operation_id, op_type, payload, attempts, key) in enumerate(group):
+                if self._cancelled.is_set():
+                    self._release(group[index:], summary)
+                    return
+                if self._halted_until is not None:
+                    self._release(group[index:], summary, self._halted_until)
+                    return
+                key = key or operation_key(op_type, payload)
+                if attempts and key and applied[key] > 0:
+                    applied[key] -= 1
+                    self._logger.info("Sync item %s (%s) already on Jira, not sent again", operation_id, op_type)
+                    self.db_service.update_sync_operation_status(operation_id, "Success")
+                    if op_type == "ADD_WORKLOG":
+                        self._update_local_worklogs(payload, "Synced")
+                    elif op_type == "ADD_ATTACHMENT":
+                        discard_staged(json.loads(payload))
+                    with self._lock:
+                        summary['already_applied'] += 1
+                    _report(operation_id, None)
+                    continue
+                error, retry_at = self._execute(operation_id, op_type, payload, attempts)
+                if error is _CANCELLED:
+                    # Upload interrotto da stop(): torna in coda con le successive
+                    self._release(group[index:], summary)
+                    return
+                _report(operation_id, error, retry_at)
+                if error is not None:
+                    # Le operazioni successive sulla stessa issue restano in coda, in ordine:
+                    # non partono prima del nuovo tentativo di quella fallita
+                    self._release(group[index + 1:], summary, retry_at)
+                    return
+
+        for future in [pool.submit(_process_group, group) for group in groups.values()]:
+            future.result()
+
+    def _push_priority_updates(self, pool, summary):
+        """Pushes the due rows of PriorityUpdates, one per issue, in batches."""
+        now = next_attempt_at(0)
+        latest = OrderedDict()
+        # Ordered by UpdatedAt: the last edit of an issue wins
+        for update in self.db_service.get_all_priority_updates():
+            latest.pop(update['jira_key'], None)
+            latest[update['jira_key']] = update
+        updates = [u for u in latest.values() if not u.get('next_attempt_at') or u['next_attempt_at'] <= now]
+
+        for start in range(0, len(updates), self.priority_batch_size):
+            if self._cancelled.is_set() or self._halted_until is not None:
+                return
+            results = list(pool.map(self._push_priority_update, updates[start:start + self.priority_batch_size]))
+            self.db_service.record_priority_update_results(results)
+            for result in results:
+                summary['priorities_synced' if result['status'] == 'synced' else 'priorities_failed'] += 1
+
+    def _push_priority_update(self, update) -> dict:
+        result = {'jira_key': update['jira_key'], 'priority_id': update['priority_id'],
+                  'version': update['version'], 'status': 'synced', 'error': None, 'next_attempt_at': None}
+        if self._halted_until is not None:
+            # Run interrotto da un altro elemento del batch: si riprova insieme
+            result.update(status='pending', next_attempt_at=self._halted_until)
+            return result
+        try:
+            self.jira_service.set_issue_priority(update['jira_key'], update['priority_id'])
+        except Exception as e:
+            error_class = classify_error(e)
+            delay = retry_delay(error_class, (update.get('attempts') or 0) + 1, retry_after_seconds(e))
+            result['error'] = str(e) or e.__class__.__name__
+            if delay is None:
+                result['status'] = 'failed'
+                self._logger.error("Priority update of %s failed (%s): %s",
+                                   update['jira_key'], error_class, result['error'])
+            else:
+                result.update(status='pending', next_attempt_at=next_attempt_at(delay))
+                self._logger.warning("Priority update of %s failed (%s), retry at %s UTC: %s",
+                                     update['jira_key'], error_class, result['next_attempt_at'], result['error'])
+                if error_class in RUN_HALTING_CLASSES:
+                    with self._lock:
+                        if self._halted_until is None or result['next_attempt_at'] > self._halted_until:
+                            self._halted_until = result['next_attempt_at']
+        return result
+
+    @staticmethod
+    def _group_key(operation):
+        try:
+            jira_key = json.loads(operation[2]).get("jira_key")
+        except (TypeError, ValueError, AttributeError):
+            jira_key = None
+        # Without an issue key the operation is independent of every other one
+        return jira_key or f"#{operation[0]}"
+
+    def _applied_on_server(self, group) -> Counter:
+        """
+        Idempotency keys of the worklogs/comments already on the issue, read
+        only if some operation of the group may have been sent before.
+        """
+        applied = Counter()
+        retried = {op[1] for op in group if op[3] and op[1] in IDEMPOTENT_OPERATIONS}
+        if not retried:
+            return applied
+        issue_key = json.loads(group[0][2]).get("jira_key")
+        if "ADD_WORKLOG" in retried:
+            for worklog in self.jira_service.get_issue_worklogs(issue_key):
+                applied[worklog_key(issue_key, worklog.get('started'), worklog.get('timeSpentSeconds'),
+                                    worklog.get('comment'))] += 1
+        if "ADD_COMMENT" in retried:
+            for comment in self.jira_service.get_issue_comments(issue_key):
+                applied[comment_key(issue_key, comment.get('body'))] += 1
+        if "ADD_ATTACHMENT" in retried:
+            for attachment in self.jira_service.get_issue_attachments(issue_key):
+                applied[attachment_key(issue_key, attachment.get('filename'), attachment.get('size'))] += 1
+        return applied
+
+    def _release(self, operations, summary, next_attempt=None):
+        if not operations:
+            return
+        self.db_service.release_sync_operations([operation[0] for operation in operations], next_attempt)
+        with self._lock:
+            summary['released'] += len(operations)
+
+    def _execute(self, operation_id, op_type, payload_str, attempts):
+        """
+        Runs one operation and records its outcome.
+        Returns (error message, next attempt) - (None, None) on success.
+        """
+        try:
+            payload = json.loads(payload_str)
+            handler = self._handlers.get(op_type)
+            if handler is None:
+                raise ValueError(f"Unknown operation type: {op_type}")
+            handler(payload, operation_id)
+        except UploadCancelled:
+            return _CANCELLED, None
+        except Exception as e:
+            error_message, retry_at = self._record_failure(
+                operation_id, op_type, attempts, e, str(e) or e.__class__.__name__)
+            if retry_at is None and op_type == "ADD_WORKLOG":
+                self._update_local_worklogs(payload_str, "Failed")
+            return error_message, retry_at
+        self.db_service.update_sync_operation_status(operation_id, "Success")
+        if op_type == "ADD_WORKLOG":
+            self._update_local_worklogs(payload_str, "Synced")
+        elif op_type == "ADD_ATTACHMENT":
+            discard_staged(payload)
+        return None, None
+
+    def _update_local_worklogs(self, payload_str, status):
+        """Mirrors the outcome of a worklog on its LocalWorklogHistory entries."""
+        try:
+            local_ids = json.loads(payload_str).get("local_worklog_ids") or []
+            if local_ids:
+                self.db_service.update_local_worklogs_sync_status(local_ids, status)
+        except Exception as e:
+            self._logger.debug("Could not update local worklog status: %s", e)
+
+    def _record_failure(self, operation_id, op_type, attempts, error, error_message):
+        """
+        Schedules the retry of a failed operation, or marks it "Failed" when the
+        error is permanent or the retry limit is reached.
+        Returns (error message, next attempt or None).
+        """
+        error_class = classify_error(error)
+        # attempts is the value before this run's claim
+        delay = retry_delay(error_class, attempts + 1, retry_after_seconds(error))
+        if delay is None:
+            self._logger.error("Failed to sync item %s (%s, %s): %s", operation_id, op_type, error_class, error_message)
+            self.db_service.update_sync_operation_status(operation_id, "Failed", error_message, error_class)
+            return error_message, None
+
+        retry_at = next_attempt_at(delay)
+        self._logger.warning("Sync item %s (%s) failed (%s), retry at %s UTC: %s",
+                             operation_id, op_type, error_class, retry_at, error_message)
+        self.db_service.reschedule_sync_operation(operation_id, retry_at, error_message, error_class)
+        if error_class in RUN_HALTING_CLASSES:
+            with self._lock:
+                if self._halted_until is None or retry_at > self._halted_until:
+                    self._halted_until = retry_at
+        return error_message, retry_at
+
+    def _handle_add_worklog(self, payload, operation_id):
+        # The payload is written by two code paths with different names for the duration
+        seconds = payload.get("time_spent_seconds", payload.get("seconds"))
+        if not seconds:
+            raise ValueError("Worklog without duration")
+        self.jira_service.add_worklog(
+            payload["jira_key"],
+            seconds,
+            started=payload.get("start_time"),
+            comment=payload.get("comment", "")
+        )
+
+    def _handle_add_comment(self, payload, operation_id):
+        self.jira_service.add_comment(payload["jira_key"], payload["body"])
+
+    def _handle_add_attachment(self, payload, operation_id):
+        callback = self._upload_progress_callback
+        last_percent = [-1]
+
+        def _on_progress(sent, total):
+            percent = sent * 100 // total if total else 100
+            if callback and percent != last_percent[0]:
+                last_percent[0] = percent
+                callback(operation_id, sent, total)
+
+        # La copia in staging resta fino al successo o alla cancellazione dell'operazione
+        if not os.path.exists(payload["file_path"]):
+            raise FileNotFoundError(f"Staged copy of {payload.get('file_name')} is missing: {payload['file_path']}")
+        self.jira_service.upload_attachment(
+            payload["jira_key"],
+            payload["file_path"],
+            file_name=payload.get("file_name"),
+            progress_callback=_on_progress,
+            cancel_event=self._cancelled
+        )
+
+    def _handle_update_priority(self, payload, operation_id):
+        # Queued by older versions: priority changes now go through PriorityUpdates
+        self.jira_service.set_issue_priority(payload["jira_key"], payload["priority_id"])
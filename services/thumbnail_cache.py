@@ -0,0 +1,190 @@
+"""
+Persistent on-disk cache of the thumbnails of image attachments.
+
+Thumbnails are small PNG files keyed by (attachment id, size) and indexed in
+the Thumbnails table, so opening an issue again is served from disk without
+network traffic. On a miss the thumbnail is generated on a bounded worker
+pool from the attachment stored locally (FileAttachments) when there is
+one, otherwise from a preview download through the DownloadManager; the
+full-size preview is removed once the thumbnail is saved.
+"""
+
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt6.QtCore import QObject, QStandardPaths, Qt, pyqtSignal
+from PyQt6.QtGui import QImage
+
+from services.download_manager import KIND_PREVIEW, get_download_manager
+
+logger = logging.getLogger('JiraTimeTracker')
+
+THUMBNAIL_SIZE = 64
+MAX_WORKERS = 2
+
+
+def default_cache_dir() -> str:
+    cache_dir = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.CacheLocation)
+    return os.path.join(cache_dir, "thumbnails")
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_thumbnail_cache(db_service, jira_service) -> "ThumbnailCache":
+    """The application's ThumbnailCache, created on first use."""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = ThumbnailCache(db_service, get_download_manager(db_service, jira_service))
+        return _shared_cache
+
+
+class ThumbnailCache(QObject):
+    """
+    Thumbnails of image attachments, generated once and kept on disk.
+
+    Signals are emitted from the worker threads: connected slots of objects
+    living in the UI thread are called there (queued connection).
+    """
+
+    thumbnail_ready = pyqtSignal(str, int, str)   # attachment id, size, thumbnail file path
+    thumbnail_failed = pyqtSignal(str, int, str)  # attachment id, size, error message
+
+    def __init__(self, db_service, download_manager, cache_dir: str = None, max_workers: int = MAX_WORKERS,
+                 parent=None):
+        super().__init__(parent)
+        self.db_service = db_service
+        self.download_manager = download_manager
+        self.cache_dir = cache_dir or default_cache_dir()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="Thumbnail")
+        self._lock = threading.Lock()
+        self._pending = {}  # (attachment id, size) -> preview path or None, for the thumbnails in progress
+        self._previews = {}  # preview path -> [(attachment id, size)], for the preview downloads in progress
+        self._preview_downloads = {}  # attachment id -> download id
+
+        # DirectConnection: la generazione parte dal thread del download, senza passare dalla UI
+        download_manager.item_finished.connect(self._on_preview_downloaded, Qt.ConnectionType.DirectConnection)
+        download_manager.item_failed.connect(self._on_preview_failed, Qt.ConnectionType.DirectConnection)
+        download_manager.item_cancelled.connect(self._on_preview_cancelled, Qt.ConnectionType.DirectConnection)
+
+    def cached_path(self, attachment_id: str, size: int = THUMBNAIL_SIZE) -> str | None:
+        """Path of the cached thumbnail, or None if it has not been generated yet."""
+        path = self.db_service.get_thumbnail(str(attachment_id), size)
+        if path and os.path.isfile(path):
+            return path
+        return None
+
+    def request(self, jira_key: str, attachment: dict, size: int = THUMBNAIL_SIZE) -> str | None:
+        """
+        Returns the path of the cached thumbnail of an attachment, or None after
+        starting its generation: thumbnail_ready or thumbnail_failed follows.
+        """
+        attachment_id = str(attachment.get('id'))
+        path = self.cached_path(attachment_id, size)
+        if path:
+            return path
+
+        key = (attachment_id, size)
+        with self._lock:
+            if key in self._pending:
+                return None
+            self._pending[key] = None
+
+        stored = self.db_service.get_file_attachment(jira_key, attachment_id)
+        if stored and os.path.isfile(stored['file_path']):
+            # Already downloaded: no network traffic
+            self._executor.submit(self._generate, [key], stored['file_path'], False)
+            return None
+
+        preview_path = os.path.join(self.cache_dir, "previews", f"{attachment_id}_{attachment.get('filename')}")
+        with self._lock:
+            self._pending[key] = preview_path
+            self._previews.setdefault(preview_path, []).append(key)
+        download_id = self.download_manager.enqueue(
+            KIND_PREVIEW, jira_key, attachment_id, attachment.get('filename'), preview_path,
+            total_bytes=attachment.get('size'), url=attachment.get('content'),
+            mime_type=attachment.get('mimeType')
+        )
+        with self._lock:
+            self._preview_downloads[attachment_id] = download_id
+        if not self.download_manager.is_active(download_id):
+            # Ended before being tracked: if it failed, its signal found nothing to drop
+            with self._lock:
+                failed = preview_path in self._previews
+            if failed:
+                self._drop_preview(download_id, "Download dell'anteprima non riuscito")
+        return None
+
+    def cancel(self, attachment_id: str):
+        """Stops the preview download of a thumbnail no longer needed (its generation is not stopped)."""
+        with self._lock:
+            download_id = self._preview_downloads.get(str(attachment_id))
+        if download_id is not None:
+            self.download_manager.cancel(download_id)
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _on_preview_downloaded(self, download_id: int, file_path: str):
+        with self._lock:
+            keys = self._previews.pop(file_path, None)
+        if keys:
+            self._executor.submit(self._generate, keys, file_path, True)
+
+    def _on_preview_failed(self, download_id: int, error_message: str):
+        self._drop_preview(download_id, error_message)
+
+    def _on_preview_cancelled(self, download_id: int):
+        self._drop_preview(download_id, "Download annullato")
+
+    def _drop_preview(self, download_id: int, error_message: str):
+        with self._lock:
+            attachment_ids = [a for a, d in self._preview_downloads.items() if d == download_id]
+            keys = [k for k, preview in self._pending.items() if k[0] in attachment_ids and preview is not None]
+            for attachment_id in attachment_ids:
+                del self._preview_downloads[attachment_id]
+            for key in keys:
+                self._previews.pop(self._pending.pop(key), None)
+        for attachment_id, size in keys:
+            self.thumbnail_failed.emit(attachment_id, size, error_message)
+
+    def _generate(self, keys: list, source_path: str, is_preview: bool):
+        """Saves the thumbnails (attachment id, size) of the image at source_path."""
+        # QImage (non QPixmap): utilizzabile fuori dal thread della UI
+        image = QImage(source_path)
+        results = []
+        for attachment_id, size in keys:
+            try:
+                if image.isNull():
+                    raise ValueError("Impossibile caricare l'immagine")
+                thumbnail = image.scaled(size, size, Qt.AspectRatioMode.KeepAspectRatio,
+                                         Qt.TransformationMode.SmoothTransformation)
+                path = os.path.join(self.cache_dir, f"{attachment_id}_{size}.png")
+                if not thumbnail.save(path, "PNG"):
+                    raise OSError(f"Impossibile salvare la miniatura {path}")
+                self.db_service.save_thumbnail(attachment_id, size, path)
+                results.append((attachment_id, size, path, None))
+            except Exception as e:
+                logger.warning(f"Thumbnail of attachment {attachment_id} not generated: {e}")
+                results.append((attachment_id, size, None, str(e)))
+
+        with self._lock:
+            for key in keys:
+                self._pending.pop(key, None)
+                if is_preview:
+                    self._preview_downloads.pop(key[0], None)
+        if is_preview:
+            try:
+                os.remove(source_path)
+            except OSError:
+                pass
+        for attachment_id, size, path, error in results:
+            if error is None:
+                self.thumbnail_ready.emit(attachment_id, size, path)
+            else:
+                self.thumbnail_failed.emit(attachment_id, size, error)
@@ -0,0 +1,101 @@
+"""
+Worklog coalescing for the sync queue.
+
+Pending worklogs of the same issue, started on the same (local) day and with
+the same comment are merged into a single worklog before being sent to Jira.
+Rules:
+  * only operations never sent (Status "Pending", Attempts 0) are merged: an
+    operation already attempted may be on the server (see idempotency)
+  * the merged worklog starts at the earliest start time
+  * its duration is the sum of the tracked seconds of the merged entries
+    ("tracked_seconds", or the queued duration when missing) rounded up to
+    the minute once, instead of once per entry
+  * the oldest operation survives with the merged payload, the others are
+    marked "Merged"; the same is done on LocalWorklogHistory (MergedIntoId),
+    so the detail view shows the merged entry
+"""
+
+import json
+import math
+from datetime import datetime
+
+from services.idempotency import normalize_text, operation_key
+
+
+def _parse_start(start_time):
+    """Start time as an aware local datetime (naive values are local time), or None."""
+    try:
+        return datetime.fromisoformat(start_time).astimezone()
+    except (TypeError, ValueError):
+        return None
+
+
+def _tracked_seconds(payload) -> int:
+    tracked = payload.get("tracked_seconds")
+    if tracked is None:
+        tracked = payload.get("time_spent_seconds", payload.get("seconds"))
+    return int(tracked or 0)
+
+
+def round_up_to_minute(seconds: int) -> int:
+    return max(1, math.ceil(seconds / 60)) * 60
+
+
+def plan_worklog_merges(operations) -> list:
+    """
+    Groups the coalescible operations (Id, Payload, NextAttemptAt), oldest
+    first, and returns one merge per group of two or more operations.
+    """
+    groups = {}
+    for operation_id, payload_str, next_attempt in operations:
+        try:
+            payload = json.loads(payload_str)
+        except (TypeError, ValueError):
+            continue
+        if not isinstance(payload, dict) or not payload.get("jira_key"):
+            continue
+        started = _parse_start(payload.get("start_time"))
+        if started is None:
+            continue
+        key = (payload["jira_key"], started.date(), normalize_text(payload.get("comment")))
+        groups.setdefault(key, []).append((operation_id, payload, next_attempt))
+
+    merges = []
+    for group in groups.values():
+        if len(group) < 2:
+            continue
+        group.sort(key=lambda item: item[0])
+        payloads = [payload for _op_id, payload, _next in group]
+        tracked = sum(_tracked_seconds(payload) for payload in payloads)
+        start_time = min((payload["start_time"] for payload in payloads), key=_parse_start)
+        local_ids = [local_id for payload in payloads for local_id in payload.get("local_worklog_ids", [])]
+
+        merged = dict(payloads[0])
+        merged.pop("seconds", None)
+        merged.update({
+            "start_time": start_time,
+            "time_spent_seconds": round_up_to_minute(tracked),
+            "tracked_seconds": tracked,
+            "local_worklog_ids": local_ids,
+        })
+        merges.append({
+            "survivor_id": group[0][0],
+            "merged_ids": [op_id for op_id, _payload, _next in group[1:]],
+            "payload": json.dumps(merged),
+            "idempotency_key": operation_key("ADD_WORKLOG", merged),
+            # Non anticipa operazioni in attesa dietro a un tentativo fallito
+            "next_attempt_at": max((next_at for _op_id, _payload, next_at in group if next_at), default=None),
+            "local_survivor_id": local_ids[0] if local_ids else None,
+            "local_merged_ids": local_ids[1:],
+            "local_duration": round_up_to_minute(tracked),
+            "local_start_time": start_time,
+        })
+    return merges
+
+
+def coalesce_pending_worklogs(db_service) -> int:
+    """Merges the coalescible pending worklogs; returns how many operations were merged away."""
+    merges = plan_worklog_merges(db_service.get_coalescible_worklog_operations())
+    if not merges:
+        return 0
+    return db_service.apply_worklog_merges(merges)
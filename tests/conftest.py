@@ -0,0 +1,47 @@
+import pytest
+
+from services.app_settings import AppSettings
+from services.db_service import DatabaseService
+
+
+@pytest.fixture
+def db(tmp_path):
+    """An initialized database in the test's temporary directory."""
+    db_file = tmp_path / "test_jira.db"
+    db = DatabaseService(db_name=str(db_file.name))
+    db.db_path = str(db_file)
+    db.initialize_db()
+    return db
+
+
+@pytest.fixture
+def make_controller(db, qtbot):
+    """
+    Factory of MainControllers on a real database and the given Jira service,
+    online and without network monitoring: make_controller(jira_service,
+    settings=None). The controllers of a test share its database, like two
+    sessions of the app. Their threads are waited for at teardown.
+    """
+    from views.main_window import MainWindow
+    from controllers.main_controller import MainController
+
+    controllers = []
+
+    def _make(jira_service, settings=None):
+        app_settings = AppSettings(db)
+        for key, value in (settings or {}).items():
+            app_settings.set_setting(key, value)
+
+        main = MainWindow()
+        qtbot.addWidget(main)
+        controller = MainController(main, db_service=db, jira_service=jira_service, app_settings=app_settings)
+        controller.network_service.stop_monitoring()
+        controller.is_internet_available = True
+        controller.is_jira_available = True
+        controllers.append(controller)
+        return controller
+
+    yield _make
+    # A QThread still running when its controller is destroyed aborts the test run
+    qtbot.waitUntil(lambda: all(not c._active_threads and c.notification_controller._check_thread is None
+                                for c in controllers), timeout=5000)
@@ -0,0 +1,69 @@
+import threading
+
+from services.jira_service import JiraService
+
+
+def connected_service(server, **kwargs):
+    """A JiraService connected to the stand-in server, without waits between retries (one by default)."""
+    kwargs.setdefault('max_retries', 1)
+    service = JiraService(sleep_func=lambda s: None, **kwargs)
+    service.connect(server.url, 'token')
+    return service
+
+
+class FakeSettings:
+    """AppSettings kept in memory, holding only the attachments directory."""
+
+    def __init__(self, attachments_dir):
+        self.values = {"attachments_dir": attachments_dir}
+
+    def get_setting(self, key, default=None):
+        return self.values.get(key, default)
+
+    def set_setting(self, key, value):
+        self.values[key] = value
+
+
+def make_issues(titles, prefix='PRJ', status='Open'):
+    """Search results with the given summaries, keyed <prefix>-0, <prefix>-1, ..."""
+    return [{'key': f'{prefix}-{i}', 'fields': {'summary': title, 'status': {'name': status},
+                                                 'updated': '2025-01-01T10:00:00.000+0000'}}
+            for i, title in enumerate(titles)]
+
+
+class FakeJiraService:
+    """
+    Jira service answering searches and counts from a list of issues.
+
+    The JQL of every search is recorded in `jqls`. `before_search`, if given,
+    is called as before_search(jql, start_at) before answering, from the
+    requesting thread: tests use it to hold or slow down some requests.
+    `server_cap` caps maxResults like Jira does.
+    """
+
+    def __init__(self, issues=(), server_cap=None, before_search=None):
+        self.issues = list(issues)
+        self.server_cap = server_cap
+        self.before_search = before_search
+        self.jqls = []
+        self.search_calls = 0
+        self.count_calls = 0
+        self._lock = threading.Lock()
+
+    def is_connected(self):
+        return True
+
+    def count_issues(self, jql, issue_keys=None):
+        with self._lock:
+            self.count_calls += 1
+        return len(self.issues)
+
+    def search_issues(self, jql, start_at=0, max_results=100, issue_keys=None):
+        with self._lock:
+            self.search_calls += 1
+            self.jqls.append(jql)
+        if self.before_search:
+            self.before_search(jql, start_at)
+        if self.server_cap:
+            max_results = min(max_results, self.server_cap)
+        return self.issues[start_at:start_at + max_results]
@@ -0,0 +1,757 @@
+"""
+Stand-in locale di Jira per test di carico e benchmark ripetibili.
+
+Implementa (sottoinsieme REST v2) gli endpoint usati dall'applicazione:
+serverInfo, myself, field, search, issue (GET/PUT), comment, worklog,
+watchers, attachments, contenuto degli allegati, priority, status,
+issuetype e issueLinkType.
+
+Funzionalità:
+- dataset sintetici di dimensione arbitraria (JiraDataset.synthetic)
+- latenza configurabile e iniezione di errori 429/5xx/timeout (FaultConfig)
+- modalità record/replay: in "record" le richieste vengono inoltrate a un
+  Jira reale e salvate in una cassetta JSON, in "replay" vengono servite
+  dalla cassetta in modo deterministico, senza rete.
+
+Uso tipico:
+
+    with JiraStandIn(JiraDataset.synthetic(2000), FaultConfig(latency=0.05)) as standin:
+        service = JiraService()
+        service.connect(standin.url, "token")
+
+Può essere avviato anche da riga di comando:
+
+    python tests/jira_standin.py --issues 2000 --latency 0.05 --port 8089
+"""
+import hashlib
+import json
+import random
+import re
+import socket
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+API = '/rest/api/2'
+
+PRIORITIES = [
+    {'id': '1', 'name': 'Highest'},
+    {'id': '2', 'name': 'High'},
+    {'id': '3', 'name': 'Medium'},
+    {'id': '4', 'name': 'Low'},
+    {'id': '5', 'name': 'Lowest'},
+]
+STATUSES = [
+    {'id': '1', 'name': 'To Do', 'statusCategory': {'key': 'new'}},
+    {'id': '3', 'name': 'In Progress', 'statusCategory': {'key': 'indeterminate'}},
+    {'id': '10001', 'name': 'In Review', 'statusCategory': {'key': 'indeterminate'}},
+    {'id': '6', 'name': 'Done', 'statusCategory': {'key': 'done'}},
+]
+ISSUE_TYPES = [
+    {'id': '1', 'name': 'Bug', 'subtask': False},
+    {'id': '3', 'name': 'Task', 'subtask': False},
+    {'id': '5', 'name': 'Sub-task', 'subtask': True},
+]
+LINK_TYPES = [
+    {'id': '10000', 'name': 'Blocks', 'inward': 'is blocked by', 'outward': 'blocks'},
+    {'id': '10001', 'name': 'Relates', 'inward': 'relates to', 'outward': 'relates to'},
+]
+
+
+def jira_timestamp(dt: datetime) -> str:
+    """Formato data usato da Jira: 2024-01-31T10:20:30.000+0000"""
+    dt = dt.astimezone(timezone.utc)
+    return dt.strftime('%Y-%m-%dT%H:%M:%S.') + f'{dt.microsecond // 1000:03d}+0000'
+
+
+class JiraDataset:
+    """Dati in memoria serviti dallo stand-in. Thread-safe tramite un lock."""
+
+    def __init__(self, user_name='standin.user', display_name='Stand-in User'):
+        self.lock = threading.RLock()
+        self.user = {
+            'name': user_name,
+            'key': user_name,
+            'accountId': user_name,
+            'displayName': display_name,
+            'emailAddress': f'{user_name}@example.com',
+            'active': True,
+        }
+        self.issues = {}                 # key -> issue json (id, key, fields)
+        self.keys_by_id = {}             # id -> key (il client usa anche gli ID negli URL)
+        self.order = []                  # keys in search order
+        self.comments = defaultdict(list)
+        self.worklogs = defaultdict(list)
+        self.watchers = defaultdict(list)
+        self.attachments = {}            # id -> {'meta': dict, 'content': bytes}
+        self._next_id = 10000
+
+    def next_id(self) -> str:
+        with self.lock:
+            self._next_id += 1
+            return str(self._next_id)
+
+    @classmethod
+    def synthetic(cls, issue_count=100, project='PRJ', comments_per_issue=2,
+                  attachments_per_issue=0, attachment_size=64 * 1024, seed=1234):
+        """Genera un dataset deterministico con issue_count ticket."""
+        rnd = random.Random(seed)
+        dataset = cls()
+        base = datetime(2024, 1, 1, 9, 0, tzinfo=timezone.utc)
+        for n in range(1, issue_count + 1):
+            key = f'{project}-{n}'
+            created = base + timedelta(hours=n)
+            priority = rnd.choice(PRIORITIES)
+            status = rnd.choice(STATUSES)
+            dataset.add_issue(key, {
+                'summary': f'Synthetic issue {n}',
+                'status': dict(status),
+                'priority': dict(priority),
+                'issuetype': dict(rnd.choice(ISSUE_TYPES[:2])),
+                'timespent': rnd.choice([None, 0, 900, 3600, 5400, 28800]),
+                'created': jira_timestamp(created),
+                'updated': jira_timestamp(created + timedelta(minutes=rnd.randint(0, 5000))),
+                'description': f'Description of {key}',
+            })
+            for c in range(comments_per_issue):
+                dataset.add_comment(key, f'Comment {c + 1} on {key}',
+                                    created=created + timedelta(minutes=30 * (c + 1)))
+            for a in range(attachments_per_issue):
+                content = bytes(rnd.getrandbits(8) for _ in range(min(attachment_size, 4096)))
+                # Ripete il blocco casuale fino alla dimensione richiesta (generazione veloce)
+                content = (content * (attachment_size // max(len(content), 1) + 1))[:attachment_size]
+                dataset.add_attachment(key, f'file_{a + 1}.bin', content)
+            dataset.watchers[key].append(dict(dataset.user))
+        return dataset
+
+    def add_issue(self, key, fields):
+        with self.lock:
+            issue_id = self.next_id()
+            fields = dict(fields)
+            fields.setdefault('attachment', [])
+            fields.setdefault('issuelinks', [])
+            self.issues[key] = {'id': issue_id, 'key': key, 'fields': fields}
+            self.keys_by_id[issue_id] = key
+            self.order.append(key)
+            return self.issues[key]
+
+    def touch(self, key):
+        self.issues[key]['fields']['updated'] = jira_timestamp(datetime.now(timezone.utc))
+
+    def add_comment(self, key, body, created=None):
+        with self.lock:
+            ts = jira_timestamp(created or datetime.now(timezone.utc))
+            comment = {
+                'id': self.next_id(),
+                'body': body,
+                'author': dict(self.user),
+                'updateAuthor': dict(self.user),
+                'created': ts,
+                'updated': ts,
+            }
+            self.comments[key].append(comment)
+            if created is None and key in self.issues:
+                self.touch(key)
+            return comment
+
+    def add_worklog(self, key, data):
+        with self.lock:
+            now = jira_timestamp(datetime.now(timezone.utc))
+            worklog = {
+                'id': self.next_id(),
+                'issueId': self.issues[key]['id'],
+                'author': dict(self.user),
+                'comment': data.get('comment', ''),
+                'started': data.get('started') or now,
+                'timeSpentSeconds': int(data.get('timeSpentSeconds') or 0),
+                'created': now,
+                'updated': now,
+            }
+            self.worklogs[key].append(worklog)
+            fields = self.issues[key]['fields']
+            fields['timespent'] = (fields.get('timespent') or 0) + worklog['timeSpentSeconds']
+            self.touch(key)
+            return worklog
+
+    def add_attachment(self, key, filename, content, mime_type='application/octet-stream'):
+        with self.lock:
+            attachment_id = self.next_id()
+            meta = {
+                'id': attachment_id,
+                'filename': filename,
+                'size': len(content),
+                'mimeType': mime_type,
+                'created': jira_timestamp(datetime.now(timezone.utc)),
+                'author': dict(self.user),
+                # 'content' e 'self' vengono completati con l'URL del server in risposta
+                'content': f'/secure/attachment/{attachment_id}/{filename}',
+            }
+            self.attachments[attachment_id] = {'meta': meta, 'content': bytes(content), 'issue': key}
+            self.issues[key]['fields']['attachment'].append(meta)
+            return meta
+
+    # --- JQL (sottoinsieme) ---
+
+    _KEY_IN = re.compile(r'key\s+in\s*\(([^)]*)\)', re.IGNORECASE)
+    _PROJECT = re.compile(r'project\s*=\s*"?([A-Za-z0-9_]+)"?', re.IGNORECASE)
+    _UPDATED = re.compile(r'updated\s*(>=|>)\s*["\']([^"\']+)["\']', re.IGNORECASE)
+    _STATUS_NOT = re.compile(r'status\s*!=\s*"([^"]+)"', re.IGNORECASE)
+
+    def search(self, jql):
+        """
+        Valuta un sottoinsieme di JQL sufficiente per i flussi dell'app:
+        key in (...), project = X, status != "Y", updated > "yyyy-mm-dd hh:mm" | "-Nm".
+        Le altre clausole vengono ignorate (corrispondono a tutto).
+        """
+        jql = jql or ''
+        with self.lock:
+            keys = list(self.order)
+            match = self._KEY_IN.search(jql)
+            if match:
+                wanted = {k.strip().strip('"\'') for k in match.group(1).split(',') if k.strip()}
+                keys = [k for k in keys if k in wanted]
+            match = self._PROJECT.search(jql)
+            if match:
+                prefix = match.group(1).upper() + '-'
+                keys = [k for k in keys if k.upper().startswith(prefix)]
+            match = self._STATUS_NOT.search(jql)
+            if match:
+                excluded = match.group(1).lower()
+                keys = [k for k in keys if self.issues[k]['fields']['status']['name'].lower() != excluded]
+            match = self._UPDATED.search(jql)
+            if match:
+                op, value = match.groups()
+                threshold = _parse_jql_date(value)
+                if threshold is not None:
+                    def _newer(k):
+                        updated = _parse_jira_date(self.issues[k]['fields']['updated'])
+                        return updated > threshold if op == '>' else updated >= threshold
+                    keys = [k for k in keys if _newer(k)]
+            return keys
+
+
+def _parse_jira_date(value):
+    return datetime.strptime(value, '%Y-%m-%dT%H:%M:%S.%f%z')
+
+
+_RELATIVE_DATE = re.compile(r'^-(\d+)([mhdw])$')
+
+
+def _parse_jql_date(value):
+    relative = _RELATIVE_DATE.match(value.strip())
+    if relative:
+        amount, unit = int(relative.group(1)), relative.group(2)
+        delta = {'m': timedelta(minutes=amount), 'h': timedelta(hours=amount),
+                 'd': timedelta(days=amount), 'w': timedelta(weeks=amount)}[unit]
+        return datetime.now(timezone.utc) - delta
+    for fmt in ('%Y-%m-%d %H:%M', '%Y/%m/%d %H:%M', '%Y-%m-%d', '%Y/%m/%d'):
+        try:
+            return datetime.strptime(value.strip(), fmt).replace(tzinfo=timezone.utc)
+        except ValueError:
+            continue
+    return None
+
+
+class FaultConfig:
+    """
+    Latenza e iniezione di errori. Le probabilità sono per richiesta e si
+    escludono a vicenda (valutate in ordine: timeout, 429, 5xx).
+    """
+
+    def __init__(self, latency=0.0, jitter=0.0, rate_limit_rate=0.0, retry_after=1,
+                 server_error_rate=0.0, timeout_rate=0.0, timeout_delay=5.0,
+                 fail_first=0, fail_status=503, seed=None, paths=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.server_error_rate = server_error_rate
+        self.timeout_rate = timeout_rate
+        self.timeout_delay = timeout_delay
+        # Le prime N richieste falliscono sempre con fail_status (scenari deterministici)
+        self.fail_first = fail_first
+        self.fail_status = fail_status
+        # Se valorizzato, i guasti si applicano solo ai path che contengono una di queste stringhe
+        self.paths = paths
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._failed = 0
+
+    def applies_to(self, path):
+        return not self.paths or any(p in path for p in self.paths)
+
+    def delay(self):
+        with self._lock:
+            extra = self._random.uniform(0, self.jitter) if self.jitter else 0.0
+        return self.latency + extra
+
+    def pick_fault(self):
+        """Ritorna None, 'timeout' oppure uno status HTTP da restituire."""
+        with self._lock:
+            if self._failed < self.fail_first:
+                self._failed += 1
+                return self.fail_status
+            roll = self._random.random()
+        if roll < self.timeout_rate:
+            return 'timeout'
+        roll -= self.timeout_rate
+        if roll < self.rate_limit_rate:
+            return 429
+        roll -= self.rate_limit_rate
+        if roll < self.server_error_rate:
+            with self._lock:
+                return self._random.choice([500, 502, 503])
+        return None
+
+
+# Header delle risposte registrate: quelli di trasporto (Content-Length, Content-Encoding,
+# Transfer-Encoding, Connection...) non valgono per il body già decompresso che viene reinviato
+RECORDED_HEADERS = ('content-type', 'retry-after', 'content-range', 'accept-ranges')
+
+# Segnaposto dell'indirizzo del server nei body registrati, sostituito con quello dello stand-in
+STANDIN_URL_PLACEHOLDER = '{{standin_url}}'
+
+
+def _is_text(headers):
+    content_type = next((v for k, v in headers.items() if k.lower() == 'content-type'), '')
+    return any(kind in content_type for kind in ('json', 'text', 'xml'))
+
+
+def replace_base_url(headers, body, old_url, new_url):
+    """Sostituisce un indirizzo di server con un altro nei body testuali (gli allegati restano intatti)."""
+    if not body or not _is_text(headers):
+        return body
+    return body.replace(old_url.encode('utf-8'), new_url.encode('utf-8'))
+
+
+class Cassette:
+    """
+    Registrazioni richiesta/risposta per la modalità record/replay.
+    Le richieste sono identificate da metodo, path, query ordinata e hash del body;
+    richieste ripetute vengono riprodotte nell'ordine in cui sono state registrate.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.entries = defaultdict(list)
+        self._cursor = Counter()
+        self._lock = threading.Lock()
+        if path:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        if line.strip():
+                            entry = json.loads(line)
+                            self.entries[entry['request']].append(entry['response'])
+            except FileNotFoundError:
+                pass
+
+    @staticmethod
+    def request_id(method, path, query, body):
+        pairs = sorted((k, v) for k, values in parse_qs(query, keep_blank_values=True).items() for v in values)
+        digest = hashlib.sha1(body or b'').hexdigest()[:12] if body else '-'
+        return f'{method} {path}?{"&".join(f"{k}={v}" for k, v in pairs)} {digest}'
+
+    def record(self, request_id, status, headers, body):
+        response = {
+            'status': status,
+            'headers': {k: v for k, v in headers.items() if k.lower() in RECORDED_HEADERS},
+            'body': body.decode('latin-1'),
+        }
+        with self._lock:
+            self.entries[request_id].append(response)
+            if self.path:
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps({'request': request_id, 'response': response}) + '\n')
+
+    def replay(self, request_id):
+        with self._lock:
+            responses = self.entries.get(request_id)
+            if not responses:
+                return None
+            index = self._cursor[request_id]
+            self._cursor[request_id] += 1
+            # Oltre la fine si ripete l'ultima risposta registrata
+            response = responses[min(index, len(responses) - 1)]
+        return response['status'], response['headers'], response['body'].encode('latin-1')
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server_version = 'JiraStandIn/1.0'
+
+    def log_message(self, format, *args):  # noqa: A002 - firma di BaseHTTPRequestHandler
+        pass
+
+    def setup(self):
+        super().setup()
+        self.standin._track_connection(self.connection, True)
+
+    def finish(self):
+        self.standin._track_connection(self.connection, False)
+        super().finish()
+
+    @property
+    def standin(self):
+        return self.server.standin
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def do_PUT(self):
+        self._handle('PUT')
+
+    def do_DELETE(self):
+        self._handle('DELETE')
+
+    def _handle(self, method):
+        standin = self.standin
+        parts = urlsplit(self.path)
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        if len(body) < length:
+            # Il client ha interrotto l'invio (es. upload annullato): come Jira, nessun effetto
+            self.close_connection = True
+            return
+        standin._count(method, parts.path)
+
+        faults = standin.faults
+        if faults and faults.applies_to(parts.path):
+            delay = faults.delay()
+            if delay:
+                time.sleep(delay)
+            fault = faults.pick_fault()
+            if fault == 'timeout':
+                # Il client resta in attesa finché scade il suo timeout, poi la connessione cade
+                time.sleep(faults.timeout_delay)
+                self.close_connection = True
+                return
+            if fault is not None:
+                headers = {'Retry-After': str(faults.retry_after)} if fault == 429 else {}
+                self._send_json(fault, {'errorMessages': [f'Injected error {fault}']}, headers)
+                return
+
+        if standin.mode == 'replay':
+            replayed = standin.cassette.replay(Cassette.request_id(method, parts.path, parts.query, body))
+            if replayed is None:
+                self._send_json(599, {'errorMessages': [f'No recording for {method} {self.path}']})
+            else:
+                status, headers, payload = replayed
+                self._send_raw(status, headers,
+                               replace_base_url(headers, payload, STANDIN_URL_PLACEHOLDER, standin.url))
+            return
+        if standin.mode == 'record':
+            status, headers, payload = standin._forward(method, self.path, self.headers, body)
+            # La cassetta non dipende dall'indirizzo dell'upstream né da quello dello stand-in
+            payload = replace_base_url(headers, payload, standin.upstream_url, STANDIN_URL_PLACEHOLDER)
+            standin.cassette.record(Cassette.request_id(method, parts.path, parts.query, body),
+                                    status, headers, payload)
+            self._send_raw(status, headers,
+                           replace_base_url(headers, payload, STANDIN_URL_PLACEHOLDER, standin.url))
+            return
+
+        try:
+            self._route(method, parts.path, parse_qs(parts.query), body)
+        except KeyError as e:
+            self._send_json(404, {'errorMessages': [f'Issue does not exist: {e}']})
+        except Exception as e:  # pragma: no cover - diagnostica
+            self._send_json(500, {'errorMessages': [str(e)]})
+
+    # --- routing della modalità sintetica ---
+
+    def _route(self, method, path, query, body):
+        data = self.standin.dataset
+        base = self.standin.url
+
+        if path == f'{API}/serverInfo':
+            return self._send_json(200, {'baseUrl': base, 'version': '9.12.0', 'versionNumbers': [9, 12, 0],
+                                         'deploymentType': 'Server', 'buildNumber': 912000,
+                                         'serverTitle': 'Jira Stand-in'})
+        if path == f'{API}/myself':
+            return self._send_json(200, dict(data.user, self=f'{base}{API}/myself'))
+        if path == f'{API}/field':
+            return self._send_json(200, [
+                {'id': name, 'name': name.capitalize(), 'custom': False, 'clauseNames': [name]}
+                for name in ('summary', 'status', 'priority', 'timespent', 'updated', 'created',
+                             'issuetype', 'attachment', 'issuelinks', 'description')
+            ])
+        if path == f'{API}/priority':
+            return self._send_json(200, [dict(p, self=f'{base}{API}/priority/{p["id"]}') for p in PRIORITIES])
+        if path == f'{API}/status':
+            return self._send_json(200, STATUSES)
+        if path == f'{API}/issuetype':
+            return self._send_json(200, ISSUE_TYPES)
+        if path == f'{API}/issueLinkType':
+            return self._send_json(200, {'issueLinkTypes': LINK_TYPES})
+        if path == f'{API}/search':
+            params = {k: v[0] for k, v in query.items()}
+            if 'fields' in query:
+                # Il client invia i campi come parametri ripetuti (fields=a&fields=b)
+                params['fields'] = ','.join(query['fields'])
+            if method == 'POST' and body:
+                params.update(json.loads(body))
+            return self._search(params)
+
+        match = re.fullmatch(rf'{API}/attachment/(\d+)', path)
+        if match:
+            attachment = data.attachments[match.group(1)]
+            return self._send_json(200, self._attachment_meta(attachment['meta']))
+        match = re.fullmatch(r'/secure/attachment/(\d+)(?:/.*)?', path)
+        if match:
+            return self._send_content(data.attachments[match.group(1)]['content'])
+
+        match = re.fullmatch(rf'{API}/issue/([^/]+)(/[A-Za-z]+)?', path)
+        if not match:
+            return self._send_json(404, {'errorMessages': [f'No stand-in route for {path}']})
+        key, sub = match.group(1), (match.group(2) or '')
+        key = data.keys_by_id.get(key, key)
+        issue = data.issues[key]  # KeyError -> 404
+        with data.lock:
+            if sub == '' and method == 'GET':
+                return self._send_json(200, self._issue_json(issue))
+            if sub == '' and method == 'PUT':
+                fields = json.loads(body or b'{}').get('fields', {})
+                if 'priority' in fields:
+                    wanted = fields['priority']
+                    priority = next((p for p in PRIORITIES
+                                     if p['id'] == str(wanted.get('id')) or p['name'] == wanted.get('name')), None)
+                    if priority is None:
+                        return self._send_json(400, {'errors': {'priority': 'invalid'}})
+                    issue['fields']['priority'] = dict(priority)
+                data.touch(key)
+                return self._send_raw(204, {}, b'')
+            if sub == '/comment' and method == 'GET':
+                comments = data.comments[key]
+                return self._send_json(200, {'startAt': 0, 'maxResults': len(comments),
+                                             'total': len(comments), 'comments': comments})
+            if sub == '/comment' and method == 'POST':
+                comment = data.add_comment(key, json.loads(body).get('body', ''))
+                return self._send_json(201, comment)
+            if sub == '/worklog' and method == 'GET':
+                worklogs = data.worklogs[key]
+                return self._send_json(200, {'startAt': 0, 'maxResults': len(worklogs),
+                                             'total': len(worklogs), 'worklogs': worklogs})
+            if sub == '/worklog' and method == 'POST':
+                return self._send_json(201, data.add_worklog(key, json.loads(body)))
+            if sub == '/watchers':
+                watchers = data.watchers[key]
+                return self._send_json(200, {'watchCount': len(watchers), 'isWatching': True,
+                                             'watchers': watchers})
+            if sub == '/attachments' and method == 'POST':
+                filename, content = _parse_multipart(self.headers.get('Content-Type', ''), body)
+                meta = data.add_attachment(key, filename, content)
+                return self._send_json(200, [self._attachment_meta(meta)])
+        return self._send_json(405, {'errorMessages': [f'{method} not supported on {path}']})
+
+    def _search(self, params):
+        data = self.standin.dataset
+        start_at = int(params.get('startAt', 0) or 0)
+        max_results = int(params.get('maxResults', 50) if params.get('maxResults') is not None else 50)
+        max_results = min(max_results, self.standin.max_page_size)
+        fields = params.get('fields')
+        if isinstance(fields, str):
+            fields = fields.split(',')
+        keys = data.search(params.get('jql', ''))
+        page = keys[start_at:start_at + max_results] if max_results > 0 else []
+        with data.lock:
+            issues = [self._issue_json(data.issues[k], fields) for k in page]
+        return self._send_json(200, {'startAt': start_at, 'maxResults': max_results,
+                                     'total': len(keys), 'issues': issues})
+
+    def _issue_json(self, issue, fields=None):
+        base = self.standin.url
+        all_fields = dict(issue['fields'])
+        all_fields['attachment'] = [self._attachment_meta(a) for a in all_fields.get('attachment', [])]
+        if fields and '*all' not in fields and '*navigable' not in fields:
+            all_fields = {k: v for k, v in all_fields.items() if k in fields}
+        return {'id': issue['id'], 'key': issue['key'], 'self': f'{base}{API}/issue/{issue["id"]}',
+                'fields': all_fields}
+
+    def _attachment_meta(self, meta):
+        base = self.standin.url
+        meta = dict(meta)
+        if meta['content'].startswith('/'):
+            meta['content'] = base + meta['content']
+        meta['self'] = f'{base}{API}/attachment/{meta["id"]}'
+        return meta
+
+    # --- risposte ---
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode('utf-8')
+        self._send_raw(status, dict(headers or {}, **{'Content-Type': 'application/json;charset=UTF-8'}), body)
+
+    def _send_raw(self, status, headers, body):
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if body and self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def _send_content(self, content):
+        """Contenuto degli allegati, con supporto alle richieste Range (bytes=N-M)."""
+        range_header = self.headers.get('Range')
+        match = re.fullmatch(r'bytes=(\d+)-(\d*)', range_header or '')
+        headers = {'Content-Type': 'application/octet-stream', 'Accept-Ranges': 'bytes'}
+        if not match:
+            return self._send_raw(200, headers, content)
+        start = int(match.group(1))
+        end = int(match.group(2)) if match.group(2) else len(content) - 1
+        if start >= len(content):
+            return self._send_raw(416, {'Content-Range': f'bytes */{len(content)}'}, b'')
+        end = min(end, len(content) - 1)
+        headers['Content-Range'] = f'bytes {start}-{end}/{len(content)}'
+        return self._send_raw(206, headers, content[start:end + 1])
+
+
+def _parse_multipart(content_type, body):
+    """Estrae (filename, contenuto) dal primo file di un body multipart/form-data."""
+    match = re.search(r'boundary=("?)([^";]+)\1', content_type)
+    if not match:
+        return 'upload.bin', body
+    boundary = b'--' + match.group(2).encode('latin-1')
+    for part in body.split(boundary):
+        header, _, content = part.partition(b'\r\n\r\n')
+        name = re.search(rb'filename="([^"]*)"', header)
+        if name:
+            return name.group(1).decode('utf-8', 'replace'), content[:-2] if content.endswith(b'\r\n') else content
+    return 'upload.bin', b''
+
+
+class JiraStandIn:
+    """
+    Server HTTP locale che simula Jira. Si avvia in un thread in background;
+    utilizzabile come context manager.
+
+    mode:
+      - 'synthetic': risponde dal JiraDataset in memoria
+      - 'record':    inoltra a upstream_url e salva le risposte nella cassetta
+      - 'replay':    risponde solo dalla cassetta (nessuna rete)
+    """
+
+    def __init__(self, dataset=None, faults=None, host='127.0.0.1', port=0, mode='synthetic',
+                 cassette_path=None, upstream_url=None, max_page_size=1000):
+        if mode not in ('synthetic', 'record', 'replay'):
+            raise ValueError(f'Unknown stand-in mode: {mode}')
+        if mode == 'record' and not upstream_url:
+            raise ValueError('Record mode requires upstream_url')
+        self.dataset = dataset if dataset is not None else JiraDataset.synthetic()
+        self.faults = faults
+        self.mode = mode
+        self.cassette = Cassette(cassette_path)
+        self.upstream_url = upstream_url.rstrip('/') if upstream_url else None
+        # Come Jira, il server limita maxResults per pagina
+        self.max_page_size = max_page_size
+        self.request_counts = Counter()
+        self._counts_lock = threading.Lock()
+        self._connections = set()
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.standin = self
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name='JiraStandIn', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        # Chiude anche le connessioni keep-alive, come farebbe un server che cade
+        with self._counts_lock:
+            connections = list(self._connections)
+        for connection in connections:
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def _track_connection(self, connection, is_open):
+        with self._counts_lock:
+            if is_open:
+                self._connections.add(connection)
+            else:
+                self._connections.discard(connection)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _count(self, method, path):
+        # Normalizza gli ID numerici e le chiavi per aggregare le statistiche per endpoint
+        endpoint = re.sub(r'/issue/[^/]+', '/issue/{key}', path)
+        endpoint = re.sub(r'/(attachment|priority)/\d+', r'/\1/{id}', endpoint)
+        with self._counts_lock:
+            self.request_counts[f'{method} {endpoint}'] += 1
+
+    def total_requests(self):
+        with self._counts_lock:
+            return sum(self.request_counts.values())
+
+    def _forward(self, method, path, headers, body):
+        import requests
+
+        forward_headers = {k: v for k, v in headers.items()
+                           if k.lower() in ('authorization', 'content-type', 'accept', 'range',
+                                            'x-atlassian-token')}
+        resp = requests.request(method, self.upstream_url + path, headers=forward_headers,
+                                data=body or None, timeout=60)
+        # resp.content è già decompresso: si tengono solo gli header che descrivono il contenuto
+        headers = {k: v for k, v in resp.headers.items() if k.lower() in RECORDED_HEADERS}
+        return resp.status_code, headers, resp.content
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Local Jira stand-in for performance testing')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--issues', type=int, default=500)
+    parser.add_argument('--comments', type=int, default=2)
+    parser.add_argument('--attachments', type=int, default=0)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0)
+    parser.add_argument('--server-error-rate', type=float, default=0.0)
+    parser.add_argument('--timeout-rate', type=float, default=0.0)
+    parser.add_argument('--mode', choices=('synthetic', 'record', 'replay'), default='synthetic')
+    parser.add_argument('--cassette')
+    parser.add_argument('--upstream')
+    args = parser.parse_args(argv)
+
+    faults = FaultConfig(latency=args.latency, jitter=args.jitter, rate_limit_rate=args.rate_limit_rate,
+                         server_error_rate=args.server_error_rate, timeout_rate=args.timeout_rate)
+    dataset = JiraDataset.synthetic(args.issues, comments_per_issue=args.comments,
+                                    attachments_per_issue=args.attachments)
+    standin = JiraStandIn(dataset, faults, port=args.port, mode=args.mode,
+                          cassette_path=args.cassette, upstream_url=args.upstream)
+    standin.start()
+    print(f'Jira stand-in ({args.mode}) listening on {standin.url} - Ctrl+C to stop')
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        standin.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+import json
+import os
+
+from services.attachment_upload import stage_file, upload_timeout
+from services.sync_engine import SyncEngine
+from tests.fake_jira import connected_service
+from tests.jira_standin import JiraDataset, JiraStandIn
+
+
+def _queue_attachment(db, tmp_path, size, name="trace.log", jira_key="PRJ-1"):
+    original = tmp_path / name
+    original.write_bytes(os.urandom(size))
+    staging = tmp_path / "staging"
+    staging.mkdir(exist_ok=True)
+    payload = {"jira_key": jira_key, **stage_file(str(original), str(staging))}
+    db.add_to_sync_queue("ADD_ATTACHMENT", json.dumps(payload))
+    return original, payload
+
+
+def _statuses(db):
+    conn = db.get_connection()
+    try:
+        return dict(conn.execute('SELECT Status, COUNT(*) FROM SyncQueue GROUP BY Status').fetchall())
+    finally:
+        conn.close()
+
+
+def test_staged_copy_is_streamed_with_progress(db, tmp_path):
+    original, payload = _queue_attachment(db, tmp_path, 3 * 1024 * 1024)
+    staged_content = open(payload["file_path"], 'rb').read()
+    original.write_bytes(b"changed after queueing")
+
+    with JiraStandIn(JiraDataset.synthetic(1)) as server:
+        progress = []
+        summary = SyncEngine(db, connected_service(server)).run(
+            upload_progress_callback=lambda op_id, sent, total: progress.append((sent, total)))
+
+        assert summary['succeeded'] == 1
+        uploaded = [a for a in server.dataset.attachments.values() if a['meta']['filename'] == 'trace.log']
+        assert len(uploaded) == 1 and uploaded[0]['content'] == staged_content
+
+    sent = [p[0] for p in progress]
+    assert sent == sorted(sent) and progress[-1][0] == progress[-1][1]
+    assert len(progress) <= 101
+    assert not os.path.exists(payload["file_path"])  # Staged copy removed after the upload
+    assert os.path.exists(original)
+
+
+def test_stop_aborts_the_upload_and_keeps_it_queued(db, tmp_path):
+    _original, payload = _queue_attachment(db, tmp_path, 8 * 1024 * 1024)
+
+    with JiraStandIn(JiraDataset.synthetic(1)) as server:
+        engine = SyncEngine(db, connected_service(server))
+        summary = engine.run(upload_progress_callback=lambda op_id, sent, total: engine.stop())
+
+        assert summary['released'] == 1 and summary['failed'] == 0
+        assert _statuses(db) == {'Pending': 1}
+        assert not any(a['meta']['filename'] == 'trace.log' for a in server.dataset.attachments.values())
+    assert os.path.exists(payload["file_path"])
+
+
+def test_retried_upload_that_already_arrived_is_not_sent_again(db, tmp_path):
+    _original, payload = _queue_attachment(db, tmp_path, 1024)
+
+    with JiraStandIn(JiraDataset.synthetic(1)) as server:
+        jira_service = connected_service(server)
+        db.claim_sync_operations()  # The first attempt reached Jira, then the app died
+        jira_service.upload_attachment('PRJ-1', payload["file_path"], file_name="trace.log")
+        server.request_counts.clear()
+
+        summary = SyncEngine(db, jira_service).run()
+
+        assert summary['already_applied'] == 1
+        assert server.request_counts['POST /rest/api/2/issue/{key}/attachments'] == 0
+
+
+def test_permanently_failed_upload_keeps_its_staged_copy(db, tmp_path):
+    original, payload = _queue_attachment(db, tmp_path, 1024, jira_key="PRJ-999")
+
+    with JiraStandIn(JiraDataset.synthetic(1)) as server:
+        summary = SyncEngine(db, connected_service(server)).run()
+
+    assert summary['failed'] == 1 and _statuses(db) == {'Failed': 1}
+    assert os.path.exists(payload["file_path"])
+
+
+def test_upload_with_a_missing_staged_copy_fails_without_sending(db, tmp_path):
+    original, payload = _queue_attachment(db, tmp_path, 1024)
+    os.remove(payload["file_path"])
+
+    with JiraStandIn(JiraDataset.synthetic(1)) as server:
+        summary = SyncEngine(db, connected_service(server)).run()
+
+        assert summary['failed'] == 1 and _statuses(db) == {'Failed': 1}
+        assert server.request_counts['POST /rest/api/2/issue/{key}/attachments'] == 0
+
+    conn = db.get_connection()
+    try:
+        error = conn.execute('SELECT ErrorMessage FROM SyncQueue').fetchone()[0]
+    finally:
+        conn.close()
+    assert 'Staged copy of trace.log is missing' in error
+
+
+def test_deleting_a_queued_upload_discards_its_staged_copy(db, tmp_path, qtbot, monkeypatch):
+    from PyQt6.QtWidgets import QMessageBox
+    from controllers.sync_queue_controller import SyncQueueController
+
+    original, payload = _queue_attachment(db, tmp_path, 1024)
+    controller = SyncQueueController(db, None)
+    qtbot.addWidget(controller.view)
+    monkeypatch.setattr(QMessageBox, 'question', lambda *args: QMessageBox.StandardButton.Yes)
+    messages = []
+    monkeypatch.setattr(controller.view, 'show_info', messages.append)
+    monkeypatch.setattr(controller.view, 'show_error', messages.append)
+
+    controller._delete_operation(db.get_pending_sync_operations()[0][0])
+
+    assert _statuses(db) == {'Deleted': 1} and len(messages) == 1
+    assert not os.path.exists(payload["file_path"])
+    assert os.path.exists(original)
+
+
+def test_read_timeout_grows_with_the_size():
+    assert upload_timeout(0)[1] < upload_timeout(200 * 1024 * 1024)[1]
+    assert upload_timeout(200 * 1024 * 1024)[1] >= 200 * 1024 * 1024 / (64 * 1024)
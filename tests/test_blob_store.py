@@ -0,0 +1,76 @@
+import os
+import threading
+
+from PyQt6.QtCore import Qt
+
+from services.attachment_service import AttachmentService
+from services.blob_store import BlobStore, hash_file
+from services.download_manager import DownloadManager
+from tests.fake_jira import FakeSettings, connected_service
+from tests.jira_standin import JiraDataset, JiraStandIn
+
+
+def _download_all(service, manager, requests):
+    """Queues (jira_key, attachment meta) pairs and waits until all their downloads have ended."""
+    pending = set()
+    lock = threading.Lock()
+    done = threading.Event()
+
+    def _ended(download_id, *_args):
+        with lock:
+            pending.discard(download_id)
+            if not pending:
+                done.set()
+
+    manager.item_finished.connect(_ended, Qt.ConnectionType.DirectConnection)
+    manager.item_failed.connect(_ended, Qt.ConnectionType.DirectConnection)
+    with lock:
+        for jira_key, meta in requests:
+            # Lo stand-in completa l'URL del contenuto solo nelle risposte: lo risolve il manager
+            pending.add(service.queue_download(jira_key, dict(meta, content=None)))
+    assert done.wait(10)
+
+
+def test_blob_ingest_links_identical_content(tmp_path):
+    store = BlobStore(str(tmp_path / "blobs"))
+    first, second = tmp_path / "a.png", tmp_path / "b.png"
+    first.write_bytes(b"same screenshot")
+    second.write_bytes(b"same screenshot")
+    digest = hash_file(str(first)).hexdigest()
+
+    assert store.ingest(str(first), digest) == str(first)
+    assert store.ingest(str(second), digest) == str(second)
+    assert os.path.samefile(first, store.blob_path(digest))
+    assert os.path.samefile(second, store.blob_path(digest))
+    assert store.blob_path(digest).endswith(os.path.join(digest[:2], digest[2:4], digest))
+
+
+def test_same_attachment_on_many_issues_is_stored_once(db, tmp_path):
+    screenshot = os.urandom(200 * 1024)
+    with JiraStandIn(JiraDataset.synthetic(3)) as server:
+        metas = [(key, server.dataset.add_attachment(key, 'screenshot.png', screenshot, 'image/png'))
+                 for key in ('PRJ-1', 'PRJ-2', 'PRJ-3')]
+        other = ('PRJ-1', server.dataset.add_attachment('PRJ-1', 'log.txt', b'other content'))
+        jira_service = connected_service(server)
+        manager = DownloadManager(db, jira_service, retry_delays=(0, 0))
+        service = AttachmentService(db, jira_service, FakeSettings(str(tmp_path)), download_manager=manager)
+        _download_all(service, manager, metas + [other])
+        manager.shutdown()
+
+    records = [db.get_file_attachment(key, meta['id']) for key, meta in metas]
+    digest = records[0]['file_hash']
+    blob = service.blob_store.blob_path(digest)
+    assert {record['file_hash'] for record in records} == {digest}
+    assert all(os.path.samefile(record['file_path'], blob) for record in records)
+    assert os.stat(blob).st_nlink == 4  # The blob and the three per-issue links
+    assert open(records[1]['file_path'], 'rb').read() == screenshot
+    assert db.count_file_attachments_by_hash(digest) == 3
+
+    # The blob is removed with its last reference
+    assert service.delete_attachment('PRJ-1', metas[0][1]['id'])
+    assert service.delete_attachment('PRJ-2', metas[1][1]['id'])
+    assert os.path.exists(blob) and os.path.exists(records[2]['file_path'])
+    assert not os.path.exists(records[0]['file_path'])
+    assert service.delete_attachment('PRJ-3', metas[2][1]['id'])
+    assert not os.path.exists(blob)
+    assert service.blob_store.has_blob(db.get_file_attachment('PRJ-1', other[1]['id'])['file_hash'])
@@ -0,0 +1,173 @@
+import os
+import threading
+
+from PyQt6.QtCore import Qt
+
+from services.attachment_service import AttachmentService
+from services.download_manager import (
+    KIND_ATTACHMENT, KIND_FILE, KIND_PREVIEW, MAX_CHUNK_SIZE, MIN_CHUNK_SIZE, DownloadManager,
+    next_chunk_size, partial_path
+)
+from tests.fake_jira import FakeSettings, connected_service
+from tests.jira_standin import FaultConfig, JiraDataset, JiraStandIn
+
+
+def _manager(db, jira_service, **kwargs):
+    manager = DownloadManager(db, jira_service, retry_delays=(0, 0), **kwargs)
+    finished = {}
+    done = threading.Event()
+
+    def _ended(download_id, result):
+        finished[download_id] = result
+        done.set()
+
+    # DirectConnection: i test non hanno un event loop Qt
+    manager.item_finished.connect(_ended, Qt.ConnectionType.DirectConnection)
+    manager.item_failed.connect(lambda download_id, error: _ended(download_id, error),
+                                Qt.ConnectionType.DirectConnection)
+    manager.item_cancelled.connect(lambda download_id: _ended(download_id, None),
+                                   Qt.ConnectionType.DirectConnection)
+    return manager, finished, done
+
+
+def _download_count(db):
+    conn = db.get_connection()
+    try:
+        return conn.execute('SELECT COUNT(*) FROM DownloadQueue').fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_chunk_size_adapts_to_the_connection_speed():
+    assert next_chunk_size(MIN_CHUNK_SIZE, 0.01) == 2 * MIN_CHUNK_SIZE
+    assert next_chunk_size(MAX_CHUNK_SIZE, 0.01) == MAX_CHUNK_SIZE
+    assert next_chunk_size(4 * MIN_CHUNK_SIZE, 2.0) == 2 * MIN_CHUNK_SIZE
+    assert next_chunk_size(MIN_CHUNK_SIZE, 2.0) == MIN_CHUNK_SIZE
+    assert next_chunk_size(4 * MIN_CHUNK_SIZE, 0.2) == 4 * MIN_CHUNK_SIZE
+
+
+def test_partial_file_is_resumed_with_a_range_request(db, tmp_path):
+    content = os.urandom(3 * 1024 * 1024)
+    target = str(tmp_path / "downloads" / "trace.log")
+    os.makedirs(os.path.dirname(target))
+    with open(partial_path(target), 'wb') as f:
+        f.write(content[:1024 * 1024])
+
+    with JiraStandIn(JiraDataset.synthetic(1)) as server:
+        meta = server.dataset.add_attachment('PRJ-1', 'trace.log', content)
+        manager, finished, done = _manager(db, connected_service(server))
+        progress = []
+        manager.item_progress.connect(lambda download_id, sent, total: progress.append((sent, total)),
+                                      Qt.ConnectionType.DirectConnection)
+        aggregate = []
+        manager.aggregate_progress.connect(lambda sent, total: aggregate.append((sent, total)),
+                                           Qt.ConnectionType.DirectConnection)
+
+        download_id = manager.enqueue(KIND_FILE, 'PRJ-1', meta['id'], 'trace.log', target, total_bytes=len(content))
+        assert done.wait(10)
+        manager.shutdown()
+
+    assert finished == {download_id: target}
+    assert open(target, 'rb').read() == content
+    assert not os.path.exists(partial_path(target))
+    # Only the missing part was transferred
+    assert progress[0][0] > 1024 * 1024 and progress[-1] == (len(content), len(content))
+    assert aggregate[-1] == (len(content), len(content))
+    assert _download_count(db) == 0
+
+
+def test_interrupted_downloads_are_resumed_after_a_restart(db, tmp_path):
+    content = os.urandom(256 * 1024)
+    with JiraStandIn(JiraDataset.synthetic(1)) as server:
+        meta = server.dataset.add_attachment('PRJ-1', 'spec.pdf', content, mime_type='application/pdf')
+        jira_service = connected_service(server)
+        manager, finished, done = _manager(db, jira_service)
+        service = AttachmentService(db, jira_service, FakeSettings(str(tmp_path)), download_manager=manager)
+        target = service.get_attachment_path('PRJ-1', meta['id'], 'spec.pdf')
+
+        # Download in corso alla chiusura precedente, più una miniatura da scartare
+        interrupted_id = db.enqueue_download(KIND_ATTACHMENT, 'PRJ-1', meta['id'], 'spec.pdf', target,
+                                             total_bytes=len(content), mime_type='application/pdf')
+        assert db.start_download(interrupted_id)
+        with open(partial_path(target), 'wb') as f:
+            f.write(content[:1000])
+        preview = str(tmp_path / "preview.png")
+        db.enqueue_download(KIND_PREVIEW, 'PRJ-1', meta['id'], 'spec.pdf', preview)
+
+        assert manager.resume_pending() == [interrupted_id]
+        assert done.wait(10)
+        manager.shutdown()
+        # A second request for a stored attachment does not download it again
+        assert service.queue_download('PRJ-1', {'id': meta['id'], 'filename': 'spec.pdf'}) is None
+
+    assert finished == {interrupted_id: target}
+    assert open(target, 'rb').read() == content
+    stored = db.get_file_attachment('PRJ-1', meta['id'])
+    assert stored['file_path'] == target and stored['file_size'] == len(content)
+    assert stored['file_hash'] == service.compute_file_hash(target)
+    assert _download_count(db) == 0
+
+
+def test_resuming_again_leaves_the_downloads_in_progress_alone(db, tmp_path):
+    content = os.urandom(64 * 1024)
+    target = str(tmp_path / "trace.log")
+    faults = FaultConfig(latency=0.3, paths=['/secure/attachment'])
+    with JiraStandIn(JiraDataset.synthetic(1), faults=faults) as server:
+        meta = server.dataset.add_attachment('PRJ-1', 'trace.log', content)
+        manager, finished, done = _manager(db, connected_service(server))
+        download_id = manager.enqueue(KIND_FILE, 'PRJ-1', meta['id'], 'trace.log', target)
+
+        # The connection comes back while the download is still running
+        assert manager.resume_pending() == []
+        assert done.wait(10)
+        manager.shutdown()
+        assert server.request_counts['GET /secure/attachment/{id}/trace.log'] == 1
+
+    assert finished == {download_id: target}
+    assert open(target, 'rb').read() == content
+
+
+def test_cancelled_download_keeps_its_partial_file_and_is_resumed(db, tmp_path):
+    content = os.urandom(4 * 1024 * 1024)
+    target = str(tmp_path / "video.mp4")
+    with JiraStandIn(JiraDataset.synthetic(1)) as server:
+        meta = server.dataset.add_attachment('PRJ-1', 'video.mp4', content)
+        manager, finished, done = _manager(db, connected_service(server), max_workers=1)
+        download_id = manager.enqueue(KIND_FILE, 'PRJ-1', meta['id'], 'video.mp4', target)
+        manager.item_progress.connect(lambda download_id, sent, total: manager.cancel(download_id),
+                                      Qt.ConnectionType.DirectConnection)
+        assert done.wait(10)
+
+        assert finished == {download_id: None}
+        assert db.get_download(download_id)['status'] == 'Cancelled'
+        received = os.path.getsize(partial_path(target))
+        assert 0 < received < len(content)
+
+        manager.item_progress.disconnect()
+        done.clear()
+        assert manager.enqueue(KIND_FILE, 'PRJ-1', meta['id'], 'video.mp4', target) == download_id
+        assert done.wait(10)
+        manager.shutdown()
+
+    assert finished == {download_id: target}
+    assert open(target, 'rb').read() == content
+
+
+def test_server_errors_are_retried_and_then_reported(db, tmp_path):
+    content = os.urandom(10 * 1024)
+    faults = FaultConfig(fail_first=1, fail_status=503, paths=['/secure/attachment'])
+    with JiraStandIn(JiraDataset.synthetic(1), faults=faults) as server:
+        meta = server.dataset.add_attachment('PRJ-1', 'notes.txt', content)
+        manager, finished, done = _manager(db, connected_service(server))
+        download_id = manager.enqueue(KIND_FILE, 'PRJ-1', meta['id'], 'notes.txt', str(tmp_path / "notes.txt"))
+        assert done.wait(10)
+        assert finished == {download_id: str(tmp_path / "notes.txt")}
+        assert server.request_counts['GET /secure/attachment/{id}/notes.txt'] == 2
+
+        done.clear()
+        missing_id = manager.enqueue(KIND_FILE, 'PRJ-1', '999999', 'missing.txt', str(tmp_path / "missing.txt"))
+        assert done.wait(10)
+        manager.shutdown()
+
+    assert finished[missing_id]
+    assert db.get_download(missing_id)['status'] == 'Failed'
@@ -0,0 +1,72 @@
+import pytest
+from jira import JIRAError
+
+from tests.fake_jira import connected_service
+from tests.jira_standin import JiraDataset, JiraStandIn
+
+
+@pytest.fixture
+def standin():
+    with JiraStandIn(JiraDataset.synthetic(5)) as server:
+        yield server
+
+
+def _service(standin, db, **kwargs):
+    service = connected_service(standin, **kwargs)
+    service.set_fictitious_store(db)
+    return service
+
+
+def _issue_requests(standin):
+    return standin.request_counts['GET /rest/api/2/issue/{key}']
+
+
+def test_not_found_ticket_is_remembered_across_restarts(standin, db):
+    service = _service(standin, db)
+    with pytest.raises(JIRAError):
+        service.get_issue('PRJ-404')
+    assert _issue_requests(standin) == 1
+    assert db.get_fictitious_tickets()['PRJ-404']['reason'] == 'not_found'
+
+    # A new session loads the registry and never asks Jira again
+    restarted = _service(standin, db)
+    assert restarted.is_ticket_marked_as_fictitious('PRJ-404')
+    with pytest.raises(JIRAError):
+        restarted.get_issue('PRJ-404')
+    with pytest.raises(JIRAError):
+        restarted.get_issue_comments('PRJ-404')
+    assert restarted.get_issue_watchers('PRJ-404') == []
+    assert _issue_requests(standin) == 1
+
+
+def test_expired_entry_is_rechecked(standin, db):
+    service = _service(standin, db, fictitious_recheck_days=0)
+    with pytest.raises(JIRAError):
+        service.get_issue('PRJ-404')
+
+    # Zero-day policy: the mark is already expired, so Jira is asked again
+    assert not service.is_ticket_marked_as_fictitious('PRJ-404')
+    assert 'PRJ-404' not in db.get_fictitious_tickets()
+    with pytest.raises(JIRAError):
+        service.get_issue('PRJ-404')
+    assert _issue_requests(standin) == 2
+
+
+def test_manual_mark_never_expires_and_unmark_is_persisted(standin, db):
+    service = _service(standin, db, fictitious_recheck_days=0)
+    service.mark_ticket_as_fictitious('PRJ-1')
+    assert db.get_fictitious_tickets()['PRJ-1']['recheck_after'] is None
+    assert service.is_ticket_marked_as_fictitious('PRJ-1')
+
+    service.unmark_ticket_as_fictitious('PRJ-1')
+    assert 'PRJ-1' not in db.get_fictitious_tickets()
+    assert service.get_issue('PRJ-1')['key'] == 'PRJ-1'
+
+
+def test_search_by_keys_skips_known_missing_tickets(standin, db):
+    service = _service(standin, db)
+    service.mark_ticket_as_fictitious('PRJ-404')
+
+    issues = service.search_issues('', issue_keys=['PRJ-1', 'PRJ-404'])
+    assert [i['key'] for i in issues] == ['PRJ-1']
+    assert service.search_issues('', issue_keys=['PRJ-404']) == []
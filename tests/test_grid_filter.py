@@ -0,0 +1,81 @@
+import time
+
+from views.issue_table_model import IssueRow
+from views.jira_grid_view import JiraGridView
+
+
+def _rows(count):
+    statuses = ['Open', 'In Progress', 'Done']
+    return [IssueRow(f'PRJ-{i}', f'Fix login issue {i}' if i % 2 else f'Update docs {i}', statuses[i % 3],
+                     favorite=i % 10 == 0)
+            for i in range(count)]
+
+
+def _visible_keys(view):
+    return [view.model.key_at(row) for row in range(view.model.rowCount())]
+
+
+def test_all_tokens_must_match_and_narrowing_checks_only_previous_matches(qtbot):
+    view = JiraGridView()
+    qtbot.addWidget(view)
+    view.append_issue_rows(_rows(10000))
+    row_filter = view.row_filter
+
+    started = time.perf_counter()
+    row_filter.apply("login")
+    elapsed = time.perf_counter() - started
+    assert len(_visible_keys(view)) == 5000
+    # Well under a frame: the model is given an index list, no row is hidden one by one
+    assert elapsed < 0.05
+
+    row_filter.apply("login progress")
+    visible = _visible_keys(view)
+    assert visible and all(int(key.split('-')[1]) % 6 == 1 for key in visible)
+    rows = view.model.rows()
+    assert [rows[storage].key for storage in row_filter._matches] == visible
+
+    # A shorter query is not a narrowing: the hidden rows come back
+    row_filter.apply("done")
+    assert len(_visible_keys(view)) == 3333
+    # Terms do not match across two fields
+    row_filter.apply("99done")
+    assert _visible_keys(view) == []
+
+
+def test_keystrokes_are_debounced_and_new_rows_follow_the_filter(qtbot):
+    view = JiraGridView()
+    qtbot.addWidget(view)
+    view.append_issue_rows(_rows(20))
+
+    for text in ("d", "do", "doc", "docs"):
+        view.row_filter.set_text(text)
+    assert len(_visible_keys(view)) == 20
+    qtbot.waitUntil(lambda: len(_visible_keys(view)) == 10, timeout=2000)
+
+    view.populator.append([{'key': 'PRJ-100'}, {'key': 'PRJ-101'}], lambda issue: IssueRow(
+        issue['key'], 'docs' if issue['key'] == 'PRJ-100' else 'code', 'Open'))
+    qtbot.waitUntil(lambda: len(view.model.rows()) == 22, timeout=2000)
+    assert 'PRJ-100' in _visible_keys(view) and 'PRJ-101' not in _visible_keys(view)
+
+    view.favorites_btn.setChecked(True)
+    view.row_filter.apply("")
+    assert _visible_keys(view) == ['PRJ-0', 'PRJ-10']
+
+
+def test_sorting_a_filtered_grid_keeps_the_filter_and_the_selection(qtbot):
+    view = JiraGridView()
+    qtbot.addWidget(view)
+    view.append_issue_rows(_rows(30))
+    view.row_filter.apply("docs")
+    view.table.selectRow(view.model.row_of_key('PRJ-4'))
+    model = view.model
+
+    view.sort_columns = [{'column': model.column_index('key'), 'order': 1}]
+    view._apply_cumulative_sort()
+    assert len(_visible_keys(view)) == 15
+    assert _visible_keys(view)[0] == 'PRJ-8'
+    assert view.selected_key() == 'PRJ-4'
+
+    # Narrowing keeps the sorted order
+    view.row_filter.apply("docs 2")
+    assert _visible_keys(view) == ['PRJ-28', 'PRJ-26', 'PRJ-24', 'PRJ-22', 'PRJ-20', 'PRJ-2', 'PRJ-12']
@@ -0,0 +1,47 @@
+import time
+
+from views.issue_table_model import IssueRow
+from views.jira_grid_view import JiraGridView
+
+
+def _slow_row(issue):
+    # Simula una conversione costosa: 1000 righe non entrano in un solo frame
+    time.sleep(0.0002)
+    return IssueRow(issue['key'], issue['key'], 'Open')
+
+
+def test_large_pages_are_inserted_in_chunks(qtbot):
+    view = JiraGridView()
+    qtbot.addWidget(view)
+    inserted = []
+    view.model.rowsInserted.connect(lambda parent, first, last: inserted.append((first, last + 1)))
+    progress = []
+    view.populator.progress.connect(lambda inserted, total: progress.append((inserted, total)))
+
+    view.populator.append([{'key': f'PRJ-{i}'} for i in range(1000)], _slow_row)
+    # Nothing is inserted before the event loop runs
+    assert view.model.rowCount() == 0
+
+    with qtbot.waitSignal(view.populator.finished, timeout=10000):
+        pass
+
+    assert view.model.rowCount() == 1000
+    assert len(inserted) > 1
+    # One model insertion per chunk, back to back
+    assert inserted[0][0] == 0 and inserted[-1][1] == 1000
+    assert all(previous[1] == current[0] for previous, current in zip(inserted, inserted[1:]))
+    assert progress[-1] == (1000, 1000)
+
+
+def test_clearing_the_grid_drops_the_rows_still_queued(qtbot):
+    view = JiraGridView()
+    qtbot.addWidget(view)
+    view.populator.append([{'key': f'OLD-{i}'} for i in range(1000)], _slow_row)
+    qtbot.waitUntil(lambda: view.model.rowCount() > 0, timeout=5000)
+
+    view.clear_table()
+    view.populator.append([{'key': 'NEW-1'}], _slow_row)
+    qtbot.waitUntil(lambda: not view.populator.is_running(), timeout=5000)
+    qtbot.wait(20)
+
+    assert [view.model.key_at(row) for row in range(view.model.rowCount())] == ['NEW-1']
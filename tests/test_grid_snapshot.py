@@ -0,0 +1,80 @@
+from PyQt6.QtCore import Qt
+
+from tests.fake_jira import FakeJiraService, make_issues
+
+SETTINGS = {'last_used_jql': 'project = PRJ'}
+
+
+def test_last_grid_is_rendered_before_any_request_then_reconciled(make_controller, qtbot):
+    first = make_controller(FakeJiraService(make_issues(['a', 'b', 'c'])), SETTINGS)
+    first.load_jira_issues()
+    qtbot.waitUntil(lambda: first.view.jira_grid_view.model.rowCount() == 3, timeout=5000)
+    grid = first.view.jira_grid_view
+    grid.sort_columns = [{'column': grid.model.column_index('key'), 'order': Qt.SortOrder.DescendingOrder}]
+    grid._apply_cumulative_sort()
+    grid.table.selectRow(grid.model.row_of_key('PRJ-1'))
+    first._save_grid_snapshot()
+
+    jira = FakeJiraService(make_issues(['a', 'b changed', 'c']))
+    second = make_controller(jira, SETTINGS)
+    second.load_cached_issues_immediately()
+    grid = second.view.jira_grid_view
+    model = grid.model
+
+    # Shown synchronously, as it was left, with no request to Jira
+    assert jira.jqls == []
+    assert [model.key_at(row) for row in range(model.rowCount())] == ['PRJ-2', 'PRJ-1', 'PRJ-0']
+    assert grid.selected_key() == 'PRJ-1'
+    assert grid.get_jql_text() == 'project = PRJ'
+    # The rendered rows count as loaded issues, so offline the grid is not flagged as empty
+    assert sorted(row.key for row in second.current_issues) == ['PRJ-0', 'PRJ-1', 'PRJ-2']
+
+    resets, touched = [], []
+    model.modelReset.connect(lambda: resets.append(True))
+    model.dataChanged.connect(lambda top_left, bottom_right: touched.append(model.key_at(top_left.row())))
+    second.load_jira_issues()
+    qtbot.waitUntil(lambda: not second.is_loading, timeout=5000)
+
+    assert touched == ['PRJ-1'] and not resets
+    assert model.row_at(model.row_of_key('PRJ-1')).title == 'b changed'
+    # The loaded issues are the records of the grid, not copies of them
+    assert all(row is model.record_of_key(row.key) for row in second.current_issues)
+    assert grid.selected_key() == 'PRJ-1'
+
+
+def test_snapshot_of_another_query_is_not_rendered(make_controller):
+    controller = make_controller(FakeJiraService(make_issues(['a'])), SETTINGS)
+    controller.db_service.save_grid_snapshot({'jql': 'project = OTHER', 'favorites_only': False,
+                                              'fields': ['key'], 'rows': [['OTHER-1']]})
+
+    assert not controller._render_grid_snapshot()
+    assert controller.view.jira_grid_view.model.rowCount() == 0
+
+
+def test_snapshot_longer_than_a_page_is_reconciled_whole(make_controller, qtbot):
+    titles = [f'Issue {i}' for i in range(300)]
+    first = make_controller(FakeJiraService(make_issues(titles)), SETTINGS)
+    first.load_jira_issues()
+    first_model = first.view.jira_grid_view.model
+    while len(first_model.rows()) < 300:
+        qtbot.waitUntil(lambda: not first.is_loading, timeout=5000)
+        first.load_jira_issues(append=True)
+    qtbot.waitUntil(lambda: not first.is_loading and len(first_model.rows()) == 300, timeout=5000)
+    first._save_grid_snapshot()
+
+    titles[250] = 'Changed'
+    second = make_controller(FakeJiraService(make_issues(titles)), SETTINGS)
+    assert second.load_cached_issues_immediately() is None
+    model = second.view.jira_grid_view.model
+    assert model.rowCount() == 300
+
+    resets, touched = [], []
+    model.modelReset.connect(lambda: resets.append(True))
+    model.dataChanged.connect(lambda top_left, bottom_right: touched.append(model.key_at(top_left.row())))
+    # The startup coordinator brings a first batch shorter than the snapshot
+    second._on_startup_data_ready({'issues': make_issues(titles[:20])})
+    qtbot.waitUntil(lambda: not second.is_loading, timeout=5000)
+
+    # Every rendered row stays: only the one that changed on Jira is redrawn
+    assert model.rowCount() == 300
+    assert touched == ['PRJ-250'] and not resets
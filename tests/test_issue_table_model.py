@@ -0,0 +1,152 @@
+import time
+
+from PyQt6.QtCore import Qt
+
+from views.issue_table_model import IssueRow
+from views.jira_grid_view import JiraGridView
+
+
+def _row(key, title, priority='Medium', seconds=0, favorite=False, status='Open', updated=''):
+    return IssueRow(key, title, status, priority, time_seconds=seconds, favorite=favorite, updated=updated)
+
+
+def _copy(row, **changes):
+    values = {field: getattr(row, field) for field in IssueRow.__slots__ if field != 'search_text'}
+    values.update(changes)
+    return IssueRow(**values)
+
+
+def test_large_grids_are_loaded_without_cell_widgets(qtbot):
+    view = JiraGridView()
+    qtbot.addWidget(view)
+    rows = [_row(f'PRJ-{i}', f'Issue {i}', seconds=i * 60) for i in range(50000)]
+
+    started = time.perf_counter()
+    view.append_issue_rows(rows)
+    elapsed = time.perf_counter() - started
+
+    assert view.model.rowCount() == 50000
+    assert elapsed < 1.0
+    model = view.model
+    assert model.data(model.index(2, model.column_index('time_spent'))) == "0h 2m"
+    assert model.data(model.index(2, model.column_index('favorite'))) == "☆"
+    assert view.table.indexWidget(model.index(0, model.column_index('priority'))) is None
+
+
+def test_cumulative_sort_keeps_the_selection(qtbot):
+    view = JiraGridView()
+    qtbot.addWidget(view)
+    view.append_issue_rows([
+        _row('PRJ-1', 'b', priority='Low', seconds=600),
+        _row('PRJ-2', 'a', priority='High', seconds=60),
+        _row('PRJ-3', 'c', priority='High', seconds=3600),
+    ])
+    view.table.selectRow(0)
+    model = view.model
+
+    view.sort_columns = [
+        {'column': model.column_index('priority'), 'order': Qt.SortOrder.DescendingOrder},
+        {'column': model.column_index('time_spent'), 'order': Qt.SortOrder.AscendingOrder.value},
+    ]
+    view._apply_cumulative_sort()
+
+    assert [model.key_at(row) for row in range(3)] == ['PRJ-2', 'PRJ-3', 'PRJ-1']
+    assert view.selected_key() == 'PRJ-1'
+
+
+def test_priority_and_favorite_edits_are_reported_by_key(qtbot):
+    view = JiraGridView()
+    qtbot.addWidget(view)
+    view.set_priorities_provider(lambda: [{'id': '2', 'name': 'High'}, {'id': '4', 'name': 'Low'}])
+    view.append_issue_rows([_row('PRJ-1', 'a'), _row('PRJ-2', 'b')])
+    view.show()
+    qtbot.waitExposed(view)
+    model = view.model
+    priorities, favorites = [], []
+    model.priority_changed.connect(lambda key, name: priorities.append((key, name)))
+    model.favorite_toggled.connect(lambda key, favorite: favorites.append((key, favorite)))
+
+    priority_index = model.index(1, model.column_index('priority'))
+    assert model.flags(priority_index) & Qt.ItemFlag.ItemIsEditable
+    assert model.setData(priority_index, 'High')
+    assert priorities == [('PRJ-2', 'High')]
+
+    favorite_index = model.index(0, model.column_index('favorite'))
+    rect = view.table.visualRect(favorite_index)
+    qtbot.mouseClick(view.table.viewport(), Qt.MouseButton.LeftButton, pos=rect.center())
+    assert favorites == [('PRJ-1', True)]
+    assert model.data(favorite_index) == "★"
+    assert view.table.indexWidget(favorite_index) is None
+
+
+def test_multi_column_sort_uses_precomputed_keys(qtbot):
+    view = JiraGridView()
+    qtbot.addWidget(view)
+    model = view.model
+    model.set_sort_orders(
+        [{'id': '1', 'name': 'Blocker'}, {'id': '2', 'name': 'Normal'}],
+        [{'id': '3', 'name': 'Closed', 'category': 'done'}, {'id': '1', 'name': 'Backlog', 'category': 'new'},
+         {'id': '2', 'name': 'Review', 'category': 'indeterminate'}])
+    statuses = ['Closed', 'Review', 'Backlog', 'Custom']
+    view.append_issue_rows([_row(f'PRJ-{i}', f'Issue {i % 7}', priority='Blocker' if i % 3 else 'Normal',
+                                 seconds=(i * 37) % 500, status=statuses[i % 4]) for i in range(10000)])
+    view.sort_columns = [
+        {'column': model.column_index('status'), 'order': Qt.SortOrder.AscendingOrder},
+        {'column': model.column_index('priority'), 'order': Qt.SortOrder.DescendingOrder},
+        {'column': model.column_index('time_spent'), 'order': Qt.SortOrder.AscendingOrder},
+    ]
+
+    view._apply_cumulative_sort()  # computes the sort keys
+    started = time.perf_counter()
+    view._apply_cumulative_sort()
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.1
+    rows = [model.row_at(row) for row in range(model.rowCount())]
+    # Workflow order, unknown statuses last
+    assert [rows[0].status, rows[2500].status, rows[5000].status, rows[7500].status] == \
+        ['Backlog', 'Review', 'Closed', 'Custom']
+    assert rows[0].priority == 'Blocker'
+    backlog_blockers = [row for row in rows if row.status == 'Backlog' and row.priority == 'Blocker']
+    assert [row.time_seconds for row in backlog_blockers] == sorted(row.time_seconds for row in backlog_blockers)
+
+
+def test_refresh_touches_only_the_rows_that_changed(qtbot):
+    view = JiraGridView()
+    qtbot.addWidget(view)
+    model = view.model
+    old_rows = [_row(f'PRJ-{i}', f'Issue {i}', updated='2025-01-01') for i in range(500)]
+    view.append_issue_rows([_copy(row) for row in old_rows])
+    view.table.selectRow(model.row_of_key('PRJ-250'))
+    resets, touched = [], []
+    model.modelReset.connect(lambda: resets.append(True))
+    model.dataChanged.connect(lambda top_left, bottom_right: touched.append(model.key_at(top_left.row())))
+
+    new_rows = [_copy(row) for row in old_rows]
+    new_rows[10] = _copy(old_rows[10], title='Renamed', updated='2025-02-01')
+    new_rows[300] = _copy(old_rows[300], status='Done', updated='2025-02-01')
+    counts = view.reconcile_issue_rows(new_rows)
+
+    assert counts == {'removed': 0, 'inserted': 0, 'changed': 2, 'moved': False}
+    assert touched == ['PRJ-10', 'PRJ-300'] and not resets
+    assert model.row_at(10).title == 'Renamed'
+    assert view.selected_key() == 'PRJ-250'
+
+    # Removals, insertions and moves keep the selected issue selected
+    new_rows = [_copy(row) for row in new_rows[:5]] + [_copy(new_rows[250]), _row('PRJ-NEW', 'New')]
+    new_rows[0], new_rows[1] = new_rows[1], new_rows[0]
+    counts = view.reconcile_issue_rows(new_rows)
+
+    assert counts == {'removed': 494, 'inserted': 1, 'changed': 0, 'moved': True}
+    assert [model.key_at(row) for row in range(model.rowCount())] == \
+        ['PRJ-1', 'PRJ-0', 'PRJ-2', 'PRJ-3', 'PRJ-4', 'PRJ-250', 'PRJ-NEW']
+    assert view.selected_key() == 'PRJ-250' and not resets
+
+
+def test_rows_are_slotted_and_share_status_and_priority_strings():
+    # Strings built at run time, as the JSON parser does for every issue
+    first = IssueRow('PRJ-1', 'a', ''.join(['In ', 'Progress']), ''.join(['Hi', 'gh']))
+    second = IssueRow('PRJ-2', 'b', ''.join(['In ', 'Pro', 'gress']), ''.join(['H', 'igh']))
+
+    assert not hasattr(first, '__dict__')
+    assert first.status is second.status and first.priority is second.priority
@@ -0,0 +1,159 @@
+import gzip
+import json
+import threading
+import time
+import warnings
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+from jira import JIRAError
+
+from tests.fake_jira import connected_service
+from tests.jira_standin import Cassette, FaultConfig, JiraDataset, JiraStandIn
+
+
+@pytest.fixture
+def standin():
+    with JiraStandIn(JiraDataset.synthetic(250, attachments_per_issue=1, attachment_size=10000)) as server:
+        yield server
+
+
+def test_jira_service_reads_from_standin(standin):
+    service = connected_service(standin)
+
+    with warnings.catch_warnings():
+        # Counting does not go through a call that warns (and no warning filter is touched)
+        warnings.simplefilter("error")
+        assert service.count_issues('project = PRJ') == 250
+    page = service.search_issues('project = PRJ', start_at=100, max_results=50)
+    assert [i['key'] for i in page][:2] == ['PRJ-101', 'PRJ-102']
+    assert set(page[0]['fields']) == {'summary', 'status', 'timespent', 'updated'}
+
+    assert len(service.get_issue_comments('PRJ-7')) == 2
+    assert [p['name'] for p in service.get_priorities()][0] == 'Highest'
+    assert service.get_issue_watchers('PRJ-7')[0]['key'] == 'standin.user'
+
+    with pytest.raises(JIRAError) as err:
+        service.get_issue('NOPE-1')
+    assert err.value.status_code == 404
+
+
+def test_jira_service_writes_to_standin(standin):
+    service = connected_service(standin)
+
+    assert service.update_issue_priority('PRJ-3', '1')
+    assert standin.dataset.issues['PRJ-3']['fields']['priority']['name'] == 'Highest'
+
+    service.add_comment('PRJ-3', 'hello')
+    assert standin.dataset.comments['PRJ-3'][-1]['body'] == 'hello'
+
+    service.jira.add_worklog('PRJ-3', timeSpentSeconds=600, comment='work')
+    assert standin.dataset.worklogs['PRJ-3'][-1]['timeSpentSeconds'] == 600
+
+    # Writes bump 'updated', so only the touched issue matches an "updated since" query
+    assert [i['key'] for i in service.search_issues('updated > "2025-01-01 00:00"')] == ['PRJ-3']
+    assert standin.request_counts['POST /rest/api/2/issue/{key}/worklog'] == 1
+
+
+def test_attachment_content_supports_range_requests(standin):
+    meta = standin.dataset.issues['PRJ-1']['fields']['attachment'][0]
+    url = standin.url + meta['content']
+
+    full = requests.get(url, timeout=5)
+    assert full.status_code == 200 and len(full.content) == 10000
+
+    partial = requests.get(url, headers={'Range': 'bytes=9000-'}, timeout=5)
+    assert partial.status_code == 206
+    assert partial.content == full.content[9000:]
+    assert partial.headers['Content-Range'] == 'bytes 9000-9999/10000'
+
+
+def test_injected_errors_are_retried():
+    faults = FaultConfig(fail_first=2, fail_status=503, paths=['/search'])
+    with JiraStandIn(JiraDataset.synthetic(10), faults) as server:
+        service = connected_service(server, max_retries=3)
+        assert len(service.search_issues('project = PRJ')) == 10
+        assert server.request_counts['GET /rest/api/2/search'] == 3
+
+
+def test_rate_limit_sends_retry_after():
+    faults = FaultConfig(rate_limit_rate=1.0, retry_after=7)
+    with JiraStandIn(JiraDataset.synthetic(1), faults) as server:
+        resp = requests.get(server.url + '/rest/api/2/myself', timeout=5)
+        assert resp.status_code == 429
+        assert resp.headers['Retry-After'] == '7'
+
+
+def test_latency_is_applied():
+    with JiraStandIn(JiraDataset.synthetic(1), FaultConfig(latency=0.2)) as server:
+        started = time.monotonic()
+        requests.get(server.url + '/rest/api/2/serverInfo', timeout=5)
+        assert time.monotonic() - started >= 0.2
+
+
+def test_record_then_replay_offline(tmp_path, standin):
+    cassette = tmp_path / 'jira.jsonl'
+    with JiraStandIn(mode='record', upstream_url=standin.url, cassette_path=str(cassette)) as recorder:
+        service = connected_service(recorder)
+        recorded = service.search_issues('project = PRJ', max_results=5)
+        recorded_comments = service.get_issue_comments('PRJ-2')
+        recorder_url = recorder.url
+
+    assert len(Cassette(str(cassette)).entries) >= 4
+
+    # The upstream is no longer needed: replay answers from the cassette only
+    standin.stop()
+    with JiraStandIn(mode='replay', cassette_path=str(cassette)) as player:
+        service = connected_service(player)
+
+        # The links point at whichever stand-in is answering, never at the upstream
+        def relocated(value):
+            return json.loads(json.dumps(value).replace(recorder_url, player.url))
+
+        replayed = service.search_issues('project = PRJ', max_results=5)
+        assert standin.url not in json.dumps(replayed)
+        assert replayed == relocated(recorded)
+        assert service.get_issue_comments('PRJ-2') == relocated(recorded_comments)
+
+        # Requests that were never recorded are reported, not invented
+        resp = requests.get(player.url + '/rest/api/2/issue/PRJ-99', timeout=5)
+        assert resp.status_code == 599
+
+
+def test_record_from_a_gzip_upstream_rewrites_its_address(tmp_path):
+    class GzipJira(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            base = f'http://127.0.0.1:{self.server.server_address[1]}'
+            body = gzip.compress(json.dumps({'baseUrl': base, 'content': base + '/secure/attachment/1/a.txt',
+                                             'version': '9.12.0'}).encode('utf-8'))
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json;charset=UTF-8')
+            self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    upstream = ThreadingHTTPServer(('127.0.0.1', 0), GzipJira)
+    threading.Thread(target=upstream.serve_forever, daemon=True).start()
+    cassette = tmp_path / 'jira.jsonl'
+    try:
+        with JiraStandIn(mode='record', upstream_url=f'http://127.0.0.1:{upstream.server_address[1]}',
+                         cassette_path=str(cassette)) as recorder:
+            resp = requests.get(recorder.url + '/rest/api/2/serverInfo', timeout=5)
+            assert resp.status_code == 200
+            assert 'Content-Encoding' not in resp.headers
+            assert resp.json()['baseUrl'] == recorder.url
+    finally:
+        upstream.shutdown()
+        upstream.server_close()
+
+    with JiraStandIn(mode='replay', cassette_path=str(cassette)) as player:
+        info = requests.get(player.url + '/rest/api/2/serverInfo', timeout=5).json()
+        assert info['baseUrl'] == player.url
+        assert info['content'] == player.url + '/secure/attachment/1/a.txt'
@@ -0,0 +1,109 @@
+import random
+import threading
+import time
+
+from tests.fake_jira import FakeJiraService, make_issues
+from workers.worker import JiraLoadAllWorker
+
+
+def _service(total, server_cap=None, delay=0.0, hold_after_first=None):
+    def _before_search(jql, start_at):
+        if delay:
+            # Random latency so pages complete out of order
+            time.sleep(random.uniform(0, delay))
+        if hold_after_first is not None and start_at > 0:
+            # Keep later pages in flight until the test lets them go
+            hold_after_first.wait(5)
+    return FakeJiraService(make_issues([''] * total), server_cap=server_cap, before_search=_before_search)
+
+
+def _run(worker):
+    pages, done = [], []
+    worker.page_loaded.connect(pages.append)
+    worker.finished.connect(done.append)
+    worker.run()
+    return pages, done
+
+
+def test_load_all_emits_pages_in_result_order():
+    service = _service(total=1050, delay=0.01)
+    worker = JiraLoadAllWorker(service, 'project = PRJ', page_size=100,
+                               max_workers=4, max_requests_per_second=None)
+    pages, done = _run(worker)
+
+    keys = [issue['key'] for page in pages for issue in page]
+    assert keys == [f'PRJ-{i}' for i in range(1050)]
+    assert done == [1050]
+    assert service.count_calls == 1
+    assert service.search_calls == 11
+
+
+def test_load_all_completes_pages_capped_by_server():
+    service = _service(total=250, server_cap=50)
+    worker = JiraLoadAllWorker(service, 'project = PRJ', page_size=100,
+                               max_requests_per_second=None)
+    pages, done = _run(worker)
+
+    assert [len(p) for p in pages] == [100, 100, 50]
+    assert done == [250]
+
+
+def test_load_all_empty_result_skips_page_requests():
+    service = _service(total=0)
+    worker = JiraLoadAllWorker(service, 'project = NONE')
+    pages, done = _run(worker)
+
+    assert pages == []
+    assert done == [0]
+    assert service.search_calls == 0
+
+
+def test_load_all_stop_discards_remaining_pages():
+    hold = threading.Event()
+    service = _service(total=1000, hold_after_first=hold)
+    worker = JiraLoadAllWorker(service, 'project = PRJ', page_size=100,
+                               max_workers=1, max_requests_per_second=None)
+    pages, done = [], []
+
+    def _cancel(page):
+        worker.stop()
+        hold.set()
+
+    worker.page_loaded.connect(pages.append)
+    worker.page_loaded.connect(_cancel)
+    worker.finished.connect(done.append)
+    worker.run()
+
+    assert len(pages) == 1
+    assert done == [100]
+    # Only the first page and the one already in flight were requested
+    assert service.search_calls <= 2
+
+
+def test_load_all_rate_limit_spaces_requests():
+    service = _service(total=300)
+    sleeps = []
+    worker = JiraLoadAllWorker(service, 'project = PRJ', page_size=100, max_workers=1,
+                               max_requests_per_second=10, sleep_func=sleeps.append)
+    _run(worker)
+
+    # The first request goes out immediately, the others wait for their slot
+    # (sleep is faked, so the waits accumulate: ~0.1s, ~0.2s)
+    assert len(sleeps) == 2
+    assert 0 < sleeps[0] <= 0.1 + 1e-6
+    assert sleeps[1] > sleeps[0]
+
+
+def test_load_all_stop_interrupts_the_rate_limit_wait():
+    service = _service(total=300)
+    # One request every 5 seconds: the second page would wait for its slot
+    worker = JiraLoadAllWorker(service, 'project = PRJ', page_size=100, max_workers=1,
+                               max_requests_per_second=0.2)
+    worker.page_loaded.connect(lambda page: worker.stop())
+
+    started = time.monotonic()
+    pages, done = _run(worker)
+
+    assert time.monotonic() - started < 1.0
+    assert done == [100]
+    assert service.search_calls == 1
@@ -0,0 +1,83 @@
+import threading
+
+from tests.fake_jira import FakeJiraService, make_issues
+
+
+class PerProjectJiraService(FakeJiraService):
+    """Answers `project = X` with the issues X-0, X-1, X-2."""
+
+    def search_issues(self, jql, start_at=0, max_results=100, issue_keys=None):
+        super().search_issues(jql, start_at, max_results, issue_keys)
+        prefix = jql.split('=')[-1].strip()
+        return make_issues([f'{prefix} {i}' for i in range(3)], prefix=prefix)
+
+
+def test_new_query_discards_late_results_of_previous_load(make_controller, qtbot):
+    release_first = threading.Event()
+    # The first query blocks until released, the others answer at once
+    jira = PerProjectJiraService(before_search=lambda jql, start_at: jql == 'project = OLD' and release_first.wait(5))
+    controller = make_controller(jira)
+
+    controller.load_jira_issues(custom_jql='project = OLD')
+    first_generation = controller._load_generation
+    # The user changes the JQL while the first load is still in flight
+    controller.load_jira_issues(custom_jql='project = NEW')
+    assert controller._load_generation > first_generation
+
+    qtbot.waitUntil(lambda: not controller.is_loading, timeout=5000)
+    # Now let the stale request complete: its rows must not reach the grid
+    release_first.set()
+    qtbot.waitUntil(lambda: not controller._active_threads, timeout=5000)
+
+    keys = [issue.key for issue in controller.current_issues]
+    assert keys == ['NEW-0', 'NEW-1', 'NEW-2']
+    assert controller.view.jira_grid_view.model.rowCount() == 3
+
+
+def test_load_all_is_cancelled_from_the_loading_overlay(make_controller, qtbot):
+    release = threading.Event()
+    # After the first page, requests wait until released
+    jira = FakeJiraService(make_issues([f'Issue {i}' for i in range(1000)]),
+                           before_search=lambda jql, start_at: start_at and release.wait(5))
+    controller = make_controller(jira)
+    grid = controller.view.jira_grid_view
+
+    controller.load_all_jira_issues()
+    assert not grid.cancel_loading_btn.isHidden()
+    qtbot.waitUntil(lambda: len(controller.current_issues) >= 100, timeout=5000)
+
+    grid.cancel_loading_btn.click()
+    release.set()
+    qtbot.waitUntil(lambda: not controller.is_loading, timeout=5000)
+
+    # The rows already loaded stay, the overlay and its button go away
+    assert len(controller.current_issues) < 1000
+    assert grid.cancel_loading_btn.isHidden()
+    assert not grid.loading_overlay.isVisible()
+
+
+def test_refresh_of_a_grid_longer_than_a_page_keeps_all_its_rows(make_controller, qtbot):
+    jira = FakeJiraService(make_issues([f'Issue {i}' for i in range(500)]))
+    controller = make_controller(jira)
+    model = controller.view.jira_grid_view.model
+
+    controller.load_jira_issues(custom_jql='project = PRJ')
+    qtbot.waitUntil(lambda: not controller.is_loading and model.rowCount() == 100, timeout=5000)
+    while len(model.rows()) < 500:
+        controller.load_jira_issues(append=True)
+        qtbot.waitUntil(lambda: not controller.is_loading, timeout=5000)
+    controller.view.jira_grid_view.table.selectRow(model.row_of_key('PRJ-450'))
+
+    jira.issues[450]['fields']['summary'] = 'Changed'
+    resets, touched = [], []
+    model.modelReset.connect(lambda: resets.append(True))
+    model.dataChanged.connect(lambda top_left, bottom_right: touched.append(model.key_at(top_left.row())))
+    jira.search_calls = 0
+    controller.load_jira_issues(custom_jql='project = PRJ')
+    qtbot.waitUntil(lambda: not controller.is_loading, timeout=5000)
+
+    # The whole grid is fetched again, page by page, and only the changed row is rewritten
+    assert model.rowCount() == 500 and len(controller.current_issues) == 500
+    assert jira.search_calls == 5
+    assert touched == ['PRJ-450'] and not resets
+    assert controller.view.jira_grid_view.selected_key() == 'PRJ-450'
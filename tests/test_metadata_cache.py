@@ -0,0 +1,80 @@
+import pytest
+
+from services.jira_service import JiraService
+from services.metadata_cache import JiraMetadataCache, DEFAULT_PRIORITIES
+from controllers.priority_config_controller import PriorityConfigController
+from tests.fake_jira import connected_service
+from tests.jira_standin import JiraDataset, JiraStandIn
+
+
+@pytest.fixture
+def standin():
+    with JiraStandIn(JiraDataset.synthetic(1)) as server:
+        yield server
+
+
+def test_empty_cache_serves_default_priorities(db):
+    cache = JiraMetadataCache(db, JiraService())
+    assert cache.get_priorities() == DEFAULT_PRIORITIES
+    assert cache.get_statuses() == []
+    assert cache.get_priority_id('Medium') == '3'
+
+
+def test_refresh_persists_all_kinds(db, standin):
+    cache = JiraMetadataCache(db, connected_service(standin))
+    assert set(cache.refresh()) == set(JiraMetadataCache.KINDS)
+    assert [s['name'] for s in cache.get_statuses()][0] == 'To Do'
+    assert cache.get_link_types()[0]['outward'] == 'blocks'
+
+    # A new session (offline) is served synchronously from the database
+    offline = JiraMetadataCache(db, JiraService())
+    assert offline.get_issue_types() == cache.get_issue_types()
+    assert not offline.is_stale('priorities')
+
+
+def test_refresh_only_fetches_stale_lists(db, standin):
+    cache = JiraMetadataCache(db, connected_service(standin))
+    cache.refresh()
+    before = standin.total_requests()
+
+    assert cache.refresh() == []
+    assert standin.total_requests() == before
+
+    cache.ttl_seconds = 0
+    assert set(cache.refresh()) == set(JiraMetadataCache.KINDS)
+
+
+def test_priority_controller_reads_from_cache_without_network(db, standin):
+    cache = JiraMetadataCache(db, connected_service(standin))
+    cache.refresh()
+    before = standin.request_counts['GET /rest/api/2/priority']
+
+    controller = PriorityConfigController(db, cache.jira_service, metadata_cache=cache)
+    assert [p['name'] for p in controller.get_available_priorities()] == [p['name'] for p in DEFAULT_PRIORITIES]
+    assert standin.request_counts['GET /rest/api/2/priority'] == before
+
+
+def test_detail_window_fills_the_priority_combo_from_the_shared_cache(db, standin, qtbot, monkeypatch):
+    from controllers.jira_detail_controller import JiraDetailController
+    from services import download_manager, thumbnail_cache
+    from views.jira_detail_view import JiraDetailView
+
+    # The detail window's shared download manager and thumbnail cache, on this test's database
+    monkeypatch.setattr(download_manager, '_shared_manager', None)
+    monkeypatch.setattr(thumbnail_cache, '_shared_cache', None)
+    cache = JiraMetadataCache(db, connected_service(standin))
+    cache.refresh()
+    standin.request_counts.clear()
+
+    view = JiraDetailView('PRJ-1')
+    qtbot.addWidget(view)
+    controller = JiraDetailController(view, cache.jira_service, db, 'PRJ-1', metadata_cache=cache)
+    try:
+        controller.populate_priority_combo()
+        combo = [view.priority_combo.itemText(i) for i in range(view.priority_combo.count())]
+        assert combo == [p['name'] for p in cache.get_priorities()]
+        assert controller.priority_controller.metadata_cache is cache
+        assert standin.total_requests() == 0
+    finally:
+        controller.thumbnail_cache.shutdown()
+        controller.download_manager.shutdown()
@@ -0,0 +1,63 @@
+import socket
+import threading
+
+import pytest
+
+from services.network_service import NetworkService
+from tests.fake_jira import connected_service
+from tests.jira_standin import JiraDataset, JiraStandIn
+
+
+@pytest.fixture
+def standin():
+    with JiraStandIn(JiraDataset.synthetic(3)) as server:
+        yield server
+
+
+def test_probe_runs_in_background_and_uses_server_info(qtbot, standin):
+    network = NetworkService(connected_service(standin), internet_check_hosts=[])
+    default_timeout = socket.getdefaulttimeout()
+    standin.request_counts.clear()
+
+    with qtbot.waitSignal(network.probe_completed, timeout=5000) as blocker:
+        network.check_connection()
+    assert blocker.args == [True, True]
+    assert network.is_jira_available and network.is_internet_available
+
+    assert standin.request_counts['GET /rest/api/2/serverInfo'] == 1
+    assert standin.request_counts['GET /rest/api/2/search'] == 0
+    # The probe must not change the timeout of every socket in the process
+    assert socket.getdefaulttimeout() == default_timeout
+
+
+def test_probe_reports_unreachable_jira(qtbot, standin):
+    network = NetworkService(connected_service(standin), internet_check_hosts=[], probe_timeout=0.5)
+    standin.stop()
+
+    with qtbot.waitSignal(network.probe_completed, timeout=5000) as blocker:
+        network.check_connection()
+    assert blocker.args == [False, False]
+
+
+def test_health_is_inferred_from_real_calls(qtbot, standin):
+    jira_service = connected_service(standin)
+    network = NetworkService(jira_service, internet_check_hosts=[], probe_timeout=0.5)
+    jira_service.add_health_listener(network._on_jira_call)
+    standin.request_counts.clear()
+
+    # A successful call from a worker thread marks Jira available without any probe
+    with qtbot.waitSignal(network.jira_connection_changed, timeout=5000) as blocker:
+        threading.Thread(target=jira_service.get_issue, args=('PRJ-1',)).start()
+    assert blocker.args == [True]
+    assert standin.request_counts['GET /rest/api/2/serverInfo'] == 0
+
+    # While Jira answers, the periodic timer does not probe
+    network._on_check_timer()
+    assert not network._probe_running
+
+    # A failed call triggers a probe, which confirms the outage
+    standin.stop()
+    with qtbot.waitSignal(network.jira_connection_changed, timeout=5000) as blocker:
+        with pytest.raises(Exception):
+            jira_service.get_issue('PRJ-2')
+    assert blocker.args == [False]
@@ -0,0 +1,118 @@
+import time
+
+from controllers.notification_controller import NotificationController
+from services.jira_service import JiraService
+from services.notification_poller import NotificationPoller
+from tests.fake_jira import connected_service
+from tests.jira_standin import FaultConfig, JiraDataset, JiraStandIn
+
+
+def _subscribe(db, count):
+    for n in range(1, count + 1):
+        db.add_notification_subscription(f'PRJ-{n}')
+
+
+def _comment_requests(server):
+    return server.request_counts['GET /rest/api/2/issue/{key}/comment']
+
+
+def test_one_search_per_chunk_and_comments_only_for_changed_issues(db):
+    with JiraStandIn(JiraDataset.synthetic(60, comments_per_issue=1)) as server:
+        _subscribe(db, 60)
+        server.dataset.add_comment('PRJ-7', 'new comment')
+        time.sleep(0.002)
+        poller = NotificationPoller(db, connected_service(server), chunk_size=50)
+
+        summary = poller.poll()
+
+        assert summary == {'due': 60, 'checked': 60, 'changed': 1, 'new_notifications': 1, 'requests': 3}
+        assert server.request_counts['GET /rest/api/2/search'] == 2
+        assert _comment_requests(server) == 1
+        assert db.get_unread_notifications_count() == 1
+        assert not db.get_notification_subscription('PRJ-7')['is_read']
+
+        # Nothing changed since the last check: no comment is read again
+        assert poller.poll(force=True)['new_notifications'] == 0
+        assert _comment_requests(server) == 1
+        assert server.request_counts['GET /rest/api/2/search'] == 4
+
+
+def _intervals(db):
+    return {s['issue_key']: s['poll_interval'] for s in db.get_all_notification_subscriptions()}
+
+
+def test_quiet_issues_back_off_and_active_issues_tighten(db):
+    with JiraStandIn(JiraDataset.synthetic(2)) as server:
+        _subscribe(db, 2)
+        poller = NotificationPoller(db, connected_service(server), min_interval=60, base_interval=300, max_interval=1000)
+
+        poller.poll()
+        assert _intervals(db) == {'PRJ-1': 600, 'PRJ-2': 600}
+
+        # Only due subscriptions are checked: right after a cycle nothing is
+        assert poller.poll() == {'due': 0, 'checked': 0, 'changed': 0, 'new_notifications': 0, 'requests': 0}
+
+        server.dataset.add_comment('PRJ-1', 'hello')
+        server.dataset.add_worklog('PRJ-2', {'timeSpentSeconds': 60})
+        time.sleep(0.002)  # Jira timestamps are per millisecond: same-ms updates are read twice
+        poller.poll(force=True)
+        # New comment: back to the minimum; other activity: halved
+        assert _intervals(db) == {'PRJ-1': 60, 'PRJ-2': 300}
+
+        poller.poll(force=True)
+        poller.poll(force=True)
+        assert _intervals(db)['PRJ-1'] == 240
+        assert _intervals(db)['PRJ-2'] == 1000
+
+
+def test_request_budget_leaves_the_rest_due(db):
+    with JiraStandIn(JiraDataset.synthetic(4)) as server:
+        _subscribe(db, 4)
+        for n in range(1, 5):
+            server.dataset.add_comment(f'PRJ-{n}', 'ping')
+        poller = NotificationPoller(db, connected_service(server), chunk_size=2, request_budget=3)
+
+        summary = poller.poll()
+        assert summary['requests'] == 3
+        assert summary['new_notifications'] == 2
+        assert server.request_counts['GET /rest/api/2/search'] == 1
+
+        # The remaining issues are still due and are served first in the next cycle
+        summary = poller.poll()
+        assert summary['due'] == 2
+        assert summary['new_notifications'] == 2
+        assert db.get_unread_notifications_count() == 4
+
+
+def test_rejected_search_falls_back_to_per_issue_check(db):
+    faults = FaultConfig(fail_first=1, fail_status=400, paths=['/search'])
+    with JiraStandIn(JiraDataset.synthetic(3, comments_per_issue=1), faults) as server:
+        _subscribe(db, 3)
+        summary = NotificationPoller(db, connected_service(server)).poll()
+
+        assert summary['checked'] == 3
+        assert _comment_requests(server) == 3
+
+
+def test_offline_poll_does_nothing(db):
+    _subscribe(db, 2)
+    before = db.get_all_notification_subscriptions()
+    assert NotificationPoller(db, JiraService()).poll()['checked'] == 0
+    assert db.get_all_notification_subscriptions() == before
+
+
+def test_controller_checks_in_background(qtbot, db):
+    with JiraStandIn(JiraDataset.synthetic(5)) as server:
+        _subscribe(db, 5)
+        server.dataset.add_comment('PRJ-2', 'ping')
+        controller = NotificationController(db, connected_service(server))
+
+        with qtbot.waitSignal(controller.check_completed, timeout=10000) as blocker:
+            controller.check_notifications()
+            # A second request while the first one runs is ignored
+            controller.check_notifications()
+
+        assert blocker.args[0]['new_notifications'] == 1
+        assert controller.notification_count == 1
+        qtbot.waitUntil(lambda: controller._check_thread is None, timeout=5000)
+        assert server.request_counts['GET /rest/api/2/search'] == 1
@@ -0,0 +1,62 @@
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pytest
+from PyQt6.QtGui import QColor, QIcon, QImage, QPixmap
+from PyQt6.QtWidgets import QApplication
+
+from services.pixmap_cache import PixmapCache, memory_report, pixmap_cost
+
+
+@pytest.fixture(scope="module", autouse=True)
+def app():
+    # QPixmap richiede una QApplication
+    return QApplication.instance() or QApplication([])
+
+
+def _pixmap(width, height):
+    pixmap = QPixmap(width, height)
+    pixmap.fill(QColor("red"))
+    return pixmap
+
+
+def test_least_recently_used_pixmaps_are_evicted_to_stay_within_the_budget():
+    cost = pixmap_cost(_pixmap(32, 32))
+    cache = PixmapCache(max_bytes=3 * cost)
+    for key in ("a", "b", "c"):
+        cache.put(key, _pixmap(32, 32))
+    assert cache.get("a") is not None  # "b" becomes the least recently used
+
+    cache.put("d", _pixmap(32, 32))
+    assert cache.get("b") is None
+    assert all(cache.get(key) is not None for key in ("a", "c", "d"))
+
+    # Larger than the whole budget: returned but not kept
+    big = cache.put("big", _pixmap(64, 64))
+    assert not big.isNull() and cache.get("big") is None
+
+    stats = cache.stats()
+    assert stats['entries'] == 3 and stats['bytes'] == 3 * cost
+    assert stats['evictions'] == 1
+    assert stats['hits'] == 4 and stats['misses'] == 2
+
+
+def test_loaded_images_and_icons_are_created_once(tmp_path):
+    path = str(tmp_path / "screenshot.png")
+    image = QImage(400, 200, QImage.Format.Format_ARGB32)
+    image.fill(QColor("blue"))
+    assert image.save(path, "PNG")
+    cache = PixmapCache()
+
+    scaled = cache.load(path, 24)
+    assert (scaled.width(), scaled.height()) == (24, 12)
+    assert cache.load(path, 24).cacheKey() == scaled.cacheKey()
+    assert cache.load(path).width() == 400
+    assert cache.load(str(tmp_path / "missing.png")).isNull()
+
+    created = []
+    factory = lambda: created.append(1) or QIcon(scaled)
+    assert cache.icon("image", factory) is cache.icon("image", factory)
+    assert created == [1]
+    assert "Cache immagini" in memory_report()
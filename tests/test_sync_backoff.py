@@ -0,0 +1,26 @@
+import requests
+from jira.exceptions import JIRAError
+
+from services.sync_backoff import classify_error, retry_delay
+
+
+def test_errors_are_classified_by_cause():
+    assert classify_error(JIRAError(status_code=401)) == 'auth'
+    assert classify_error(JIRAError(status_code=403)) == 'auth'
+    assert classify_error(JIRAError(status_code=429)) == 'rate_limit'
+    assert classify_error(JIRAError(status_code=502)) == 'server'
+    assert classify_error(JIRAError(status_code=404)) == 'client'
+    assert classify_error(requests.ConnectionError("refused")) == 'network'
+    assert classify_error(ConnectionError("Not connected to Jira.")) == 'network'
+    assert classify_error(FileNotFoundError("missing.pdf")) == 'client'
+    assert classify_error(RuntimeError("rejected")) == 'unknown'
+
+
+def test_delay_doubles_up_to_the_cap_and_stops_at_the_limit():
+    no_jitter = lambda: 0.0
+    assert [retry_delay('server', n, rng=no_jitter) for n in (1, 2, 3)] == [60, 120, 240]
+    assert retry_delay('server', 9, rng=no_jitter) == 3600
+    assert retry_delay('server', 10, rng=no_jitter) is None
+    assert retry_delay('client', 1) is None
+    assert retry_delay('rate_limit', 1, retry_after=300, rng=no_jitter) == 300
+    assert 60 <= retry_delay('server', 1) <= 72
@@ -0,0 +1,274 @@
+import json
+import threading
+from datetime import datetime, timezone
+
+from services.sync_engine import SyncEngine
+from tests.fake_jira import connected_service
+from tests.jira_standin import FaultConfig, JiraDataset, JiraStandIn
+
+
+def _queue_worklog(db, key, minutes, note):
+    db.add_to_sync_queue("ADD_WORKLOG", json.dumps({
+        "jira_key": key,
+        "time_spent_seconds": minutes * 60,
+        "start_time": datetime(2025, 3, 1, 9, 0).isoformat(),
+        "comment": note,
+    }))
+
+
+def _statuses(db):
+    conn = db.get_connection()
+    try:
+        return dict(conn.execute('SELECT Status, COUNT(*) FROM SyncQueue GROUP BY Status').fetchall())
+    finally:
+        conn.close()
+
+
+def test_thousand_items_are_synced_concurrently_in_per_issue_order(db):
+    with JiraStandIn(JiraDataset.synthetic(50)) as server:
+        for n in range(1000):
+            _queue_worklog(db, f'PRJ-{n % 50 + 1}', 1, f'item {n}')
+        # Both payload spellings written by the app are accepted
+        db.add_to_sync_queue("ADD_WORKLOG", json.dumps({
+            "jira_key": "PRJ-1", "start_time": datetime(2025, 3, 1).isoformat(), "seconds": 120, "comment": "last"}))
+
+        progress = []
+        summary = SyncEngine(db, connected_service(server), max_workers=8).run(
+            progress_callback=lambda done, total, op_id, error: progress.append((done, total)))
+
+        assert summary == {'total': 1001, 'succeeded': 1001, 'failed': 0, 'rescheduled': 0, 'released': 0, 'already_applied': 0, 'coalesced': 0, 'priorities_synced': 0, 'priorities_failed': 0}
+        assert _statuses(db) == {'Success': 1001}
+        assert server.request_counts['POST /rest/api/2/issue/{key}/worklog'] == 1001
+        assert progress[-1] == (1001, 1001)
+
+        comments = [w['comment'] for w in server.dataset.worklogs['PRJ-1']]
+        assert comments == [f'item {n}' for n in range(0, 1000, 50)] + ['last']
+        assert server.dataset.worklogs['PRJ-1'][-1]['timeSpentSeconds'] == 120
+
+
+def test_failure_keeps_later_operations_of_the_issue_queued(db):
+    with JiraStandIn(JiraDataset.synthetic(2)) as server:
+        db.add_to_sync_queue("ADD_COMMENT", json.dumps({"jira_key": "PRJ-404", "body": "lost"}))
+        db.add_to_sync_queue("ADD_COMMENT", json.dumps({"jira_key": "PRJ-404", "body": "after"}))
+        db.add_to_sync_queue("ADD_COMMENT", json.dumps({"jira_key": "PRJ-1", "body": "ok"}))
+
+        summary = SyncEngine(db, connected_service(server)).run()
+
+        assert summary == {'total': 3, 'succeeded': 1, 'failed': 1, 'rescheduled': 0, 'released': 1, 'already_applied': 0, 'coalesced': 0, 'priorities_synced': 0, 'priorities_failed': 0}
+        assert _statuses(db) == {'Failed': 1, 'Pending': 1, 'Success': 1}
+        assert [c['body'] for c in server.dataset.comments['PRJ-1']][-1] == 'ok'
+
+
+def test_claim_is_atomic(db):
+    for n in range(200):
+        db.add_to_sync_queue("ADD_COMMENT", json.dumps({"jira_key": f"PRJ-{n}", "body": "x"}))
+
+    claimed = []
+
+    def _claim():
+        claimed.extend(row[0] for row in db.claim_sync_operations(limit=10))
+
+    threads = [threading.Thread(target=_claim) for _ in range(20)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(claimed) == sorted(set(claimed))
+    assert len(claimed) == 200
+
+
+def test_interrupted_run_is_resumed(db):
+    with JiraStandIn(JiraDataset.synthetic(1), FaultConfig(latency=0.01)) as server:
+        _queue_worklog(db, 'PRJ-1', 5, 'crash')
+        db.claim_sync_operations()  # Simulates a run killed while processing
+
+        summary = SyncEngine(db, connected_service(server)).run()
+        assert summary['succeeded'] == 1
+        assert _statuses(db) == {'Success': 1}
+
+
+def test_operations_already_on_jira_are_not_posted_again(db):
+    with JiraStandIn(JiraDataset.synthetic(2)) as server:
+        jira_service = connected_service(server)
+        _queue_worklog(db, 'PRJ-1', 30, 'applied')
+        _queue_worklog(db, 'PRJ-1', 45, 'lost')
+        db.add_to_sync_queue("ADD_COMMENT", json.dumps({"jira_key": "PRJ-2", "body": "applied\r\n"}))
+
+        # A run sends everything, Jira accepts the first worklog and the comment,
+        # then the app dies before recording the outcome
+        db.claim_sync_operations()
+        jira_service.add_worklog('PRJ-1', 30 * 60, started=datetime(2025, 3, 1, 9, 0).isoformat(), comment='applied')
+        jira_service.add_comment('PRJ-2', 'applied')
+        server.request_counts.clear()
+
+        summary = SyncEngine(db, jira_service).run()
+
+        assert summary['already_applied'] == 2
+        assert summary['succeeded'] == 3
+        assert _statuses(db) == {'Success': 3}
+        assert [w['comment'] for w in server.dataset.worklogs['PRJ-1']] == ['applied', 'lost']
+        assert [c['body'] for c in server.dataset.comments['PRJ-2']].count('applied') == 1
+        # One lookup per issue and kind, one POST for the missing worklog
+        assert server.request_counts['GET /rest/api/2/issue/{key}/worklog'] == 1
+        assert server.request_counts['GET /rest/api/2/issue/{key}/comment'] == 1
+        assert server.request_counts['POST /rest/api/2/issue/{key}/worklog'] == 1
+        assert server.request_counts['POST /rest/api/2/issue/{key}/comment'] == 0
+
+
+def test_first_attempt_needs_no_lookup(db):
+    with JiraStandIn(JiraDataset.synthetic(1)) as server:
+        _queue_worklog(db, 'PRJ-1', 10, 'new')
+        jira_service = connected_service(server)
+        server.request_counts.clear()
+
+        SyncEngine(db, jira_service).run()
+        assert server.request_counts['GET /rest/api/2/issue/{key}/worklog'] == 0
+
+
+def _queue_row(db, operation_id):
+    conn = db.get_connection()
+    try:
+        return conn.execute(
+            'SELECT Status, Attempts, NextAttemptAt, LastErrorClass FROM SyncQueue WHERE Id = ?', (operation_id,)
+        ).fetchone()
+    finally:
+        conn.close()
+
+
+def _seconds_from_now(timestamp):
+    due = datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc)
+    return (due - datetime.now(timezone.utc)).total_seconds()
+
+
+def test_server_error_is_retried_later_with_the_rest_of_the_issue(db):
+    faults = FaultConfig(fail_first=1, fail_status=503, paths=['/worklog'])
+    with JiraStandIn(JiraDataset.synthetic(1), faults) as server:
+        _queue_worklog(db, 'PRJ-1', 10, 'first')
+        _queue_worklog(db, 'PRJ-1', 20, 'second')
+        jira_service = connected_service(server)
+
+        summary = SyncEngine(db, jira_service).run()
+        assert summary['rescheduled'] == 1 and summary['released'] == 1 and summary['failed'] == 0
+
+        status, attempts, first_due, error_class = _queue_row(db, 1)
+        assert (status, attempts, error_class) == ('Pending', 1, 'server')
+        assert 50 <= _seconds_from_now(first_due) <= 75
+        # The second operation waits for the first one, its attempt is not counted
+        assert _queue_row(db, 2)[:3] == ('Pending', 0, first_due)
+
+        # Nothing is due: a new run sends nothing
+        server.request_counts.clear()
+        assert db.has_due_sync_operations() is False
+        assert SyncEngine(db, jira_service).run()['total'] == 0
+        assert sum(server.request_counts.values()) == 0
+
+
+def test_auth_error_stops_the_run(db):
+    faults = FaultConfig(fail_first=1, fail_status=401, paths=['/comment'])
+    with JiraStandIn(JiraDataset.synthetic(10), faults) as server:
+        for n in range(10):
+            db.add_to_sync_queue("ADD_COMMENT", json.dumps({"jira_key": f"PRJ-{n + 1}", "body": "x"}))
+
+        summary = SyncEngine(db, connected_service(server), max_workers=1).run()
+
+        assert summary['rescheduled'] == 1 and summary['released'] == 9
+        assert server.request_counts['POST /rest/api/2/issue/{key}/comment'] == 1
+        assert _queue_row(db, 1)[3] == 'auth'
+        assert _seconds_from_now(_queue_row(db, 1)[2]) >= 14 * 60
+        assert _statuses(db) == {'Pending': 10}
+
+
+def test_rate_limit_honours_retry_after(db):
+    faults = FaultConfig(fail_first=1, fail_status=429, retry_after=600, paths=['/comment'])
+    with JiraStandIn(JiraDataset.synthetic(1), faults) as server:
+        db.add_to_sync_queue("ADD_COMMENT", json.dumps({"jira_key": "PRJ-1", "body": "x"}))
+        SyncEngine(db, connected_service(server)).run()
+
+        status, _attempts, due, error_class = _queue_row(db, 1)
+        assert (status, error_class) == ('Pending', 'rate_limit')
+        assert _seconds_from_now(due) >= 590
+
+
+def test_retry_limit_marks_the_operation_failed_until_requeued(db):
+    faults = FaultConfig(fail_first=2, fail_status=503, paths=['/comment'])
+    with JiraStandIn(JiraDataset.synthetic(1), faults) as server:
+        db.add_to_sync_queue("ADD_COMMENT", json.dumps({"jira_key": "PRJ-1", "body": "x"}))
+        conn = db.get_connection()
+        conn.execute('UPDATE SyncQueue SET Attempts = 9')
+        conn.commit()
+        conn.close()
+        jira_service = connected_service(server)
+
+        summary = SyncEngine(db, jira_service).run()
+        assert summary['failed'] == 1
+        assert _queue_row(db, 1)[::3] == ('Failed', 'server')
+
+        # A manual retry gives one more attempt, then the limit applies again
+        assert db.requeue_sync_operations() == 1
+        assert db.has_due_sync_operations() is True
+        assert SyncEngine(db, jira_service).run()['failed'] == 1
+        assert _queue_row(db, 1)[:2] == ('Failed', 11)
+
+
+def _priority_rows(db):
+    conn = db.get_connection()
+    try:
+        return {row[0]: row[1:] for row in conn.execute(
+            'SELECT JiraKey, SyncStatus, Attempts, NextAttemptAt, LastError FROM PriorityUpdates')}
+    finally:
+        conn.close()
+
+
+def test_priority_updates_are_pushed_in_batches_with_one_request_each(db):
+    with JiraStandIn(JiraDataset.synthetic(120)) as server:
+        for n in range(120):
+            db.store_priority_update(f'PRJ-{n + 1}', '4', 'Low')
+        db.store_priority_update('PRJ-1', '2', 'High')  # Only the last edit is pushed
+        jira_service = connected_service(server)
+        server.request_counts.clear()
+
+        summary = SyncEngine(db, jira_service, max_workers=8, priority_batch_size=50).run()
+
+        assert summary['priorities_synced'] == 120
+        assert server.request_counts['PUT /rest/api/2/issue/{key}'] == 120
+        assert server.request_counts['GET /rest/api/2/issue/{key}'] == 0
+        assert server.dataset.issues['PRJ-1']['fields']['priority']['id'] == '2'
+        assert {row[0] for row in _priority_rows(db).values()} == {'synced'}
+        assert db.has_pending_priority_updates() is False
+
+
+def test_priority_update_failures_are_recorded_per_item(db):
+    faults = FaultConfig(fail_first=1, fail_status=503, paths=['/issue/PRJ-2'])
+    with JiraStandIn(JiraDataset.synthetic(3), faults) as server:
+        db.store_priority_update('PRJ-1', '99', 'Unknown')
+        db.store_priority_update('PRJ-2', '1', 'Highest')
+        db.store_priority_update('PRJ-3', '1', 'Highest')
+
+        summary = SyncEngine(db, connected_service(server)).run()
+
+        assert (summary['priorities_synced'], summary['priorities_failed']) == (1, 2)
+        rows = _priority_rows(db)
+        assert rows['PRJ-1'][:2] == ('failed', 1) and rows['PRJ-1'][3]
+        assert rows['PRJ-2'][:2] == ('pending', 1) and _seconds_from_now(rows['PRJ-2'][2]) > 50
+        assert rows['PRJ-3'][0] == 'synced'
+
+
+def test_priority_edited_while_pushing_stays_pending(db):
+    db.store_priority_update('PRJ-1', '4', 'Low')
+    read = db.get_all_priority_updates()[0]
+    db.store_priority_update('PRJ-1', '2', 'High')
+
+    db.record_priority_update_results([{**read, 'status': 'synced', 'error': None}])
+    assert db.get_all_priority_updates()[0]['priority_id'] == '2'
+
+
+def test_later_edit_with_the_same_values_and_second_is_told_apart(db):
+    db.store_priority_update('PRJ-1', '4', 'Low')
+    read = db.get_all_priority_updates()[0]
+    # Low -> High -> Low: same PriorityId and, within a second, the same UpdatedAt
+    db.store_priority_update('PRJ-1', '2', 'High')
+    db.store_priority_update('PRJ-1', '4', 'Low')
+
+    db.record_priority_update_results([{**read, 'status': 'synced', 'error': None}])
+    assert [update['priority_id'] for update in db.get_all_priority_updates()] == ['4']
@@ -0,0 +1,16 @@
+from views.sync_status_indicator import SyncStatusIndicator
+
+
+def test_run_progress_replaces_the_count_until_the_run_ends(qtbot):
+    indicator = SyncStatusIndicator()
+    qtbot.addWidget(indicator)
+    indicator.set_counts(5, 1)
+    assert indicator.count_label.text() == "6"
+
+    indicator.set_run_progress(2, 5)
+    assert indicator.count_label.text() == "⟳ 2/5"
+    assert "2 di 5" in indicator.toolTip()
+
+    indicator.set_counts(3, 1)
+    indicator.set_run_progress(None, None)
+    assert indicator.count_label.text() == "4"
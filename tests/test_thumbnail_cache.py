@@ -0,0 +1,79 @@
+import os
+import threading
+
+from PyQt6.QtCore import QBuffer, QByteArray, QIODevice, Qt
+from PyQt6.QtGui import QColor, QImage
+
+from services.download_manager import DownloadManager
+from services.jira_service import JiraService
+from services.thumbnail_cache import ThumbnailCache
+from tests.fake_jira import connected_service
+from tests.jira_standin import JiraDataset, JiraStandIn
+
+
+def _png(width, height):
+    image = QImage(width, height, QImage.Format.Format_RGB32)
+    image.fill(QColor('steelblue'))
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+    image.save(buffer, "PNG")
+    return bytes(data)
+
+
+def _cache(db, jira_service, tmp_path):
+    manager = DownloadManager(db, jira_service, retry_delays=(0, 0))
+    cache = ThumbnailCache(db, manager, cache_dir=str(tmp_path / "thumbnails"))
+    results = {}
+    done = threading.Event()
+
+    def _ended(attachment_id, size, result):
+        results[(attachment_id, size)] = result
+        done.set()
+
+    # DirectConnection: i test non hanno un event loop Qt
+    cache.thumbnail_ready.connect(_ended, Qt.ConnectionType.DirectConnection)
+    cache.thumbnail_failed.connect(_ended, Qt.ConnectionType.DirectConnection)
+    return manager, cache, results, done
+
+
+def test_thumbnail_is_generated_once_and_then_served_from_disk(db, tmp_path):
+    with JiraStandIn(JiraDataset.synthetic(1)) as server:
+        meta = server.dataset.add_attachment('PRJ-1', 'screen.png', _png(800, 400), 'image/png')
+        jira_service = connected_service(server)
+        manager, cache, results, done = _cache(db, jira_service, tmp_path)
+        attachment = dict(meta, content=None)
+
+        assert cache.request('PRJ-1', attachment) is None
+        assert done.wait(10)
+        path = results[(meta['id'], 64)]
+        requests_after_first_view = server.total_requests()
+
+        # Una nuova apertura (anche dopo un riavvio) non usa la rete
+        reopened = ThumbnailCache(db, manager, cache_dir=str(tmp_path / "thumbnails"))
+        assert reopened.request('PRJ-1', attachment) == path
+        assert server.total_requests() == requests_after_first_view
+        manager.shutdown()
+        cache.shutdown()
+
+    thumbnail = QImage(path)
+    assert (thumbnail.width(), thumbnail.height()) == (64, 32)
+    assert not os.listdir(tmp_path / "thumbnails" / "previews")  # Full-size preview removed
+
+
+def test_locally_stored_attachment_is_used_without_network(db, tmp_path):
+    stored = tmp_path / "stored.png"
+    stored.write_bytes(_png(100, 300))
+    db.add_file_attachment('PRJ-1', '555', 'stored.png', str(stored), 'hash', stored.stat().st_size, 'image/png')
+
+    jira_service = JiraService(sleep_func=lambda s: None, max_retries=1)  # Not connected
+    manager, cache, results, done = _cache(db, jira_service, tmp_path)
+    assert cache.request('PRJ-1', {'id': '555', 'filename': 'stored.png'}, size=96) is None
+    assert done.wait(10)
+    cache.shutdown()
+    manager.shutdown()
+
+    path = results[('555', 96)]
+    assert QImage(path).height() == 96
+    assert db.get_thumbnail('555', 96) == path
+    assert stored.exists()
@@ -0,0 +1,79 @@
+import json
+from datetime import datetime, timedelta
+
+from services.sync_engine import SyncEngine
+from services.worklog_coalescer import plan_worklog_merges
+from tests.fake_jira import connected_service
+from tests.jira_standin import JiraDataset, JiraStandIn
+
+
+def _stop_timer(db, key, start, tracked_seconds, comment="Worklog from Jira Time Tracker"):
+    """Queues a worklog the way JiraDetailController._stop_timer does."""
+    seconds = -(-tracked_seconds // 60) * 60
+    local_id = db.add_local_worklog(key, start, seconds, comment)
+    db.add_to_sync_queue("ADD_WORKLOG", json.dumps({
+        "jira_key": key,
+        "time_spent_seconds": seconds,
+        "tracked_seconds": tracked_seconds,
+        "start_time": start.isoformat(),
+        "comment": comment,
+        "local_worklog_ids": [local_id],
+    }))
+
+
+def _row(op_id, key, start, seconds, comment="x", **extra):
+    payload = {"jira_key": key, "start_time": start.isoformat(), "time_spent_seconds": seconds, "comment": comment}
+    payload.update(extra)
+    return (op_id, json.dumps(payload), None)
+
+
+def test_merge_rules():
+    morning = datetime(2025, 3, 3, 9, 0)
+    merges = plan_worklog_merges([
+        _row(1, 'PRJ-1', morning + timedelta(hours=2), 60, tracked_seconds=20),
+        _row(2, 'PRJ-1', morning, 60, tracked_seconds=20),
+        _row(3, 'PRJ-1', morning + timedelta(hours=3), 120, comment="x \r\n"),  # Same comment once normalized
+        _row(4, 'PRJ-1', morning, 60, comment="other"),
+        _row(5, 'PRJ-1', morning + timedelta(days=1), 60),
+        _row(6, 'PRJ-2', morning, 60),
+    ])
+
+    assert len(merges) == 1
+    merge = merges[0]
+    assert (merge['survivor_id'], merge['merged_ids']) == (1, [2, 3])
+    payload = json.loads(merge['payload'])
+    # 20s + 20s + 120s tracked: rounded up once on the total
+    assert payload['tracked_seconds'] == 160
+    assert payload['time_spent_seconds'] == 180
+    assert payload['start_time'] == morning.isoformat()
+
+
+def test_coalesced_worklogs_are_sent_once_and_shown_merged(db):
+    start = datetime(2025, 3, 3, 9, 0)
+    for n in range(5):
+        _stop_timer(db, 'PRJ-1', start + timedelta(minutes=30 * n), 50)
+    _stop_timer(db, 'PRJ-1', start, 50, comment="review")
+
+    with JiraStandIn(JiraDataset.synthetic(1)) as server:
+        jira_service = connected_service(server)
+
+        summary = SyncEngine(db, jira_service, coalesce_worklogs=True).run()
+
+        assert summary['coalesced'] == 4
+        assert summary['succeeded'] == 2
+        assert server.request_counts['POST /rest/api/2/issue/{key}/worklog'] == 2
+        assert sorted(w['timeSpentSeconds'] for w in server.dataset.worklogs['PRJ-1'][-2:]) == [60, 300]
+
+    history = db.get_local_worklogs('PRJ-1')
+    assert sorted((row[2], row[3], row[4]) for row in history) == [
+        (60, "review", "Synced"), (300, "Worklog from Jira Time Tracker", "Synced")]
+
+
+def test_attempted_worklogs_are_not_merged(db):
+    start = datetime(2025, 3, 3, 9, 0)
+    _stop_timer(db, 'PRJ-1', start, 50)
+    db.claim_sync_operations()
+    db.reset_interrupted_sync_operations()
+    _stop_timer(db, 'PRJ-1', start, 50)
+
+    assert plan_worklog_merges(db.get_coalescible_worklog_operations()) == []
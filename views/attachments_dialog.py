@@ -11,73 +11,13 @@ from PyQt6.QtWidgets import (
     QMenu, QCheckBox, QProgressBar
 )
 from PyQt6.QtGui import QIcon, QPixmap, QAction, QCursor
-from PyQt6.QtCore import Qt, QSize, QThread, pyqtSignal, QObject
+from PyQt6.QtCore import Qt, QSize
 
 from services.attachment_service import AttachmentService
+from services.pixmap_cache import shared_pixmap_cache
 from views.universal_search_widget import UniversalSearchWidget, SearchableMixin
 from qfluentwidgets import FluentIcon
 
-class DownloadWorker(QObject):
-    """Worker thread for downloading attachments."""
-    
-    progress = pyqtSignal(int, int)  # (current_index, total_count)
-    download_complete = pyqtSignal(str, bool)  # (attachment_id, success)
-    all_downloads_complete = pyqtSignal()
-    
-    def __init__(self, attachment_service, jira_key, attachments):
-        """
-        Initialize the worker.
-        
-        Args:
-            attachment_service: The attachment service to use for downloading
-            jira_key: The Jira issue key
-            attachments: List of attachment info dictionaries from Jira API
-        """
-        super().__init__()
-        self.attachment_service = attachment_service
-        self.jira_key = jira_key
-        self.attachments = attachments
-        self.should_stop = False
-        
-    async def download(self):
-        """Download all attachments."""
-        total = len(self.attachments)
-        
-        for i, attachment in enumerate(self.attachments):
-            if self.should_stop:
-                break
-                
-            self.progress.emit(i + 1, total)
-            
-            try:
-                attachment_id = attachment.get('id')
-                
-                if not attachment_id:
-                    self.download_complete.emit("unknown", False)
-                    continue
-                
-                file_path = await self.attachment_service.download_attachment(
-                    self.jira_key, 
-                    attachment
-                )
-                
-                success = file_path is not None
-                self.download_complete.emit(attachment_id, success)
-                
-            except Exception as e:
-                print(f"Error downloading attachment: {e}")
-                self.download_complete.emit(
-                    attachment.get('id', "unknown"), 
-                    False
-                )
-                
-        self.all_downloads_complete.emit()
-        
-    def stop(self):
-        """Stop the download process."""
-        self.should_stop = True
-
-
 class AttachmentItem(QWidget):
     """Custom widget for displaying an attachment in the list."""
     
@@ -163,8 +103,16 @@ class AttachmentItem(QWidget):
         Returns:
             A QIcon for the attachment type or None
         """
-        mime_type = self.attachment.get('mimeType', '')
+        mime_type = self.attachment.get('mimeType') or ''
         filename = self.attachment.get('filename', '')
+        cache = shared_pixmap_cache()
+        
+        # Images already downloaded show a preview, scaled once and shared through the cache
+        local_path = self.attachment.get('local_path')
+        if mime_type.startswith('image/') and local_path and os.path.isfile(local_path):
+            pixmap = cache.load(local_path, 24)
+            if not pixmap.isNull():
+                return QIcon(pixmap)
         
         # Determine icon based on mime type or extension
         icon_name = 'document'  # Default
@@ -188,11 +136,10 @@ class AttachmentItem(QWidget):
         elif any(ext in filename.lower() for ext in ['.zip', '.rar', '.7z', '.tar', '.gz']):
             icon_name = 'archive'
         
-        # Return the corresponding FluentIcon
-        if hasattr(FluentIcon, icon_name.upper()):
-            return getattr(FluentIcon, icon_name.upper())
-        else:
-            return FluentIcon.DOCUMENT
+        # Return the corresponding FluentIcon, created once for all the items
+        fluent_icon = getattr(FluentIcon, icon_name.upper(), FluentIcon.DOCUMENT)
+        return cache.icon(("fluent", icon_name),
+                          lambda: fluent_icon if isinstance(fluent_icon, QIcon) else fluent_icon.icon())
             
     def format_size(self, size_bytes: int) -> str:
         """
@@ -259,10 +206,17 @@ class AttachmentsDialog(QDialog, SearchableMixin):
         self.attachment_service = attachment_service
         self.attachments = []
         self.local_attachments = {}
-        self.download_worker = None
-        self.download_thread = None
+        self.downloads = {}  # download id -> attachment id, for the downloads started by this dialog
+        self.download_progress = {}  # download id -> (bytes done, total bytes)
         
         self.setup_ui()
+        
+        # Downloads run on the shared manager and continue after the dialog is closed
+        download_manager = self.attachment_service.download_manager
+        download_manager.item_progress.connect(self.update_download_progress)
+        download_manager.item_finished.connect(self.on_download_finished)
+        download_manager.item_failed.connect(self.on_download_failed)
+        download_manager.item_cancelled.connect(self.on_download_failed)
         self.setWindowTitle(f"Attachments for {jira_key}")
         self.resize(600, 400)
         
@@ -428,9 +382,9 @@ class AttachmentsDialog(QDialog, SearchableMixin):
                 widget.set_download_in_progress()
                 break
                 
-        # Start download in a worker thread
+        # Start download on the download manager
         attachments = [attachment]
-        self.start_download_worker(attachments)
+        self.start_downloads(attachments)
         
     async def open_attachment(self, attachment):
         """
@@ -465,7 +419,7 @@ class AttachmentsDialog(QDialog, SearchableMixin):
         # Show progress bar
         self.progress_bar.setVisible(True)
         self.progress_bar.setValue(0)
-        self.progress_bar.setMaximum(len(to_download))
+        self.progress_bar.setMaximum(100)
         
         # Update UI for all attachments being downloaded
         for i in range(self.attachments_list.count()):
@@ -476,57 +430,67 @@ class AttachmentsDialog(QDialog, SearchableMixin):
             if attachment_id and not widget.attachment.get('is_cached', False):
                 widget.set_download_in_progress()
                 
-        # Start download worker
-        self.start_download_worker(to_download)
+        # Queue the downloads
+        self.start_downloads(to_download)
         
-    def start_download_worker(self, attachments_to_download):
+    def start_downloads(self, attachments_to_download):
         """
-        Start a worker thread for downloading attachments.
+        Queue attachments on the download manager.
         
         Args:
             attachments_to_download: List of attachments to download
         """
-        # Stop any existing worker
-        if self.download_worker:
-            self.download_worker.stop()
-            
-        if self.download_thread and self.download_thread.isRunning():
-            self.download_thread.quit()
-            self.download_thread.wait()
+        for attachment in attachments_to_download:
+            attachment_id = attachment.get('id')
+            if not attachment_id:
+                continue
+            download_id = self.attachment_service.queue_download(self.jira_key, attachment)
+            if download_id is None:
+                # Already stored locally
+                self.on_download_complete(attachment_id, True)
+                continue
+            self.downloads[download_id] = attachment_id
+            self.download_progress[download_id] = (0, attachment.get('size') or 0)
+            
+        if not self.downloads:
+            self.on_all_downloads_complete()
+            return
             
-        # Create new worker and thread
-        self.download_worker = DownloadWorker(
-            self.attachment_service,
-            self.jira_key,
-            attachments_to_download
-        )
-        
-        self.download_thread = QThread()
-        self.download_worker.moveToThread(self.download_thread)
-        
-        # Connect signals
-        self.download_worker.progress.connect(self.update_download_progress)
-        self.download_worker.download_complete.connect(self.on_download_complete)
-        self.download_worker.all_downloads_complete.connect(self.on_all_downloads_complete)
-        
-        self.download_thread.started.connect(self.download_worker.download)
-        self.download_thread.finished.connect(self.on_download_thread_finished)
-        
-        # Start the thread
-        self.download_thread.start()
-        
         # Disable buttons during download
         self.download_all_btn.setEnabled(False)
         
-    def update_download_progress(self, current, total):
+    def update_download_progress(self, download_id, done, total):
         """
-        Update the download progress bar.
+        Update the download progress bar with the bytes received by this dialog's downloads.
         
         Args:
-            current: Current download index
-            total: Total number of downloads
+            download_id: ID of the download in progress
+            done: Bytes received
+            total: Total bytes (None if unknown)
         """
-        self.progress_bar.setValue(current)
+        if download_id not in self.downloads:
+            return
+        self.download_progress[download_id] = (done, total or done)
+        received = sum(item_done for item_done, _total in self.download_progress.values())
+        expected = sum(max(item_total, item_done) for item_done, item_total in self.download_progress.values())
+        if expected:
+            self.progress_bar.setValue(int(received * 100 / expected))
+        
+    def on_download_finished(self, download_id, file_path):
+        """Handle a download of the manager completing."""
+        self._on_download_ended(download_id, True)
+        
+    def on_download_failed(self, download_id, error_message=None):
+        """Handle a download of the manager failing or being cancelled."""
+        self._on_download_ended(download_id, False)
+        
+    def _on_download_ended(self, download_id, success):
+        attachment_id = self.downloads.pop(download_id, None)
+        if attachment_id is None:
+            return  # Not one of this dialog's downloads
+        self.on_download_complete(attachment_id, success)
+        if not self.downloads:
+            self.on_all_downloads_complete()
         
     def on_download_complete(self, attachment_id, success):
         """
@@ -564,11 +528,6 @@ class AttachmentsDialog(QDialog, SearchableMixin):
         # Refresh attachments list to update cached status
         self.refresh_attachments()
         
-    def on_download_thread_finished(self):
-        """Handle download thread finishing."""
-        self.download_thread = None
-        self.download_worker = None
-        
     def show_context_menu(self, position):
         """
         Show context menu for attachment items.
@@ -698,13 +657,18 @@ class AttachmentsDialog(QDialog, SearchableMixin):
         Args:
             event: Close event
         """
-        # Stop any running download worker
-        if self.download_worker:
-            self.download_worker.stop()
-            
-        if self.download_thread and self.download_thread.isRunning():
-            self.download_thread.quit()
-            self.download_thread.wait()
+        # Downloads in progress continue on the manager: stop listening to them
+        download_manager = self.attachment_service.download_manager
+        for signal, slot in (
+            (download_manager.item_progress, self.update_download_progress),
+            (download_manager.item_finished, self.on_download_finished),
+            (download_manager.item_failed, self.on_download_failed),
+            (download_manager.item_cancelled, self.on_download_failed),
+        ):
+            try:
+                signal.disconnect(slot)
+            except TypeError:
+                pass  # Not connected
             
         super().closeEvent(event)
 
@@ -44,6 +44,7 @@ class ConfigDialog(QDialog):
         self.editor_tab = QWidget()
         self.logging_tab = QWidget()
         self.data_paths_tab = QWidget()
+        self.diagnostics_tab = QWidget()
         
         # Add tabs to widget
         self.tab_widget.addTab(self.connection_tab, "Connessione")
@@ -53,6 +54,7 @@ class ConfigDialog(QDialog):
         self.tab_widget.addTab(self.editor_tab, "Editor Note")
         self.tab_widget.addTab(self.logging_tab, "Logging")
         self.tab_widget.addTab(self.data_paths_tab, "Percorsi Dati")
+        self.tab_widget.addTab(self.diagnostics_tab, "Diagnostica")
         
         # Add tab widget to dialog
         self.main_layout.addWidget(self.tab_widget)
@@ -65,6 +67,7 @@ class ConfigDialog(QDialog):
         self._setup_editor_tab()
         self._setup_logging_tab()
         self._setup_data_paths_tab()
+        self._setup_diagnostics_tab()
         
         # Dialog buttons
         self.button_box = QDialogButtonBox(
@@ -281,6 +284,17 @@ class ConfigDialog(QDialog):
         auto_sync_layout.addWidget(auto_sync_desc)
         
         layout.addLayout(auto_sync_layout)
+
+        # Worklog coalescing switch
+        coalesce_layout = QVBoxLayout()
+        self.coalesce_worklogs_switch = SwitchButton("Unisci i worklog in attesa")
+        self.coalesce_worklogs_switch.setToolTip("Unisce i worklog non ancora inviati della stessa issue, dello stesso giorno e con lo stesso commento")
+        coalesce_layout.addWidget(self.coalesce_worklogs_switch)
+        coalesce_desc = BodyLabel("Quando attiva, i worklog creati fermando e riavviando più volte il timer sulla stessa issue "
+                                  "vengono inviati come un unico worklog, arrotondato al minuto una sola volta sul totale.")
+        coalesce_desc.setWordWrap(True)
+        coalesce_layout.addWidget(coalesce_desc)
+        layout.addLayout(coalesce_layout)
         
         # Sync queue management section
         layout.addWidget(StrongBodyLabel("Gestione Coda di Sincronizzazione"))
@@ -320,6 +334,30 @@ class ConfigDialog(QDialog):
         
         layout.addStretch()
     
+    def _setup_diagnostics_tab(self):
+        """Setup the diagnostics tab with the memory used by the in-memory caches."""
+        layout = QVBoxLayout(self.diagnostics_tab)
+        
+        layout.addWidget(StrongBodyLabel("Memoria"))
+        layout.addWidget(BodyLabel("Occupazione delle cache in memoria condivise dalle finestre dell'applicazione."))
+        
+        self.memory_report_label = BodyLabel("")
+        self.memory_report_label.setStyleSheet("background-color: #f0f0f0; padding: 5px; border-radius: 3px;")
+        self.memory_report_label.setWordWrap(True)
+        layout.addWidget(self.memory_report_label)
+        
+        self.refresh_memory_report_btn = PushButton("Aggiorna")
+        self.refresh_memory_report_btn.setIcon(FIF.SYNC)
+        self.refresh_memory_report_btn.clicked.connect(self.refresh_memory_report)
+        layout.addWidget(self.refresh_memory_report_btn, alignment=Qt.AlignmentFlag.AlignLeft)
+        self.refresh_memory_report()
+        
+        layout.addStretch()
+    
+    def refresh_memory_report(self):
+        from services.pixmap_cache import memory_report
+        self.memory_report_label.setText(memory_report())
+    
     def _setup_data_paths_tab(self):
         """Setup the data paths tab to show where persistent data is stored."""
         from PyQt6.QtCore import QStandardPaths
@@ -478,6 +516,7 @@ class ConfigDialog(QDialog):
             "pat": self.pat_input.text().strip(),
             "jql": self.jql_input.toPlainText().strip(),
             "auto_sync": self.auto_sync_switch.isChecked(),
+            "coalesce_worklogs": self.coalesce_worklogs_switch.isChecked(),
             "log_info": self.log_info_checkbox.isChecked(),
             "log_debug": self.log_debug_checkbox.isChecked(),
             "log_warning": self.log_warning_checkbox.isChecked(),
@@ -551,6 +590,13 @@ class ConfigDialog(QDialog):
             # If switch not available, ignore silently
             pass
 
+    def set_coalesce_worklogs(self, enabled: bool):
+        """Set the worklog coalescing switch state."""
+        try:
+            self.coalesce_worklogs_switch.setChecked(bool(enabled))
+        except Exception:
+            pass
+
     def set_always_on_top(self, enabled: bool):
         """Set the local switch state for always-on-top UI element."""
         try:
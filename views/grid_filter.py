@@ -0,0 +1,99 @@
+"""
+Client-side filter of the Jira grid.
+
+Every row carries a lowercased search text (see IssueTableModel.search_fields),
+built once when the row is inserted. The query is split into tokens that
+must all occur in it (AND). Keystrokes are debounced, and a query that
+extends the previous one only re-checks the rows the previous one matched.
+The model is given the list of matching rows in display order: no row of
+the view is hidden one by one.
+"""
+
+from PyQt6.QtCore import QObject, QTimer
+
+from views.issue_table_model import IssueRow
+
+FILTER_DEBOUNCE_MS = 150
+
+
+def query_tokens(text: str) -> list:
+    return text.lower().split()
+
+
+def matches(search_text: str, tokens: list) -> bool:
+    return all(token in search_text for token in tokens)
+
+
+class GridRowFilter(QObject):
+    def __init__(self, grid_view, debounce_ms: int = FILTER_DEBOUNCE_MS, parent=None):
+        super().__init__(parent)
+        self.grid_view = grid_view
+        self._text = ""
+        self._tokens = []
+        self._query = None    # normalized query of the last filtering, None if the rows changed since
+        self._matches = None  # storage indices matching self._query, in display order
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(debounce_ms)
+        self._timer.timeout.connect(self.apply)
+
+        model = grid_view.model
+        model.set_row_filter(self._accept_row)
+        # Sorting changes the display order of the matches
+        model.layoutChanged.connect(self._invalidate)
+
+    def set_text(self, text: str):
+        """Filters by text after the debounce interval; each new call restarts it."""
+        self._text = text
+        self._timer.start()
+
+    def apply(self, text: str = None):
+        """Filters all the rows now, by text or by the last text set."""
+        self._timer.stop()
+        if text is not None:
+            self._text = text
+        self._tokens = query_tokens(self._text)
+        query = " ".join(self._tokens)
+        model = self.grid_view.model
+        rows = model.rows()
+
+        if self._matches is not None and query.startswith(self._query):
+            # The query only got longer: the rows excluded before stay out
+            candidates = self._matches
+        else:
+            candidates = model.display_order()
+        tokens = self._tokens
+        self._matches = [storage for storage in candidates if matches(rows[storage].search_text, tokens)]
+        self._query = query
+
+        if self.grid_view.favorites_btn.isChecked():
+            visible = [storage for storage in self._matches if rows[storage].favorite]
+        else:
+            visible = self._matches
+        self._set_visible_rows(visible)
+
+    def _accept_row(self, storage: int, row: IssueRow) -> bool:
+        """Filters a row appended to the grid with the current text."""
+        if not matches(row.search_text, self._tokens):
+            return False
+        if self._matches is not None:
+            self._matches.append(storage)
+        return not self.grid_view.favorites_btn.isChecked() or row.favorite
+
+    def _set_visible_rows(self, visible: list):
+        # The reset of the model drops the selection: it follows the issue, not the row
+        grid_view = self.grid_view
+        selected_key = grid_view.selected_key()
+        grid_view.model.set_visible_rows(visible)
+        if selected_key:
+            row = grid_view.model.row_of_key(selected_key)
+            if row >= 0:
+                grid_view.table.selectRow(row)
+
+    def reset(self):
+        """Forgets the previous matches (the rows of the grid were removed)."""
+        self._invalidate()
+
+    def _invalidate(self):
+        self._query = None
+        self._matches = None
@@ -0,0 +1,85 @@
+"""
+Incremental population of the Jira grid.
+
+A page of issues is converted to grid rows and inserted in chunks, one per
+event-loop turn: a chunk ends once FRAME_BUDGET_MS have elapsed, so input
+and painting go on while a large page lands. The table is not repainted
+during a chunk.
+"""
+
+import time
+from collections import deque
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+# Half of a 60 Hz frame: the rest is left to painting and input
+FRAME_BUDGET_MS = 8
+
+
+class GridPopulator(QObject):
+    progress = pyqtSignal(int, int)  # rows inserted, rows queued since the grid was last idle
+    finished = pyqtSignal()
+
+    def __init__(self, grid_view, frame_budget_ms: float = FRAME_BUDGET_MS, parent=None):
+        super().__init__(parent)
+        self.grid_view = grid_view
+        self.frame_budget = frame_budget_ms / 1000.0
+        self._pending = deque()  # (issue, make_row)
+        self._scheduled = False
+        self._done = 0
+        self._total = 0
+
+    def append(self, issues: list, make_row):
+        """Queues issues to be inserted; make_row(issue) returns the row record of the model."""
+        if not issues:
+            return
+        self._pending.extend((issue, make_row) for issue in issues)
+        self._total += len(issues)
+        self._schedule()
+
+    def cancel(self):
+        """Drops the issues not inserted yet (the grid is being cleared)."""
+        self._pending.clear()
+        self._done = 0
+        self._total = 0
+
+    def is_running(self) -> bool:
+        return bool(self._pending)
+
+    def flush(self):
+        """Inserts all the queued issues now."""
+        while self._pending:
+            self._insert_chunk(deadline=None)
+
+    def _schedule(self):
+        if not self._scheduled:
+            self._scheduled = True
+            QTimer.singleShot(0, self._run_chunk)
+
+    def _run_chunk(self):
+        self._scheduled = False
+        if not self._pending:
+            return
+        self._insert_chunk(deadline=time.perf_counter() + self.frame_budget)
+        if self._pending:
+            self._schedule()
+
+    def _insert_chunk(self, deadline):
+        rows = []
+        while self._pending and (deadline is None or not rows or time.perf_counter() < deadline):
+            issue, make_row = self._pending.popleft()
+            rows.append(make_row(issue))
+
+        table = self.grid_view.table
+        table.setUpdatesEnabled(False)
+        try:
+            self.grid_view.append_issue_rows(rows)
+        finally:
+            table.setUpdatesEnabled(True)
+
+        self._done += len(rows)
+        self.progress.emit(self._done, self._total)
+        if not self._pending:
+            self._done = 0
+            self._total = 0
+            self.finished.emit()
@@ -0,0 +1,565 @@
+"""
+Model and delegates of the Jira issue grid.
+
+The grid keeps no widget per cell: issues are plain row records held by
+IssueTableModel and the QTableView paints only the rows in the viewport.
+The priority column is edited through a combo box created by
+PriorityDelegate only while the user edits a cell, and FavoriteDelegate
+toggles the star on click without any editor at all.
+
+A row is an IssueRow, holding only what the grid shows of an issue: the
+raw search result is dropped once converted. search_text, the lowercased
+text the grid filter looks into, is set by the model when the row is
+inserted.
+
+A refresh does not rebuild the grid: reconcile_rows() diffs the new rows
+against the current ones by key and applies only the removals, moves,
+insertions and changed rows, so scroll position and selection survive.
+"""
+
+import sys
+
+from PyQt6.QtCore import QAbstractTableModel, QEvent, QModelIndex, Qt, QTimer, pyqtSignal
+from PyQt6.QtGui import QBrush, QColor
+from PyQt6.QtWidgets import QComboBox, QStyledItemDelegate
+
+COLUMN_IDS = ("key", "title", "status", "priority", "time_spent", "favorite")
+
+FAVORITE_ON = "★"
+FAVORITE_OFF = "☆"
+
+# Ordine delle priorità per l'ordinamento (le sconosciute valgono 0)
+PRIORITY_RANK = {'Highest': 5, 'High': 4, 'Medium': 3, 'Low': 2, 'Lowest': 1, '': 0}
+
+# Jira status categories, in workflow order
+STATUS_CATEGORY_RANK = {'new': 0, 'indeterminate': 1, 'done': 2}
+
+# Fields of a row the grid filter searches in
+SEARCH_FIELDS = ("key", "title", "status")
+
+# Fields compared by reconcile_rows(): a row is rewritten only if one of them differs
+ROW_FIELDS = ("updated", "title", "status", "priority", "priority_id", "time_seconds", "favorite")
+
+STATUS_COLOR_ALPHA = 40    # semitrasparente: il testo resta leggibile
+PRIORITY_COLOR_ALPHA = 80  # più visibile sulla cella della priorità
+
+
+def format_seconds(total_seconds: int) -> str:
+    hours = total_seconds // 3600
+    minutes = (total_seconds % 3600) // 60
+    return f"{hours}h {minutes}m"
+
+
+def sort_order_is_descending(order) -> bool:
+    """Accepts a Qt.SortOrder or its integer value, as restored from the settings."""
+    return order == Qt.SortOrder.DescendingOrder or order == Qt.SortOrder.DescendingOrder.value
+
+
+def _runs(numbers: list) -> list:
+    """Ascending numbers grouped in (first, last) runs of consecutive values."""
+    runs = []
+    for number in numbers:
+        if runs and runs[-1][1] == number - 1:
+            runs[-1][1] = number
+        else:
+            runs.append([number, number])
+    return [(first, last) for first, last in runs]
+
+
+class IssueRow:
+    """
+    A row of the grid. Slotted: no per-row __dict__. Status and priority
+    names repeat across thousands of rows and are interned, so the rows
+    share one string per distinct value.
+    """
+
+    __slots__ = ("key", "title", "status", "priority", "priority_id", "time_seconds", "favorite", "updated",
+                 "search_text")
+
+    def __init__(self, key: str, title: str = '', status: str = '', priority: str = '', priority_id: str = '',
+                 time_seconds: int = 0, favorite: bool = False, updated: str = ''):
+        self.key = key
+        self.title = title or ''
+        self.status = sys.intern(status or '')
+        self.priority = sys.intern(priority or '')
+        self.priority_id = sys.intern(priority_id or '')
+        self.time_seconds = time_seconds or 0
+        self.favorite = bool(favorite)
+        self.updated = updated or ''
+        self.search_text = ''
+
+
+class IssueTableModel(QAbstractTableModel):
+    """
+    Rows of the Jira grid; columns follow the visible columns configuration.
+
+    Row records are stored once, in insertion order, and never move: sorting
+    and filtering only rebuild the list of storage indices shown by the view
+    (display order). Row numbers of the Qt interface are positions in that
+    list; the storage index of a row is what the grid filter keeps.
+    """
+
+    priority_changed = pyqtSignal(str, str)  # jira key, priority name ("" removes the local priority)
+    favorite_toggled = pyqtSignal(str, bool)  # jira key, favorite
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._columns = list(COLUMN_IDS)
+        self._labels = {}
+        self._rows = []       # row records, in insertion order
+        self._order = []      # storage indices of all the rows, in display order
+        self._visible = []    # storage indices of the rows shown, in display order
+        self._view_rows = None  # storage index -> row of the view, built on demand
+        self._storage_by_key = {}
+        self._accept_row = None  # callable(storage index, row) -> bool for the rows appended
+        self._sort_keys = {}  # column id -> sort key of every row, by storage index
+        self._sort_spec = []  # (column id, descending) of the last sort, primary first
+        self._priority_rank = dict(PRIORITY_RANK)
+        self._status_rank = {}  # status name -> position in the workflow
+        self._status_colors = {}
+        self._priority_colors = {}
+        self._brushes = {}  # (color hex, alpha) -> QBrush
+        self.search_fields = SEARCH_FIELDS
+
+    # --- Columns ---
+
+    def set_columns(self, columns: list):
+        """Shows the given column configurations ({id, label, ...}), in order."""
+        self.beginResetModel()
+        self._columns = [c.get('id') for c in columns]
+        self._labels = {c.get('id'): c.get('label', c.get('id')) for c in columns}
+        self.endResetModel()
+
+    def column_id(self, column: int) -> str | None:
+        if 0 <= column < len(self._columns):
+            return self._columns[column]
+        return None
+
+    def column_index(self, column_id: str) -> int:
+        try:
+            return self._columns.index(column_id)
+        except ValueError:
+            return -1
+
+    # --- Rows ---
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._visible)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._columns)
+
+    def clear(self):
+        self.beginResetModel()
+        self._rows = []
+        self._order = []
+        self._visible = []
+        self._view_rows = None
+        self._storage_by_key = {}
+        self._sort_keys = {}
+        self.endResetModel()
+
+    def append_rows(self, rows: list):
+        """
+        Appends the rows at the end of the display order, with a single
+        insertion whatever their number; only the rows accepted by the row
+        filter (set_row_filter) are shown.
+        """
+        if not rows:
+            return
+        first_storage = len(self._rows)
+        accepted = []
+        for offset, row in enumerate(rows):
+            storage = first_storage + offset
+            row.search_text = self._search_text(row)
+            self._storage_by_key[row.key] = storage
+            if self._accept_row is None or self._accept_row(storage, row):
+                accepted.append(storage)
+        self._rows.extend(rows)
+        self._order.extend(range(first_storage, len(self._rows)))
+        if accepted:
+            first = len(self._visible)
+            self.beginInsertRows(QModelIndex(), first, first + len(accepted) - 1)
+            self._visible.extend(accepted)
+            if self._view_rows is not None:
+                self._view_rows.update((storage, first + offset) for offset, storage in enumerate(accepted))
+            self.endInsertRows()
+
+    def reconcile_rows(self, rows: list) -> dict:
+        """
+        Makes the grid show rows, in their order (then in the order of the
+        last sort), touching only what differs from the rows shown now:
+        rows whose key is gone are removed, new keys are inserted and a row
+        with the same key is rewritten only if one of ROW_FIELDS changed.
+
+        Returns:
+            The number of rows removed, inserted, changed and whether the
+            order changed ({removed, inserted, changed, moved})
+        """
+        new_by_key = {row.key: row for row in rows}
+        rows = list(new_by_key.values())
+
+        # Removals, then the storage is compacted
+        gone = {storage for storage, row in enumerate(self._rows) if row.key not in new_by_key}
+        if gone:
+            self._remove_view_rows([row for row, storage in enumerate(self._visible) if storage in gone])
+            self._compact_storage(gone)
+
+        # Changed rows are replaced in place
+        changed = []
+        for storage, old_row in enumerate(self._rows):
+            new_row = new_by_key[old_row.key]
+            if any(getattr(old_row, field) != getattr(new_row, field) for field in ROW_FIELDS):
+                new_row.search_text = self._search_text(new_row)
+                self._rows[storage] = new_row
+                for column, column_keys in self._sort_keys.items():
+                    if storage < len(column_keys):
+                        column_keys[storage] = self._sort_value(new_row, column)
+                changed.append(storage)
+
+        # New keys go to the end of the storage
+        inserted = 0
+        for row in rows:
+            if row.key not in self._storage_by_key:
+                row.search_text = self._search_text(row)
+                self._storage_by_key[row.key] = len(self._rows)
+                self._rows.append(row)
+                inserted += 1
+
+        self._order = [self._storage_by_key[row.key] for row in rows]
+        self._sort_order()
+        accept_row = self._accept_row
+        target = [storage for storage in self._order
+                  if accept_row is None or accept_row(storage, self._rows[storage])]
+
+        # Rows hidden by the filter since they changed, then moves, then insertions
+        target_set = set(target)
+        self._remove_view_rows([row for row, storage in enumerate(self._visible) if storage not in target_set])
+        shown = set(self._visible)
+        kept = [storage for storage in target if storage in shown]
+        moved = kept != self._visible
+        if moved:
+            self.layoutAboutToBeChanged.emit()
+            old_visible = self._visible
+            self._visible = kept
+            self._view_rows = None
+            self._update_persistent_indexes(old_visible)
+            self.layoutChanged.emit()
+        self._insert_view_rows(target, shown)
+
+        last_column = len(self._columns) - 1
+        for storage in changed:
+            row = self.row_of_key(self._rows[storage].key)
+            if row >= 0 and storage in shown:
+                self.dataChanged.emit(self.index(row, 0), self.index(row, last_column))
+        return {'removed': len(gone), 'inserted': inserted, 'changed': len(changed), 'moved': moved}
+
+    def _remove_view_rows(self, view_rows: list):
+        """Removes rows of the view (ascending), one removal per contiguous run."""
+        for first, last in reversed(_runs(view_rows)):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self._visible[first:last + 1]
+            self._view_rows = None
+            self.endRemoveRows()
+
+    def _insert_view_rows(self, target: list, shown: set):
+        """Inserts the rows of target not shown yet at their position in target."""
+        positions = [position for position, storage in enumerate(target) if storage not in shown]
+        for first, last in _runs(positions):
+            self.beginInsertRows(QModelIndex(), first, last)
+            self._visible[first:first] = target[first:last + 1]
+            self._view_rows = None
+            self.endInsertRows()
+
+    def _compact_storage(self, gone: set):
+        """Drops the given storage indices, renumbering the others."""
+        kept = [storage for storage in range(len(self._rows)) if storage not in gone]
+        renumbered = {old: new for new, old in enumerate(kept)}
+        self._rows = [self._rows[storage] for storage in kept]
+        self._order = [renumbered[storage] for storage in self._order if storage in renumbered]
+        self._visible = [renumbered[storage] for storage in self._visible]
+        self._sort_keys = {column: [column_keys[storage] for storage in kept if storage < len(column_keys)]
+                           for column, column_keys in self._sort_keys.items()}
+        self._storage_by_key = {row.key: storage for storage, row in enumerate(self._rows)}
+        self._view_rows = None
+
+    def set_search_fields(self, fields: tuple):
+        """Sets the fields searched by the grid filter (rows may carry extra fields)."""
+        self.search_fields = tuple(fields)
+        for row in self._rows:
+            row.search_text = self._search_text(row)
+
+    def _search_text(self, row: IssueRow) -> str:
+        # Separatore non digitabile: un termine non trova corrispondenza a cavallo di due campi
+        return "\x1f".join(str(getattr(row, field) or '') for field in self.search_fields).lower()
+
+    def row_at(self, row: int) -> IssueRow | None:
+        """Record of a row of the view."""
+        if 0 <= row < len(self._visible):
+            return self._rows[self._visible[row]]
+        return None
+
+    def key_at(self, row: int) -> str | None:
+        record = self.row_at(row)
+        return record.key if record else None
+
+    def row_of_key(self, jira_key: str) -> int:
+        """Row of the view showing an issue, -1 if it is not shown."""
+        storage = self._storage_by_key.get(jira_key)
+        if storage is None:
+            return -1
+        if self._view_rows is None:
+            self._view_rows = {storage: row for row, storage in enumerate(self._visible)}
+        return self._view_rows.get(storage, -1)
+
+    def record_of_key(self, jira_key: str) -> IssueRow | None:
+        """Record of an issue, shown or not; None if it is not in the grid."""
+        storage = self._storage_by_key.get(jira_key)
+        return self._rows[storage] if storage is not None else None
+
+    def rows(self) -> list:
+        """All the row records, shown or not, by storage index."""
+        return self._rows
+
+    def display_order(self) -> list:
+        """Storage indices of all the rows, in display order."""
+        return self._order
+
+    def visible_rows(self) -> list:
+        """Storage indices of the rows shown, in display order."""
+        return self._visible
+
+    # --- Filtering ---
+
+    def set_row_filter(self, accept_row):
+        """Sets the callable(storage index, row) -> bool deciding whether an appended row is shown."""
+        self._accept_row = accept_row
+
+    def set_visible_rows(self, storage_indices: list):
+        """Shows only the given rows, in the given (display) order."""
+        if storage_indices == self._visible:
+            return
+        self.beginResetModel()
+        self._visible = list(storage_indices)
+        self._view_rows = None
+        self.endResetModel()
+
+    def set_colors(self, status_colors: dict, priority_colors: dict):
+        """Background colors (hex) by status name and by priority name or id."""
+        if status_colors == self._status_colors and priority_colors == self._priority_colors:
+            return
+        self._status_colors = dict(status_colors)
+        self._priority_colors = dict(priority_colors)
+        if self._visible:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self._visible) - 1, len(self._columns) - 1),
+                                  [Qt.ItemDataRole.BackgroundRole])
+
+    # --- Qt model interface ---
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._rows[self._visible[index.row()]]
+        column = self._columns[index.column()]
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == 'time_spent':
+                return format_seconds(row.time_seconds)
+            if column == 'favorite':
+                return FAVORITE_ON if row.favorite else FAVORITE_OFF
+            return getattr(row, column, '')
+        if role == Qt.ItemDataRole.EditRole:
+            if column == 'favorite':
+                return row.favorite
+            if column == 'time_spent':
+                return row.time_seconds
+            return getattr(row, column, '')
+        if role == Qt.ItemDataRole.BackgroundRole:
+            return self._background(row, column)
+        if role == Qt.ItemDataRole.TextAlignmentRole and column == 'favorite':
+            return Qt.AlignmentFlag.AlignCenter
+        if role == Qt.ItemDataRole.ToolTipRole and column == 'favorite':
+            return "Aggiungi/rimuovi dai preferiti"
+        return None
+
+    def headerData(self, section: int, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            column = self.column_id(section)
+            return self._labels.get(column, column)
+        return super().headerData(section, orientation, role)
+
+    def flags(self, index: QModelIndex):
+        flags = super().flags(index)
+        if index.isValid() and self._columns[index.column()] == 'priority':
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    def setData(self, index: QModelIndex, value, role=Qt.ItemDataRole.EditRole) -> bool:
+        if not index.isValid() or role != Qt.ItemDataRole.EditRole:
+            return False
+        row = self._rows[self._visible[index.row()]]
+        column = self._columns[index.column()]
+        if column == 'priority':
+            value = value or ''
+            if value == row.priority:
+                return False
+            row.priority = sys.intern(value)
+            row.priority_id = ''
+            self._sort_keys.pop('priority', None)
+            self.dataChanged.emit(self.index(index.row(), 0), self.index(index.row(), len(self._columns) - 1))
+            self.priority_changed.emit(row.key, value)
+            return True
+        if column == 'favorite':
+            row.favorite = bool(value)
+            self.dataChanged.emit(index, index)
+            self.favorite_toggled.emit(row.key, row.favorite)
+            return True
+        return False
+
+    # --- Sorting ---
+
+    def set_sort_orders(self, priorities: list, statuses: list):
+        """
+        Ranks priorities and statuses as Jira lists them: priorities from the
+        highest ({id, name}, highest first), statuses by category then by
+        position ({id, name, category}). Unknown names sort after the known ones.
+        """
+        self._priority_rank = dict(PRIORITY_RANK)
+        for position, priority in enumerate(priorities):
+            self._priority_rank[priority.get('name', '')] = len(priorities) - position
+        ranked = sorted(enumerate(statuses),
+                        key=lambda item: (STATUS_CATEGORY_RANK.get(item[1].get('category'), 1), item[0]))
+        self._status_rank = {status.get('name', ''): rank for rank, (_, status) in enumerate(ranked)}
+        self._sort_keys.pop('priority', None)
+        self._sort_keys.pop('status', None)
+
+    def sort_rows(self, sort_columns: list):
+        """
+        Sorts by several columns: sort_columns is a list of {column, order}
+        with the primary column first. The favorite column is not sortable.
+        Rows that compare equal keep their relative order.
+        """
+        sort_spec = []
+        for sort_info in sort_columns:
+            column = self.column_id(sort_info.get('column', -1))
+            if column and column != 'favorite':
+                sort_spec.append((column, sort_order_is_descending(sort_info.get('order'))))
+        if not sort_spec:
+            return
+        self._sort_spec = sort_spec
+
+        self.layoutAboutToBeChanged.emit()
+        old_visible = self._visible
+        self._sort_order()
+        shown = set(old_visible)
+        self._visible = [storage for storage in self._order if storage in shown]
+        self._view_rows = None
+        self._update_persistent_indexes(old_visible)
+        self.layoutChanged.emit()
+
+    def _sort_order(self):
+        """Sorts the display order by the last sort."""
+        keys = [(self._column_sort_keys(column), descending) for column, descending in self._sort_spec]
+        if not keys:
+            return
+        if len({descending for _, descending in keys}) == 1:
+            # Same direction everywhere: a single pass on the composite key
+            columns = [column_keys for column_keys, _ in keys]
+            if len(columns) == 1:
+                composite = columns[0].__getitem__
+            else:
+                composite = lambda storage: tuple(column_keys[storage] for column_keys in columns)
+            self._order.sort(key=composite, reverse=keys[0][1])
+        else:
+            # Ordinamenti stabili dal criterio meno importante al principale
+            for column_keys, descending in reversed(keys):
+                self._order.sort(key=column_keys.__getitem__, reverse=descending)
+
+    def _column_sort_keys(self, column: str) -> list:
+        """Sort keys of a column by storage index, computed once per row."""
+        column_keys = self._sort_keys.setdefault(column, [])
+        if len(column_keys) < len(self._rows):
+            column_keys.extend(self._sort_value(row, column) for row in self._rows[len(column_keys):])
+        return column_keys
+
+    def _sort_value(self, row: IssueRow, column: str):
+        if column == 'time_spent':
+            return row.time_seconds
+        if column == 'priority':
+            return self._priority_rank.get(row.priority, 0)
+        if column == 'status':
+            status = row.status or ''
+            return self._status_rank.get(status, len(self._status_rank)), status.lower()
+        return str(getattr(row, column, '') or '').lower()
+
+    def _update_persistent_indexes(self, old_visible: list):
+        old_indexes = self.persistentIndexList()
+        new_indexes = []
+        for old_index in old_indexes:
+            new_row = self.row_of_key(self._rows[old_visible[old_index.row()]].key)
+            new_indexes.append(self.index(new_row, old_index.column()) if new_row >= 0 else QModelIndex())
+        self.changePersistentIndexList(old_indexes, new_indexes)
+
+    def _background(self, row: IssueRow, column: str):
+        if column == 'favorite':
+            return None
+        if column == 'priority':
+            color_hex = (self._priority_colors.get(row.priority)
+                         or self._priority_colors.get(row.priority_id))
+            if color_hex:
+                return self._brush(color_hex, PRIORITY_COLOR_ALPHA)
+        color_hex = self._status_colors.get(row.status)
+        return self._brush(color_hex, STATUS_COLOR_ALPHA) if color_hex else None
+
+    def _brush(self, color_hex: str, alpha: int) -> QBrush:
+        brush = self._brushes.get((color_hex, alpha))
+        if brush is None:
+            color = QColor(color_hex)
+            color.setAlpha(alpha)
+            brush = self._brushes[(color_hex, alpha)] = QBrush(color)
+        return brush
+
+
+class PriorityDelegate(QStyledItemDelegate):
+    """Edits the priority with a combo box that exists only while the cell is edited."""
+
+    def __init__(self, priorities_provider, parent=None):
+        super().__init__(parent)
+        # callable() -> [{'id', 'name'}], letto a ogni apertura dell'editor
+        self._priorities_provider = priorities_provider
+
+    def createEditor(self, parent, option, index):
+        combo = QComboBox(parent)
+        combo.addItem("", "")
+        for priority in self._priorities_provider():
+            combo.addItem(priority.get("name", ""), priority.get("id", ""))
+        combo.activated.connect(lambda _index, editor=combo: self._commit_and_close(editor))
+        return combo
+
+    def setEditorData(self, editor, index):
+        position = editor.findText(index.data(Qt.ItemDataRole.EditRole) or "")
+        editor.setCurrentIndex(max(position, 0))
+        # Opened by a single click: show the list straight away
+        QTimer.singleShot(0, editor.showPopup)
+
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.currentText(), Qt.ItemDataRole.EditRole)
+
+    def updateEditorGeometry(self, editor, option, index):
+        editor.setGeometry(option.rect)
+
+    def _commit_and_close(self, editor):
+        self.commitData.emit(editor)
+        self.closeEditor.emit(editor)
+
+
+class FavoriteDelegate(QStyledItemDelegate):
+    """Toggles the favorite star on click; no editor widget is ever created."""
+
+    def editorEvent(self, event, model, option, index):
+        if (event.type() == QEvent.Type.MouseButtonRelease
+                and event.button() == Qt.MouseButton.LeftButton
+                and option.rect.contains(event.position().toPoint())):
+            model.setData(index, not index.data(Qt.ItemDataRole.EditRole), Qt.ItemDataRole.EditRole)
+            return True
+        return super().editorEvent(event, model, option, index)
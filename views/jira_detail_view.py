@@ -710,7 +710,8 @@ class JiraDetailView(QDialog, SearchableMixin):
                     detail_dialog,
                     self.controller.jira_service,
                     self.controller.db_service,
-                    issue_key
+                    issue_key,
+                    metadata_cache=getattr(self.controller, 'metadata_cache', None)
                 )
                 detail_dialog.controller = detail_controller
                 detail_controller._load_data()
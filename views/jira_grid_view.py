@@ -1,18 +1,28 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QAbstractItemView, QHeaderView, QLabel, QTableWidgetItem, QFrame, QComboBox
-from PyQt6.QtCore import Qt, QSize, pyqtSignal
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QAbstractItemView, QHeaderView, QLabel, QFrame, QComboBox, QProgressBar
+from PyQt6.QtCore import Qt, QSize, QTimer, pyqtSignal
 from PyQt6.QtGui import QMovie
 from qfluentwidgets import (
-    SearchLineEdit, TableWidget, FluentIcon as FIF, 
+    SearchLineEdit, TableView, FluentIcon as FIF, 
     LineEdit, PushButton, TransparentToolButton,
     InfoBar, InfoBarPosition
 )
+from views.grid_filter import GridRowFilter
+from views.grid_populator import GridPopulator
+from views.issue_table_model import (
+    ROW_FIELDS, FavoriteDelegate, IssueRow, IssueTableModel, PriorityDelegate, sort_order_is_descending
+)
+
+# Fields of a row kept in the grid snapshot, in the order of its row lists
+SNAPSHOT_FIELDS = ("key",) + ROW_FIELDS
+# Rows kept in the grid snapshot: the first page of the refresh replaces them anyway
+SNAPSHOT_MAX_ROWS = 1000
 
 class JiraGridView(QWidget):
     """
     A view widget that displays Jira issues in a searchable and sortable table.
     Fulfills requirements 2.3.1, 2.3.2.
     """
-    # Signal emitted when sorting is completed and favorite buttons need to be reconnected
+    # Signal emitted when sorting is completed (the row filter follows the model by itself)
     sorting_completed = pyqtSignal()
     
     def __init__(self, parent=None):
@@ -31,32 +41,40 @@ class JiraGridView(QWidget):
             {"id": "favorite", "label": "Favorite", "visible": True, "sortable": False},
         ]
 
-        self.table = TableWidget() # Using Fluent TableWidget
-        # Initialize columns according to config (will be updated when app_settings set)
-        # Default: apply current config
-        try:
-            header = self.table.horizontalHeader()
-        except Exception:
-            header = None
-        # We'll set up headers properly when app_settings is available via _apply_columns()
-        
-        # Configure column resizing - Key column always visible, Title stretches
-        header = self.table.horizontalHeader()
-        header.setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)  # Key column auto-resize
-        header.setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)  # Title column stretches
-        header.setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)  # Status column auto-resize
-        header.setSectionResizeMode(3, QHeaderView.ResizeMode.ResizeToContents)  # Priority column auto-resize
-        header.setSectionResizeMode(4, QHeaderView.ResizeMode.ResizeToContents)  # Time column auto-resize
-        header.setSectionResizeMode(5, QHeaderView.ResizeMode.Fixed)  # Favorite column fixed
-        self.table.setColumnWidth(5, 60)  # Fixed width for favorite column
+        # Model/view grid: rows live in the model, only the visible ones are painted
+        self.model = IssueTableModel(self)
+        self.table = TableView()
+        self.table.setModel(self.model)
+        # Columns sized to their contents measure the rows on screen only, not the first thousand
+        self.table.horizontalHeader().setResizeContentsPrecision(0)
+        self._priorities_provider = lambda: []
+        # Editors are created only while a cell is being edited
+        self.priority_delegate = PriorityDelegate(lambda: self._priorities_provider(), self.table)
+        self.favorite_delegate = FavoriteDelegate(self.table)
+        self._apply_columns()
         
         self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        # The priority editor opens with a single click (see _on_cell_clicked)
+        self.table.clicked.connect(self._on_cell_clicked)
         
-        # Enable cumulative sorting
-        self.table.setSortingEnabled(True)
+        # Cumulative sorting is done by the model (_on_header_clicked), not by the view
+        header = self.table.horizontalHeader()
+        header.setSortIndicatorShown(True)
         self.sort_columns = []  # Track sort order for cumulative sorting
         header.sectionClicked.connect(self._on_header_clicked)
+        
+        # Large pages are inserted in chunks, between two frames
+        self.populator = GridPopulator(self, parent=self)
+        self.populator.progress.connect(self._on_population_progress)
+        self.populator.finished.connect(self._on_population_finished)
+        self.population_progress = QProgressBar()
+        self.population_progress.setFixedHeight(6)
+        self.population_progress.setTextVisible(False)
+        self.population_progress.setVisible(False)
+        
+        # Client-side filter over the precomputed search text of the rows
+        self.row_filter = GridRowFilter(self, parent=self)
 
         # Title label
         self.title_label = QLabel("Griglia Jira")
@@ -79,6 +97,11 @@ class JiraGridView(QWidget):
         self.apply_jql_btn.setToolTip("Esegui la query JQL")
         jql_layout.addWidget(self.apply_jql_btn)
 
+        self.load_all_btn = PushButton("Carica tutti")
+        self.load_all_btn.setIcon(FIF.DOWNLOAD)
+        self.load_all_btn.setToolTip("Carica tutti i risultati della query JQL (per ordinamento, export o totali)")
+        jql_layout.addWidget(self.load_all_btn)
+
         # Search and filter layout
         filter_layout = QHBoxLayout()
         self.search_box = SearchLineEdit(self)
@@ -100,6 +123,7 @@ class JiraGridView(QWidget):
         layout.addWidget(self.title_label)
         layout.addLayout(jql_layout)
         layout.addLayout(filter_layout)
+        layout.addWidget(self.population_progress)
         layout.addWidget(self.table)
         self.setLayout(layout)
 
@@ -137,6 +161,12 @@ class JiraGridView(QWidget):
         self.status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.status_label.setStyleSheet("font-size: 16px; font-weight: bold; color: #007ACC; margin: 10px;")
         loading_layout.addWidget(self.status_label)
+
+        # Stops a long load (e.g. "Carica tutti"); shown only for loads that can be cancelled
+        self.cancel_loading_btn = PushButton("Annulla")
+        self.cancel_loading_btn.setToolTip("Interrompe il caricamento mantenendo i ticket già caricati")
+        self.cancel_loading_btn.setVisible(False)
+        loading_layout.addWidget(self.cancel_loading_btn, 0, Qt.AlignmentFlag.AlignCenter)
         
         # Error message label
         self.error_label = QLabel()
@@ -164,16 +194,19 @@ class JiraGridView(QWidget):
         else:
             self.hide_loading_status()
 
-    def show_status_message(self, message: str, is_loading: bool = False):
+    def show_status_message(self, message: str, is_loading: bool = False, cancellable: bool = False):
         """
         Shows a status message without blocking the UI.
         New non-blocking approach for better UX.
+        With cancellable the overlay also shows cancel_loading_btn.
         """
         if is_loading:
             # Start the loading animation but keep UI enabled
             self.animation_timer.start(200)  # Update every 200ms
             self.status_label.setText(message)
             self.error_label.setVisible(False)
+            self.cancel_loading_btn.setEnabled(True)
+            self.cancel_loading_btn.setVisible(cancellable)
             
             # Position the overlay over the table but make it less intrusive
             self.loading_overlay.setGeometry(self.table.geometry())
@@ -194,6 +227,7 @@ class JiraGridView(QWidget):
         """Hides the loading status and re-enables all controls."""
         self.animation_timer.stop()
         self.loading_overlay.setVisible(False)
+        self.cancel_loading_btn.setVisible(False)
         self._set_controls_enabled(True)
 
     def _set_controls_enabled(self, enabled):
@@ -292,32 +326,110 @@ class JiraGridView(QWidget):
                     pass
 
     def clear_table(self):
-        """Removes all rows from the table."""
-        self.table.setRowCount(0)
+        """Removes all rows from the table, including the ones still to be inserted."""
+        self.populator.cancel()
+        self._on_population_finished()
+        self.row_filter.reset()
+        self.model.clear()
 
     def add_issue_row(self, row_data):
         """
         Adds a new row to the table.
-        `row_data` should be a dictionary with keys: 'key', 'title', 'status', 'priority', 'time_spent'.
+        `row_data` is an IssueRow.
         """
-        # Insert row and populate columns according to visible columns config
-        row_position = self.table.rowCount()
-        self.table.insertRow(row_position)
-        visible = self.get_visible_columns()
-        for col_index, col in enumerate(visible):
-            cid = col.get('id')
-            if cid == 'favorite':
-                fav_button = TransparentToolButton("☆")
-                fav_button.setCheckable(True)
-                fav_button.setToolTip("Aggiungi/rimuovi dai preferiti")
-                # set checked state if provided
-                if row_data.get('favorite_checked'):
-                    fav_button.setChecked(True)
-                    fav_button.setText("★")
-                self.table.setCellWidget(row_position, col_index, fav_button)
-            else:
-                text = str(row_data.get(cid, ''))
-                self.table.setItem(row_position, col_index, QTableWidgetItem(text))
+        self.append_issue_rows([row_data])
+
+    def append_issue_rows(self, rows: list):
+        """Adds several rows with a single model insertion."""
+        self.model.append_rows(rows)
+
+    def reconcile_issue_rows(self, rows: list) -> dict:
+        """
+        Replaces the rows of the table with rows, changing only the rows that
+        differ (see IssueTableModel.reconcile_rows); rows still queued for
+        insertion are dropped.
+        """
+        self.populator.cancel()
+        self._on_population_finished()
+        self.row_filter.reset()
+        return self.model.reconcile_rows(rows)
+
+    def snapshot(self) -> dict:
+        """
+        Compact state of the grid, to be shown again at the next launch:
+        rows in display order (lists of SNAPSHOT_FIELDS values), column
+        layout, sort order, scroll position and selected issue.
+        """
+        rows = self.model.rows()
+        order = self.model.display_order()[:SNAPSHOT_MAX_ROWS]
+        return {
+            'fields': list(SNAPSHOT_FIELDS),
+            'rows': [[getattr(rows[storage], field) for field in SNAPSHOT_FIELDS] for storage in order],
+            'columns': self.columns_config,
+            'sort': [{'column': sort_info.get('column'),
+                      'order': 1 if sort_order_is_descending(sort_info.get('order')) else 0}
+                     for sort_info in self.sort_columns],
+            'scroll': self.table.verticalScrollBar().value(),
+            'selected': self.selected_key(),
+        }
+
+    def restore_snapshot(self, snapshot: dict) -> bool:
+        """
+        Shows a grid snapshot (see snapshot()) at once, without chunking.
+        Returns False, leaving the grid untouched, if the snapshot is not usable.
+        """
+        fields = snapshot.get('fields') or []
+        if 'key' not in fields or not set(ROW_FIELDS) <= set(fields):
+            return False
+        positions = [(field, fields.index(field)) for field in SNAPSHOT_FIELDS]
+        rows = [IssueRow(**{field: values[position] for field, position in positions})
+                for values in snapshot.get('rows') or []]
+
+        self.clear_table()
+        if snapshot.get('columns'):
+            self.columns_config = snapshot['columns']
+            self._apply_columns()
+        self.model.append_rows(rows)
+        self.sort_columns = [{'column': sort_info['column'], 'order': Qt.SortOrder(sort_info['order'])}
+                             for sort_info in snapshot.get('sort') or []]
+        if self.sort_columns:
+            self._apply_cumulative_sort()
+
+        selected_row = self.model.row_of_key(snapshot.get('selected') or '')
+        if selected_row >= 0:
+            self.table.selectRow(selected_row)
+        scroll = snapshot.get('scroll') or 0
+        if scroll:
+            # The range of the scroll bar follows the rows once the table has laid them out
+            QTimer.singleShot(0, lambda: self.table.verticalScrollBar().setValue(scroll))
+        return True
+
+    def _on_population_progress(self, inserted: int, total: int):
+        self.population_progress.setMaximum(total)
+        self.population_progress.setValue(inserted)
+        self.population_progress.setToolTip(f"Inseriti {inserted} di {total} ticket")
+        self.population_progress.setVisible(inserted < total)
+
+    def _on_population_finished(self):
+        self.population_progress.setVisible(False)
+
+    def key_at(self, row: int) -> str | None:
+        """Jira key shown in a row of the table."""
+        return self.model.key_at(row)
+
+    def selected_key(self) -> str | None:
+        """Jira key of the selected row, if any."""
+        selection_model = self.table.selectionModel()
+        rows = selection_model.selectedRows() if selection_model else []
+        return self.model.key_at(rows[0].row()) if rows else None
+
+    def set_priorities_provider(self, provider):
+        """Sets the callable returning the priorities ({id, name}) offered by the priority editor."""
+        self._priorities_provider = provider
+
+    def _on_cell_clicked(self, index):
+        if self.model.column_id(index.column()) == 'priority':
+            self.table.edit(index)
 
     def populate_jql_favorites(self, favorites):
         """Populate the JQL combo box with favorite queries."""
@@ -442,173 +554,18 @@ class JiraGridView(QWidget):
             return
     
     def _apply_cumulative_sort(self):
-        """Apply cumulative sorting to the table."""
+        """Apply cumulative sorting to the rows of the model."""
         if not self.sort_columns:
             return
         
         try:
-            # Identify special column indices (columns that contain widgets)
-            favorite_col_index = -1
-            priority_col_index = -1
-            visible_columns = self.get_visible_columns()
-            
-            for i, col in enumerate(visible_columns):
-                col_id = col.get('id')
-                if col_id == 'favorite':
-                    favorite_col_index = i
-                elif col_id == 'priority':
-                    priority_col_index = i
-                    
-            # Collect all row data including widget states
-            data_to_sort = []
-            for row in range(self.table.rowCount()):
-                row_data = {'values': [], 'widgets': {}}
-                
-                # Get text from all columns, handling widgets specially
-                for col in range(self.table.columnCount()):
-                    if col == favorite_col_index:
-                        # For favorite column, get the widget state
-                        widget = self.table.cellWidget(row, col)
-                        if widget:
-                            row_data['widgets'][col] = {
-                                'type': 'favorite',
-                                'checked': widget.isChecked(),
-                                'text': "★" if widget.isChecked() else "☆"
-                            }
-                            row_data['values'].append("★" if widget.isChecked() else "☆")
-                        else:
-                            row_data['values'].append("☆")
-                    elif col == priority_col_index:
-                        # For priority column, get the combobox selection
-                        widget = self.table.cellWidget(row, col)
-                        if widget and hasattr(widget, 'currentText'):
-                            current_text = widget.currentText()
-                            current_data = widget.currentData() if hasattr(widget, 'currentData') else None
-                            row_data['widgets'][col] = {
-                                'type': 'priority',
-                                'text': current_text,
-                                'data': current_data,
-                                'current_index': widget.currentIndex() if hasattr(widget, 'currentIndex') else 0
-                            }
-                            row_data['values'].append(current_text)
-                        else:
-                            # Fallback: get text from item if no widget
-                            item = self.table.item(row, col)
-                            text = item.text() if item else ""
-                            row_data['values'].append(text)
-                    else:
-                        # Regular column - get text from item
-                        item = self.table.item(row, col)
-                        row_data['values'].append(item.text() if item else "")
-                            
-                data_to_sort.append(row_data)
-            
-            # Define sort key function
-            def sort_key(row_data):
-                key = []
-                for sort_info in reversed(self.sort_columns):  # Process in reverse order for stable sort
-                    col_index = sort_info['column']
-                    # Skip favorite column from custom sorting
-                    if col_index == favorite_col_index:
-                        continue
-                        
-                    if 0 <= col_index < len(row_data['values']):
-                        value = row_data['values'][col_index]
-                        
-                        # Handle time spent column specially
-                        is_time_column = False
-                        is_priority_column = False
-                        if 0 <= col_index < len(visible_columns):
-                            col_id = visible_columns[col_index].get('id')
-                            is_time_column = col_id == 'time_spent'
-                            is_priority_column = col_id == 'priority'
-                        
-                        if is_time_column and isinstance(value, str):
-                            try:
-                                # Extract hours and minutes
-                                if 'h' in value and 'm' in value:
-                                    parts = value.replace('h', '').replace('m', '').split()
-                                    hours = int(parts[0]) if len(parts) > 0 else 0
-                                    minutes = int(parts[1]) if len(parts) > 1 else 0
-                                    numeric_value = hours * 60 + minutes
-                                else:
-                                    numeric_value = 0
-                                key.append((numeric_value, sort_info['order'] == Qt.SortOrder.DescendingOrder))
-                            except Exception:
-                                key.append((0, sort_info['order'] == Qt.SortOrder.DescendingOrder))
-                        elif is_priority_column:
-                            # Priority sorting by predefined order
-                            priority_order = {
-                                'Highest': 5, 'High': 4, 'Medium': 3, 'Low': 2, 'Lowest': 1, '': 0
-                            }
-                            priority_value = priority_order.get(str(value), 0)
-                            key.append((priority_value, sort_info['order'] == Qt.SortOrder.DescendingOrder))
-                        else:
-                            # String sorting - handle None values safely
-                            str_value = str(value) if value is not None else ""
-                            key.append((str_value.lower(), sort_info['order'] == Qt.SortOrder.DescendingOrder))
-                return key
-            
-            # Sort the data
-            sorted_data = sorted(data_to_sort, key=sort_key)
-            
-            # Remember scroll position
-            vscroll = self.table.verticalScrollBar().value()
-            
-            # Temporarily block signals to prevent cell widget signals during rebuild
-            self.table.blockSignals(True)
-            
-            # Clear table and repopulate with sorted data
-            self.table.setRowCount(0)
-            for row_data in sorted_data:
-                row_position = self.table.rowCount()
-                self.table.insertRow(row_position)
-                
-                # Add all items back to table
-                for col, value in enumerate(row_data['values']):
-                    if col in row_data['widgets']:
-                        # This column has a widget - recreate it
-                        widget_info = row_data['widgets'][col]
-                        if widget_info['type'] == 'favorite':
-                            from qfluentwidgets import TransparentToolButton
-                            favorite_widget = TransparentToolButton(widget_info['text'])
-                            favorite_widget.setCheckable(True)
-                            favorite_widget.setChecked(widget_info['checked'])
-                            favorite_widget.setToolTip("Aggiungi/rimuovi dai preferiti")
-                            self.table.setCellWidget(row_position, col, favorite_widget)
-                        elif widget_info['type'] == 'priority':
-                            from PyQt6.QtWidgets import QComboBox
-                            priority_combo = QComboBox()
-                            priority_combo.addItem("", "")
-                            priority_combo.addItem("Highest", "1")
-                            priority_combo.addItem("High", "2") 
-                            priority_combo.addItem("Medium", "3")
-                            priority_combo.addItem("Low", "4")
-                            priority_combo.addItem("Lowest", "5")
-                            
-                            # Restore the previous selection
-                            if widget_info.get('data'):
-                                index = priority_combo.findData(widget_info['data'])
-                                if index >= 0:
-                                    priority_combo.setCurrentIndex(index)
-                            else:
-                                index = priority_combo.findText(widget_info['text'])
-                                if index >= 0:
-                                    priority_combo.setCurrentIndex(index)
-                            
-                            self.table.setCellWidget(row_position, col, priority_combo)
-                    else:
-                        # Regular column - create text item
-                        item = QTableWidgetItem(str(value) if value is not None else "")
-                        self.table.setItem(row_position, col, item)
-                        
-            # Re-enable signals
-            self.table.blockSignals(False)
-            
-            # Restore scroll position
-            self.table.verticalScrollBar().setValue(vscroll)
+            self.model.sort_rows(self.sort_columns)
+            primary = self.sort_columns[0]
+            order = (Qt.SortOrder.DescendingOrder if sort_order_is_descending(primary.get('order'))
+                     else Qt.SortOrder.AscendingOrder)
+            self.table.horizontalHeader().setSortIndicator(primary.get('column', -1), order)
             
-            # Emit signal to notify that sorting is completed and widgets need reconnecting
+            # Emit signal to notify that sorting is completed
             self.sorting_completed.emit()
             
         except Exception as e:
@@ -690,15 +647,10 @@ class JiraGridView(QWidget):
             pass
 
     def _apply_columns(self):
-        """Apply current `self.columns_config` to the table headers and column count."""
+        """Apply current `self.columns_config` to the model columns, header and delegates."""
         # Build visible columns list
-        visible = [c for c in self.columns_config if c.get('visible', True)]
-        self.table.setColumnCount(len(visible))
-        labels = [c.get('label', c.get('id')) for c in visible]
-        try:
-            self.table.setHorizontalHeaderLabels(labels)
-        except Exception:
-            pass
+        visible = self.get_visible_columns()
+        self.model.set_columns(visible)
         # Adjust header defaults for some known columns
         try:
             header = self.table.horizontalHeader()
@@ -718,6 +670,13 @@ class JiraGridView(QWidget):
                     header.setSectionResizeMode(i, QHeaderView.ResizeMode.ResizeToContents)
         except Exception:
             pass
+        # Delegates follow the columns they edit
+        for i in range(self.model.columnCount()):
+            self.table.setItemDelegateForColumn(i, None)
+        for column_id, delegate in (('priority', self.priority_delegate), ('favorite', self.favorite_delegate)):
+            column = self.model.column_index(column_id)
+            if column >= 0:
+                self.table.setItemDelegateForColumn(column, delegate)
 
     def get_visible_columns(self):
         return [c for c in self.columns_config if c.get('visible', True)]
@@ -29,6 +29,8 @@ class NotificationsDialog(QDialog):
         
         self._setup_ui()
         self._load_subscriptions()
+        # The check runs in background: reload the table when it completes
+        self.notification_controller.check_completed.connect(self._on_check_completed)
         
     def _setup_ui(self):
         """Set up the dialog UI."""
@@ -259,7 +261,11 @@ class NotificationsDialog(QDialog):
         
     def _check_notifications_now(self):
         """Force an immediate check for notifications."""
-        self.notification_controller.check_notifications()
+        self.notification_controller.check_notifications(force=True)
+        self._load_subscriptions()
+
+    def _on_check_completed(self, summary):
+        """Reload the subscriptions after a background check."""
         self._load_subscriptions()
         
     def _open_in_browser(self, issue_key):
@@ -104,6 +104,24 @@ class SyncStatusIndicator(QWidget):
         else:
             self.setToolTip("Nessuna operazione in coda")
         
+    def set_transfer_progress(self, sent, total):
+        """Shows the progress of an upload in the count label; (None, None) restores the count."""
+        if sent is None or not total:
+            self._update_appearance()
+            return
+        self.setVisible(True)
+        self.count_label.setText(f"⬆ {sent * 100 // total}%")
+        self.setToolTip(f"Caricamento allegato: {sent // 1024} / {total // 1024} KB")
+
+    def set_run_progress(self, done, total):
+        """Shows how many operations of the running sync are done; (None, None) restores the count."""
+        if done is None or not total:
+            self._update_appearance()
+            return
+        self.setVisible(True)
+        self.count_label.setText(f"⟳ {done}/{total}")
+        self.setToolTip(f"Sincronizzazione: {done} di {total} operazioni inviate")
+
     def mousePressEvent(self, event):
         """Handles mouse press events to emit the clicked signal."""
         self.clicked.emit()
@@ -1,6 +1,9 @@
 from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot
 import logging
+import threading
+import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 
 class JiraWorker(QObject):
@@ -12,21 +15,35 @@ class JiraWorker(QObject):
     finished = pyqtSignal(list)  # Signal to emit when the task is done, carrying the result
     error = pyqtSignal(str)        # Signal to emit when an error occurs
 
-    def __init__(self, jira_service, jql, start_at=0, max_results=100, favorite_keys=None):
+    def __init__(self, jira_service, jql, start_at=0, max_results=100, favorite_keys=None, page_size=100):
         super().__init__()
         self.jira_service = jira_service
         self.jql = jql
         self.start_at = start_at
         self.max_results = max_results
         self.favorite_keys = favorite_keys
+        # More than page_size issues are requested page by page: Jira caps maxResults
+        self.page_size = max(1, int(page_size))
+        self._cancelled = False
         self._logger = logging.getLogger('JiraTimeTracker')
 
+    def stop(self):
+        """
+        Marks the worker as superseded. A request already sent cannot be
+        interrupted, but its result is dropped and the thread ends as soon as it returns.
+        """
+        self._cancelled = True
+
     @pyqtSlot()
     def run(self):
         """
         The main task to be executed by the worker.
         Fetches Jira issues and emits the result or an error.
         """
+        if self._cancelled:
+            # Superseded before starting: still emit so the owning thread quits
+            self.finished.emit([])
+            return
         try:
             # Instrumentation: log entry and parameters so we can trace worker activity
             self._logger.debug(
@@ -40,12 +57,18 @@ class JiraWorker(QObject):
             if not self.jira_service.is_connected():
                 raise ConnectionError("Not connected to Jira.")
 
-            issues = self.jira_service.search_issues(
-                self.jql,
-                start_at=self.start_at,
-                max_results=self.max_results,
-                issue_keys=self.favorite_keys,
-            )
+            issues = []
+            while len(issues) < self.max_results and not self._cancelled:
+                size = min(self.page_size, self.max_results - len(issues))
+                chunk = self.jira_service.search_issues(
+                    self.jql,
+                    start_at=self.start_at + len(issues),
+                    max_results=size,
+                    issue_keys=self.favorite_keys,
+                )
+                issues.extend(chunk or [])
+                if not chunk or len(chunk) < size:
+                    break
 
             # Log result size for quick diagnostics
             try:
@@ -54,10 +77,176 @@ class JiraWorker(QObject):
                 count = 0
             self._logger.debug("JiraWorker finished: loaded %s issues", count)
 
-            self.finished.emit(issues)
+            self.finished.emit([] if self._cancelled else issues)
         except Exception as e:
             tb = traceback.format_exc()
             # Log full traceback to the configured logger so it's visible in file/console
             self._logger.error("JiraWorker error: %s\n%s", e, tb)
             # Emit a descriptive error message including the traceback to aid debugging
             self.error.emit(f"Failed to load data: {e}\n{tb}")
+
+
+class JiraLoadAllWorker(QObject):
+    """
+    Loads a whole JQL result set using concurrent page requests.
+
+    A maxResults=0 count query is issued first to learn the total; the pages
+    are then fetched in parallel with bounded concurrency and a simple rate
+    limit. Pages are emitted in startAt order as soon as every preceding page
+    has arrived, so the grid can be filled progressively in result order.
+    The load can be cancelled at any time via stop().
+    """
+    total_known = pyqtSignal(int)       # Total number of issues reported by Jira
+    page_loaded = pyqtSignal(list)      # Issues of the next page, in result order
+    progress = pyqtSignal(int, int)     # (loaded, total)
+    finished = pyqtSignal(int)          # Number of issues emitted
+    error = pyqtSignal(str)
+
+    def __init__(self, jira_service, jql, favorite_keys=None, page_size=100,
+                 max_workers=4, max_requests_per_second=8.0, sleep_func=None):
+        super().__init__()
+        self.jira_service = jira_service
+        self.jql = jql
+        self.favorite_keys = favorite_keys
+        self.page_size = max(1, int(page_size))
+        self.max_workers = max(1, int(max_workers))
+        self.max_requests_per_second = max_requests_per_second
+        self._stop_event = threading.Event()
+        # Waiting on the stop event lets stop() cut a rate-limit wait short
+        self._sleep = sleep_func or self._stop_event.wait
+        self._rate_lock = threading.Lock()
+        self._next_request_at = 0.0
+        self._logger = logging.getLogger('JiraTimeTracker')
+
+    def stop(self):
+        """Requests cancellation; pages still in flight are discarded."""
+        self._stop_event.set()
+
+    def is_stopped(self) -> bool:
+        return self._stop_event.is_set()
+
+    def _wait_for_rate_slot(self):
+        """Spaces out request starts to at most max_requests_per_second."""
+        if not self.max_requests_per_second:
+            return
+        interval = 1.0 / float(self.max_requests_per_second)
+        with self._rate_lock:
+            now = time.monotonic()
+            wait = self._next_request_at - now
+            self._next_request_at = max(now, self._next_request_at) + interval
+        if wait > 0:
+            self._sleep(wait)
+
+    def _fetch_page(self, start_at: int, size: int) -> list:
+        """
+        Fetches the range [start_at, start_at + size).
+        Jira may cap maxResults below the requested size, so keep asking for
+        the remainder of the range until it is complete or Jira runs dry.
+        """
+        issues = []
+        while len(issues) < size and not self._stop_event.is_set():
+            self._wait_for_rate_slot()
+            if self._stop_event.is_set():
+                break
+            chunk = self.jira_service.search_issues(
+                self.jql,
+                start_at=start_at + len(issues),
+                max_results=size - len(issues),
+                issue_keys=self.favorite_keys,
+            )
+            if not chunk:
+                break
+            issues.extend(chunk)
+        return issues
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            if not self.jira_service.is_connected():
+                raise ConnectionError("Not connected to Jira.")
+
+            total = self.jira_service.count_issues(self.jql, issue_keys=self.favorite_keys)
+            self._logger.debug("JiraLoadAllWorker: %s issues for jql=%s", total, self.jql)
+            self.total_known.emit(total)
+            if total <= 0 or self._stop_event.is_set():
+                self.finished.emit(0)
+                return
+
+            starts = list(range(0, total, self.page_size))
+            pending = {}      # start_at -> issues, pages arrived out of order
+            next_index = 0    # index into starts of the next page to emit
+            emitted = 0
+
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(starts))) as executor:
+                futures = {
+                    executor.submit(self._fetch_page, start, min(self.page_size, total - start)): start
+                    for start in starts
+                }
+                try:
+                    for future in as_completed(futures):
+                        if self._stop_event.is_set():
+                            break
+                        pending[futures[future]] = future.result()
+                        # Emit every page that is now contiguous with what was already shown
+                        while next_index < len(starts) and starts[next_index] in pending:
+                            page = pending.pop(starts[next_index])
+                            next_index += 1
+                            if page:
+                                emitted += len(page)
+                                self.page_loaded.emit(page)
+                                self.progress.emit(emitted, total)
+                finally:
+                    if next_index < len(starts):
+                        # Cancelled or failed: stop in-flight pages and drop queued ones
+                        self._stop_event.set()
+                        for future in futures:
+                            future.cancel()
+
+            if self._stop_event.is_set():
+                self._logger.debug("JiraLoadAllWorker cancelled after %s/%s issues", emitted, total)
+            self.finished.emit(emitted)
+        except Exception as e:
+            self._stop_event.set()
+            tb = traceback.format_exc()
+            self._logger.error("JiraLoadAllWorker error: %s\n%s", e, tb)
+            self.error.emit(f"Failed to load data: {e}")
+
+
+class MetadataRefreshWorker(QObject):
+    """Refreshes the stale Jira metadata lists (priorities, statuses, ...) off the UI thread."""
+    finished = pyqtSignal(list)   # Kinds that were refreshed
+    error = pyqtSignal(str)
+
+    def __init__(self, metadata_cache, force=False):
+        super().__init__()
+        self.metadata_cache = metadata_cache
+        self.force = force
+        self._logger = logging.getLogger('JiraTimeTracker')
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            self.finished.emit(self.metadata_cache.refresh(force=self.force))
+        except Exception as e:
+            self._logger.error("MetadataRefreshWorker error: %s", e)
+            self.error.emit(str(e))
+
+
+class NotificationCheckWorker(QObject):
+    """Runs one notification polling cycle (see NotificationPoller) off the UI thread."""
+    finished = pyqtSignal(dict)   # Summary of the cycle
+    error = pyqtSignal(str)
+
+    def __init__(self, poller, force=False):
+        super().__init__()
+        self.poller = poller
+        self.force = force
+        self._logger = logging.getLogger('JiraTimeTracker')
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            self.finished.emit(self.poller.poll(force=self.force))
+        except Exception as e:
+            self._logger.error("NotificationCheckWorker error: %s", e)
+            self.error.emit(str(e))